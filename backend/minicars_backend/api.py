@@ -1,15 +1,19 @@
+from typing import Optional
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from .settings import get_settings
 from .commands.start_stream import start_stream
-from .commands.start_car_control import start_car_control
+from .commands.start_car_control import start_car_control, get_joystick_sender
 from .commands.start_receiver import start_receiver
 from .commands.stop_stream import stop_stream
 from .commands.stop_car_control import stop_car_control
 from .commands.stop_receiver import stop_receiver
 from .process_registry import list_status
+from .video import get_monitor, get_tracker
+from .jetson_client import JetsonError, JetsonUnavailable, get_supervisor_health, supervisor_request
 from .control_profiles import (
     load_profile,
     save_profile,
@@ -32,7 +36,7 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
 
@@ -41,6 +45,15 @@ class ControlProfile(BaseModel):
     active_mode: str
 
 
+class PresetSelection(BaseModel):
+    name: Optional[str] = None
+
+
+class StreamDestination(BaseModel):
+    host: str
+    port: int
+
+
 @app.get("/health")
 def health():
     return {
@@ -53,7 +66,16 @@ def health():
 
 @app.get("/status")
 def status():
-    return list_status()
+    """
+    Estado de los procesos locales y del stream_supervisor de la Jetson.
+
+    ``jetson`` trae el estado del pipeline (running/starting/backoff/waiting/stopped)
+    con su motivo, reinicios, último fallo clasificado, historial de alcance al
+    backend, fps/bitrate del encoder y tiempo al primer frame.
+    """
+    result = list_status()
+    result["jetson"] = get_supervisor_health()
+    return result
 
 
 @app.post("/actions/start_stream")
@@ -136,6 +158,140 @@ def set_control_profile(profile: ControlProfile) -> ControlProfile:
     return ControlProfile(**saved)
 
 
+@app.get("/control/telemetry")
+def get_control_telemetry():
+    """
+    Telemetría más reciente del auto (batería, velocidad, latencia de actuación).
+
+    Los valores llegan por la misma conexión TCP del joystick, así que este
+    endpoint solo lee la última copia en memoria (sin ida y vuelta a la Jetson).
+    """
+    sender = get_joystick_sender()
+    if sender is None:
+        return {"status": "stopped", "telemetry": None}
+    return {"status": "running", "telemetry": sender.get_telemetry()}
+
+
+@app.get("/video/qos")
+def get_video_qos():
+    """
+    Calidad de recepción del stream de video (pérdida, jitter, paquetes tardíos).
+
+    Son los mismos datos que el monitor QoS envía a la Jetson como feedback
+    para el bitrate adaptativo.
+    """
+    monitor = get_monitor()
+    if monitor is None or not monitor.running:
+        return {"status": "stopped", "qos": None}
+    return {"status": "running", "qos": monitor.get_qos()}
+
+
+@app.get("/video/latency")
+def get_video_latency():
+    """
+    Latencia del video por etapas (percentiles en ms) en modo medición.
+
+    Requiere MINICARS_VIDEO_LATENCY_ENABLED=true en la laptop, el stream iniciado
+    con /actions/start_stream y MINICARS_LATENCY_PROBE_PORT en la Jetson.
+    """
+    tracker = get_tracker()
+    if tracker is None:
+        return {"status": "disabled", "latency": None}
+    return {"status": "running", "latency": tracker.snapshot()}
+
+
+@app.post("/video/latency/reset")
+def reset_video_latency():
+    """Descarta las muestras acumuladas para empezar una medición nueva."""
+    tracker = get_tracker()
+    if tracker is None:
+        raise HTTPException(status_code=409, detail="Latency measurement mode is disabled")
+    tracker.reset()
+    return {"status": "ok"}
+
+
+def _call_jetson(method: str, path: str, json: Optional[dict] = None) -> dict:
+    """Llama al supervisor de la Jetson traduciendo los fallos a errores HTTP."""
+    try:
+        return supervisor_request(method, path, json)
+    except JetsonUnavailable as exc:
+        raise HTTPException(status_code=502, detail={"message": "Jetson no disponible", "error": str(exc)})
+    except JetsonError as exc:
+        raise HTTPException(status_code=exc.status_code, detail={"message": "Error de la Jetson", "error": exc.detail})
+
+
+@app.get("/stream/presets")
+def get_stream_presets():
+    """
+    Presets de video definidos en la Jetson, el activo y los valores en uso.
+    """
+    return _call_jetson("GET", "/presets")
+
+
+@app.post("/stream/presets/active")
+def set_stream_preset(selection: PresetSelection):
+    """
+    Activa un preset en la Jetson (name=null vuelve a los valores base).
+
+    La Jetson aplica en vivo lo que puede (bitrate, framerate, GOP) y reinicia
+    el pipeline solo si cambia la resolución o el encoder; la respuesta indica
+    qué se aplicó de cada forma.
+    """
+    return _call_jetson("POST", "/presets/active", {"name": selection.name})
+
+
+@app.get("/stream/destinations")
+def get_stream_destinations():
+    """
+    Receptores del video (estación de control + destinos extra) con sus
+    estadísticas de envío en la Jetson.
+    """
+    return _call_jetson("GET", "/destinations")
+
+
+@app.post("/stream/destinations")
+def add_stream_destination(destination: StreamDestination):
+    """
+    Agrega un receptor (otra laptop, pantalla de espectadores o grupo multicast).
+
+    El video se codifica una sola vez y los mismos paquetes RTP se envían a todos
+    los destinos; el receptor nuevo no interrumpe a los demás.
+    """
+    return _call_jetson("POST", "/destinations/add", {"host": destination.host, "port": destination.port})
+
+
+@app.delete("/stream/destinations/{host}/{port}")
+def remove_stream_destination(host: str, port: int):
+    """Deja de enviar el video a un receptor extra."""
+    return _call_jetson("POST", "/destinations/remove", {"host": host, "port": port})
+
+
+@app.get("/stream/recording")
+def get_stream_recording():
+    """
+    Estado de la grabación en el auto: si está activa, buffers descartados,
+    segmentos recientes con su velocidad de escritura y uso de disco.
+    """
+    return _call_jetson("GET", "/recording")
+
+
+@app.post("/stream/recording/start")
+def start_stream_recording():
+    """
+    Empieza a grabar en la Jetson el mismo H.264 que se transmite (sin recodificar).
+
+    Con el pipeline en proceso la grabación se engancha sin cortar el video en vivo;
+    con gst-launch el pipeline se reinicia (``result: "restart"``).
+    """
+    return _call_jetson("POST", "/recording/start")
+
+
+@app.post("/stream/recording/stop")
+def stop_stream_recording():
+    """Detiene la grabación y cierra el segmento en curso."""
+    return _call_jetson("POST", "/recording/stop")
+
+
 @app.post("/shutdown")
 async def shutdown():
     """
@@ -18,6 +18,19 @@ settings = get_settings()
 _joystick_sender: Optional[JoystickSender] = None
 
 
+def get_joystick_sender() -> Optional[JoystickSender]:
+    """
+    Devuelve el JoystickSender activo.
+    
+    Returns:
+        El sender si el control del vehículo está corriendo, None si no.
+    """
+    sender = _joystick_sender
+    if sender is None or not sender.running:
+        return None
+    return sender
+
+
 def start_car_control() -> dict:
     """
     Inicia el sistema de control del vehículo RC.
@@ -57,6 +70,9 @@ def start_car_control() -> dict:
             target_host=settings.joystick_target_host,
             target_port=settings.joystick_target_port,
             send_hz=settings.joystick_send_hz,
+            link_timeout_ms=settings.joystick_link_timeout_ms,
+            probe_interval_ms=settings.joystick_probe_interval_ms,
+            reconnect_delay=settings.joystick_reconnect_delay,
         )
         _joystick_sender.start()
         
@@ -8,7 +8,9 @@ import logging
 import subprocess
 from typing import Optional
 
+from ..settings import get_settings
 from ..utils.check_gstreamer import get_gstreamer_path
+from ..video import build_receiver_pipeline, start_monitor
 
 logger = logging.getLogger(__name__)
 
@@ -44,16 +46,15 @@ def start_receiver() -> dict:
             "message": "Receiver ya está corriendo (proceso existente).",
         }
 
-    # Pipeline GStreamer para recibir video RTP/H264
-    # - rtpjitterbuffer latency=30: buffer de 30ms para compensar jitter en WiFi
+    # El monitor QoS (si está habilitado) recibe en UDP 5000 y reenvía al receptor
+    settings = get_settings()
+    listen_port = start_monitor(settings)
+
+    # Pipeline GStreamer receptor (video/receiver.py)
+    # - rtpjitterbuffer latency (30ms por defecto): compensa el jitter en WiFi
     # - drop-on-late=true: descarta paquetes tardíos para mantener latencia baja
-    pipeline = (
-        f'"{gst_launch}" -v '
-        'udpsrc port=5000 caps="application/x-rtp,media=video,encoding-name=H264,payload=96,clock-rate=90000" ! '
-        'rtpjitterbuffer latency=30 drop-on-late=true ! '
-        'rtph264depay ! h264parse ! '
-        'avdec_h264 ! videoconvert ! autovideosink sync=false'
-    )
+    # - video_loss_recovery: retransmisión (rtx) o FEC, con latencia acotada
+    pipeline = f'"{gst_launch}" -v ' + build_receiver_pipeline(settings, listen_port)
 
     try:
         # shell=True porque usamos la sintaxis de pipeline con "!"
@@ -5,10 +5,13 @@ Este módulo maneja el proceso del stream de video desde la Jetson Nano.
 Unificado con start_receiver para usar la misma lógica de detección de GStreamer.
 """
 import logging
+import os
 import subprocess
 from typing import Optional
 
+from ..settings import get_settings
 from ..utils.check_gstreamer import get_gstreamer_path
+from ..video import TRACER_ENV, build_receiver_pipeline, get_tracker, start_monitor
 
 logger = logging.getLogger(__name__)
 
@@ -56,16 +59,23 @@ def start_stream() -> dict:
             logger.info(f"[STREAM] Previous process ended (exit code: {poll_result}), starting new one")
             _stream_process = None
 
-    # Pipeline GStreamer receptor optimizada
-    # - rtpjitterbuffer latency=30: buffer de 30ms para compensar jitter en WiFi
+    # El monitor QoS (si está habilitado) recibe en UDP 5000 y reenvía al receptor
+    settings = get_settings()
+    listen_port = start_monitor(settings)
+
+    # Pipeline GStreamer receptor (video/receiver.py)
+    # - rtpjitterbuffer latency (30ms por defecto): compensa el jitter en WiFi
     # - drop-on-late=true: descarta paquetes tardíos para mantener latencia baja
-    pipeline = (
-        f'"{gst_launch}" -v '
-        'udpsrc port=5000 caps="application/x-rtp,media=video,encoding-name=H264,payload=96,clock-rate=90000" ! '
-        'rtpjitterbuffer latency=30 drop-on-late=true ! '
-        'rtph264depay ! h264parse ! '
-        'avdec_h264 ! videoconvert ! autovideosink sync=false'
-    )
+    # - video_loss_recovery: retransmisión (rtx) o FEC, con latencia acotada
+    pipeline = f'"{gst_launch}" -v ' + build_receiver_pipeline(settings, listen_port)
+
+    # Modo medición: el tracer de latencia de GStreamer escribe en stderr las
+    # latencias del jitterbuffer y del pipeline receptor
+    tracker = get_tracker()
+    env = None
+    if tracker is not None:
+        env = dict(os.environ, **TRACER_ENV)
+        logger.info("[STREAM] Latency measurement mode: receiver runs with the GStreamer latency tracer")
 
     try:
         logger.info("[STREAM] Starting camera receiver on UDP port 5000...")
@@ -75,8 +85,11 @@ def start_stream() -> dict:
             shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
+            env=env,
         )
         _stream_process = proc
+        if tracker is not None:
+            tracker.follow_receiver(proc.stderr)
 
         logger.info("[STREAM] GStreamer receiver started successfully")
         logger.info("[STREAM] NOTE: Ensure Jetson streamer is running (minicars-streamer.service or manually)")
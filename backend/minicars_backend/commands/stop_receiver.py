@@ -4,7 +4,8 @@ Comando para detener el receptor GStreamer en Windows.
 import logging
 import subprocess
 
-from . import start_receiver
+from . import start_receiver, start_stream
+from ..video import stop_monitor
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,9 @@ def stop_receiver() -> dict:
             start_receiver._receiver_process.wait()
 
         start_receiver._receiver_process = None
+        # El monitor QoS se comparte con start_stream: solo se detiene si ya no hay receptor
+        if start_stream._stream_process is None or start_stream._stream_process.poll() is not None:
+            stop_monitor()
         logger.info("Receptor GStreamer detenido correctamente")
         return {
             "status": "ok",
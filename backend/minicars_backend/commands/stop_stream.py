@@ -5,7 +5,8 @@ import logging
 import subprocess
 
 # Importamos el módulo completo para acceder a su variable global
-from . import start_stream
+from . import start_receiver, start_stream
+from ..video import stop_monitor
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,9 @@ def stop_stream() -> dict:
             start_stream._stream_process.wait()
 
         start_stream._stream_process = None
+        # El monitor QoS se comparte con start_receiver: solo se detiene si ya no hay receptor
+        if start_receiver._receiver_process is None or start_receiver._receiver_process.poll() is not None:
+            stop_monitor()
         logger.info("[STREAM] GStreamer receiver stopped successfully")
         return {
             "status": "ok",
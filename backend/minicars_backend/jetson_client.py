@@ -0,0 +1,94 @@
+"""
+Cliente HTTP de la API de control del stream_supervisor en la Jetson.
+
+El supervisor expone una API JSON mínima (por defecto en el puerto 9000) para
+consultar y cambiar el stream sin SSH. La URL base es
+``MINICARS_JETSON_BASE_URL`` o, si no está definida,
+``http://<MINICARS_JOYSTICK_TARGET_HOST>:<MINICARS_JETSON_CONTROL_PORT>``.
+
+Si la Jetson exige token (``MINICARS_CONTROL_TOKEN``), el mismo valor va en
+``MINICARS_JETSON_CONTROL_TOKEN`` y se envía en el header ``X-MiniCars-Token``.
+"""
+import logging
+from typing import Optional
+
+import httpx
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = "X-MiniCars-Token"  # Mismo header que jetson/control_api.py
+
+
+class JetsonUnavailable(Exception):
+    """La Jetson no respondió (apagada, fuera de la red o supervisor detenido)."""
+
+
+class JetsonError(Exception):
+    """La Jetson respondió con un error (status_code y detail del supervisor)."""
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(f"Jetson returned {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def get_supervisor_url() -> str:
+    """URL base de la API del supervisor."""
+    settings = get_settings()
+    if settings.jetson_base_url:
+        return str(settings.jetson_base_url).rstrip("/")
+    return f"http://{settings.joystick_target_host}:{settings.jetson_control_port}"
+
+
+def supervisor_request(method: str, path: str, json: Optional[dict] = None,
+                       timeout: Optional[float] = None) -> dict:
+    """
+    Llama a la API del supervisor.
+
+    Args:
+        method: "GET" o "POST"
+        path: Ruta (ej. "/presets")
+        json: Cuerpo JSON (POST)
+        timeout: Segundos (por defecto jetson_request_timeout)
+
+    Returns:
+        Respuesta JSON del supervisor
+
+    Raises:
+        JetsonUnavailable: Si no hay conexión o se agota el timeout
+        JetsonError: Si el supervisor responde con un error
+    """
+    settings = get_settings()
+    url = get_supervisor_url() + path
+    headers = {TOKEN_HEADER: settings.jetson_control_token} if settings.jetson_control_token else None
+    try:
+        if timeout is None:
+            timeout = settings.jetson_request_timeout
+        response = httpx.request(method, url, json=json, timeout=timeout, headers=headers)
+    except httpx.HTTPError as e:
+        logger.warning(f"[JETSON] {method} {url} failed: {e}")
+        raise JetsonUnavailable(f"Jetson supervisor not reachable at {get_supervisor_url()}: {e}") from e
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = {"error": response.text}
+    if response.status_code >= 400:
+        raise JetsonError(response.status_code, payload.get("error", payload))
+    return payload
+
+
+def get_supervisor_health() -> dict:
+    """
+    Estado del stream_supervisor para GET /status.
+
+    Nunca lanza excepción: si la Jetson no responde devuelve
+    ``{"reachable": False, "error": ...}``, que ya explica por qué no hay video.
+    """
+    try:
+        health = supervisor_request("GET", "/health", timeout=get_settings().jetson_status_timeout)
+    except (JetsonUnavailable, JetsonError) as e:
+        return {"reachable": False, "error": str(e)}
+    health["reachable"] = True
+    return health
@@ -12,7 +12,13 @@ from .profiles import (
     DRIVING_PROFILES,
 )
 from .sender import JoystickSender
-from .protocol import JoystickMessage, format_message, parse_message
+from .protocol import (
+    CarTelemetry,
+    JoystickMessage,
+    format_message,
+    parse_bridge_line,
+    parse_message,
+)
 
 __all__ = [
     "DrivingMode",
@@ -21,7 +27,9 @@ __all__ = [
     "DRIVING_PROFILES",
     "JoystickSender",
     "JoystickMessage",
+    "CarTelemetry",
     "format_message",
     "parse_message",
+    "parse_bridge_line",
 ]
 
@@ -4,7 +4,7 @@ MiniCars Joystick Control Protocol.
 Defines the message format for communication between laptop and Jetson.
 """
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -111,3 +111,51 @@ def parse_message(line: str) -> Optional[JoystickMessage]:
     except (ValueError, IndexError):
         return None
 
+
+
+# Bridge → laptop lines (sent back on the same TCP connection)
+BRIDGE_TELEMETRY = "T"  # "T,battery_mv,wheel_speed_cms\n"
+BRIDGE_ACK_RTT = "A"  # "A,rtt_us\n" (UART write → Arduino ack)
+BRIDGE_PONG = "Q"  # "Q,probe_id\n" (reply to a laptop "P,probe_id\n" liveness probe)
+LINK_PROBE = "P"
+
+
+@dataclass
+class CarTelemetry:
+    """
+    Latest telemetry reported by the car through the Jetson bridge.
+    
+    Fields are None until the first report is received.
+    """
+    battery_mv: Optional[int] = None
+    wheel_speed_cms: Optional[int] = None
+    ack_rtt_ms: Optional[float] = None  # Last actuation round-trip (bridge UART write → Arduino ack)
+    ack_rtt_avg_ms: Optional[float] = None  # Exponential moving average of ack_rtt_ms
+    link_rtt_ms: Optional[float] = None  # Last liveness probe round-trip (laptop ↔ bridge)
+    last_recovery_ms: Optional[float] = None  # Last dead-link time-to-recover (last data → reconnected)
+    reconnects: int = 0
+    updated_at: Optional[float] = None  # time.time() of last report
+
+
+def parse_bridge_line(line: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Parse a line sent back by the Jetson bridge.
+    
+    Args:
+        line: Raw line from TCP socket
+        
+    Returns:
+        ("T", battery_mv, wheel_speed_cms), ("A", rtt_us, 0), ("Q", probe_id, 0)
+        or None if invalid
+    """
+    try:
+        parts = line.strip().split(',')
+        if parts[0] == BRIDGE_TELEMETRY and len(parts) == 3:
+            return (BRIDGE_TELEMETRY, int(parts[1]), int(parts[2]))
+        if parts[0] == BRIDGE_ACK_RTT and len(parts) == 2:
+            return (BRIDGE_ACK_RTT, int(parts[1]), 0)
+        if parts[0] == BRIDGE_PONG and len(parts) == 2:
+            return (BRIDGE_PONG, int(parts[1]), 0)
+        return None
+    except (ValueError, IndexError):
+        return None
@@ -9,6 +9,7 @@ import socket
 import sys
 import threading
 import time
+from dataclasses import asdict
 from typing import Optional
 
 try:
@@ -19,12 +20,56 @@ except ImportError:
     pygame = None  # type: ignore
 
 from .profiles import get_driving_profile, DrivingMode
-from .protocol import JoystickMessage
+from .protocol import (
+    BRIDGE_ACK_RTT,
+    BRIDGE_PONG,
+    BRIDGE_TELEMETRY,
+    CarTelemetry,
+    JoystickMessage,
+    LINK_PROBE,
+    parse_bridge_line,
+)
 from .throttle_mapper import get_mode, map_pedal_to_throttle, percent_from_axis
 from ..control_profiles import load_profile
+from ..utils.log_sampling import RateLimiter, install_queue_handler
 
 logger = logging.getLogger("minicars.joystick.sender")
 
+_PROBE_SLOTS = 64  # Outstanding liveness probes tracked for RTT (ids wrap modulo this)
+
+
+def configure_link_socket(sock: socket.socket, link_timeout_ms: int) -> None:
+    """
+    Ajusta el socket de control para detectar enlaces muertos rápido.
+    
+    Los probes de aplicación ("P,<id>" → "Q,<id>") son el mecanismo
+    principal; keepalive y TCP_USER_TIMEOUT hacen que el kernel también
+    corte una conexión medio abierta en vez de dejarla colgada minutos.
+    
+    Args:
+        sock: Socket conectado al bridge
+        link_timeout_ms: Timeout de enlace configurado
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for option, value in (
+        ("TCP_KEEPIDLE", 1),
+        ("TCP_KEEPINTVL", 1),
+        ("TCP_KEEPCNT", 2),
+        ("TCP_USER_TIMEOUT", 2 * link_timeout_ms),  # Solo Linux
+    ):
+        if hasattr(socket, option):
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+            except OSError as e:
+                logger.debug(f"[joystick-sender] Could not set {option}: {e}")
+    if hasattr(socket, "SIO_KEEPALIVE_VALS"):
+        # Windows: (on, idle_ms, interval_ms)
+        try:
+            sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, 1000, 1000))
+        except OSError as e:
+            logger.debug(f"[joystick-sender] Could not set SIO_KEEPALIVE_VALS: {e}")
+
 
 class JoystickSender:
     """
@@ -34,6 +79,9 @@ class JoystickSender:
         target_host: Hostname or IP of Jetson
         target_port: TCP port on Jetson
         send_hz: Frequency of sending commands (default 20Hz)
+        link_timeout_ms: Drop the connection if the bridge is silent this long
+        probe_interval_ms: Period of "P,<id>" liveness probes
+        reconnect_delay: Maximum backoff between reconnect attempts (seconds)
     """
     
     def __init__(
@@ -41,10 +89,16 @@ class JoystickSender:
         target_host: str = "SKLNx.local",
         target_port: int = 5005,
         send_hz: int = 20,
+        link_timeout_ms: int = 500,
+        probe_interval_ms: int = 100,
+        reconnect_delay: float = 2.0,
     ):
         self.target_host = target_host
         self.target_port = target_port
         self.send_hz = send_hz
+        self.link_timeout_ms = link_timeout_ms
+        self.probe_interval_ms = probe_interval_ms
+        self.reconnect_delay = reconnect_delay
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._socket: Optional[socket.socket] = None
@@ -52,6 +106,20 @@ class JoystickSender:
         # State for throttle mapper (uses ramp rate internally)
         self._throttle_state_key = f"sender_{id(self)}"
         
+        # Telemetry streamed back by the bridge on the same connection
+        self._telemetry = CarTelemetry()
+        self._telemetry_lock = threading.Lock()
+        self._recv_thread: Optional[threading.Thread] = None
+        
+        # Link liveness (time.monotonic() based)
+        self._last_rx = 0.0
+        self._link_confirmed = False  # Bridge answered a probe (older bridges never do)
+        self._probe_id = 0
+        self._probe_sent_at = [0.0] * _PROBE_SLOTS
+        
+        # Sampled logging for the send loop (see MINICARS_LOG_RATE_LIMITS)
+        self._values_log_limiter = RateLimiter("sender.values", 0.4)
+        
     def start(self) -> None:
         """Start the joystick sender thread."""
         # Check if pygame is available
@@ -64,11 +132,19 @@ class JoystickSender:
             logger.warning("Joystick sender already running")
             return
         
+        # Log I/O happens on a listener thread, not in the 100Hz loop
+        install_queue_handler(logger)
+        
         self._running = True
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
         logger.info(f"[joystick-sender] Started (target: {self.target_host}:{self.target_port})")
     
+    @property
+    def running(self) -> bool:
+        """Whether the sender thread is running."""
+        return self._running
+    
     def stop(self) -> None:
         """Stop the joystick sender thread."""
         if not self._running:
@@ -89,21 +165,33 @@ class JoystickSender:
         
         logger.info("[joystick-sender] Stopped")
     
-    def _connect(self) -> bool:
+    def _connect(self, connect_timeout: float = 5.0) -> bool:
         """
         Establish TCP connection to Jetson.
         
+        Args:
+            connect_timeout: Seconds to wait for the TCP handshake
+        
         Returns:
             True if connected successfully
         """
         try:
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             # Set timeout for connection attempt
-            self._socket.settimeout(5.0)
+            self._socket.settimeout(connect_timeout)
             self._socket.connect((self.target_host, self.target_port))
-            # Remove timeout after connection (for blocking sends)
-            self._socket.settimeout(None)
+            # Bounded sends/receives: a dead link must not block the loop
+            self._socket.settimeout(self.link_timeout_ms / 1000.0)
+            configure_link_socket(self._socket, self.link_timeout_ms)
+            self._last_rx = time.monotonic()
+            self._link_confirmed = False
             logger.info(f"[joystick-sender] Connected to {self.target_host}:{self.target_port}")
+            
+            # One reader thread per connection; it exits when the socket closes
+            self._recv_thread = threading.Thread(
+                target=self._recv_loop, args=(self._socket,), daemon=True
+            )
+            self._recv_thread.start()
             return True
         except socket.timeout:
             logger.error(f"[joystick-sender] Connection timeout to {self.target_host}:{self.target_port}")
@@ -120,6 +208,115 @@ class JoystickSender:
             logger.error(f"[joystick-sender] Failed to connect to {self.target_host}:{self.target_port}: {e}")
             return False
     
+    def _recv_loop(self, sock: socket.socket) -> None:
+        """
+        Read telemetry lines sent back by the bridge.
+        
+        Args:
+            sock: Connected socket (the thread exits when it is closed)
+        """
+        buffer = ""
+        while self._running:
+            try:
+                data = sock.recv(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if not data:
+                break
+            
+            if sock is self._socket:
+                self._last_rx = time.monotonic()
+            buffer += data.decode("ascii", errors="ignore")
+            while "\n" in buffer:
+                line, buffer = buffer.split("\n", 1)
+                parsed = parse_bridge_line(line)
+                if parsed is None:
+                    continue
+                self._apply_bridge_event(parsed)
+    
+    def _apply_bridge_event(self, event: tuple) -> None:
+        """Update the latest telemetry snapshot from a parsed bridge line."""
+        kind, value, extra = event
+        if kind == BRIDGE_PONG:
+            sent_at = self._probe_sent_at[value % _PROBE_SLOTS]
+            self._link_confirmed = True
+            if sent_at:
+                with self._telemetry_lock:
+                    self._telemetry.link_rtt_ms = round((time.monotonic() - sent_at) * 1000.0, 2)
+            return
+        with self._telemetry_lock:
+            telemetry = self._telemetry
+            if kind == BRIDGE_TELEMETRY:
+                telemetry.battery_mv = value
+                telemetry.wheel_speed_cms = extra
+            elif kind == BRIDGE_ACK_RTT:
+                rtt_ms = value / 1000.0
+                telemetry.ack_rtt_ms = rtt_ms
+                if telemetry.ack_rtt_avg_ms is None:
+                    telemetry.ack_rtt_avg_ms = rtt_ms
+                else:
+                    telemetry.ack_rtt_avg_ms += 0.1 * (rtt_ms - telemetry.ack_rtt_avg_ms)
+            telemetry.updated_at = time.time()
+    
+    def get_telemetry(self) -> dict:
+        """
+        Get the latest telemetry received from the car.
+        
+        Returns:
+            Dict with CarTelemetry fields plus age_ms (None if nothing received yet)
+        """
+        with self._telemetry_lock:
+            data = asdict(self._telemetry)
+        updated_at = data["updated_at"]
+        data["age_ms"] = None if updated_at is None else round((time.time() - updated_at) * 1000.0, 1)
+        return data
+    
+    def _send_probe(self) -> None:
+        """Send a "P,<id>" liveness probe (the bridge echoes it as "Q,<id>")."""
+        probe_id = self._probe_id
+        self._probe_id += 1
+        self._probe_sent_at[probe_id % _PROBE_SLOTS] = time.monotonic()
+        self._socket.sendall(f"{LINK_PROBE},{probe_id}\n".encode("ascii"))
+    
+    def _check_link(self) -> None:
+        """
+        Raise if the bridge has gone silent.
+        
+        Only enforced once the bridge has answered a probe, so older bridges
+        that ignore probes keep working (without fast dead-link detection).
+        
+        Raises:
+            ConnectionError: If nothing was received for link_timeout_ms
+        """
+        if not self._link_confirmed:
+            return
+        silent_ms = (time.monotonic() - self._last_rx) * 1000.0
+        if silent_ms > self.link_timeout_ms:
+            raise ConnectionError(f"no data from bridge for {silent_ms:.0f}ms")
+    
+    def _reconnect(self) -> bool:
+        """
+        Reconnect after a lost link, retrying with backoff until stopped.
+        
+        Returns:
+            True once reconnected, False if the sender was stopped
+        """
+        lost_at = self._last_rx
+        delay = 0.05
+        while self._running:
+            if self._connect(connect_timeout=1.0):
+                recovery_ms = round((time.monotonic() - lost_at) * 1000.0, 1)
+                with self._telemetry_lock:
+                    self._telemetry.reconnects += 1
+                    self._telemetry.last_recovery_ms = recovery_ms
+                logger.info(f"[joystick-sender] Link recovered in {recovery_ms:.0f}ms (last data → reconnected)")
+                return True
+            time.sleep(delay)
+            delay = min(self.reconnect_delay, delay * 2)
+        return False
+    
     def _send_failsafe(self) -> None:
         """Send failsafe message (centered servo, no throttle, full brake)."""
         if not self._socket:
@@ -165,6 +362,8 @@ class JoystickSender:
         # Main loop
         dt = 1.0 / self.send_hz
         next_send_time = time.perf_counter()
+        probe_interval = self.probe_interval_ms / 1000.0
+        next_probe_time = time.monotonic()
         
         turbo_mode = False
         prev_turbo_button = False
@@ -230,21 +429,19 @@ class JoystickSender:
                 tcp_msg = msg.to_tcp_format()
                 self._socket.sendall(tcp_msg.encode("ascii"))
                 
-                # Log values periodically for debugging (every 50 messages ~2.5 seconds at 20Hz)
-                if hasattr(self, '_debug_counter'):
-                    self._debug_counter += 1
-                else:
-                    self._debug_counter = 0
+                # Liveness: probe the bridge and drop the link if it went silent
+                if time.monotonic() >= next_probe_time:
+                    self._send_probe()
+                    next_probe_time = time.monotonic() + probe_interval
+                self._check_link()
                 
-                if self._debug_counter % 50 == 0:
+                # Log values periodically for debugging (sampled, formatted only if emitted)
+                if logger.isEnabledFor(logging.DEBUG) and self._values_log_limiter.allow():
                     logger.debug(
-                        f"[joystick-sender] Values: "
-                        f"servo={servo_normalized:.3f}, "
-                        f"throttle={throttle:.3f}, "
-                        f"brake={brake_normalized:.3f}, "
-                        f"mode={active_mode}, "
-                        f"raw_accel={accel_raw:.3f}, "
-                        f"raw_brake={brake_raw:.3f}"
+                        "[joystick-sender] Values: servo=%.3f, throttle=%.3f, brake=%.3f, "
+                        "mode=%s, raw_accel=%.3f, raw_brake=%.3f",
+                        servo_normalized, throttle, brake_normalized,
+                        active_mode, accel_raw, brake_raw,
                     )
                 
                 # Maintain frequency
@@ -260,9 +457,10 @@ class JoystickSender:
                     self._socket.close()
                 except:
                     pass
-                time.sleep(2.0)
-                if not self._connect():
+                if not self._reconnect():
                     break
+                next_send_time = time.perf_counter()
+                next_probe_time = time.monotonic()
             except Exception as e:
                 logger.error(f"Error in sender loop: {e}", exc_info=True)
                 break
@@ -52,6 +52,21 @@ class Settings(BaseSettings):
     Por ejemplo: http://192.168.0.50:9000
     """
     
+    jetson_control_port: int = 9000
+    """Puerto de la API de control del stream_supervisor en la Jetson (presets, estado).
+    Se usa con joystick_target_host cuando jetson_base_url no está definido."""
+    
+    jetson_control_token: Optional[str] = None
+    """Token compartido de la API de control (MINICARS_CONTROL_TOKEN en la Jetson).
+    Se envía en el header X-MiniCars-Token de cada llamada."""
+    
+    jetson_request_timeout: float = 2.0
+    """Timeout (segundos) de las llamadas HTTP a la Jetson."""
+    
+    jetson_status_timeout: float = 0.5
+    """Timeout (segundos) de la consulta de salud del supervisor que agrega GET /status.
+    Es corto para que /status responda rápido aunque la Jetson esté apagada."""
+    
     # Joystick / Car Control settings
     joystick_target_host: str = "192.168.68.102"
     """Hostname o IP de la Jetson Nano para envío de comandos de joystick.
@@ -67,7 +82,64 @@ class Settings(BaseSettings):
     Puede reducirse a 20Hz si hay problemas de red."""
     
     joystick_reconnect_delay: float = 2.0
-    """Delay en segundos entre intentos de reconexión al bridge de Jetson."""
+    """Delay máximo en segundos entre intentos de reconexión al bridge de Jetson
+    (el primer reintento es inmediato y el delay crece exponencialmente hasta este valor)."""
+    
+    joystick_link_timeout_ms: int = 500
+    """Si el bridge no envía nada (pongs, telemetría) durante este tiempo, la conexión
+    se da por muerta y se reconecta. Debe coincidir con MINICARS_LINK_TIMEOUT_MS en la Jetson."""
+    
+    joystick_probe_interval_ms: int = 100
+    """Periodo de los probes de liveness "P,<id>" que el bridge responde con "Q,<id>"."""
+    
+    # Video / QoS del stream
+    video_port: int = 5000
+    """Puerto UDP donde llega el stream RTP/H264 de la Jetson."""
+    
+    video_jitterbuffer_latency_ms: int = 30
+    """Latencia del rtpjitterbuffer del receptor (ms). Paquetes con más retardo
+    relativo se descartan (drop-on-late) y se reportan como tardíos."""
+    
+    video_qos_enabled: bool = False
+    """Mide el stream (pérdida, jitter, tardíos) con un relay UDP delante del receptor
+    y envía el feedback a la Jetson (necesario para el bitrate adaptativo). Con False
+    (default) el receptor escucha directo en video_port."""
+    
+    video_relay_port: int = 5002
+    """Puerto local (127.0.0.1) donde escucha el receptor GStreamer cuando el monitor QoS está activo."""
+    
+    video_feedback_port: int = 5010
+    """Puerto UDP de la Jetson que recibe el feedback QoS (bitrate adaptativo)."""
+    
+    video_feedback_interval_ms: int = 1000
+    """Periodo de los reportes QoS enviados a la Jetson."""
+    
+    video_loss_recovery: str = "none"
+    """Recuperación de paquetes perdidos: "none", "rtx" (retransmisión con NACK) o "fec"
+    (ULP FEC). Debe coincidir con loss_recovery.mode de stream_config.json en la Jetson."""
+    
+    video_loss_recovery_latency_ms: int = 100
+    """Latencia del rtpjitterbuffer con rtx o fec (ms): cota de la latencia extra. Con rtx
+    debe superar el RTT del WiFi más un intervalo entre paquetes para que la retransmisión llegue."""
+    
+    video_rtcp_port: int = 5001
+    """Puerto UDP local del RTCP de la Jetson (modo rtx)."""
+    
+    video_sender_rtcp_port: int = 5003
+    """Puerto UDP de la Jetson que recibe el RTCP (NACKs) del receptor (loss_recovery.rtcp_port).
+    El host es joystick_target_host."""
+    
+    video_latency_enabled: bool = False
+    """Modo medición de latencia por etapas: el receptor corre con el tracer de latencia
+    de GStreamer y se reciben los timestamps por frame de la Jetson (ver video/latency.py).
+    Agrega carga al receptor; solo para medir."""
+    
+    video_latency_port: int = 5012
+    """Puerto UDP local donde llegan los timestamps por frame de la Jetson (modo medición)."""
+    
+    log_rate_limits: str = ""
+    """Límites de logging por canal para loops calientes, "canal=msgs_por_seg,...".
+    Ejemplo: "sender.values=0.5,sender.errors=1". 0 silencia el canal."""
     
     class Config:
         env_prefix = "MINICARS_"
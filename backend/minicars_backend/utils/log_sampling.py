@@ -0,0 +1,126 @@
+"""
+Logging muestreado y asíncrono para los loops de alta frecuencia del backend.
+
+El JoystickSender corre a 100Hz; registrar cada mensaje (o formatear un
+f-string en cada iteración aunque no se emita) cuesta más que el propio
+envío TCP. Este módulo ofrece:
+
+- ``RateLimiter``: decide por canal si una línea se emite (token bucket).
+  Las tasas por canal se configuran con ``MINICARS_LOG_RATE_LIMITS``,
+  p. ej. ``"sender.values=0.5,sender.errors=1"`` (mensajes por segundo, 0 = silencio).
+- ``install_queue_handler``: mueve los handlers de un logger detrás de una
+  cola, de modo que el formateo y la escritura ocurren en un hilo aparte.
+"""
+import logging
+import logging.handlers
+import queue
+import time
+from typing import Dict
+
+from ..settings import get_settings
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """
+    Interpreta una especificación "canal=tasa,canal=tasa".
+
+    Args:
+        spec: Especificación (las entradas inválidas se ignoran)
+
+    Returns:
+        Dict canal → mensajes por segundo
+    """
+    limits = {}
+    for item in spec.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            limits[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return limits
+
+
+class RateLimiter:
+    """
+    Token bucket por canal de log.
+
+    Args:
+        channel: Nombre del canal (clave en MINICARS_LOG_RATE_LIMITS)
+        default_rate: Mensajes por segundo si el canal no está configurado
+        burst: Mensajes permitidos seguidos antes de limitar
+    """
+
+    def __init__(self, channel: str, default_rate: float, burst: float = 1.0):
+        limits = parse_rate_limits(get_settings().log_rate_limits)
+        self.channel = channel
+        self.rate = limits.get(channel, default_rate)
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self.suppressed = 0
+
+    def allow(self) -> bool:
+        """
+        Indica si se puede emitir una línea ahora.
+
+        Returns:
+            True si el llamador debe registrar el mensaje
+        """
+        if self.rate <= 0:
+            self.suppressed += 1
+            return False
+        now = time.monotonic()
+        tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if tokens < 1.0:
+            self._tokens = tokens
+            self.suppressed += 1
+            return False
+        self._tokens = tokens - 1.0
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que no formatea en el hilo que registra."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Los argumentos que pasamos son números y strings inmutables, así que
+        # el formateo puede esperar al hilo del listener.
+        return record
+
+
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def install_queue_handler(logger: logging.Logger) -> logging.handlers.QueueListener:
+    """
+    Hace que un logger escriba a través de una cola y un hilo de fondo.
+
+    Si el logger no tiene handlers propios se usan los del root; si tampoco
+    hay, se crea un StreamHandler. El logger deja de propagar para no
+    escribir dos veces.
+
+    Args:
+        logger: Logger del loop caliente
+
+    Returns:
+        El QueueListener iniciado (o el existente si ya estaba instalado)
+    """
+    if logger.name in _listeners:
+        return _listeners[logger.name]
+
+    handlers = list(logger.handlers) or list(logging.getLogger().handlers)
+    if not handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s: %(message)s"))
+        handlers = [handler]
+
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.handlers[:] = [_DeferredQueueHandler(log_queue)]
+    logger.propagate = False
+    listener.start()
+    _listeners[logger.name] = listener
+    return listener
@@ -0,0 +1,56 @@
+"""
+MiniCars Video QoS.
+
+Este módulo mide la calidad del stream RTP recibido desde la Jetson
+(pérdida, jitter, paquetes tardíos) y la reporta de vuelta al auto.
+En modo medición también mide la latencia por etapas (latency.py).
+El pipeline del receptor, con la recuperación de pérdidas, está en receiver.py.
+"""
+
+from .latency import (
+    STAGES,
+    LatencyTracker,
+    TRACER_ENV,
+    format_timing,
+    get_tracker,
+    parse_timing,
+    parse_tracer_line,
+)
+
+from .receiver import (
+    LOSS_RECOVERY_MODES,
+    build_receiver_pipeline,
+    jitterbuffer_latency_ms,
+)
+
+from .qos import (
+    QosReport,
+    RtpMonitor,
+    RtpReceiveStats,
+    format_feedback,
+    get_monitor,
+    parse_feedback,
+    start_monitor,
+    stop_monitor,
+)
+
+__all__ = [
+    "STAGES",
+    "LatencyTracker",
+    "TRACER_ENV",
+    "format_timing",
+    "get_tracker",
+    "parse_timing",
+    "parse_tracer_line",
+    "LOSS_RECOVERY_MODES",
+    "build_receiver_pipeline",
+    "jitterbuffer_latency_ms",
+    "QosReport",
+    "RtpMonitor",
+    "RtpReceiveStats",
+    "format_feedback",
+    "parse_feedback",
+    "get_monitor",
+    "start_monitor",
+    "stop_monitor",
+]
@@ -0,0 +1,308 @@
+"""
+Medición de latencia del video por etapas (modo medición).
+
+Cada etapa se mide donde ocurre y se une por el timestamp RTP del frame:
+
+- la Jetson (``jetson/latency_probe.py``, pipeline en proceso) envía por UDP
+  una línea por frame con los instantes de captura, salida del encoder y
+  envío del primer paquete (reloj de pared, µs):
+
+      "T,<rtp_ts>,<captura_us>,<encoder_us>,<envío_us>\\n"
+
+- ``RtpMonitor`` (qos.py) anota la llegada del último paquete de cada frame
+  (bit marker) con el mismo reloj de pared
+- el receptor GStreamer que lanza ``start_stream`` corre con el tracer
+  ``latency`` de GStreamer; sus líneas en stderr dan la latencia del
+  rtpjitterbuffer y del pipeline receptor completo (udpsrc → sink)
+
+Etapas reportadas (percentiles en ms):
+
+- ``capture_to_encode``: timestamp de captura → salida del encoder
+- ``encode_to_send``: salida del encoder → primer paquete RTP enviado
+- ``network``: primer paquete enviado → frame completo recibido
+- ``jitterbuffer``: espera en rtpjitterbuffer
+- ``decode_to_display``: resto del receptor (depay, decode, conversión) hasta el sink
+- ``total``: captura → sink
+
+``network`` y ``total`` comparan relojes de dos máquinas: necesitan NTP/chrony
+en ambas (o todo en una sola máquina con el backend de pipeline software).
+El escaneo del sensor y el refresco de la pantalla no están incluidos.
+"""
+import logging
+import re
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from .receiver import FEC_PAYLOAD_TYPE
+
+logger = logging.getLogger("minicars.video.latency")
+
+TIMING_PREFIX = "T"
+STAGES = ("capture_to_encode", "encode_to_send", "network", "jitterbuffer", "decode_to_display", "total")
+PERCENTILES = (50, 90, 95, 99)
+_RTP_HEADER = struct.Struct("!BBHII")
+_PENDING_FRAMES = 256  # Frames esperando su otra mitad (timing o llegada)
+
+# Tracer "latency" de GStreamer (GST_TRACERS="latency(flags=pipeline+element)")
+_TRACER_LINE = re.compile(r"\b(element-latency|latency), (.*?)time=\(guint64\)(\d+)")
+_TRACER_ELEMENT = re.compile(r"\belement=\(string\)([^,;]+)")
+TRACER_ENV = {
+    "GST_TRACERS": "latency(flags=pipeline+element)",
+    "GST_DEBUG": "GST_TRACER:7",
+}
+
+
+def format_timing(rtp_ts: int, capture_us: int, encoded_us: int, sent_us: int) -> bytes:
+    """Línea de timing de un frame (lo que envía la Jetson)."""
+    return f"{TIMING_PREFIX},{rtp_ts},{capture_us},{encoded_us},{sent_us}\n".encode("ascii")
+
+
+def parse_timing(data: bytes) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Interpreta una línea de timing.
+
+    Returns:
+        (rtp_ts, captura_us, encoder_us, envío_us) o None si es inválida
+    """
+    parts = data.decode("ascii", errors="replace").strip().split(",")
+    if len(parts) != 5 or parts[0] != TIMING_PREFIX:
+        return None
+    try:
+        rtp_ts, capture_us, encoded_us, sent_us = (int(value) for value in parts[1:])
+    except ValueError:
+        return None
+    return rtp_ts, capture_us, encoded_us, sent_us
+
+
+def parse_tracer_line(line: str) -> Optional[Tuple[str, Optional[str], float]]:
+    """
+    Interpreta una línea del tracer de latencia de GStreamer.
+
+    Returns:
+        ("pipeline", None, ms) para la latencia fuente → sink,
+        ("element", nombre, ms) para la latencia de un elemento, o None
+    """
+    match = _TRACER_LINE.search(line)
+    if match is None:
+        return None
+    kind, fields, nanoseconds = match.groups()
+    ms = int(nanoseconds) / 1e6
+    if kind == "latency":
+        return "pipeline", None, ms
+    element = _TRACER_ELEMENT.search(fields)
+    return "element", element.group(1) if element else None, ms
+
+
+def percentiles(samples: Iterable[float]) -> Optional[dict]:
+    """count, p50/p90/p95/p99 y max (ms) de una lista de muestras."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    result = {"count": len(ordered)}
+    for p in PERCENTILES:
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        result[f"p{p}"] = round(ordered[index], 2)
+    result["max"] = round(ordered[-1], 2)
+    return result
+
+
+class LatencyTracker:
+    """
+    Junta los timestamps del emisor, las llegadas RTP y el tracer del receptor.
+
+    Args:
+        history: Muestras guardadas por etapa
+    """
+
+    def __init__(self, history: int = 3000):
+        self.samples: Dict[str, Deque[float]] = {stage: deque(maxlen=history) for stage in STAGES}
+        self.frames_matched = 0
+        self.negative_network = 0
+        self._timings: "OrderedDict[int, Tuple[int, int, int]]" = OrderedDict()
+        self._arrivals: "OrderedDict[int, float]" = OrderedDict()
+        self._receiver_ms: Optional[float] = None  # Última latencia del pipeline receptor
+        self._jitterbuffer_ms: Optional[float] = None
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @staticmethod
+    def _remember(pending: OrderedDict, key: int, value) -> None:
+        pending[key] = value
+        while len(pending) > _PENDING_FRAMES:
+            pending.popitem(last=False)
+
+    def on_packet(self, packet: bytes, arrival: Optional[float] = None) -> None:
+        """
+        Registra un paquete RTP (llamado por RtpMonitor).
+
+        Args:
+            packet: Datagrama RTP
+            arrival: time.time() de llegada
+        """
+        if len(packet) < _RTP_HEADER.size:
+            return
+        _, second, _, rtp_ts, _ = _RTP_HEADER.unpack_from(packet)
+        if not second & 0x80 or second & 0x7F == FEC_PAYLOAD_TYPE:
+            return  # Solo el último paquete de video del frame (marker) lo completa
+        arrival = time.time() if arrival is None else arrival
+        with self._lock:
+            timing = self._timings.pop(rtp_ts, None)
+            if timing is None:
+                self._remember(self._arrivals, rtp_ts, arrival)
+            else:
+                self._match(timing, arrival)
+
+    def on_timing(self, rtp_ts: int, capture_us: int, encoded_us: int, sent_us: int) -> None:
+        """Registra los timestamps de un frame enviados por la Jetson."""
+        timing = (capture_us, encoded_us, sent_us)
+        with self._lock:
+            arrival = self._arrivals.pop(rtp_ts, None)
+            if arrival is None:
+                self._remember(self._timings, rtp_ts, timing)
+            else:
+                self._match(timing, arrival)
+
+    def _match(self, timing: Tuple[int, int, int], arrival: float) -> None:
+        capture_us, encoded_us, sent_us = timing
+        arrival_us = arrival * 1e6
+        network_ms = (arrival_us - sent_us) / 1000.0
+        self.frames_matched += 1
+        self.samples["capture_to_encode"].append((encoded_us - capture_us) / 1000.0)
+        self.samples["encode_to_send"].append((sent_us - encoded_us) / 1000.0)
+        self.samples["network"].append(network_ms)
+        if network_ms < 0:
+            self.negative_network += 1  # Relojes de la Jetson y la laptop desincronizados
+        if self._receiver_ms is not None:
+            self.samples["total"].append((arrival_us - capture_us) / 1000.0 + self._receiver_ms)
+
+    def on_tracer_line(self, line: str) -> None:
+        """Registra una línea de stderr del receptor (ignora las que no son del tracer)."""
+        parsed = parse_tracer_line(line)
+        if parsed is None:
+            return
+        kind, element, ms = parsed
+        with self._lock:
+            if kind == "pipeline":
+                self._receiver_ms = ms
+                if self._jitterbuffer_ms is not None:
+                    self.samples["decode_to_display"].append(max(0.0, ms - self._jitterbuffer_ms))
+            elif element and element.startswith("rtpjitterbuffer"):
+                self._jitterbuffer_ms = ms
+                self.samples["jitterbuffer"].append(ms)
+
+    def follow_receiver(self, stream) -> threading.Thread:
+        """
+        Lee el stderr del receptor en un hilo (también evita que el pipe se llene).
+
+        Args:
+            stream: stderr del proceso (bytes)
+        """
+        def run():
+            for raw in iter(stream.readline, b""):
+                self.on_tracer_line(raw.decode("utf-8", errors="replace"))
+
+        thread = threading.Thread(target=run, name="latency-tracer", daemon=True)
+        thread.start()
+        return thread
+
+    def start(self, port: int) -> None:
+        """Escucha las líneas de timing de la Jetson en UDP ``port``."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("0.0.0.0", port))
+        sock.settimeout(0.2)
+        self._sock = sock
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="latency-timing", daemon=True)
+        self._thread.start()
+        logger.info(f"[VIDEO LATENCY] Measurement mode: frame timings from the Jetson on UDP {port}")
+
+    def _run(self) -> None:
+        while self._running:
+            try:
+                data, _ = self._sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._running:
+                    time.sleep(0.1)
+                continue
+            timing = parse_timing(data)
+            if timing is not None:
+                self.on_timing(*timing)
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def reset(self) -> None:
+        """Descarta las muestras (para empezar una medición nueva)."""
+        with self._lock:
+            for samples in self.samples.values():
+                samples.clear()
+            self.frames_matched = 0
+            self.negative_network = 0
+
+    def snapshot(self) -> dict:
+        """
+        Percentiles por etapa para la API.
+
+        Returns:
+            Dict con "stages" (etapa -> percentiles o None), "frames_matched"
+            y "clock_skew_suspected"
+        """
+        with self._lock:
+            stages = {stage: percentiles(samples) for stage, samples in self.samples.items()}
+            return {
+                "stages": stages,
+                "frames_matched": self.frames_matched,
+                "clock_skew_suspected": self.negative_network > 0,
+                "receiver_tracer": self._receiver_ms is not None,
+            }
+
+
+_tracker: Optional[LatencyTracker] = None
+
+
+def start_tracker(settings) -> Optional[LatencyTracker]:
+    """
+    Activa el modo medición si ``video_latency_enabled`` está activo.
+
+    Returns:
+        El tracker (None si el modo está deshabilitado o el puerto está ocupado)
+    """
+    global _tracker
+    if not settings.video_latency_enabled:
+        return None
+    if _tracker is not None:
+        return _tracker
+    tracker = LatencyTracker()
+    try:
+        tracker.start(settings.video_latency_port)
+    except OSError as e:
+        logger.warning(f"[VIDEO LATENCY] Could not listen on UDP {settings.video_latency_port}: {e}")
+        return None
+    _tracker = tracker
+    return tracker
+
+
+def stop_tracker() -> None:
+    global _tracker
+    if _tracker is not None:
+        _tracker.stop()
+        _tracker = None
+
+
+def get_tracker() -> Optional[LatencyTracker]:
+    """Tracker activo (None fuera del modo medición)."""
+    return _tracker
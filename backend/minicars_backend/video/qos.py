@@ -0,0 +1,433 @@
+"""
+Monitor RTP y canal de feedback QoS hacia la Jetson.
+
+El receptor GStreamer de la laptop (``udpsrc ! rtpjitterbuffer
+drop-on-late=true ! ...``) corre como proceso externo y no expone sus
+estadísticas. Para medirlas sin tocar el pipeline, ``RtpMonitor`` se pone
+delante: escucha el puerto de video, reenvía cada datagrama sin cambios al
+puerto local del receptor y lee de paso la cabecera RTP.
+
+Por intervalo (1s por defecto) calcula:
+
+- pérdida: paquetes esperados (por número de secuencia) vs recibidos
+- jitter entre llegadas según RFC 3550 (en ms)
+- tardíos estimados: paquetes cuyo retardo relativo supera la latencia del
+  jitterbuffer, es decir los que ``drop-on-late=true`` descartaría
+
+y envía el resultado a la Jetson por UDP como una línea de texto, igual que
+el protocolo del bridge de control:
+
+    "R,<intervalo>,<pérdida_ppm>,<jitter_us>,<tardíos>,<recibidos>\\n"
+
+El feedback va a la IP de origen de los paquetes RTP (la Jetson), así que
+no hace falta configurar su dirección.
+
+En modo medición (``video_latency_enabled``) el relay también alimenta a
+``LatencyTracker`` (latency.py) con la llegada de cada frame.
+"""
+import logging
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Optional, Tuple
+
+from ..utils.log_sampling import RateLimiter
+from .latency import LatencyTracker, start_tracker, stop_tracker
+from .receiver import RTX_PAYLOAD_TYPE, jitterbuffer_latency_ms
+
+logger = logging.getLogger("minicars.video.qos")
+
+FEEDBACK_PREFIX = "R"
+RTP_CLOCK_RATE = 90000  # H264 sobre RTP
+_RTP_HEADER = struct.Struct("!BBHII")
+_MIN_TRANSIT_WINDOW = 10  # Intervalos usados para el retardo mínimo de referencia
+MAX_DROPOUT = 3000  # Salto hacia adelante máximo aceptado como pérdida (RFC 3550 A.1)
+MAX_MISORDER = 100  # Salto hacia atrás máximo aceptado como desorden
+
+
+@dataclass
+class QosReport:
+    """
+    Estadísticas de recepción de un intervalo.
+
+    Attributes:
+        interval: Número de intervalo (crece de a 1; permite detectar reportes perdidos)
+        loss_fraction: Perdidos / esperados en el intervalo (0.0-1.0)
+        jitter_ms: Jitter entre llegadas (RFC 3550)
+        late: Paquetes que llegaron más tarde que la latencia del jitterbuffer
+        received: Paquetes recibidos en el intervalo
+        expected: Paquetes esperados según los números de secuencia
+        bitrate_kbps: Bitrate recibido
+        timestamp: time.time() del reporte
+    """
+    interval: int
+    loss_fraction: float
+    jitter_ms: float
+    late: int
+    received: int
+    expected: int
+    bitrate_kbps: float
+    timestamp: float
+
+
+def format_feedback(report: QosReport) -> bytes:
+    """
+    Serializa un reporte para el canal de feedback.
+
+    Returns:
+        Línea "R,intervalo,pérdida_ppm,jitter_us,tardíos,recibidos\\n" en ASCII
+    """
+    return (
+        f"{FEEDBACK_PREFIX},{report.interval},{int(report.loss_fraction * 1e6)},"
+        f"{int(report.jitter_ms * 1000)},{report.late},{report.received}\n"
+    ).encode("ascii")
+
+
+def parse_feedback(data: bytes) -> Optional[Tuple[int, float, float, int, int]]:
+    """
+    Interpreta una línea de feedback.
+
+    Returns:
+        (intervalo, pérdida 0-1, jitter_ms, tardíos, recibidos) o None si es inválida
+    """
+    parts = data.decode("ascii", errors="replace").strip().split(",")
+    if len(parts) != 6 or parts[0] != FEEDBACK_PREFIX:
+        return None
+    try:
+        interval, loss_ppm, jitter_us, late, received = (int(value) for value in parts[1:])
+    except ValueError:
+        return None
+    return interval, loss_ppm / 1e6, jitter_us / 1000.0, late, received
+
+
+class RtpReceiveStats:
+    """
+    Estadísticas de recepción RTP (RFC 3550, A.1 y A.8).
+
+    Args:
+        late_threshold_ms: Retardo relativo a partir del cual un paquete cuenta
+            como tardío (latencia del jitterbuffer del receptor)
+        clock_rate: Reloj RTP del payload
+    """
+
+    def __init__(self, late_threshold_ms: float = 30.0, clock_rate: int = RTP_CLOCK_RATE):
+        self.late_threshold_ms = late_threshold_ms
+        self.clock_rate = clock_rate
+        self.jitter = 0.0  # En unidades del reloj RTP
+        self._ssrc: Optional[int] = None
+        self._cycles = 0
+        self._max_seq: Optional[int] = None
+        self._bad_seq: Optional[int] = None
+        self._interval = 0
+        self._base_ext_seq = 0
+        self._expected_prior = 0  # Esperados del intervalo antes de un re-sync
+        self._received = 0
+        self._late = 0
+        self._bytes = 0
+        self._last_transit: Optional[float] = None
+        self._interval_min_transit: Optional[float] = None
+        self._min_transits: Deque[float] = deque(maxlen=_MIN_TRANSIT_WINDOW)
+        self._interval_started = time.monotonic()
+
+    def _min_transit(self) -> Optional[float]:
+        candidates = list(self._min_transits)
+        if self._interval_min_transit is not None:
+            candidates.append(self._interval_min_transit)
+        return min(candidates) if candidates else None
+
+    def _resync(self, ssrc: int, seq: int) -> None:
+        """Empieza una fuente nueva (SSRC distinto o emisor reiniciado) en ``seq``."""
+        if self._max_seq is not None:
+            self._expected_prior += max(0, self._cycles + self._max_seq - self._base_ext_seq)
+        self._ssrc = ssrc
+        self._cycles = 0
+        self._max_seq = seq
+        self._bad_seq = None
+        self._base_ext_seq = seq - 1
+        self._last_transit = None
+        self._interval_min_transit = None
+        self._min_transits.clear()
+
+    def add_packet(self, packet: bytes, arrival: Optional[float] = None) -> bool:
+        """
+        Registra un datagrama recibido.
+
+        Args:
+            packet: Datagrama UDP (RTP)
+            arrival: time.monotonic() de llegada
+
+        Un SSRC distinto reinicia las estadísticas de secuencia. Un salto de
+        secuencia fuera de la ventana (MAX_DROPOUT hacia adelante,
+        MAX_MISORDER hacia atrás) no cuenta como pérdida: el paquete se
+        descarta y, si el siguiente continúa la secuencia nueva, se asume que
+        el emisor se reinició y se re-sincroniza (RFC 3550 A.1).
+
+        Returns:
+            False si no es un paquete RTP v2, es una retransmisión o un salto
+            de secuencia todavía no confirmado (se ignora)
+        """
+        if len(packet) < _RTP_HEADER.size:
+            return False
+        first, second, seq, rtp_ts, ssrc = _RTP_HEADER.unpack_from(packet)
+        if first >> 6 != 2:
+            return False
+        if second & 0x7F == RTX_PAYLOAD_TYPE:
+            return False  # Retransmisión: otro SSRC y otra secuencia; la pérdida se mide en el original
+        arrival = time.monotonic() if arrival is None else arrival
+
+        if self._max_seq is None or ssrc != self._ssrc:
+            self._resync(ssrc, seq)
+        else:
+            delta = (seq - self._max_seq) & 0xFFFF
+            if delta < MAX_DROPOUT:  # En orden (con posible salto por pérdida)
+                if seq < self._max_seq:
+                    self._cycles += 1 << 16
+                self._max_seq = seq
+            elif delta <= 0x10000 - MAX_MISORDER:  # Salto grande
+                if seq != self._bad_seq:
+                    self._bad_seq = (seq + 1) & 0xFFFF
+                    return False
+                self._resync(ssrc, seq)  # Dos paquetes seguidos: el emisor se reinició
+            # Si no, duplicado o desordenado: cuenta como recibido
+        self._received += 1
+        self._bytes += len(packet)
+
+        transit = arrival * self.clock_rate - rtp_ts
+        if self._last_transit is not None:
+            difference = abs(transit - self._last_transit)
+            if difference < self.clock_rate:  # Ignora saltos de timestamp (reinicio del emisor)
+                self.jitter += (difference - self.jitter) / 16.0
+        self._last_transit = transit
+
+        min_transit = self._min_transit()
+        if min_transit is None or transit < min_transit or transit - min_transit > 10 * self.clock_rate:
+            self._interval_min_transit = transit  # Primera muestra o reloj del emisor reiniciado
+            self._min_transits.clear()
+        elif (transit - min_transit) * 1000.0 / self.clock_rate > self.late_threshold_ms:
+            self._late += 1
+        if self._interval_min_transit is None or transit < self._interval_min_transit:
+            self._interval_min_transit = transit
+        return True
+
+    def snapshot(self) -> QosReport:
+        """
+        Cierra el intervalo actual y devuelve sus estadísticas.
+
+        Returns:
+            QosReport del intervalo
+        """
+        now = time.monotonic()
+        ext_max = self._cycles + self._max_seq if self._max_seq is not None else self._base_ext_seq
+        expected = self._expected_prior + max(0, ext_max - self._base_ext_seq)
+        lost = max(0, expected - self._received)
+        elapsed = max(now - self._interval_started, 1e-6)
+        self._interval += 1
+        report = QosReport(
+            interval=self._interval,
+            loss_fraction=lost / expected if expected else 0.0,
+            jitter_ms=self.jitter * 1000.0 / self.clock_rate,
+            late=self._late,
+            received=self._received,
+            expected=expected,
+            bitrate_kbps=self._bytes * 8 / elapsed / 1000.0,
+            timestamp=time.time(),
+        )
+        self._base_ext_seq = ext_max
+        self._expected_prior = 0
+        self._received = 0
+        self._late = 0
+        self._bytes = 0
+        if self._interval_min_transit is not None:
+            self._min_transits.append(self._interval_min_transit)
+        self._interval_min_transit = None
+        self._interval_started = now
+        return report
+
+
+class RtpMonitor:
+    """
+    Relay UDP que mide el stream RTP y envía feedback QoS a la Jetson.
+
+    Attributes:
+        listen_port: Puerto donde llega el video de la Jetson
+        relay_port: Puerto local donde escucha el receptor GStreamer
+        feedback_port: Puerto UDP de la Jetson que recibe el feedback
+        interval_s: Periodo de los reportes
+    """
+
+    def __init__(self, listen_port: int = 5000, relay_port: int = 5002, feedback_port: int = 5010,
+                 interval_s: float = 1.0, late_threshold_ms: float = 30.0, history: int = 60):
+        self.listen_port = listen_port
+        self.relay_port = relay_port
+        self.feedback_port = feedback_port
+        self.interval_s = interval_s
+        self.stats = RtpReceiveStats(late_threshold_ms=late_threshold_ms)
+        self.history: Deque[QosReport] = deque(maxlen=history)
+        self.sender: Optional[Tuple[str, int]] = None  # Origen de los paquetes RTP (la Jetson)
+        self.feedback_sent = 0
+        self.latency: Optional[LatencyTracker] = None  # Modo medición de latencia
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._error_limiter = RateLimiter("video.qos.errors", 0.2)
+
+    def start(self) -> None:
+        """Abre el puerto de video y arranca el hilo del relay."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        sock.bind(("0.0.0.0", self.listen_port))
+        sock.settimeout(0.1)
+        self._sock = sock
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="rtp-monitor", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"[VIDEO QOS] Monitoring RTP on UDP {self.listen_port} -> receiver on 127.0.0.1:{self.relay_port}, "
+            f"feedback to Jetson UDP {self.feedback_port} every {self.interval_s:.1f}s"
+        )
+
+    def stop(self) -> None:
+        """Detiene el relay y libera el puerto."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _run(self) -> None:
+        relay_addr = ("127.0.0.1", self.relay_port)
+        next_report = time.monotonic() + self.interval_s
+        while self._running:
+            try:
+                packet, addr = self._sock.recvfrom(65536)
+            except socket.timeout:
+                packet = None
+            except OSError as e:
+                if self._running and self._error_limiter.allow():
+                    logger.warning(f"[VIDEO QOS] Receive error: {e}")
+                packet = None
+
+            now = time.monotonic()
+            if packet is not None:
+                try:
+                    self._sock.sendto(packet, relay_addr)
+                except OSError as e:
+                    if self._error_limiter.allow():
+                        logger.warning(f"[VIDEO QOS] Relay error: {e}")
+                with self._lock:
+                    if self.stats.add_packet(packet, now):
+                        self.sender = addr
+                latency = self.latency
+                if latency is not None:
+                    latency.on_packet(packet, time.time())
+
+            if now >= next_report:
+                next_report += self.interval_s
+                if next_report < now:
+                    next_report = now + self.interval_s
+                self._report()
+
+    def _report(self) -> None:
+        with self._lock:
+            report = self.stats.snapshot()
+            self.history.append(report)
+            sender = self.sender
+        if sender is None or report.expected == 0:
+            return  # Nada recibido todavía: no hay nada que reportar
+        try:
+            self._sock.sendto(format_feedback(report), (sender[0], self.feedback_port))
+            self.feedback_sent += 1
+        except OSError as e:
+            if self._error_limiter.allow():
+                logger.warning(f"[VIDEO QOS] Feedback send error: {e}")
+
+    def get_qos(self) -> dict:
+        """
+        Estado QoS para la API: último intervalo y resumen reciente.
+
+        Returns:
+            Dict con "last", "recent" (promedios de los últimos 10 intervalos),
+            "sender" y "feedback_sent"
+        """
+        with self._lock:
+            history = list(self.history)
+            sender = self.sender
+        recent = [report for report in history[-10:] if report.expected]
+        summary = None
+        if recent:
+            summary = {
+                "intervals": len(recent),
+                "loss_fraction": sum(r.loss_fraction for r in recent) / len(recent),
+                "jitter_ms": sum(r.jitter_ms for r in recent) / len(recent),
+                "late": sum(r.late for r in recent),
+                "bitrate_kbps": sum(r.bitrate_kbps for r in recent) / len(recent),
+            }
+        return {
+            "last": asdict(history[-1]) if history else None,
+            "recent": summary,
+            "sender": f"{sender[0]}:{sender[1]}" if sender else None,
+            "feedback_sent": self.feedback_sent,
+        }
+
+
+_monitor: Optional[RtpMonitor] = None
+
+
+def start_monitor(settings) -> int:
+    """
+    Inicia el monitor QoS si está habilitado y devuelve el puerto donde debe
+    escuchar el receptor GStreamer.
+
+    Si el monitor está deshabilitado o no puede abrir el puerto de video, el
+    receptor escucha directamente en el puerto de video (sin estadísticas).
+
+    Args:
+        settings: Settings del backend
+
+    Returns:
+        Puerto UDP para ``udpsrc`` del receptor
+    """
+    global _monitor
+    if not (settings.video_qos_enabled or settings.video_latency_enabled):
+        return settings.video_port
+    if _monitor is not None and _monitor.running:
+        return _monitor.relay_port
+    monitor = RtpMonitor(
+        listen_port=settings.video_port,
+        relay_port=settings.video_relay_port,
+        feedback_port=settings.video_feedback_port,
+        interval_s=settings.video_feedback_interval_ms / 1000.0,
+        late_threshold_ms=jitterbuffer_latency_ms(settings),
+    )
+    try:
+        monitor.start()
+    except OSError as e:
+        logger.warning(f"[VIDEO QOS] Could not start RTP monitor ({e}), receiver listens directly")
+        return settings.video_port
+    monitor.latency = start_tracker(settings)
+    _monitor = monitor
+    return monitor.relay_port
+
+
+def stop_monitor() -> None:
+    """Detiene el monitor QoS si está corriendo."""
+    global _monitor
+    if _monitor is not None:
+        _monitor.stop()
+        _monitor = None
+    stop_tracker()
+
+
+def get_monitor() -> Optional[RtpMonitor]:
+    """Monitor QoS activo (None si no hay)."""
+    return _monitor
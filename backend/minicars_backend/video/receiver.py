@@ -0,0 +1,85 @@
+"""
+Pipeline GStreamer del receptor de video (laptop).
+
+Lo usan ``start_stream`` y ``start_receiver``. Según
+``video_loss_recovery`` (igual a ``loss_recovery.mode`` de
+stream_config.json en la Jetson) agrega la recuperación de pérdidas:
+
+- ``none``: ``udpsrc ! rtpjitterbuffer drop-on-late=true ! depay ! decode``
+- ``rtx``: un ``rtpsession`` (perfil AVPF) envía NACKs por RTCP a la Jetson
+  en cuanto el jitterbuffer detecta un hueco; ``rtprtxreceive`` devuelve las
+  retransmisiones (payload 97) al stream original
+- ``fec``: ``rtpstorage`` guarda los paquetes recibidos y ``rtpulpfecdec``
+  reconstruye los perdidos con los paquetes FEC (payload 122)
+
+Con recuperación el jitterbuffer usa ``video_loss_recovery_latency_ms``:
+es la cota de la latencia extra, un paquete que no se recuperó a tiempo se
+da por perdido igual que sin recuperación.
+"""
+from typing import Optional
+
+VIDEO_PAYLOAD_TYPE = 96
+RTX_PAYLOAD_TYPE = 97  # Mismos valores que jetson/gst_pipeline.py
+FEC_PAYLOAD_TYPE = 122
+
+LOSS_RECOVERY_MODES = ("none", "rtx", "fec")
+
+_RTP_CAPS = f"application/x-rtp,media=video,encoding-name=H264,payload={VIDEO_PAYLOAD_TYPE},clock-rate=90000"
+_DECODE = "rtph264depay ! h264parse ! avdec_h264 ! videoconvert ! "
+
+
+def loss_recovery_mode(settings) -> str:
+    """Modo de recuperación configurado ("none" si el valor no es válido)."""
+    mode = (settings.video_loss_recovery or "none").lower()
+    return mode if mode in LOSS_RECOVERY_MODES else "none"
+
+
+def jitterbuffer_latency_ms(settings) -> int:
+    """Latencia del rtpjitterbuffer según el modo de recuperación."""
+    if loss_recovery_mode(settings) == "none":
+        return settings.video_jitterbuffer_latency_ms
+    return settings.video_loss_recovery_latency_ms
+
+
+def build_receiver_pipeline(settings, listen_port: int, sink: Optional[str] = None) -> str:
+    """
+    Descripción del pipeline receptor (lo que va después de ``gst-launch-1.0 -v``).
+
+    Args:
+        settings: Settings del backend
+        listen_port: Puerto UDP del video (el del relay QoS si está activo)
+        sink: Sink de video (default: ``autovideosink sync=false``)
+
+    Returns:
+        Descripción del pipeline para gst-launch
+    """
+    mode = loss_recovery_mode(settings)
+    latency = jitterbuffer_latency_ms(settings)
+    sink = sink or "autovideosink sync=false"
+    source = f'udpsrc port={listen_port} caps="{_RTP_CAPS}"'
+
+    if mode == "rtx":
+        pt_map = f'payload-type-map="application/x-rtp-pt-map,{VIDEO_PAYLOAD_TYPE}=(uint){RTX_PAYLOAD_TYPE}"'
+        return (
+            f"rtpsession name=session rtp-profile=avpf "
+            f"{source} ! session.recv_rtp_sink "
+            f"session.recv_rtp_src ! rtprtxreceive {pt_map} ! "
+            f"rtpjitterbuffer latency={latency} drop-on-late=true do-retransmission=true ! "
+            f"{_DECODE}{sink} "
+            f"udpsrc port={settings.video_rtcp_port} ! session.recv_rtcp_sink "
+            f"session.send_rtcp_src ! udpsink host={settings.joystick_target_host} "
+            f"port={settings.video_sender_rtcp_port} sync=false async=false"
+        )
+    if mode == "fec":
+        return (
+            f"{source} ! rtpstorage size-time={latency * 1000000} ! rtpssrcdemux ! "
+            f'"{_RTP_CAPS}" ! '
+            f"rtpjitterbuffer latency={latency} drop-on-late=true do-lost=true ! "
+            f"rtpulpfecdec name=fec pt={FEC_PAYLOAD_TYPE} ! "
+            f"{_DECODE}{sink}"
+        )
+    return (
+        f"{source} ! "
+        f"rtpjitterbuffer latency={latency} drop-on-late=true ! "
+        f"{_DECODE}{sink}"
+    )
@@ -1,5 +1,7 @@
+import httpx
 from fastapi.testclient import TestClient
 
+from minicars_backend import jetson_client
 from minicars_backend.api import app
 
 
@@ -12,3 +14,27 @@ def test_health():
     assert r.json()["status"] == "ok"
 
 
+def test_status_includes_jetson_supervisor(monkeypatch):
+    calls = []
+
+    def fake_request(method, url, json=None, timeout=None, headers=None):
+        calls.append((url, timeout))
+        return httpx.Response(200, json={"state": "backoff", "reason": "failed to start (capture)"})
+
+    monkeypatch.setattr(jetson_client.httpx, "request", fake_request)
+    r = client.get("/status")
+    assert r.status_code == 200
+    jetson = r.json()["jetson"]
+    assert jetson == {"state": "backoff", "reason": "failed to start (capture)", "reachable": True}
+    assert calls[-1][0].endswith("/health") and calls[-1][1] == 0.5
+
+
+def test_status_when_jetson_unreachable(monkeypatch):
+    def unreachable(method, url, json=None, timeout=None, headers=None):
+        raise httpx.ConnectTimeout("timed out")
+
+    monkeypatch.setattr(jetson_client.httpx, "request", unreachable)
+    r = client.get("/status")
+    assert r.status_code == 200
+    assert r.json()["stream"] in ("running", "stopped")
+    assert r.json()["jetson"]["reachable"] is False
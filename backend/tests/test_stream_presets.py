@@ -0,0 +1,89 @@
+import httpx
+from fastapi.testclient import TestClient
+
+from minicars_backend import jetson_client
+from minicars_backend.api import app
+
+
+client = TestClient(app)
+
+
+def test_presets_proxy(monkeypatch):
+    calls = []
+
+    def fake_request(method, url, json=None, timeout=None, headers=None):
+        calls.append((method, url, json))
+        if json == {"name": "missing"}:
+            return httpx.Response(404, json={"error": "Unknown preset: missing"})
+        return httpx.Response(200, json={"active": "low_latency", "live": ["bitrate"], "restart": []})
+
+    monkeypatch.setattr(jetson_client.httpx, "request", fake_request)
+
+    r = client.post("/stream/presets/active", json={"name": "low_latency"})
+    assert r.status_code == 200
+    assert r.json()["active"] == "low_latency"
+    assert calls[-1][0] == "POST" and calls[-1][1].endswith("/presets/active")
+
+    r = client.post("/stream/presets/active", json={"name": "missing"})
+    assert r.status_code == 404
+    assert r.json()["detail"]["error"] == "Unknown preset: missing"
+
+
+def test_presets_when_jetson_unreachable(monkeypatch):
+    def unreachable(method, url, json=None, timeout=None, headers=None):
+        raise httpx.ConnectError("connection refused")
+
+    monkeypatch.setattr(jetson_client.httpx, "request", unreachable)
+    r = client.get("/stream/presets")
+    assert r.status_code == 502
+
+
+def test_destinations_proxy(monkeypatch):
+    calls = []
+
+    def fake_request(method, url, json=None, timeout=None, headers=None):
+        calls.append((method, url, json))
+        return httpx.Response(200, json={"mode": "fanout", "destinations": [], "restart": []})
+
+    monkeypatch.setattr(jetson_client.httpx, "request", fake_request)
+
+    assert client.post("/stream/destinations", json={"host": "239.1.1.5", "port": 5004}).status_code == 200
+    assert calls[-1][1].endswith("/destinations/add") and calls[-1][2] == {"host": "239.1.1.5", "port": 5004}
+
+    assert client.delete("/stream/destinations/239.1.1.5/5004").status_code == 200
+    assert calls[-1][1].endswith("/destinations/remove") and calls[-1][2] == {"host": "239.1.1.5", "port": 5004}
+
+
+def test_recording_proxy(monkeypatch):
+    calls = []
+
+    def fake_request(method, url, json=None, timeout=None, headers=None):
+        calls.append((method, url))
+        if url.endswith("/recording/start"):
+            return httpx.Response(409, json={"error": "no 'recording' section in stream_config.json"})
+        return httpx.Response(200, json={"requested": False, "active": False})
+
+    monkeypatch.setattr(jetson_client.httpx, "request", fake_request)
+
+    assert client.get("/stream/recording").json()["active"] is False
+    r = client.post("/stream/recording/start")
+    assert r.status_code == 409
+    assert calls[-1][0] == "POST" and calls[-1][1].endswith("/recording/start")
+    assert client.post("/stream/recording/stop").status_code == 200
+
+
+def test_control_token_header(monkeypatch):
+    calls = []
+
+    def fake_request(method, url, json=None, timeout=None, headers=None):
+        calls.append(headers)
+        return httpx.Response(200, json={"active": None, "presets": {}})
+
+    monkeypatch.setattr(jetson_client.httpx, "request", fake_request)
+    settings = jetson_client.get_settings()
+    monkeypatch.setattr(settings, "jetson_control_token", None)
+    jetson_client.supervisor_request("GET", "/presets")
+    monkeypatch.setattr(settings, "jetson_control_token", "s3cret")
+    jetson_client.supervisor_request("GET", "/presets")
+
+    assert calls == [None, {"X-MiniCars-Token": "s3cret"}]
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from minicars_backend.api import app
+from minicars_backend.joystick import JoystickSender, parse_bridge_line
+
+
+client = TestClient(app)
+
+
+def test_parse_bridge_line():
+    assert parse_bridge_line("T,7400,120\n") == ("T", 7400, 120)
+    assert parse_bridge_line("A,3500\n") == ("A", 3500, 0)
+    assert parse_bridge_line("T,abc,1\n") is None
+    assert parse_bridge_line("garbage") is None
+
+
+def test_sender_telemetry_snapshot():
+    sender = JoystickSender()
+    assert sender.get_telemetry()["updated_at"] is None
+
+    sender._apply_bridge_event(("T", 7200, -15))
+    sender._apply_bridge_event(("A", 4000, 0))
+    telemetry = sender.get_telemetry()
+    assert telemetry["battery_mv"] == 7200
+    assert telemetry["wheel_speed_cms"] == -15
+    assert telemetry["ack_rtt_ms"] == 4.0
+    assert telemetry["age_ms"] is not None
+
+
+def test_telemetry_endpoint_when_stopped():
+    r = client.get("/control/telemetry")
+    assert r.status_code == 200
+    assert r.json()["status"] == "stopped"
+
+
+def test_parse_bridge_pong():
+    assert parse_bridge_line("Q,42\n") == ("Q", 42, 0)
+    assert parse_bridge_line("Q,\n") is None
+
+
+def test_sender_link_check_after_pong():
+    sender = JoystickSender(link_timeout_ms=50)
+    sender._last_rx = time.monotonic() - 1.0
+    # Bridges that never answer probes are not timed out
+    sender._check_link()
+
+    sender._probe_sent_at[7] = time.monotonic()
+    sender._apply_bridge_event(("Q", 7, 0))
+    assert sender.get_telemetry()["link_rtt_ms"] is not None
+    with pytest.raises(ConnectionError):
+        sender._check_link()
+
+    sender._last_rx = time.monotonic()
+    sender._check_link()
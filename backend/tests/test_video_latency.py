@@ -0,0 +1,83 @@
+import struct
+
+from fastapi.testclient import TestClient
+
+from minicars_backend.api import app
+from minicars_backend.video import LatencyTracker, format_timing, parse_timing, parse_tracer_line
+
+
+client = TestClient(app)
+
+
+def rtp_packet(seq, timestamp, marker=False):
+    return struct.pack("!BBHII", 0x80, 96 | (0x80 if marker else 0), seq, timestamp, 1234) + b"x" * 100
+
+
+def test_timing_line_round_trip():
+    line = format_timing(2970, 1_000_000, 1_008_000, 1_009_000)
+    assert line == b"T,2970,1000000,1008000,1009000\n"
+    assert parse_timing(line) == (2970, 1_000_000, 1_008_000, 1_009_000)
+    assert parse_timing(b"R,1000,0,0,0,10\n") is None
+    assert parse_timing(b"T,1,2,x,4\n") is None
+
+
+def test_tracer_lines():
+    element = ("0:00:01.5 12 0x1 TRACE GST_TRACER :0:: element-latency, element-id=(string)0x2, "
+               "element=(string)rtpjitterbuffer0, src=(string)src, time=(guint64)40000000, ts=(guint64)1;")
+    pipeline = ("0:00:01.5 12 0x1 TRACE GST_TRACER :0:: latency, src-element-id=(string)0x3, "
+                "src-element=(string)udpsrc0, src=(string)src, sink-element=(string)autovideosink0-actual-sink-xvimage, "
+                "sink=(string)sink, time=(guint64)55500000, ts=(guint64)1;")
+    assert parse_tracer_line(element) == ("element", "rtpjitterbuffer0", 40.0)
+    assert parse_tracer_line(pipeline) == ("pipeline", None, 55.5)
+    assert parse_tracer_line("Setting pipeline to PLAYING ...") is None
+
+
+def test_tracker_matches_frames_in_either_order():
+    tracker = LatencyTracker()
+    tracker.on_tracer_line("element-latency, element=(string)rtpjitterbuffer0, time=(guint64)40000000;")
+    tracker.on_tracer_line("latency, src-element=(string)udpsrc0, time=(guint64)50000000;")
+
+    # Timing first, then the frame's packets (only the marker packet completes it)
+    tracker.on_timing(2970, 1_000_000, 1_008_000, 1_009_000)
+    tracker.on_packet(rtp_packet(1, 2970), arrival=1.010)
+    assert tracker.frames_matched == 0
+    tracker.on_packet(rtp_packet(2, 2970, marker=True), arrival=1.012)
+    # Packets first, then the timing
+    tracker.on_packet(rtp_packet(3, 5940, marker=True), arrival=1.045)
+    tracker.on_timing(5940, 1_033_000, 1_040_000, 1_041_000)
+
+    snapshot = tracker.snapshot()
+    stages = snapshot["stages"]
+    assert snapshot["frames_matched"] == 2 and not snapshot["clock_skew_suspected"]
+    assert stages["capture_to_encode"]["p50"] == 7.0 and stages["capture_to_encode"]["max"] == 8.0
+    assert stages["encode_to_send"]["p50"] == 1.0
+    assert stages["network"]["max"] == 4.0
+    assert stages["jitterbuffer"]["p50"] == 40.0
+    assert stages["decode_to_display"]["p50"] == 10.0
+    assert stages["total"]["max"] == 62.0  # 12ms capture -> arrival + 50ms receiver
+
+    tracker.reset()
+    assert tracker.snapshot()["frames_matched"] == 0
+    assert tracker.snapshot()["stages"]["network"] is None
+
+
+def test_clock_skew_flagged():
+    tracker = LatencyTracker()
+    tracker.on_timing(1, 2_000_000, 2_001_000, 2_002_000)
+    tracker.on_packet(rtp_packet(1, 1, marker=True), arrival=1.999)
+    assert tracker.snapshot()["clock_skew_suspected"]
+
+
+def test_latency_endpoints_when_disabled():
+    r = client.get("/video/latency")
+    assert r.status_code == 200
+    assert r.json() == {"status": "disabled", "latency": None}
+    assert client.post("/video/latency/reset").status_code == 409
+
+
+def test_fec_packets_do_not_complete_frames():
+    tracker = LatencyTracker()
+    tracker.on_timing(2970, 1_000_000, 1_008_000, 1_009_000)
+    fec = struct.pack("!BBHII", 0x80, 0x80 | 122, 9, 2970, 1234) + b"x" * 50
+    tracker.on_packet(fec, arrival=1.011)
+    assert tracker.frames_matched == 0
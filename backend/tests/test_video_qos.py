@@ -0,0 +1,186 @@
+import socket
+import struct
+import time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from minicars_backend.api import app
+from minicars_backend.video import (
+    RtpMonitor,
+    RtpReceiveStats,
+    build_receiver_pipeline,
+    format_feedback,
+    parse_feedback,
+)
+
+
+client = TestClient(app)
+
+
+def rtp_packet(seq, timestamp, payload=b"x" * 100, ssrc=1234):
+    return struct.pack("!BBHII", 0x80, 96, seq & 0xFFFF, timestamp & 0xFFFFFFFF, ssrc) + payload
+
+
+def test_stats_loss_and_wraparound():
+    stats = RtpReceiveStats()
+    now = 100.0
+    # 65530..65535, 0..3 with 65533 and 1 lost: 10 expected, 8 received
+    for seq in [65530, 65531, 65532, 65534, 65535, 0, 2, 3]:
+        stats.add_packet(rtp_packet(seq, 0), now)
+    report = stats.snapshot()
+    assert report.received == 8
+    assert report.expected == 10
+    assert abs(report.loss_fraction - 0.2) < 1e-9
+
+    stats.add_packet(rtp_packet(4, 0), now)
+    report = stats.snapshot()
+    assert (report.expected, report.received, report.loss_fraction) == (1, 1, 0.0)
+
+
+def test_stats_jitter_and_late_packets():
+    stats = RtpReceiveStats(late_threshold_ms=30.0)
+    # One frame every 33ms (2970 ticks at 90kHz), arriving on time...
+    for i in range(10):
+        stats.add_packet(rtp_packet(i, i * 2970), 100.0 + i * 0.033)
+    assert stats.snapshot().late == 0
+    # ...then one delayed by 50ms
+    stats.add_packet(rtp_packet(10, 10 * 2970), 100.0 + 10 * 0.033 + 0.050)
+    report = stats.snapshot()
+    assert report.late == 1
+    assert report.jitter_ms > 0
+
+
+def test_stats_resync_after_forward_jump():
+    stats = RtpReceiveStats()
+    for seq in range(100, 110):
+        stats.add_packet(rtp_packet(seq, 0), 100.0)
+    # Sender restarted with a new seqnum-offset: the first packet is held back...
+    assert stats.add_packet(rtp_packet(20000, 0), 100.1) is False
+    # ...and the next one in sequence confirms the new source
+    for seq in range(20001, 20011):
+        assert stats.add_packet(rtp_packet(seq, 0), 100.1)
+    report = stats.snapshot()
+    assert (report.expected, report.received, report.loss_fraction) == (20, 20, 0.0)
+
+
+def test_stats_resync_after_backward_jump():
+    stats = RtpReceiveStats()
+    for seq in range(30000, 30010):
+        stats.add_packet(rtp_packet(seq, 0), 100.0)
+    stats.snapshot()
+    for seq in range(500, 510):
+        stats.add_packet(rtp_packet(seq, 0), 100.1)
+    report = stats.snapshot()
+    # 500 is dropped, 501 confirms the restart; nothing counts as lost
+    assert (report.expected, report.received, report.loss_fraction) == (9, 9, 0.0)
+
+    stats.add_packet(rtp_packet(510, 0), 100.2)
+    stats.add_packet(rtp_packet(512, 0), 100.2)
+    report = stats.snapshot()
+    assert (report.expected, report.received) == (3, 2)
+
+
+def test_stats_isolated_jump_is_ignored():
+    stats = RtpReceiveStats()
+    for seq in (1, 2, 3, 9000, 4, 5):
+        stats.add_packet(rtp_packet(seq, 0), 100.0)
+    report = stats.snapshot()
+    assert (report.expected, report.received, report.loss_fraction) == (5, 5, 0.0)
+
+
+def test_stats_reset_on_ssrc_change():
+    stats = RtpReceiveStats()
+    for seq in range(10, 20):
+        stats.add_packet(rtp_packet(seq, 0), 100.0)
+    for seq in (40000, 40001, 40003):
+        assert stats.add_packet(rtp_packet(seq, 5000000, ssrc=9999), 100.1)
+    report = stats.snapshot()
+    assert (report.expected, report.received) == (14, 13)
+    assert report.jitter_ms < 1.0  # The new timestamp base is not a transit jump
+
+
+def test_stats_ignores_non_rtp():
+    stats = RtpReceiveStats()
+    assert not stats.add_packet(b"\x00" * 20)
+    assert not stats.add_packet(b"short")
+
+
+def test_feedback_roundtrip():
+    stats = RtpReceiveStats()
+    for seq in (1, 2, 4):
+        stats.add_packet(rtp_packet(seq, 0), 1.0)
+    line = format_feedback(stats.snapshot())
+    interval, loss, jitter_ms, late, received = parse_feedback(line)
+    assert interval == 1 and received == 3 and late == 0
+    assert abs(loss - 0.25) < 1e-6
+    assert parse_feedback(b"T,1,2\n") is None
+    assert parse_feedback(b"R,1,x,0,0,0\n") is None
+
+
+def test_monitor_relays_and_sends_feedback():
+    def free_udp_socket():
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.settimeout(2.0)
+        return sock
+
+    receiver = free_udp_socket()  # Plays the GStreamer receiver
+    jetson = free_udp_socket()  # Plays the Jetson (sender of RTP, receiver of feedback)
+    probe = free_udp_socket()
+    listen_port = probe.getsockname()[1]
+    probe.close()
+
+    monitor = RtpMonitor(listen_port=listen_port, relay_port=receiver.getsockname()[1],
+                         feedback_port=jetson.getsockname()[1], interval_s=0.2)
+    monitor.start()
+    try:
+        packet = rtp_packet(1, 0)
+        jetson.sendto(packet, ("127.0.0.1", listen_port))
+        assert receiver.recv(2048) == packet
+        feedback = parse_feedback(jetson.recv(2048))
+        assert feedback is not None and feedback[4] == 1
+        assert monitor.get_qos()["sender"].startswith("127.0.0.1:")
+    finally:
+        monitor.stop()
+        receiver.close()
+        jetson.close()
+
+
+def test_qos_endpoint_when_stopped():
+    r = client.get("/video/qos")
+    assert r.status_code == 200
+    assert r.json() == {"status": "stopped", "qos": None}
+
+
+def test_retransmissions_do_not_count_as_received():
+    stats = RtpReceiveStats()
+    for seq in (1, 2, 4):
+        stats.add_packet(rtp_packet(seq, 0), 100.0)
+    rtx = struct.pack("!BBHII", 0x80, 97, 500, 0, 5678) + b"\x00\x03" + b"x" * 100
+    assert stats.add_packet(rtx, 100.01) is False
+    report = stats.snapshot()
+    assert (report.expected, report.received) == (4, 3)
+
+
+def test_receiver_pipeline_modes():
+    settings = SimpleNamespace(
+        video_loss_recovery="none", video_jitterbuffer_latency_ms=30, video_loss_recovery_latency_ms=120,
+        video_rtcp_port=5001, video_sender_rtcp_port=5003, joystick_target_host="10.0.0.5",
+    )
+    plain = build_receiver_pipeline(settings, 5002)
+    assert plain.startswith("udpsrc port=5002 ")
+    assert "rtpjitterbuffer latency=30 drop-on-late=true ! rtph264depay" in plain
+    assert plain.endswith("autovideosink sync=false")
+
+    settings.video_loss_recovery = "RTX"
+    rtx = build_receiver_pipeline(settings, 5002, sink="fakesink")
+    assert "session.recv_rtp_src ! rtprtxreceive" in rtx
+    assert "rtpjitterbuffer latency=120 drop-on-late=true do-retransmission=true" in rtx
+    assert "udpsrc port=5001 ! session.recv_rtcp_sink" in rtx
+    assert "session.send_rtcp_src ! udpsink host=10.0.0.5 port=5003" in rtx
+
+    settings.video_loss_recovery = "fec"
+    fec = build_receiver_pipeline(settings, 5002)
+    assert "rtpstorage size-time=120000000" in fec
+    assert "do-lost=true ! rtpulpfecdec name=fec pt=122 ! rtph264depay" in fec
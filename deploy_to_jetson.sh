@@ -147,6 +147,10 @@ echo ""
 # Reiniciar el servicio joystick
 echo "Reiniciando servicio minicars-joystick..."
 echo "-----------------------------------"
+# Reinicio planificado: el bridge conserva la conexión del laptop en vez de frenar
+if [ -d /run/minicars-joystick ]; then
+    sudo touch /run/minicars-joystick/restart
+fi
 if sudo systemctl restart minicars-joystick; then
     echo -e "${GREEN}✓${NC} Servicio minicars-joystick reiniciado"
 else
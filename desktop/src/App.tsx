@@ -11,15 +11,18 @@ import { StatusCard } from "./components/StatusCard";
 import { ActionButtons } from "./components/ActionButtons";
 import { DrivingModeSelector } from "./components/DrivingModeSelector";
 import type { DrivingModeId } from "./api/controlProfile";
+import type { JetsonHealth } from "./api/client";
 
 type StatusState = {
   stream: string;
   car_control: string;
+  jetson: JetsonHealth | null;
 };
 
 const INITIAL_STATUS: StatusState = {
   stream: "unknown",
   car_control: "unknown",
+  jetson: null,
 };
 
 type ActionName =
@@ -40,6 +43,7 @@ function App() {
       setStatus({
         stream: data?.stream ?? "unknown",
         car_control: data?.car_control ?? "unknown",
+        jetson: data?.jetson ?? null,
       });
     } catch (error) {
       setMessage(
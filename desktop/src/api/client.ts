@@ -7,9 +7,19 @@ function getBaseUrl(): string {
 
 export const API_BASE_URL = getBaseUrl();
 
+export type JetsonHealth = {
+  reachable: boolean;
+  error?: string;
+  state?: string;
+  reason?: string;
+  restarts?: number;
+  last_failure?: { class: string; context: string } | null;
+};
+
 type StatusResponse = {
   stream: string;
   car_control: string;
+  jetson?: JetsonHealth;
 };
 
 async function request<T>(path: string, options?: RequestInit): Promise<T> {
@@ -1,6 +1,9 @@
+import type { JetsonHealth } from "../api/client";
+
 type StatusState = {
   stream: string;
   car_control: string;
+  jetson: JetsonHealth | null;
 };
 
 type StatusCardProps = {
@@ -14,6 +17,15 @@ const STATUS_COLOR: Record<string, string> = {
   unknown: "#9E9E9E",
 };
 
+const VIDEO_COLOR: Record<string, string> = {
+  running: "#4CAF50",
+  starting: "#f59e0b",
+  backoff: "#E53935",
+  waiting: "#f59e0b",
+  stopped: "#E53935",
+  unreachable: "#9E9E9E",
+};
+
 const MODE_COLOR: Record<string, string> = {
   kid: "#10b981",
   normal: "#3b82f6",
@@ -61,6 +73,35 @@ function ModeItem({ label, mode }: { label: string; mode: string | null }) {
   );
 }
 
+function VideoItem({ jetson }: { jetson: JetsonHealth | null }) {
+  const state = !jetson
+    ? "unknown"
+    : jetson.reachable
+    ? jetson.state ?? "unknown"
+    : "unreachable";
+  // Motivo por el que no hay video (sin tener que entrar por SSH a la Jetson)
+  const reason = !jetson
+    ? null
+    : jetson.reachable
+    ? jetson.reason || null
+    : "Supervisor de la Jetson sin respuesta";
+
+  return (
+    <div className="status-card" title={reason ?? undefined}>
+      <div>
+        <p className="status-label">Video (Jetson)</p>
+        {reason && <p className="status-detail">{reason}</p>}
+      </div>
+      <span
+        className="status-pill"
+        style={{ backgroundColor: VIDEO_COLOR[state] ?? STATUS_COLOR.unknown }}
+      >
+        {state}
+      </span>
+    </div>
+  );
+}
+
 export function StatusCard({ status, activeMode }: StatusCardProps) {
   return (
     <section className="card status-wrapper">
@@ -68,6 +109,7 @@ export function StatusCard({ status, activeMode }: StatusCardProps) {
       <div className="status-grid">
         <StatusItem label="Stream" state={status.stream} />
         <StatusItem label="Car Control" state={status.car_control} />
+        <VideoItem jetson={status.jetson} />
         <ModeItem label="Modo de conducción" mode={activeMode} />
       </div>
     </section>
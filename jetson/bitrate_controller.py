@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+MiniCars adaptive video bitrate (AIMD) from receiver feedback.
+
+The receiver on the control station reports packet loss, jitter and frames
+dropped by ``rtpjitterbuffer drop-on-late=true``. Instead of letting the
+jitterbuffer throw frames away on a congested WiFi, the car lowers the
+encoder bitrate:
+
+- congestion (loss, late drops or jitter above thresholds): multiplicative
+  decrease, then hold for a few intervals so the network can drain
+- clean intervals: additive increase back towards the configured maximum
+- optionally, once at the minimum bitrate, the framerate is lowered too
+  (restored first when conditions improve)
+- no feedback: hold (never increase blind)
+
+Feedback arrives through a ``FeedbackSource``: ``UdpFeedbackSource``
+receives the reports the control station backend sends every second
+(``R,<interval>,<loss_ppm>,<jitter_us>,<late>,<received>``) and
+``SyntheticFeedbackSource`` replays scripted reports for tests and benchmarks.
+"""
+import errno
+import logging
+import socket
+import time
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Decision actions
+ACTION_HOLD = "hold"
+ACTION_INCREASE = "increase"
+ACTION_DECREASE = "decrease"
+
+
+class ReceiverReport:
+    """
+    Receiver statistics for one reporting interval.
+
+    Attributes:
+        loss_fraction: Lost / expected packets in the interval (0.0-1.0)
+        jitter_ms: Interarrival jitter (RFC 3550) in milliseconds
+        late_drops: Packets dropped by the jitterbuffer for arriving late
+        received: Packets received in the interval
+        timestamp: time.time() when the report was produced
+    """
+
+    __slots__ = ("loss_fraction", "jitter_ms", "late_drops", "received", "timestamp")
+
+    def __init__(self, loss_fraction: float = 0.0, jitter_ms: float = 0.0, late_drops: int = 0,
+                 received: int = 0, timestamp: Optional[float] = None):
+        self.loss_fraction = loss_fraction
+        self.jitter_ms = jitter_ms
+        self.late_drops = late_drops
+        self.received = received
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def as_dict(self) -> dict:
+        """Plain dict (for logs and JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"ReceiverReport(loss={self.loss_fraction:.3f}, jitter={self.jitter_ms:.1f}ms, "
+                f"late_drops={self.late_drops}, received={self.received})")
+
+
+class FeedbackSource:
+    """Where receiver reports come from (interface)."""
+
+    def poll(self) -> Optional[ReceiverReport]:
+        """
+        Latest report not yet consumed.
+
+        Returns:
+            ReceiverReport, or None if nothing new arrived
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources."""
+
+
+class SyntheticFeedbackSource(FeedbackSource):
+    """
+    Scripted feedback for tests and benchmarks.
+
+    Args:
+        reports: Reports (or None for "no feedback") returned by successive
+            poll() calls, or a callable producing the next one
+    """
+
+    def __init__(self, reports: Union[Iterable[Optional[ReceiverReport]], Callable[[], Optional[ReceiverReport]]]):
+        self._next: Callable[[], Optional[ReceiverReport]]
+        if callable(reports):
+            self._next = reports
+        else:
+            iterator: Iterator[Optional[ReceiverReport]] = iter(reports)
+            self._next = lambda: next(iterator, None)
+
+    def poll(self) -> Optional[ReceiverReport]:
+        return self._next()
+
+
+def parse_feedback_line(data: bytes) -> Optional[ReceiverReport]:
+    """
+    Parse one feedback datagram from the control station.
+
+    Args:
+        data: "R,<interval>,<loss_ppm>,<jitter_us>,<late>,<received>" (ASCII)
+
+    Returns:
+        ReceiverReport, or None if the datagram is malformed
+    """
+    parts = data.decode("ascii", errors="replace").strip().split(",")
+    if len(parts) != 6 or parts[0] != "R":
+        return None
+    try:
+        _, loss_ppm, jitter_us, late, received = (int(value) for value in parts[1:])
+    except ValueError:
+        return None
+    return ReceiverReport(loss_fraction=loss_ppm / 1e6, jitter_ms=jitter_us / 1000.0,
+                          late_drops=late, received=received)
+
+
+class UdpFeedbackSource(FeedbackSource):
+    """
+    Receiver reports sent by the control station backend over UDP.
+
+    The socket is non-blocking: poll() drains every queued datagram and
+    returns the newest valid report, so a burst after a stall never makes
+    the controller act on stale intervals.
+
+    Args:
+        port: UDP port to listen on
+        bind_host: Local address to bind
+    """
+
+    def __init__(self, port: int = 5010, bind_host: str = "0.0.0.0"):
+        self.port = port
+        self.received = 0
+        self.invalid = 0
+        self.last_sender: Optional[str] = None
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((bind_host, port))
+        self._sock.setblocking(False)
+
+    def poll(self) -> Optional[ReceiverReport]:
+        latest = None
+        while True:
+            try:
+                data, addr = self._sock.recvfrom(512)
+            except OSError as e:
+                if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    logger.warning(f"Feedback receive error on UDP {self.port}: {e}")
+                return latest
+            report = parse_feedback_line(data)
+            if report is None:
+                self.invalid += 1
+                continue
+            self.received += 1
+            self.last_sender = addr[0]
+            latest = report
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+class BitrateDecision:
+    """
+    Outcome of one controller step.
+
+    Attributes:
+        action: ACTION_HOLD, ACTION_INCREASE or ACTION_DECREASE
+        bitrate: Target encoder bitrate (bps)
+        framerate: Target framerate (fps)
+        reason: Human-readable cause
+    """
+
+    __slots__ = ("action", "bitrate", "framerate", "reason")
+
+    def __init__(self, action: str, bitrate: int, framerate: int, reason: str):
+        self.action = action
+        self.bitrate = bitrate
+        self.framerate = framerate
+        self.reason = reason
+
+    def __repr__(self):
+        return f"BitrateDecision({self.action}, {self.bitrate} bps, {self.framerate} fps: {self.reason})"
+
+
+class AimdBitrateController:
+    """
+    Additive-increase / multiplicative-decrease bitrate controller.
+
+    Args:
+        start_bitrate: Initial bitrate (bps)
+        min_bitrate: Lower bound (bps)
+        max_bitrate: Upper bound (bps)
+        framerate: Configured framerate (fps), also the upper framerate bound
+        min_framerate: Lower framerate bound when adapt_framerate is set
+        adapt_framerate: Lower the framerate once the bitrate is at its minimum
+        increase_step: Additive increase per clean interval (bps)
+        decrease_factor: Multiplier applied on congestion
+        framerate_step: Framerate change per step (fps)
+        loss_threshold: Loss fraction considered congestion
+        jitter_threshold_ms: Jitter considered congestion
+        late_drop_threshold: Late drops per interval considered congestion
+        hold_intervals: Intervals to hold after a decrease before increasing again
+    """
+
+    def __init__(self, start_bitrate: int, min_bitrate: int, max_bitrate: int, framerate: int,
+                 min_framerate: int = 15, adapt_framerate: bool = False,
+                 increase_step: int = 250000, decrease_factor: float = 0.85, framerate_step: int = 5,
+                 loss_threshold: float = 0.02, jitter_threshold_ms: float = 30.0,
+                 late_drop_threshold: int = 0, hold_intervals: int = 3):
+        self.min_bitrate = min_bitrate
+        self.max_bitrate = max_bitrate
+        self.max_framerate = framerate
+        self.min_framerate = min(min_framerate, framerate)
+        self.adapt_framerate = adapt_framerate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.framerate_step = framerate_step
+        self.loss_threshold = loss_threshold
+        self.jitter_threshold_ms = jitter_threshold_ms
+        self.late_drop_threshold = late_drop_threshold
+        self.hold_intervals = hold_intervals
+        self.bitrate = max(min_bitrate, min(max_bitrate, start_bitrate))
+        self.framerate = framerate
+        self._hold = 0
+
+    def reset(self, bitrate: int) -> None:
+        """Start over from a bitrate (e.g. after a pipeline restart)."""
+        self.bitrate = max(self.min_bitrate, min(self.max_bitrate, bitrate))
+        self.framerate = self.max_framerate
+        self._hold = 0
+
+    def rollback(self, bitrate: int, framerate: int) -> None:
+        """Go back to the bitrate and framerate the encoder still runs at (a decision was not applied)."""
+        self.bitrate = bitrate
+        self.framerate = framerate
+
+    def _congestion(self, report: ReceiverReport) -> Optional[str]:
+        causes = []
+        if report.loss_fraction > self.loss_threshold:
+            causes.append(f"loss {report.loss_fraction * 100:.1f}%")
+        if report.late_drops > self.late_drop_threshold:
+            causes.append(f"{report.late_drops} late drops")
+        if report.jitter_ms > self.jitter_threshold_ms:
+            causes.append(f"jitter {report.jitter_ms:.1f}ms")
+        return ", ".join(causes) or None
+
+    def update(self, report: Optional[ReceiverReport]) -> BitrateDecision:
+        """
+        Run one control step.
+
+        Args:
+            report: Receiver report for the last interval (None = no feedback)
+
+        Returns:
+            BitrateDecision (bitrate/framerate are the new targets)
+        """
+        if report is None:
+            decision = BitrateDecision(ACTION_HOLD, self.bitrate, self.framerate, "no feedback")
+            logger.debug(f"ABR: {decision}")
+            return decision
+
+        congestion = self._congestion(report)
+        if congestion is not None:
+            self._hold = self.hold_intervals
+            bitrate = max(self.min_bitrate, int(self.bitrate * self.decrease_factor))
+            framerate = self.framerate
+            if bitrate == self.bitrate and self.adapt_framerate:
+                framerate = max(self.min_framerate, self.framerate - self.framerate_step)
+            if (bitrate, framerate) == (self.bitrate, self.framerate):
+                decision = BitrateDecision(ACTION_HOLD, bitrate, framerate, f"{congestion} (at minimum)")
+            else:
+                decision = BitrateDecision(ACTION_DECREASE, bitrate, framerate, congestion)
+        elif self._hold > 0:
+            self._hold -= 1
+            decision = BitrateDecision(ACTION_HOLD, self.bitrate, self.framerate, "holding after decrease")
+        elif self.framerate < self.max_framerate:
+            decision = BitrateDecision(ACTION_INCREASE, self.bitrate,
+                                       min(self.max_framerate, self.framerate + self.framerate_step),
+                                       "clean interval, restoring framerate")
+        elif self.bitrate < self.max_bitrate:
+            decision = BitrateDecision(ACTION_INCREASE, min(self.max_bitrate, self.bitrate + self.increase_step),
+                                       self.framerate, "clean interval")
+        else:
+            decision = BitrateDecision(ACTION_HOLD, self.bitrate, self.framerate, "at maximum")
+
+        if decision.action == ACTION_HOLD and congestion is None:
+            logger.debug(f"ABR: {decision} {report}")
+        else:
+            logger.info(f"ABR {decision.action}: {self.bitrate} -> {decision.bitrate} bps, "
+                        f"{self.framerate} -> {decision.framerate} fps ({decision.reason}; {report})")
+        self.bitrate = decision.bitrate
+        self.framerate = decision.framerate
+        return decision
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+MiniCars supervisor control API (small HTTP/JSON server on asyncio).
+
+The control station backend talks to the car's stream supervisor through
+this endpoint instead of editing files over SSH. It runs on the supervisor's
+event loop, so handlers can read and change supervisor state directly; no
+web framework is needed on the Jetson.
+
+Handlers receive the decoded JSON body (None for GET) and return
+``(status_code, payload)``; raising ``ApiError`` sends an error payload.
+
+With a token configured, every request must carry it in the
+``X-MiniCars-Token`` header (401 otherwise). Without one the API should only
+listen on loopback.
+"""
+import asyncio
+import hmac
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Optional[dict]], Union[Tuple[int, dict], Awaitable[Tuple[int, dict]]]]
+
+TOKEN_HEADER = "X-MiniCars-Token"
+
+_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+_MAX_BODY = 64 * 1024
+_REQUEST_TIMEOUT = 5.0
+
+
+class ApiError(Exception):
+    """Error returned to the client as {"error": message} with an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ControlServer:
+    """
+    Minimal HTTP/1.1 server (one request per connection, JSON in and out).
+
+    Args:
+        loop: Event loop to serve on
+        host: Address to bind
+        port: TCP port (0 = pick a free one, see ``port`` after start())
+        token: Shared secret required in the TOKEN_HEADER header (None = no check)
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, host: str = "127.0.0.1", port: int = 9000,
+                 token: Optional[str] = None):
+        self.loop = loop
+        self.host = host
+        self.port = port
+        self.token = token or None
+        self._routes: Dict[Tuple[str, str], Handler] = {}
+        self._server = None
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        """
+        Register a handler.
+
+        Args:
+            method: "GET" or "POST"
+            path: Exact request path (e.g. "/presets")
+            handler: Called with the JSON body, returns (status, payload)
+        """
+        self._routes[(method.upper(), path)] = handler
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Control API listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        path = path.split("?", 1)[0]
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                raise ApiError(405, f"{method} not allowed on {path}")
+            raise ApiError(404, f"No such endpoint: {path}")
+        payload = None
+        if body:
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except ValueError as e:
+                raise ApiError(400, f"Invalid JSON body: {e}")
+        result = handler(payload)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), _REQUEST_TIMEOUT)
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2:
+                writer.close()
+                return
+            method, path = parts[0].upper(), parts[1]
+            length = 0
+            token = ""
+            while True:
+                line = await asyncio.wait_for(reader.readline(), _REQUEST_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                if name == "content-length":
+                    length = int(value.strip() or 0)
+                elif name == TOKEN_HEADER.lower():
+                    token = value.strip()
+            body = b""
+            if 0 < length <= _MAX_BODY:
+                body = await asyncio.wait_for(reader.readexactly(length), _REQUEST_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+            return
+        try:
+            if self.token is not None and not hmac.compare_digest(token.encode("latin-1"),
+                                                                  self.token.encode("utf-8")):
+                raise ApiError(401, f"Missing or wrong {TOKEN_HEADER} header")
+            if length > _MAX_BODY:
+                raise ApiError(413, "Request body too large")
+            status, payload = await self._dispatch(method, path, body)
+        except ApiError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:
+            logger.error(f"Control API handler failed: {e}", exc_info=True)
+            status, payload = 500, {"error": str(e)}
+        data = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+            .encode("latin-1") + data
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
@@ -6,6 +6,7 @@
 #
 # Usage:
 #   ./deploy_services.sh
+#   MINICARS_RT_MODE=fifo ./deploy_services.sh   # also enable the bridge's RT mode (nice|fifo)
 
 set -e  # Abort on errors
 
@@ -13,6 +14,8 @@ set -e  # Abort on errors
 REPO_DIR="${HOME}/minicars-control-station"
 JETSON_USER="jetson-rod"
 SYSTEMD_DIR="/etc/systemd/system"
+RT_MODE="${MINICARS_RT_MODE:-off}"
+RT_DROPIN="$SYSTEMD_DIR/minicars-joystick.service.d/rt.conf"
 
 # Colors for output
 RED='\033[0;31m'
@@ -54,6 +57,7 @@ echo "Step 3: Verifying service files..."
 SERVICES=(
     "jetson/minicars-streamer.service"
     "jetson/minicars-joystick.service"
+    "jetson/minicars-joystick.socket"
 )
 
 for service_file in "${SERVICES[@]}"; do
@@ -75,6 +79,17 @@ for service_file in "${SERVICES[@]}"; do
     echo -e "  ${GREEN}✓${NC} Copied to $SYSTEMD_DIR/$service_name"
 done
 
+# Real-time mode for the bridge is opt-in: the drop-in carries the RT limits too
+if [ "$RT_MODE" = "fifo" ] || [ "$RT_MODE" = "nice" ]; then
+    sudo mkdir -p "$(dirname "$RT_DROPIN")"
+    sed "s/^Environment=\"MINICARS_RT_MODE=.*\"/Environment=\"MINICARS_RT_MODE=$RT_MODE\"/" \
+        jetson/minicars-joystick-rt.conf | sudo tee "$RT_DROPIN" >/dev/null
+    echo -e "  ${GREEN}✓${NC} Bridge RT mode ($RT_MODE) installed as $RT_DROPIN"
+elif [ -f "$RT_DROPIN" ]; then
+    sudo rm -f "$RT_DROPIN"
+    echo -e "  ${GREEN}✓${NC} Bridge RT mode disabled (removed $RT_DROPIN)"
+fi
+
 # Step 5: Reload systemd daemon
 echo ""
 echo "Step 5: Reloading systemd daemon..."
@@ -94,8 +109,18 @@ echo -e "${GREEN}✓${NC} Service restarted"
 # Step 7: Enable and restart joystick service (if needed)
 echo ""
 echo "Step 7: Configuring minicars-joystick.service..."
+if ! systemctl is-active minicars-joystick.socket >/dev/null 2>&1; then
+    # First install: a bridge that binds port 5005 itself must stop before the socket unit can bind it
+    sudo systemctl stop minicars-joystick.service
+    sudo systemctl enable --now minicars-joystick.socket
+    echo -e "${GREEN}✓${NC} Socket enabled (listening socket held by systemd)"
+fi
 if systemctl is-enabled minicars-joystick.service >/dev/null 2>&1; then
     echo "  Service already enabled, restarting..."
+    # Planned restart: let the bridge hand the laptop's connection over instead of braking
+    if [ -d /run/minicars-joystick ]; then
+        sudo touch /run/minicars-joystick/restart
+    fi
     sudo systemctl restart minicars-joystick.service
     echo -e "${GREEN}✓${NC} Service restarted"
 else
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+MiniCars fake Arduino (PTY stand-in).
+
+Creates a pseudo-terminal that behaves like the Arduino serial port so the
+TCP-UART bridge can be exercised without hardware. Decoded commands are
+printed to stdout; every command is acknowledged and a synthetic telemetry
+report (battery voltage, wheel speed) is sent back periodically.
+
+Usage:
+    python3 fake_arduino.py [--framing ascii|binary]
+
+Then, in another terminal, point the bridge at the printed device:
+    MINICARS_UART_DEVICE=/dev/pts/N MINICARS_UART_FRAMING=binary python3 tcp_uart_bridge.py
+"""
+import argparse
+import os
+import pty
+import select
+import sys
+import time
+import tty
+
+from uart_protocol import (
+    FRAMING_ASCII,
+    FRAMING_BINARY,
+    VALID_FRAMINGS,
+    BinaryFrameDecoder,
+    decode_ascii_line,
+    encode_ack,
+    encode_telemetry,
+)
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="PTY stand-in for the MiniCars Arduino")
+    parser.add_argument("--framing", choices=VALID_FRAMINGS, default=FRAMING_ASCII,
+                        help="UART framing the bridge is configured with")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Only print a summary every second")
+    parser.add_argument("--telemetry-hz", type=float, default=10.0,
+                        help="Telemetry report rate (0 = disabled)")
+    parser.add_argument("--no-ack", action="store_true",
+                        help="Do not acknowledge commands")
+    args = parser.parse_args()
+
+    master_fd, slave_fd = pty.openpty()
+    tty.setraw(slave_fd)  # No line discipline: binary frames must pass through untouched
+    print(f"[fake-arduino] Serial device: {os.ttyname(slave_fd)} ({args.framing} framing)")
+    sys.stdout.flush()
+
+    decoder = BinaryFrameDecoder()
+    ascii_buffer = ""
+    ascii_invalid = 0
+    received = 0
+    window_start = time.time()
+    window_count = 0
+    telemetry_period = 1.0 / args.telemetry_hz if args.telemetry_hz > 0 else None
+    next_telemetry = time.time()
+    battery_mv = 7400
+    wheel_speed_cms = 0
+
+    try:
+        while True:
+            now = time.time()
+            if telemetry_period is not None and now >= next_telemetry:
+                os.write(master_fd, encode_telemetry(args.framing, battery_mv, wheel_speed_cms))
+                battery_mv = max(6000, battery_mv - 1)  # Slow synthetic discharge
+                next_telemetry = now + telemetry_period
+
+            timeout = max(0.0, next_telemetry - now) if telemetry_period is not None else None
+            readable, _, _ = select.select([master_fd], [], [], timeout)
+            if not readable:
+                continue
+
+            data = os.read(master_fd, 1024)
+            if not data:
+                break
+
+            if args.framing == FRAMING_BINARY:
+                commands = decoder.feed(data)
+            else:
+                commands = []
+                ascii_buffer += data.decode('ascii', errors='replace')
+                while '\n' in ascii_buffer:
+                    line, ascii_buffer = ascii_buffer.split('\n', 1)
+                    values = decode_ascii_line(line)
+                    if values is None:
+                        ascii_invalid += 1
+                    else:
+                        commands.append(values)
+
+            for values in commands:
+                received += 1
+                window_count += 1
+                wheel_speed_cms = values[1] * 3  # Pretend speed follows throttle
+                if not args.quiet:
+                    print(f"[fake-arduino] cmd #{received}: servo={values[0]} accel={values[1]} "
+                          f"brake={values[2]} hbrake={values[3]} turbo={values[4]}")
+
+            if commands and not args.no_ack:
+                # Ack the newest command in this chunk (the one actually applied)
+                os.write(master_fd, encode_ack(args.framing, decoder.last_seq))
+
+            now = time.time()
+            if args.quiet and now - window_start >= 1.0:
+                errors = decoder.crc_errors if args.framing == FRAMING_BINARY else ascii_invalid
+                print(f"[fake-arduino] {window_count / (now - window_start):.1f} cmd/s, "
+                      f"total={received}, errors={errors}")
+                window_start = now
+                window_count = 0
+    except (KeyboardInterrupt, OSError):
+        pass
+    finally:
+        os.close(master_fd)
+        os.close(slave_fd)
+
+
+if __name__ == "__main__":
+    main()
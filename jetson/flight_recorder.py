@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+MiniCars flight recorder for the TCP-UART bridge.
+
+Keeps the last N seconds of bridge activity (received commands, smoothed
+commands, UART writes, watchdog events, telemetry) in a preallocated ring of
+fixed-size binary records. Recording is a single ``struct.pack_into`` into a
+bytearray: no per-event objects, no locks, a fraction of a microsecond per
+event on a desktop CPU and a few microseconds on the Nano.
+
+Dumps are written as compact binary files that this module can also decode:
+
+    python3 flight_recorder.py /tmp/minicars-flight/flight-20250101-120000.250-failsafe.bin
+
+File layout::
+
+    header: magic "MCFR", version u16, record_size u16, record_count u32
+    records: oldest first, each "<dB3xffff" (time, kind, pad, a, b, c, d)
+"""
+import itertools
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Event kinds and the meaning of (a, b, c, d) for each
+EV_RX = 1  # Command received over TCP: servo, throttle, brake, flags
+EV_SMOOTHED = 2  # After bridge smoothing: servo, throttle, brake, flags
+EV_UART_WRITE = 3  # Written to UART: servo_angle, accel_pct, brake_pct, flags | seq << 4
+EV_FAILSAFE_ON = 4  # Watchdog tripped: elapsed_ms, 0, 0, 0
+EV_FAILSAFE_OFF = 5  # Commands resumed: 0, 0, 0, 0
+EV_CONNECT = 6  # Client connected: 0, 0, 0, 0
+EV_DISCONNECT = 7  # Client disconnected: reason (0 closed, 1 link timeout, 2 preempted, 3 error), 0, 0, 0
+EV_TELEMETRY = 8  # Arduino telemetry: battery_mv, wheel_speed_cms, 0, 0
+EV_ACK = 9  # Arduino ack: rtt_ms, seq (-1 = ASCII), 0, 0
+EV_INVALID = 10  # Invalid TCP line: invalid_count, 0, 0, 0
+
+# EV_DISCONNECT reasons
+DISCONNECT_CLOSED = 0  # Client closed the connection
+DISCONNECT_LINK_TIMEOUT = 1  # Nothing received within MINICARS_LINK_TIMEOUT_MS
+DISCONNECT_PREEMPTED = 2  # A new client connection replaced this one
+DISCONNECT_ERROR = 3  # Socket or UART error
+
+EVENT_NAMES = {
+    EV_RX: "rx",
+    EV_SMOOTHED: "smoothed",
+    EV_UART_WRITE: "uart_write",
+    EV_FAILSAFE_ON: "failsafe_on",
+    EV_FAILSAFE_OFF: "failsafe_off",
+    EV_CONNECT: "connect",
+    EV_DISCONNECT: "disconnect",
+    EV_TELEMETRY: "telemetry",
+    EV_ACK: "ack",
+    EV_INVALID: "invalid",
+}
+
+_RECORD = struct.Struct("<dB3xffff")
+_HEADER = struct.Struct("<4sHHI")
+_MAGIC = b"MCFR"
+_VERSION = 1
+_DUMP_PREFIX = "flight-"
+_DUMP_SUFFIX = ".bin"
+
+Record = Tuple[float, int, float, float, float, float]
+
+
+class FlightRecorder:
+    """
+    Fixed-capacity ring buffer of bridge events.
+
+    ``record`` may be called concurrently from the network, UART reader and
+    watchdog threads: slots are claimed with ``next()`` on an
+    ``itertools.count``, which is atomic under the GIL.
+
+    Args:
+        capacity: Number of records kept (oldest are overwritten)
+        dump_dir: Directory where dumps are written
+        min_dump_interval: Minimum seconds between automatic (failsafe) dumps
+        max_dumps: Dump files kept in dump_dir (oldest are deleted; 0 = keep all)
+    """
+
+    def __init__(self, capacity: int, dump_dir: str, min_dump_interval: float = 10.0, max_dumps: int = 20):
+        self.capacity = max(1, capacity)
+        self.dump_dir = dump_dir
+        self.min_dump_interval = min_dump_interval
+        self.max_dumps = max(0, max_dumps)
+        self._buffer = bytearray(_RECORD.size * self.capacity)
+        self._counter = itertools.count()
+        self._written = 0  # Slots claimed so far (updated on each record)
+        self._last_auto_dump = 0.0
+        self._last_dump_ms = 0  # Dump names are unique and increasing, even within a millisecond
+        self._dump_name_lock = threading.Lock()
+        self._pack_into = _RECORD.pack_into
+        self._size = _RECORD.size
+
+    def record(self, kind: int, a: float = 0.0, b: float = 0.0, c: float = 0.0, d: float = 0.0) -> None:
+        """
+        Record one event (hot path).
+
+        Args:
+            kind: Event kind (EV_* constant)
+            a, b, c, d: Event values (see EV_* comments)
+        """
+        n = next(self._counter)
+        self._written = n + 1
+        self._pack_into(self._buffer, (n % self.capacity) * self._size, time.time(), kind, a, b, c, d)
+
+    def snapshot(self) -> Tuple[bytes, int]:
+        """
+        Copy the ring into chronological order.
+
+        Returns:
+            (records bytes oldest-first, record count)
+        """
+        written = self._written
+        data = bytes(self._buffer)
+        if written <= self.capacity:
+            return data[:written * self._size], written
+        split = (written % self.capacity) * self._size
+        return data[split:] + data[:split], self.capacity
+
+    def dump(self, reason: str, background: bool = True) -> Optional[str]:
+        """
+        Write the current ring to a dump file.
+
+        The ring is copied synchronously (a memcpy) so later events don't
+        leak into the dump; the file write happens on a background thread
+        unless ``background`` is False. Only the newest ``max_dumps`` files
+        are kept.
+
+        Args:
+            reason: Short tag included in the file name (e.g. "failsafe")
+            background: Write the file on a separate thread
+
+        Returns:
+            Path of the dump file, or None if it could not be created
+        """
+        records, count = self.snapshot()
+        with self._dump_name_lock:
+            stamp_ms = max(int(time.time() * 1000), self._last_dump_ms + 1)
+            self._last_dump_ms = stamp_ms
+        stamp = "%s.%03d" % (time.strftime("%Y%m%d-%H%M%S", time.localtime(stamp_ms // 1000)), stamp_ms % 1000)
+        filename = "%s%s-%s%s" % (_DUMP_PREFIX, stamp, reason, _DUMP_SUFFIX)
+        path = os.path.join(self.dump_dir, filename)
+
+        def write() -> None:
+            try:
+                os.makedirs(self.dump_dir, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(_HEADER.pack(_MAGIC, _VERSION, self._size, count))
+                    f.write(records)
+                logger.info(f"Flight recorder dump written: {path} ({count} records, reason={reason})")
+            except OSError as e:
+                logger.error(f"Failed to write flight recorder dump {path}: {e}")
+            self.prune_dumps()
+
+        if background:
+            threading.Thread(target=write, daemon=True).start()
+        else:
+            write()
+        return path
+
+    def prune_dumps(self) -> int:
+        """
+        Delete the oldest dump files beyond ``max_dumps``.
+
+        Returns:
+            Number of files deleted
+        """
+        if not self.max_dumps:
+            return 0
+        try:
+            # Names start with the timestamp, so they sort oldest first
+            dumps = sorted(name for name in os.listdir(self.dump_dir)
+                           if name.startswith(_DUMP_PREFIX) and name.endswith(_DUMP_SUFFIX))
+        except OSError:
+            return 0
+        deleted = 0
+        for name in dumps[:max(0, len(dumps) - self.max_dumps)]:
+            try:
+                os.remove(os.path.join(self.dump_dir, name))
+                deleted += 1
+            except OSError as e:
+                logger.warning(f"Failed to delete old flight recorder dump {name}: {e}")
+        return deleted
+
+    def dump_if_due(self, reason: str) -> Optional[str]:
+        """
+        Dump unless an automatic dump was written less than min_dump_interval ago.
+
+        Args:
+            reason: Short tag included in the file name
+
+        Returns:
+            Path of the dump file, or None if skipped
+        """
+        now = time.monotonic()
+        if now - self._last_auto_dump < self.min_dump_interval:
+            return None
+        self._last_auto_dump = now
+        return self.dump(reason)
+
+
+def read_dump(path: str) -> Iterator[Record]:
+    """
+    Read records from a dump file.
+
+    Args:
+        path: Dump file path
+
+    Yields:
+        (time, kind, a, b, c, d) tuples, oldest first
+
+    Raises:
+        ValueError: If the file is not a flight recorder dump
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path}: truncated header")
+        magic, version, record_size, count = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            raise ValueError(f"{path}: not a flight recorder dump (magic={magic!r}, version={version})")
+        data = f.read(record_size * count)
+    for record in _RECORD.iter_unpack(data[:len(data) - len(data) % record_size]):
+        yield record
+
+
+def main() -> None:
+    """Decode dump files to text (one event per line)."""
+    if len(sys.argv) < 2:
+        print("Usage: python3 flight_recorder.py <dump.bin> [...]")
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        records = list(read_dump(path))
+        if not records:
+            print(f"{path}: empty")
+            continue
+        t0 = records[0][0]
+        print(f"# {path}: {len(records)} records, "
+              f"{records[-1][0] - t0:.3f}s, starting {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t0))}")
+        for t, kind, a, b, c, d in records:
+            name = EVENT_NAMES.get(kind, str(kind))
+            print(f"{t - t0:10.4f} {name:<13} {a:9.3f} {b:9.3f} {c:9.3f} {d:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+MiniCars in-process GStreamer pipeline (PyGObject bindings).
+
+Running the pipeline inside the supervisor instead of through gst-launch-1.0
+lets encoder and sink properties change while PLAYING, so a new bitrate or
+destination no longer costs a full nvargus/camera restart:
+
+- ``InProcessPipeline`` builds the pipeline from the same description the
+  gst-launch fallback uses (gst_parse_launch syntax, named elements)
+- bus messages are read on a background thread and fed into an
+  ``OutputDrainer`` as lines, so error classification, crash reports and
+  readiness markers work the same for both modes
+- pad probes mark the first camera frame and the first RTP packet, and
+  count encoded frames and bytes (measured encoder fps / bitrate)
+- element messages (e.g. splitmuxsink fragments) are passed to registered
+  handlers, so branches added at runtime (recorder) can follow their state
+- in fan-out mode (multiudpsink) destinations are added and removed live
+  and each one reports its own send statistics
+- the object mimics the parts of subprocess.Popen the supervisor uses
+  (poll, wait, terminate, kill, pid), so it can stand in for the child
+
+The bindings (python3-gi, gir1.2-gstreamer-1.0) are optional: ``available()``
+reports whether they can be imported and the supervisor falls back to
+gst-launch-1.0 otherwise.
+"""
+import logging
+import subprocess
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from pipeline_output import OutputDrainer
+
+logger = logging.getLogger(__name__)
+
+Gst = None  # Imported lazily by available()
+
+# Element names used in the pipeline description
+SOURCE_NAME = "camera"
+CAPS_NAME = "camcaps"  # capsfilter after the camera (resolution / framerate)
+ENCODER_NAME = "encoder"
+PAYLOADER_NAME = "pay"
+SINK_NAME = "sink"
+RTX_NAME = "rtx"  # rtprtxsend (loss_recovery "rtx")
+SESSION_NAME = "session"  # rtpsession exchanging RTCP with the receiver (loss_recovery "rtx")
+FEC_NAME = "fec"  # rtpulpfecenc (loss_recovery "fec")
+
+# RTP payload types; the control station receiver expects the same ones
+VIDEO_PAYLOAD_TYPE = 96
+RTX_PAYLOAD_TYPE = 97
+FEC_PAYLOAD_TYPE = 122
+
+# Properties that can change while PLAYING: (element name, property)
+LIVE_PROPERTIES = {
+    "bitrate": (ENCODER_NAME, "bitrate"),
+    "iframe_interval": (ENCODER_NAME, "iframeinterval"),
+    "host": (SINK_NAME, "host"),
+    "port": (SINK_NAME, "port"),
+    "camera_caps": (CAPS_NAME, "caps"),  # Caps string; framerate changes renegotiate the camera
+    # Fan-out mode (multiudpsink)
+    "clients": (SINK_NAME, "clients"),  # List of (host, port); unchanged clients keep their stats
+    "multicast_ttl": (SINK_NAME, "ttl-mc"),
+}
+
+# Exit codes reported by poll()/wait(), matching what gst-launch would give
+EXIT_EOS = 0
+EXIT_ERROR = 1
+EXIT_TERMINATED = -15
+EXIT_KILLED = -9
+
+
+def available() -> bool:
+    """True if the GStreamer Python bindings can be imported (and initializes them)."""
+    global Gst
+    if Gst is not None:
+        return True
+    try:
+        import gi
+        gi.require_version("Gst", "1.0")
+        from gi.repository import Gst as _Gst
+    except (ImportError, ValueError) as e:
+        logger.debug(f"GStreamer Python bindings unavailable: {e}")
+        return False
+    _Gst.init(None)
+    Gst = _Gst
+    return True
+
+
+def parse_clients(value: Optional[str]) -> List[Tuple[str, int]]:
+    """Parse a multiudpsink "clients" string ("host:port,host:port")."""
+    clients = []
+    for item in (value or "").split(","):
+        host, _, port = item.strip().rpartition(":")
+        if host and port.isdigit():
+            clients.append((host, int(port)))
+    return clients
+
+
+class InProcessPipeline:
+    """
+    A GStreamer pipeline run in this process, with a Popen-like interface.
+
+    Args:
+        description: gst_parse_launch description (elements named as above)
+        output: Drainer receiving bus messages as lines and readiness markers
+    """
+
+    pid = None  # No child process
+
+    def __init__(self, description: str, output: OutputDrainer):
+        if not available():
+            raise RuntimeError("GStreamer Python bindings are not available")
+        self.description = description
+        self.output = output
+        self.returncode: Optional[int] = None
+        self._exited = threading.Event()
+        self._stopping = False
+        self._element_handlers: List[Callable[[str, str, object], None]] = []
+        self.encoded_frames = 0
+        self.encoded_bytes = 0
+
+        self.pipeline = Gst.parse_launch(description)
+        self._add_first_buffer_probe(SOURCE_NAME, "first_frame")
+        self._add_first_buffer_probe(PAYLOADER_NAME, "first_packet")
+        encoder_pad = self.pipeline.get_by_name(ENCODER_NAME).get_static_pad("src")
+        encoder_pad.add_probe(Gst.PadProbeType.BUFFER, self._count_encoded)
+
+        self._bus_thread = threading.Thread(target=self._bus_loop, name="gst-bus", daemon=True)
+        self._bus_thread.start()
+        self.output.feed("bus", "Setting pipeline to PLAYING ...")
+        if self.pipeline.set_state(Gst.State.PLAYING) == Gst.StateChangeReturn.FAILURE:
+            self.output.feed("bus", "ERROR: pipeline doesn't want to go to PLAYING")
+            self._finish(EXIT_ERROR)
+
+    def _add_first_buffer_probe(self, element_name: str, marker: str) -> None:
+        element = self.pipeline.get_by_name(element_name)
+        pad = element.get_static_pad("src") if element is not None else None
+        if pad is None:
+            return
+
+        def on_buffer(pad, info):
+            self.output.mark(marker)
+            return Gst.PadProbeReturn.REMOVE
+
+        pad.add_probe(Gst.PadProbeType.BUFFER, on_buffer)
+
+    def _count_encoded(self, pad, info):
+        # Only the streaming thread writes; readers tolerate a torn pair
+        self.encoded_frames += 1
+        self.encoded_bytes += info.get_buffer().get_size()
+        return Gst.PadProbeReturn.OK
+
+    def encoder_counters(self) -> Tuple[int, int]:
+        """(frames, bytes) produced by the encoder since the pipeline started."""
+        return self.encoded_frames, self.encoded_bytes
+
+    def _bus_loop(self) -> None:
+        bus = self.pipeline.get_bus()
+        wanted = (Gst.MessageType.ERROR | Gst.MessageType.WARNING | Gst.MessageType.EOS
+                  | Gst.MessageType.STATE_CHANGED | Gst.MessageType.ELEMENT)
+        while not self._exited.is_set():
+            message = bus.timed_pop_filtered(100 * Gst.MSECOND, wanted)
+            if message is None:
+                continue
+            source = message.src.get_path_string() if message.src is not None else "pipeline"
+            if message.type == Gst.MessageType.ERROR:
+                error, debug = message.parse_error()
+                self.output.feed("bus", f"ERROR: from element {source}: {error.message}")
+                if debug:
+                    self.output.feed("bus", f"Additional debug info: {debug}")
+                self._finish(EXIT_ERROR)
+            elif message.type == Gst.MessageType.WARNING:
+                warning, debug = message.parse_warning()
+                self.output.feed("bus", f"WARNING: from element {source}: {warning.message}")
+            elif message.type == Gst.MessageType.EOS:
+                self.output.feed("bus", "Got EOS from element " + source)
+                self._finish(EXIT_TERMINATED if self._stopping else EXIT_EOS)
+            elif message.type == Gst.MessageType.ELEMENT:
+                structure = message.get_structure()
+                if structure is not None:
+                    source_name = message.src.get_name() if message.src is not None else ""
+                    for handler in list(self._element_handlers):
+                        try:
+                            handler(source_name, structure.get_name(), structure)
+                        except Exception as e:
+                            logger.warning(f"Element message handler failed: {e}")
+            elif message.type == Gst.MessageType.STATE_CHANGED and message.src == self.pipeline:
+                _, new_state, _ = message.parse_state_changed()
+                if new_state == Gst.State.PLAYING:
+                    self.output.mark("playing")
+
+    def _finish(self, returncode: int) -> None:
+        if self._exited.is_set():
+            return
+        self.pipeline.set_state(Gst.State.NULL)
+        self.returncode = returncode
+        self._exited.set()
+        self.output.close()
+
+    def add_element_handler(self, handler: Callable[[str, str, object], None]) -> None:
+        """
+        Receive element messages from the bus thread.
+
+        Args:
+            handler: Called as handler(source element name, structure name, Gst.Structure)
+        """
+        self._element_handlers.append(handler)
+
+    def remove_element_handler(self, handler: Callable[[str, str, object], None]) -> None:
+        if handler in self._element_handlers:
+            self._element_handlers.remove(handler)
+
+    def set_property(self, name: str, value) -> None:
+        """
+        Change a live property (see LIVE_PROPERTIES) while PLAYING.
+
+        Args:
+            name: Key of LIVE_PROPERTIES (e.g. "bitrate", "host")
+            value: New value
+        """
+        element_name, prop = LIVE_PROPERTIES[name]
+        element = self.pipeline.get_by_name(element_name)
+        if element is None:
+            raise KeyError(f"pipeline has no element named {element_name}")
+        if name == "clients":
+            self._set_clients(element, value)
+            return
+        if prop == "caps" and isinstance(value, str):
+            value = Gst.Caps.from_string(value)
+        element.set_property(prop, value)
+
+    def _set_clients(self, sink, clients: List[Tuple[str, int]]) -> None:
+        """Add / remove multiudpsink clients (the "clients" property would reset all of them)."""
+        current = set(parse_clients(sink.get_property("clients")))
+        wanted = [(host, int(port)) for host, port in clients]
+        for host, port in current - set(wanted):
+            sink.emit("remove", host, port)
+        for host, port in wanted:
+            if (host, port) not in current:
+                sink.emit("add", host, port)
+
+    def client_stats(self) -> List[dict]:
+        """
+        Per-destination send statistics (fan-out mode).
+
+        Returns:
+            [{"host", "port", "bytes_sent", "packets_sent"}], empty if the sink is not a multiudpsink
+        """
+        sink = self.pipeline.get_by_name(SINK_NAME)
+        if sink is None or sink.find_property("clients") is None:
+            return []
+        stats = []
+        for host, port in parse_clients(sink.get_property("clients")):
+            structure = sink.emit("get-stats", host, port)
+            entry = {"host": host, "port": port, "bytes_sent": None, "packets_sent": None}
+            if structure is not None:
+                for field in ("bytes-sent", "packets-sent"):
+                    if structure.has_field(field):
+                        entry[field.replace("-", "_")] = structure.get_value(field)
+            stats.append(entry)
+        return stats
+
+    def get_property(self, name: str):
+        """Current value of a live property."""
+        element_name, prop = LIVE_PROPERTIES[name]
+        value = self.pipeline.get_by_name(element_name).get_property(prop)
+        if name == "clients":
+            return parse_clients(value)
+        return value.to_string() if prop == "caps" and value is not None else value
+
+    # subprocess.Popen compatible subset
+
+    def poll(self) -> Optional[int]:
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired("in-process pipeline", timeout)
+        return self.returncode
+
+    def terminate(self) -> None:
+        """Send EOS so nvarguscamerasrc releases the camera cleanly; the bus thread finishes."""
+        if self._exited.is_set():
+            return
+        self._stopping = True
+        self.pipeline.send_event(Gst.Event.new_eos())
+
+    def kill(self) -> None:
+        """Stop immediately (no EOS)."""
+        self._finish(EXIT_KILLED)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+MiniCars logging helpers for hot loops on the Jetson.
+
+- ``setup_logging`` installs a QueueHandler on the root logger so the calling
+  thread only enqueues records; formatting and the write to stdout/journald
+  happen on a QueueListener thread.
+- ``RateLimiter`` samples periodic/diagnostic messages per named channel so a
+  loop running at 100Hz logs at most a few lines per second, and the message
+  is only formatted when it is actually emitted (pass %-style args to the
+  logger instead of f-strings).
+
+Per-channel rates come from ``MINICARS_LOG_RATE_LIMITS``, e.g.::
+
+    MINICARS_LOG_RATE_LIMITS="bridge.uart=0.5,bridge.invalid=1,supervisor.status=0.05"
+
+Rates are messages per second; 0 silences the channel.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from typing import Dict, Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """
+    Parse a "name=rate,name=rate" specification.
+
+    Args:
+        spec: Rate limit specification (invalid entries are ignored)
+
+    Returns:
+        Dict of channel name to messages per second
+    """
+    limits = {}
+    for item in spec.split(','):
+        name, sep, value = item.partition('=')
+        if not sep:
+            continue
+        try:
+            limits[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return limits
+
+
+_RATE_LIMITS = parse_rate_limits(os.getenv("MINICARS_LOG_RATE_LIMITS", ""))
+
+
+class RateLimiter:
+    """
+    Token bucket deciding whether a log line on a channel may be emitted.
+
+    Args:
+        channel: Channel name used to look up MINICARS_LOG_RATE_LIMITS
+        default_rate: Messages per second when the channel is not configured
+        burst: Messages allowed back-to-back before limiting kicks in
+        delay_first: Start with an empty bucket (first message after 1/rate seconds)
+    """
+
+    def __init__(self, channel: str, default_rate: float, burst: float = 1.0, delay_first: bool = False):
+        self.channel = channel
+        self.rate = _RATE_LIMITS.get(channel, default_rate)
+        self.burst = burst
+        self._tokens = 0.0 if delay_first else burst
+        self._last = time.monotonic()
+        self.suppressed = 0  # Calls denied since the last allowed one
+
+    def allow(self) -> bool:
+        """
+        Check whether a message may be logged now.
+
+        Returns:
+            True if the caller should log (``suppressed`` then holds how many
+            calls were dropped since the previous allowed one)
+        """
+        if self.rate <= 0:
+            self.suppressed += 1
+            return False
+        now = time.monotonic()
+        tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if tokens < 1.0:
+            self._tokens = tokens
+            self.suppressed += 1
+            return False
+        self._tokens = tokens - 1.0
+        return True
+
+    def take_suppressed(self) -> int:
+        """Return and reset the suppressed-call count."""
+        count = self.suppressed
+        self.suppressed = 0
+        return count
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message on the calling thread. Our
+        # log arguments are plain numbers/strings, so the record can be
+        # handed over untouched and formatted by the listener instead.
+        return record
+
+
+def setup_logging(fmt: str, level: int = logging.INFO, datefmt: Optional[str] = None) -> None:
+    """
+    Configure root logging with queue-backed, off-thread output.
+
+    Args:
+        fmt: Log format string
+        level: Root log level
+        datefmt: Optional date format
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt, datefmt=datefmt))
+
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.handlers[:] = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+MiniCars per-frame timestamps for latency measurement (sender side).
+
+In measurement mode pad probes on the running in-process pipeline note,
+for every frame, when it was captured (buffer PTS on the pipeline clock),
+when it left the encoder and when its first RTP packet left the
+payloader. One line per frame goes to the control station over UDP:
+
+    "T,<rtp_ts>,<capture_us>,<encoded_us>,<sent_us>\\n"
+
+Times are wall-clock microseconds. The control station matches the line to
+the frame's packets by RTP timestamp
+(backend/minicars_backend/video/latency.py), so no bytes are added to the
+RTP stream itself and any receiver keeps working. The probes only read
+buffers; the encoder keeps PTS, so frames are matched by PTS on the
+way down.
+"""
+import logging
+import socket
+import struct
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import gst_pipeline
+
+logger = logging.getLogger(__name__)
+
+TIMING_PREFIX = "T"
+_RTP_HEADER = struct.Struct("!BBHII")
+_PENDING_FRAMES = 64  # Encoded frames waiting for their first packet
+
+
+def format_timing_line(rtp_ts: int, capture_us: int, encoded_us: int, sent_us: int) -> bytes:
+    """Timing line for one frame."""
+    return f"{TIMING_PREFIX},{rtp_ts},{capture_us},{encoded_us},{sent_us}\n".encode("ascii")
+
+
+class LatencyProbe:
+    """
+    Frame timestamp probes on a running in-process pipeline.
+
+    Args:
+        pipeline: Running pipeline (elements named as in gst_pipeline)
+        host: Control station address
+        port: UDP port of the control station's latency tracker
+    """
+
+    def __init__(self, pipeline: gst_pipeline.InProcessPipeline, host: str, port: int):
+        self.pipeline = pipeline
+        self.address = (host, port)
+        self.frames_sent = 0
+        self._encoded: "OrderedDict[int, int]" = OrderedDict()  # PTS -> clock time at encoder output
+        self._last_rtp_ts: Optional[int] = None
+        self._probes: List[Tuple[object, int]] = []
+        self._sock: Optional[socket.socket] = None
+
+    def attach(self) -> None:
+        Gst = gst_pipeline.Gst
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._add_probe(gst_pipeline.ENCODER_NAME, Gst.PadProbeType.BUFFER, self._on_encoded)
+        self._add_probe(gst_pipeline.PAYLOADER_NAME, Gst.PadProbeType.BUFFER | Gst.PadProbeType.BUFFER_LIST,
+                        self._on_payloaded)
+        logger.info(f"Latency probe: frame timings to {self.address[0]}:{self.address[1]}")
+
+    def _add_probe(self, element_name: str, mask, callback) -> None:
+        pad = self.pipeline.pipeline.get_by_name(element_name).get_static_pad("src")
+        self._probes.append((pad, pad.add_probe(mask, callback)))
+
+    def detach(self) -> None:
+        for pad, probe_id in self._probes:
+            pad.remove_probe(probe_id)
+        self._probes = []
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _clock_now(self) -> Optional[int]:
+        clock = self.pipeline.pipeline.get_clock()
+        return clock.get_time() if clock is not None else None
+
+    def _on_encoded(self, pad, info):
+        buffer = info.get_buffer()
+        now = self._clock_now()
+        if now is not None and buffer.pts != gst_pipeline.Gst.CLOCK_TIME_NONE:
+            self._encoded[buffer.pts] = now
+            while len(self._encoded) > _PENDING_FRAMES:
+                self._encoded.popitem(last=False)
+        return gst_pipeline.Gst.PadProbeReturn.OK
+
+    def _on_payloaded(self, pad, info):
+        Gst = gst_pipeline.Gst
+        buffer = info.get_buffer()
+        if buffer is None:
+            buffers = info.get_buffer_list()
+            buffer = buffers.get(0) if buffers is not None and buffers.length() else None
+        if buffer is not None:
+            self._send_timing(buffer)
+        return Gst.PadProbeReturn.OK
+
+    def _send_timing(self, buffer) -> None:
+        header = buffer.extract_dup(0, _RTP_HEADER.size)
+        if header is None or len(header) < _RTP_HEADER.size:
+            return
+        rtp_ts = _RTP_HEADER.unpack(header)[3]
+        if rtp_ts == self._last_rtp_ts:
+            return  # Not the first packet of the frame
+        self._last_rtp_ts = rtp_ts
+        encoded = self._encoded.pop(buffer.pts, None)
+        now = self._clock_now()
+        if encoded is None or now is None:
+            return
+        captured = self.pipeline.pipeline.get_base_time() + buffer.pts
+        # Pipeline clock (monotonic) -> wall clock, comparable with the control station's
+        to_wall_us = time.time() * 1e6 - now / 1000.0
+        line = format_timing_line(
+            rtp_ts, int(captured / 1000.0 + to_wall_us), int(encoded / 1000.0 + to_wall_us), int(now / 1000.0 + to_wall_us),
+        )
+        try:
+            self._sock.sendto(line, self.address)
+            self.frames_sent += 1
+        except OSError:
+            pass  # Measurement only: never disturb the stream
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+MiniCars pipeline backends: the hardware-specific part of the stream.
+
+Every backend produces the same named chain, so live changes, readiness
+detection, fan-out and recording work unchanged:
+
+    camera ! camcaps ! <convert> ! encoder ! h264parse ! [tee] ! pay ! sink
+
+- ``nvidia`` (Jetson): nvarguscamerasrc, NVMM caps, nvvidconv and
+  nvv4l2h264enc; capture errors are recovered by restarting nvargus-daemon
+- ``software`` (any Linux with gst-plugins-good/ugly): videotestsrc or a
+  v4l2 camera, videoconvert / videoflip and ``x264enc tune=zerolatency``,
+  so the supervisor, its restart behaviour and end-to-end latency can be
+  tested and benchmarked without a Jetson
+
+The backend is selected with "pipeline_backend" in stream_config.json.
+Values the supervisor uses (bitrate in bps, GOP length in frames) and the
+"encoder_tuning" section are converted to the encoder's own properties
+here; settings an encoder has no equivalent for are left out.
+"""
+import math
+import re
+from typing import Dict, FrozenSet, List, Optional
+
+import gst_pipeline
+from pipeline_output import FIRST_FRAME_PATTERN
+from stream_config import PIPELINE_BACKEND_NVIDIA, PIPELINE_BACKEND_SOFTWARE, EncoderTuning, StreamConfig
+
+# nvvidconv flip-method -> videoflip method (same orientation)
+_VIDEOFLIP_METHODS = {
+    0: "none", 1: "counterclockwise", 2: "rotate-180", 3: "clockwise",
+    4: "horizontal-flip", 5: "upper-right-diagonal", 6: "vertical-flip", 7: "upper-left-diagonal",
+}
+# encoder_tuning values -> nvv4l2h264enc enums
+_NV_CONTROL_RATES = {"vbr": 0, "cbr": 1}
+_NV_PRESET_LEVELS = {"ultrafast": 1, "fast": 2, "medium": 3, "slow": 4}
+# encoder_tuning preset_level -> x264enc speed-preset (shifted: x264 "fast" is far too slow for live video)
+_X264_SPEED_PRESETS = {"ultrafast": "ultrafast", "fast": "superfast", "medium": "veryfast", "slow": "faster"}
+
+
+def _property(name: str, value) -> str:
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    return f"{name}={value}"
+
+
+class PipelineBackend:
+    """
+    Hardware-specific elements of the pipeline.
+
+    Attributes:
+        name: Value of "pipeline_backend" in stream_config.json
+        uses_nvargus: Capture failures are recovered by restarting nvargus-daemon
+        live_properties: gst_pipeline.LIVE_PROPERTIES keys this backend can change while PLAYING
+        first_frame_pattern: ``gst-launch -v`` line marking the first camera frame
+    """
+
+    name = ""
+    uses_nvargus = False
+    live_properties: FrozenSet[str] = frozenset(gst_pipeline.LIVE_PROPERTIES)
+    first_frame_pattern: Optional["re.Pattern"] = None
+
+    def camera_caps(self, config: StreamConfig, framerate: Optional[int] = None) -> str:
+        """Caps negotiated with the camera (framerate defaults to the configured one)."""
+        raise NotImplementedError
+
+    def source_elements(self, config: StreamConfig) -> List[str]:
+        """Camera, caps filter and conversion up to the encoder input (without a trailing "!")."""
+        raise NotImplementedError
+
+    def encoder_elements(self, config: StreamConfig) -> List[str]:
+        """The encoder element named gst_pipeline.ENCODER_NAME with its properties."""
+        raise NotImplementedError
+
+    def to_element(self, name: str, value):
+        """Convert a live property value from supervisor units to the element's."""
+        return value
+
+    def from_element(self, name: str, value):
+        """Convert a live property value read from the element to supervisor units."""
+        return value
+
+    def _extra_encoder_properties(self, config: StreamConfig) -> List[str]:
+        return [_property(name, value) for name, value in sorted((config.encoder or {}).items())]
+
+
+def _tuning(config: StreamConfig) -> EncoderTuning:
+    return config.encoder_tuning or EncoderTuning()
+
+
+class NvidiaBackend(PipelineBackend):
+    """Jetson: Argus camera, NVMM buffers and the hardware encoder."""
+
+    name = PIPELINE_BACKEND_NVIDIA
+    uses_nvargus = True
+    first_frame_pattern = FIRST_FRAME_PATTERN
+
+    def camera_caps(self, config: StreamConfig, framerate: Optional[int] = None) -> str:
+        return (f"video/x-raw(memory:NVMM),width={config.resolution.width},height={config.resolution.height},"
+                f"framerate={framerate or config.framerate}/1")
+
+    def source_elements(self, config: StreamConfig) -> List[str]:
+        return [
+            config.camera_device, f"name={gst_pipeline.SOURCE_NAME}",
+            "!", "capsfilter", f"name={gst_pipeline.CAPS_NAME}", f'caps="{self.camera_caps(config)}"',
+            "!", "nvvidconv", f"flip-method={config.flip_method}",
+            "!", 'video/x-raw(memory:NVMM),format=NV12',
+        ]
+
+    def encoder_elements(self, config: StreamConfig) -> List[str]:
+        tuning = _tuning(config)
+        elements = ["nvv4l2h264enc", f"name={gst_pipeline.ENCODER_NAME}", "insert-sps-pps=true"]
+        if tuning.maxperf:
+            elements.append("maxperf-enable=1")
+        # Without a control_rate the pipeline keeps the value it has always used
+        elements += [
+            f"control-rate={_NV_CONTROL_RATES.get(tuning.control_rate, 2)}",
+            f"bitrate={config.bitrate}",
+            f"iframeinterval={config.iframe_interval}",
+        ]
+        if tuning.idr_interval is not None:
+            elements.append(f"idrinterval={tuning.idr_interval}")
+        if tuning.preset_level is not None:
+            elements.append(f"preset-level={_NV_PRESET_LEVELS[tuning.preset_level]}")
+        if tuning.insert_vui:
+            elements.append("insert-vui=true")
+        if tuning.slices is not None and tuning.slices > 1:
+            # Slice size in macroblocks (bit-packetization=false)
+            macroblocks = math.ceil(config.resolution.width / 16) * math.ceil(config.resolution.height / 16)
+            elements.append(f"slice-header-spacing={math.ceil(macroblocks / tuning.slices)}")
+        if tuning.intra_refresh is not None:
+            elements.append(f"slice-intrarefresh-interval={tuning.intra_refresh}")
+        return elements + self._extra_encoder_properties(config)
+
+
+class SoftwareBackend(PipelineBackend):
+    """
+    Plain Linux: test pattern or V4L2 camera and x264.
+
+    camera_device selects the source: "videotestsrc" (moving test pattern),
+    "v4l2src" (default camera), a device path ("/dev/video0") or any other
+    source element name.
+    """
+
+    name = PIPELINE_BACKEND_SOFTWARE
+    # x264enc reads its GOP length only when it (re)initializes
+    live_properties = frozenset(gst_pipeline.LIVE_PROPERTIES) - {"iframe_interval"}
+    # The caps filter after the source gets its caps once the first frame is negotiated
+    first_frame_pattern = re.compile(rf"GstCapsFilter:{gst_pipeline.CAPS_NAME}\.GstPad:src: caps = ")
+
+    def camera_caps(self, config: StreamConfig, framerate: Optional[int] = None) -> str:
+        return (f"video/x-raw,width={config.resolution.width},height={config.resolution.height},"
+                f"framerate={framerate or config.framerate}/1")
+
+    def _source(self, config: StreamConfig) -> List[str]:
+        device = config.camera_device
+        if device == "videotestsrc":
+            # Live source: frames are produced in real time like a camera's
+            return ["videotestsrc", f"name={gst_pipeline.SOURCE_NAME}", "is-live=true", "pattern=ball"]
+        if device.startswith("/dev/"):
+            return ["v4l2src", f"name={gst_pipeline.SOURCE_NAME}", f"device={device}"]
+        return [device, f"name={gst_pipeline.SOURCE_NAME}"]
+
+    def source_elements(self, config: StreamConfig) -> List[str]:
+        return self._source(config) + [
+            "!", "capsfilter", f"name={gst_pipeline.CAPS_NAME}", f'caps="{self.camera_caps(config)}"',
+            "!", "videoconvert",
+            "!", "videoflip", f"method={_VIDEOFLIP_METHODS[config.flip_method]}",
+            "!", "video/x-raw,format=I420",
+        ]
+
+    def encoder_elements(self, config: StreamConfig) -> List[str]:
+        # maxperf, idr_interval (every x264 keyframe is an IDR) and insert_vui
+        # (always written) have no x264enc equivalent
+        tuning = _tuning(config)
+        elements = [
+            "x264enc", f"name={gst_pipeline.ENCODER_NAME}",
+            "tune=zerolatency",
+            f"speed-preset={_X264_SPEED_PRESETS[tuning.preset_level or 'ultrafast']}",
+            f"bitrate={self.to_element('bitrate', config.bitrate)}",
+            # With intra refresh x264 spreads one refresh cycle over key-int-max frames
+            f"key-int-max={tuning.intra_refresh or config.iframe_interval}",
+        ]
+        if tuning.control_rate == "cbr":
+            # VBV buffer of one frame: every frame stays close to bitrate / framerate
+            elements.append(f"vbv-buf-capacity={math.ceil(1000 / config.framerate)}")
+        elif tuning.control_rate == "vbr":
+            elements.append("vbv-buf-capacity=1000")
+        if tuning.intra_refresh is not None:
+            elements.append("intra-refresh=true")
+        if tuning.slices is not None and tuning.slices > 1:
+            elements += ["sliced-threads=true", f'option-string="slices={tuning.slices}"']
+        return elements + self._extra_encoder_properties(config)
+
+    def to_element(self, name: str, value):
+        if name == "bitrate":
+            return max(1, int(value) // 1000)  # x264enc bitrate is in kbit/s
+        return value
+
+    def from_element(self, name: str, value):
+        if name == "bitrate":
+            return int(value) * 1000
+        return value
+
+
+BACKENDS: Dict[str, PipelineBackend] = {
+    backend.name: backend for backend in (NvidiaBackend(), SoftwareBackend())
+}
+
+
+def get_backend(name: str) -> PipelineBackend:
+    """
+    Backend registered under ``name``.
+
+    Raises:
+        KeyError: If no backend has that name
+    """
+    return BACKENDS[name]
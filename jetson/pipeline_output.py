@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+MiniCars GStreamer output draining and error classification.
+
+gst-launch-1.0 writes progress and errors to stdout/stderr. If nobody reads
+the pipes, the kernel pipe buffer (64 KiB) fills up and GStreamer blocks on
+write(), stalling the video. ``OutputDrainer`` reads both streams on
+background threads as they are produced, keeps the most recent lines in a
+bounded ring buffer for crash reports, and classifies known error signatures
+the moment they appear.
+"""
+import logging
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Error categories
+ERROR_CAPTURE = "capture"  # Argus / capture session failures (nvargus-daemon), V4L2 camera errors
+ERROR_ENCODER = "encoder"  # nvv4l2h264enc / NVENC / x264enc failures
+ERROR_UDPSINK = "udpsink"  # Network send failures
+ERROR_OTHER = "other"  # Any other GStreamer ERROR message
+
+# (category, pattern) checked in order; first match wins. Only error forms:
+# the Jetson prints "===== NVMEDIA: NVENC =====", NvMMLite and GST_ARGUS banners
+# on every normal start.
+ERROR_SIGNATURES: List[Tuple[str, "re.Pattern"]] = [
+    (ERROR_CAPTURE, re.compile(
+        r"Failed to create CaptureSession|CaptureSession.*(error|fail)|\(Argus\) Error|Argus.*[Ee]rror|"
+        r"No cameras available|nvarguscamerasrc.*(error|fail)|Error generated\..*nvarguscamerasrc|"
+        r"Cannot identify device|Could not open device|v4l2src.*(error|fail)",
+        re.IGNORECASE,
+    )),
+    (ERROR_ENCODER, re.compile(
+        r"nvv4l2h264enc.*(error|fail)|NvV4l2Element.*(error|fail)|NVENC.*(error|fail)|"
+        r"Failed to (open|create|allocate).*encoder|"
+        r"Could not (get|set) .*encoder|v4l2.*(enc|encoder).*error|x264enc.*(error|fail)",
+        re.IGNORECASE,
+    )),
+    (ERROR_UDPSINK, re.compile(
+        r"udpsink.*(error|could not)|Error sending UDP packets|Could not send|"
+        r"Network is unreachable|No route to host",
+        re.IGNORECASE,
+    )),
+    (ERROR_OTHER, re.compile(r"^ERROR:|ERROR: from element|ERROR: pipeline", re.IGNORECASE)),
+]
+
+# ERROR-level messages: gst-launch prints bus errors as "ERROR: from element ..."
+# / "ERROR: pipeline ..." (in-process pipelines feed bus errors the same way).
+# Other classified lines (warnings, Argus diagnostics) don't end a start.
+FATAL_PATTERN = re.compile(r"^ERROR:")
+
+# Readiness markers in ``gst-launch-1.0 -v`` output
+PLAYING_PATTERN = re.compile(r"Setting pipeline to PLAYING")
+# Argus consumer attached to the running capture: frames are being produced
+FIRST_FRAME_PATTERN = re.compile(r"CONSUMER: Producer has connected")
+# rtph264pay only sets its src caps / notifies timestamp and seqnum once the
+# first encoded buffer has been payloaded: RTP packets are flowing. The type
+# is GstRtpH264Pay; matched case-insensitively like the error signatures.
+FIRST_PACKET_PATTERN = re.compile(
+    r"GstRtpH264Pay:[^:]*(\.GstPad:src: caps = |: (timestamp|seqnum) = )", re.IGNORECASE
+)
+
+
+def classify_line(line: str) -> Optional[str]:
+    """
+    Classify a GStreamer output line.
+
+    Args:
+        line: One line of gst-launch output
+
+    Returns:
+        Error category (ERROR_*) or None if the line is not an error
+    """
+    for category, pattern in ERROR_SIGNATURES:
+        if pattern.search(line):
+            return category
+    return None
+
+
+class OutputDrainer:
+    """
+    Continuously drain a child's stdout/stderr into a ring buffer.
+
+    Without a child (``proc=None``) nothing is read; lines are pushed with
+    feed() and markers set with mark() instead (in-process pipelines turning
+    bus messages into lines), and close() marks the end of the output.
+
+    Args:
+        proc: Child started with stdout=PIPE and stderr=PIPE (text mode), or None
+        max_lines: Number of recent lines kept
+        on_error: Called as on_error(category, stream, line) for each classified line
+        on_line: Called as on_line(stream, line) for every line (readiness probes)
+        markers: Named patterns; the first matching line records a marker
+        on_marker: Called as on_marker(name, monotonic_time) when a marker is first seen
+    """
+
+    def __init__(self, proc: Optional[subprocess.Popen], max_lines: int = 200,
+                 on_error: Optional[Callable[[str, str, str], None]] = None,
+                 on_line: Optional[Callable[[str, str], None]] = None,
+                 markers: Optional[Dict[str, "re.Pattern"]] = None,
+                 on_marker: Optional[Callable[[str, float], None]] = None):
+        self._lines = deque(maxlen=max_lines)  # (time, stream, line)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._on_error = on_error
+        self._on_line = on_line
+        self._markers = dict(markers or {})
+        self._on_marker = on_marker
+        self.marker_times: Dict[str, float] = {}  # name -> time.monotonic() when seen
+        self.error_counts: Dict[str, int] = {}
+        self.first_error: Optional[Tuple[str, str]] = None  # (category, line)
+        self.last_error: Optional[Tuple[str, str]] = None
+        self.fatal_error: Optional[str] = None  # First ERROR-level line
+        self.total_lines = 0
+        self._eof_count = 0
+        self._closed = False
+        self._threads = []
+        streams = (("stdout", proc.stdout), ("stderr", proc.stderr)) if proc is not None else ()
+        for stream_name, stream in streams:
+            if stream is None:
+                continue
+            thread = threading.Thread(
+                target=self._drain, args=(stream_name, stream),
+                name=f"gst-{stream_name}", daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _drain(self, stream_name: str, stream) -> None:
+        try:
+            for raw in iter(stream.readline, ""):
+                line = raw.rstrip()
+                if line:
+                    self.feed(stream_name, line)
+        except (ValueError, OSError):
+            pass  # Pipe closed underneath us
+        finally:
+            try:
+                stream.close()
+            except OSError:
+                pass
+            with self._lock:
+                self._eof_count += 1
+                if self._eof_count >= len(self._threads):
+                    self._closed = True
+                self._changed.notify_all()
+
+    def feed(self, stream_name: str, line: str) -> None:
+        """
+        Record one output line: buffer it, classify it and check the markers.
+
+        Args:
+            stream_name: Origin shown in tail() ("stdout", "stderr", "bus", ...)
+            line: Line without the trailing newline
+        """
+        category = classify_line(line)
+        fatal = FATAL_PATTERN.search(line) is not None
+        seen = [name for name, pattern in self._markers.items()
+                if name not in self.marker_times and pattern.search(line)]
+        now = time.monotonic()
+        with self._lock:
+            self._lines.append((time.time(), stream_name, line))
+            self.total_lines += 1
+            if category is not None:
+                self.error_counts[category] = self.error_counts.get(category, 0) + 1
+                self.last_error = (category, line)
+                if self.first_error is None:
+                    self.first_error = (category, line)
+            if fatal and self.fatal_error is None:
+                self.fatal_error = line
+            seen = [name for name in seen if name not in self.marker_times]
+            for name in seen:
+                self.marker_times[name] = now
+            if seen or fatal:
+                self._changed.notify_all()
+        if self._on_line is not None:
+            self._on_line(stream_name, line)
+        if category is not None and self._on_error is not None:
+            self._on_error(category, stream_name, line)
+        if self._on_marker is not None:
+            for name in seen:
+                self._on_marker(name, now)
+
+    def mark(self, name: str) -> None:
+        """Record a marker directly (first call wins)."""
+        now = time.monotonic()
+        with self._lock:
+            if name in self.marker_times:
+                return
+            self.marker_times[name] = now
+            self._changed.notify_all()
+        if self._on_marker is not None:
+            self._on_marker(name, now)
+
+    def close(self) -> None:
+        """Mark the output as finished (wakes wait_for)."""
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+
+    def join(self, timeout: float = 1.0) -> None:
+        """Wait for both readers to hit EOF (call after the child exited)."""
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def wait_for(self, marker: Optional[str] = None, timeout: float = 1.0,
+                 stop_on_fatal: bool = False) -> bool:
+        """
+        Block until a marker is seen, a fatal error shows up or the output ends.
+
+        Args:
+            marker: Marker name to wait for (None = only fatal errors / EOF)
+            timeout: Maximum wait in seconds
+            stop_on_fatal: Return early on an ERROR-level line (FATAL_PATTERN);
+                other classified lines are only counted
+
+        Returns:
+            True if the marker was seen
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                if marker is not None and marker in self.marker_times:
+                    return True
+                if stop_on_fatal and self.fatal_error is not None:
+                    return False
+                if self._closed:
+                    return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+
+    def tail(self, count: int = 40) -> List[str]:
+        """
+        Most recent lines, oldest first.
+
+        Args:
+            count: Maximum number of lines
+
+        Returns:
+            Lines formatted as "[stream] text"
+        """
+        with self._lock:
+            lines = list(self._lines)[-count:]
+        return [f"[{stream}] {line}" for _, stream, line in lines]
+
+    def primary_error(self) -> Optional[str]:
+        """
+        Category that best explains a failure.
+
+        The first classified error is usually the cause; later ones are
+        often fallout (e.g. "Internal data stream error" after Argus failed).
+
+        Returns:
+            Error category or None if nothing was classified
+        """
+        with self._lock:
+            if self.first_error is None:
+                return None
+            return self.first_error[0]
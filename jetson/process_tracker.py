@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+MiniCars process tracking for the stream supervisor without subprocesses.
+
+- ``PidFile`` enforces a single supervisor instance with an flock()ed pidfile
+  and records the PID of the pipeline child, so a supervisor restarted after
+  a crash can find the orphan it left behind directly.
+- ``find_processes`` scans /proc for orphans by command line. It replaces
+  ``pgrep -f`` (a fork + exec per check) and is only meant for startup.
+"""
+import errno
+import fcntl
+import logging
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def read_cmdline(pid: int, proc_root: str = "/proc") -> Optional[str]:
+    """
+    Read a process command line.
+
+    Args:
+        pid: Process ID
+        proc_root: procfs mount point (overridable for tests)
+
+    Returns:
+        Arguments joined with spaces, or None if the process is gone
+    """
+    try:
+        with open(os.path.join(proc_root, str(pid), "cmdline"), "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    return raw.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", errors="replace")
+
+
+def find_processes(pattern: str, proc_root: str = "/proc", exclude: Iterable[int] = ()) -> List[int]:
+    """
+    Find processes whose command line matches a regex (like ``pgrep -f``).
+
+    Args:
+        pattern: Regular expression searched in the command line
+        proc_root: procfs mount point
+        exclude: PIDs to leave out (the caller itself is always excluded)
+
+    Returns:
+        Matching PIDs in ascending order
+    """
+    regex = re.compile(pattern)
+    skip = set(exclude) | {os.getpid()}
+    pids = []
+    try:
+        entries = os.listdir(proc_root)
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        pid = int(entry)
+        if pid in skip:
+            continue
+        cmdline = read_cmdline(pid, proc_root)
+        if cmdline and regex.search(cmdline):
+            pids.append(pid)
+    return sorted(pids)
+
+
+class PidFile:
+    """
+    Exclusive pidfile: "<supervisor pid>\\n<pipeline pid or 0>\\n".
+
+    The flock() is released by the kernel when the process dies, so a stale
+    file left by a crash never blocks the next start.
+
+    Args:
+        path: Pidfile location
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def read(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Read the recorded PIDs (without locking).
+
+        Returns:
+            (supervisor_pid, pipeline_pid); None for missing/invalid entries
+        """
+        try:
+            with open(self.path, "r") as f:
+                fields = f.read().split()
+        except OSError:
+            return None, None
+        values = []
+        for index in range(2):
+            try:
+                value = int(fields[index])
+            except (IndexError, ValueError):
+                value = 0
+            values.append(value or None)
+        return values[0], values[1]
+
+    def acquire(self) -> bool:
+        """
+        Take the lock and record our PID.
+
+        Returns:
+            True if acquired, False if another live supervisor holds it
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            os.close(fd)
+            if e.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+        self._fd = fd
+        return True
+
+    def previous_pipeline_pid(self) -> Optional[int]:
+        """Pipeline PID recorded by the previous holder (call after acquire())."""
+        return self.read()[1]
+
+    def update(self, pipeline_pid: Optional[int] = None) -> None:
+        """
+        Rewrite the file with our PID and the current pipeline PID.
+
+        Args:
+            pipeline_pid: PID of the running pipeline child (None if stopped)
+        """
+        if self._fd is None:
+            return
+        data = f"{os.getpid()}\n{pipeline_pid or 0}\n".encode("ascii")
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, data, 0)
+
+    def release(self) -> None:
+        """Remove the pidfile and drop the lock."""
+        if self._fd is None:
+            return
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        os.close(self._fd)
+        self._fd = None
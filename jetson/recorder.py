@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+MiniCars on-car recording of the encoded stream.
+
+The H.264 produced for streaming is also written to disk, so recording
+costs no second encode:
+
+    encoder ! h264parse ! tee ! queue ! rtph264pay ! udpsink     (live)
+                             tee ! queue leaky ! h264parse ! splitmuxsink
+
+- the recording queue is leaky: a slow SD card drops recording buffers
+  (counted) instead of stalling the live stream
+- splitmuxsink cuts time-based segments (MKV or MP4) on keyframes
+- ``SegmentRing`` deletes the oldest segments when the directory exceeds
+  its disk quota
+- in-process pipelines attach and detach ``RecordingBranch`` while PLAYING
+  (tee request pad, EOS into the branch only), so starting or stopping a
+  recording never interrupts the live stream; with gst-launch the branch is
+  part of the static pipeline description
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional, Tuple
+
+import gst_pipeline
+
+logger = logging.getLogger(__name__)
+
+TEE_NAME = "enctee"
+QUEUE_NAME = "recqueue"
+SINK_NAME = "recsink"
+SEGMENT_PREFIX = "rec-"
+MUXERS = {"mkv": "matroskamux", "mp4": "mp4mux"}
+_QUEUE_MAX_TIME_NS = 2 * 1000000000  # Recording backlog kept before dropping
+
+
+def segment_location(directory: str, fmt: str, started: Optional[float] = None) -> str:
+    """splitmuxsink location pattern for a recording started at ``started``."""
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started or time.time()))
+    return os.path.join(directory, f"{SEGMENT_PREFIX}{stamp}-%05d.{fmt}")
+
+
+def branch_elements(directory: str, fmt: str, segment_seconds: int, started: Optional[float] = None) -> list:
+    """
+    Recording branch (starting at its queue) as gst-launch tokens.
+
+    Args:
+        directory: Output directory
+        fmt: "mkv" or "mp4"
+        segment_seconds: Segment length
+        started: Recording start time (for file names)
+    """
+    return [
+        "queue", f"name={QUEUE_NAME}", "leaky=downstream",
+        "max-size-buffers=0", "max-size-bytes=0", f"max-size-time={_QUEUE_MAX_TIME_NS}",
+        "!", "h264parse",
+        "!", "splitmuxsink", f"name={SINK_NAME}", f"muxer={MUXERS[fmt]}",
+        f"max-size-time={segment_seconds * 1000000000}",
+        f"location={segment_location(directory, fmt, started)}",
+    ]
+
+
+class SegmentRing:
+    """
+    Disk quota for recording segments: oldest segments are deleted first.
+
+    Args:
+        directory: Recording directory
+        quota_bytes: Maximum total size of the segments
+    """
+
+    def __init__(self, directory: str, quota_bytes: int):
+        self.directory = Path(directory)
+        self.quota_bytes = quota_bytes
+        self.deleted = 0
+        self._last_total: Optional[int] = None
+        self._last_scan = 0.0
+        self._write_kbps: Optional[float] = None
+
+    def segments(self) -> List[Tuple[str, os.stat_result]]:
+        """[(path, stat)] of the segment files, oldest first."""
+        found = []
+        try:
+            entries = list(os.scandir(str(self.directory)))
+        except OSError:
+            return []
+        for entry in entries:
+            if entry.name.startswith(SEGMENT_PREFIX) and entry.is_file():
+                try:
+                    found.append((entry.path, entry.stat()))
+                except OSError:
+                    continue
+        found.sort(key=lambda item: item[1].st_mtime)
+        return found
+
+    def enforce(self) -> List[str]:
+        """
+        Delete the oldest segments until the total fits the quota.
+
+        The newest segment (the one being written) is never deleted.
+
+        Returns:
+            Deleted paths
+        """
+        segments = self.segments()
+        total = sum(st.st_size for _, st in segments)
+        deleted = []
+        for path, st in segments[:-1]:
+            if total <= self.quota_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError as e:
+                logger.warning(f"Could not delete old recording {path}: {e}")
+                continue
+            total -= st.st_size
+            deleted.append(path)
+        if deleted:
+            self.deleted += len(deleted)
+            logger.info(f"Recording quota: deleted {len(deleted)} old segment(s), "
+                        f"{total / 1e6:.0f}/{self.quota_bytes / 1e6:.0f} MB used")
+        return deleted
+
+    def stats(self) -> dict:
+        """Directory usage and write rate since the previous call."""
+        segments = self.segments()
+        total = sum(st.st_size for _, st in segments)
+        now = time.monotonic()
+        if self._last_total is not None and now > self._last_scan and total >= self._last_total:
+            self._write_kbps = round((total - self._last_total) * 8 / (now - self._last_scan) / 1000.0, 1)
+        self._last_total, self._last_scan = total, now
+        return {
+            "directory": str(self.directory),
+            "segments": len(segments),
+            "bytes": total,
+            "quota_bytes": self.quota_bytes,
+            "deleted_segments": self.deleted,
+            "newest": os.path.basename(segments[-1][0]) if segments else None,
+            "write_kbps": self._write_kbps,
+        }
+
+
+class RecordingBranch:
+    """
+    Recording branch attached to a running in-process pipeline.
+
+    Args:
+        pipeline: Running pipeline with a tee named TEE_NAME after the encoder
+        directory: Output directory
+        fmt: "mkv" or "mp4"
+        segment_seconds: Segment length
+        history: Closed segments kept for statistics
+    """
+
+    def __init__(self, pipeline: gst_pipeline.InProcessPipeline, directory: str, fmt: str = "mkv",
+                 segment_seconds: int = 60, history: int = 20):
+        self.pipeline = pipeline
+        self.directory = directory
+        self.fmt = fmt
+        self.segment_seconds = segment_seconds
+        self.started_at: Optional[float] = None
+        self.buffers_in = 0
+        self.buffers_out = 0
+        self.skipped_until_keyframe = 0
+        self.closed_segments: Deque[dict] = deque(maxlen=history)
+        self._open_segments = {}  # location -> monotonic open time
+        self._bin = None
+        self._queue = None
+        self._tee_pad = None
+        self._keyframe_seen = False
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self._bin is not None
+
+    def start(self) -> None:
+        """Attach the branch; the first segment starts at the next keyframe."""
+        Gst = gst_pipeline.Gst
+        os.makedirs(self.directory, exist_ok=True)
+        self.started_at = time.time()
+        description = " ".join(branch_elements(self.directory, self.fmt, self.segment_seconds, self.started_at))
+        self._bin = Gst.parse_bin_from_description(description, True)
+        self._queue = self._bin.get_by_name(QUEUE_NAME)
+        self._queue.get_static_pad("sink").add_probe(Gst.PadProbeType.BUFFER, self._on_buffer_in)
+        self._queue.get_static_pad("src").add_probe(Gst.PadProbeType.BUFFER, self._on_buffer_out)
+        self.pipeline.add_element_handler(self._on_element_message)
+
+        tee = self.pipeline.pipeline.get_by_name(TEE_NAME)
+        if tee is None:
+            raise RuntimeError(f"pipeline has no element named {TEE_NAME}")
+        self.pipeline.pipeline.add(self._bin)
+        self._bin.sync_state_with_parent()
+        self._tee_pad = tee.get_request_pad("src_%u")
+        sink_pad = self._bin.get_static_pad("sink")
+        self._tee_pad.link(sink_pad)
+        # Ask the encoder for a keyframe instead of waiting for the next GOP
+        sink_pad.push_event(Gst.Event.new_custom(
+            Gst.EventType.CUSTOM_UPSTREAM, Gst.Structure.new_from_string("GstForceKeyUnit, all-headers=(boolean)true")))
+        logger.info(f"Recording started: {segment_location(self.directory, self.fmt, self.started_at)}")
+
+    def stop(self, timeout: float = 1.5) -> None:
+        """
+        Detach the branch: EOS finalizes the current segment (MP4 index),
+        the live branch keeps flowing.
+
+        Args:
+            timeout: Seconds to wait for the last segment to be closed
+        """
+        if self._bin is None:
+            return
+        Gst = gst_pipeline.Gst
+        sink_pad = self._bin.get_static_pad("sink")
+        tee_pad = self._tee_pad
+
+        def on_blocked(pad, info):
+            pad.unlink(sink_pad)
+            sink_pad.send_event(Gst.Event.new_eos())
+            return Gst.PadProbeReturn.REMOVE
+
+        self._closed.clear()
+        tee_pad.add_probe(Gst.PadProbeType.BLOCK_DOWNSTREAM, on_blocked)
+        if not self._closed.wait(timeout):
+            logger.warning(f"Recording: last segment not closed after {timeout:.1f}s, removing branch anyway")
+            if tee_pad.is_linked():
+                tee_pad.unlink(sink_pad)
+        tee = self.pipeline.pipeline.get_by_name(TEE_NAME)
+        tee.release_request_pad(tee_pad)
+        self._bin.set_state(Gst.State.NULL)
+        self.pipeline.pipeline.remove(self._bin)
+        self.pipeline.remove_element_handler(self._on_element_message)
+        self._bin = None
+        self._tee_pad = None
+        logger.info(f"Recording stopped ({self.stats()['dropped_buffers']} buffers dropped)")
+
+    def _on_buffer_in(self, pad, info):
+        with self._lock:
+            self.buffers_in += 1
+        return gst_pipeline.Gst.PadProbeReturn.OK
+
+    def _on_buffer_out(self, pad, info):
+        Gst = gst_pipeline.Gst
+        with self._lock:
+            if not self._keyframe_seen:
+                if info.get_buffer().has_flags(Gst.BufferFlags.DELTA_UNIT):
+                    self.skipped_until_keyframe += 1
+                    return Gst.PadProbeReturn.DROP  # Segments must start on a keyframe
+                self._keyframe_seen = True
+            self.buffers_out += 1
+        return Gst.PadProbeReturn.OK
+
+    def _on_element_message(self, source: str, name: str, structure) -> None:
+        if source != SINK_NAME:
+            return
+        location = structure.get_string("location") if structure.has_field("location") else None
+        if name == "splitmuxsink-fragment-opened":
+            self._open_segments[location] = time.monotonic()
+        elif name == "splitmuxsink-fragment-closed":
+            opened = self._open_segments.pop(location, None)
+            try:
+                size = os.path.getsize(location)
+            except (OSError, TypeError):
+                size = None
+            seconds = time.monotonic() - opened if opened is not None else None
+            segment = {
+                "file": os.path.basename(location or ""),
+                "bytes": size,
+                "seconds": round(seconds, 1) if seconds is not None else None,
+                "write_kbps": round(size * 8 / seconds / 1000.0, 1) if size and seconds else None,
+            }
+            self.closed_segments.append(segment)
+            logger.info(f"Recording segment closed: {segment}")
+            self._closed.set()
+
+    def stats(self) -> dict:
+        """Branch counters; dropped buffers are those the leaky queue threw away."""
+        level = self._queue.get_property("current-level-buffers") if self._bin is not None else 0
+        with self._lock:
+            dropped = self.buffers_in - self.buffers_out - self.skipped_until_keyframe - level
+            return {
+                "started_at": self.started_at,
+                "buffers_in": self.buffers_in,
+                "buffers_written": self.buffers_out,
+                "dropped_buffers": max(0, dropped),
+                "skipped_until_keyframe": self.skipped_until_keyframe,
+                "queued_buffers": level,
+                "recent_segments": list(self.closed_segments),
+            }
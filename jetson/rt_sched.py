@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+MiniCars real-time scheduling helpers for the Jetson bridge.
+
+Opt-in via environment variables (see minicars-joystick-rt.conf):
+
+    MINICARS_RT_MODE=off|nice|fifo   Scheduling request for bridge threads (default: off)
+    MINICARS_RT_PRIORITY=50          SCHED_FIFO priority (1-99) when mode is "fifo"
+    MINICARS_RT_NICE=-10             Nice value when mode is "nice" (or fifo fallback)
+    MINICARS_CPU_NET=3               CPU list for the network (TCP receive + UART write) thread
+    MINICARS_CPU_UART=3              CPU list for the UART reader thread
+    MINICARS_CPU_WATCHDOG=2          CPU list for the watchdog thread
+
+CPU lists accept "3", "2,3" or "2-3". Each thread calls ``apply_thread_policy``
+for its role: on Linux, ``sched_setaffinity(0)``, ``sched_setscheduler(0)`` and
+``setpriority(PRIO_PROCESS, 0)`` apply to the calling thread only.
+
+Without privileges (no CAP_SYS_NICE / RLIMIT_RTPRIO) "fifo" falls back to
+"nice", and "nice" falls back to the default policy; the policy actually
+obtained is read back and reported.
+"""
+import array
+import logging
+import os
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+RT_MODE = os.getenv("MINICARS_RT_MODE", "off").lower()
+RT_PRIORITY = int(os.getenv("MINICARS_RT_PRIORITY", "50"))
+RT_NICE = int(os.getenv("MINICARS_RT_NICE", "-10"))
+VALID_RT_MODES = ("off", "nice", "fifo")
+
+_POLICY_NAMES = {
+    getattr(os, "SCHED_OTHER", 0): "SCHED_OTHER",
+    getattr(os, "SCHED_FIFO", 1): "SCHED_FIFO",
+    getattr(os, "SCHED_RR", 2): "SCHED_RR",
+}
+
+
+def parse_cpu_list(spec: str) -> Set[int]:
+    """
+    Parse a CPU list like "3", "2,3" or "0-1,3".
+
+    Args:
+        spec: CPU list specification
+
+    Returns:
+        Set of CPU indexes (empty if spec is empty)
+
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    cpus = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def _cpus_for_role(role: str) -> Set[int]:
+    spec = os.getenv(f"MINICARS_CPU_{role.upper()}", "")
+    try:
+        return parse_cpu_list(spec)
+    except ValueError:
+        logger.warning(f"Ignoring invalid MINICARS_CPU_{role.upper()}={spec!r}")
+        return set()
+
+
+def describe_current_thread() -> str:
+    """
+    Describe the scheduling the calling thread actually has.
+
+    Returns:
+        E.g. "SCHED_FIFO prio 50, cpus [3]" or "SCHED_OTHER nice -10, cpus [0, 1, 2, 3]"
+    """
+    try:
+        policy = os.sched_getscheduler(0)
+        name = _POLICY_NAMES.get(policy, str(policy))
+        if policy in (getattr(os, "SCHED_FIFO", -1), getattr(os, "SCHED_RR", -1)):
+            detail = f"{name} prio {os.sched_getparam(0).sched_priority}"
+        else:
+            detail = f"{name} nice {os.getpriority(os.PRIO_PROCESS, 0)}"
+        return f"{detail}, cpus {sorted(os.sched_getaffinity(0))}"
+    except (AttributeError, OSError) as e:
+        return f"unknown ({e})"
+
+
+def apply_thread_policy(role: str) -> str:
+    """
+    Apply the configured affinity and priority to the calling thread.
+
+    Args:
+        role: Thread role ("net", "uart" or "watchdog")
+
+    Returns:
+        Description of the scheduling actually obtained
+    """
+    notes = []
+
+    cpus = _cpus_for_role(role)
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (AttributeError, OSError, ValueError) as e:
+            notes.append(f"affinity {sorted(cpus)} failed: {e}")
+
+    mode = RT_MODE
+    if mode == "fifo":
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+        except (AttributeError, OSError) as e:
+            notes.append(f"SCHED_FIFO denied ({e}), falling back to nice")
+            mode = "nice"
+    if mode == "nice":
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, RT_NICE)
+        except (AttributeError, OSError) as e:
+            notes.append(f"nice {RT_NICE} denied ({e})")
+
+    actual = describe_current_thread()
+    if notes:
+        logger.warning(f"Scheduling [{role}]: {actual} ({'; '.join(notes)})")
+    elif mode != "off" or cpus:
+        logger.info(f"Scheduling [{role}]: {actual}")
+    else:
+        logger.debug(f"Scheduling [{role}]: {actual}")
+    return actual
+
+
+class JitterStats:
+    """
+    Fixed-size sample window of timing deviations (milliseconds).
+
+    Used to report periodic-loop wake-up jitter before/after enabling
+    RT mode. Samples are kept in a preallocated array; ``summary`` sorts a
+    copy, so call it at reporting cadence, not per sample.
+
+    Args:
+        size: Number of most recent samples kept
+    """
+
+    def __init__(self, size: int = 3000):
+        self._samples = array.array('d', bytes(8 * size))
+        self._size = size
+        self._count = 0
+
+    def add(self, value_ms: float) -> None:
+        """Record one sample."""
+        self._samples[self._count % self._size] = value_ms
+        self._count += 1
+
+    def summary(self) -> Optional[str]:
+        """
+        Summarize the current window.
+
+        Returns:
+            "n=..., mean=...ms, p99=...ms, max=...ms" or None if empty
+        """
+        n = min(self._count, self._size)
+        if n == 0:
+            return None
+        values = sorted(self._samples[:n])
+        mean = sum(values) / n
+        p99 = values[min(n - 1, int(n * 0.99))]
+        return f"n={n}, mean={mean:.2f}ms, p99={p99:.2f}ms, max={values[-1]:.2f}ms"
@@ -4,11 +4,13 @@ MiniCars Stream Configuration Loader.
 
 Loads and validates streaming configuration from stream_config.json.
 """
+import ipaddress
 import json
 import logging
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 # Verify Python version (need at least 3.6)
 if sys.version_info < (3, 6):
@@ -17,6 +19,21 @@ if sys.version_info < (3, 6):
 
 logger = logging.getLogger(__name__)
 
+# Pipeline backends (pipeline_backends): Jetson hardware or software on plain Linux
+PIPELINE_BACKEND_NVIDIA = "nvidia"
+PIPELINE_BACKEND_SOFTWARE = "software"
+PIPELINE_BACKENDS = (PIPELINE_BACKEND_NVIDIA, PIPELINE_BACKEND_SOFTWARE)
+
+# Encoder tuning values (translated to each encoder's properties by pipeline_backends)
+CONTROL_RATES = ("cbr", "vbr")
+PRESET_LEVELS = ("ultrafast", "fast", "medium", "slow")
+
+# Packet loss recovery (loss_recovery.mode): RTP retransmission on NACK or ULP FEC
+LOSS_RECOVERY_NONE = "none"
+LOSS_RECOVERY_RTX = "rtx"
+LOSS_RECOVERY_FEC = "fec"
+LOSS_RECOVERY_MODES = (LOSS_RECOVERY_NONE, LOSS_RECOVERY_RTX, LOSS_RECOVERY_FEC)
+
 # Python 3.7+ has dataclasses, but Jetson may have Python 3.6
 # Use a fallback for compatibility
 try:
@@ -40,6 +57,195 @@ class ResolutionConfig:
         return f"ResolutionConfig(width={self.width}, height={self.height})"
 
 
+class AdaptiveBitrateConfig:
+    """
+    Closed-loop bitrate control from receiver feedback (bitrate_controller).
+    
+    Attributes:
+        enabled: Adjust the encoder bitrate from receiver feedback
+        min_bitrate: Lower bound (bps)
+        max_bitrate: Upper bound (bps)
+        adapt_framerate: Also lower the framerate when already at min_bitrate
+        min_framerate: Lower framerate bound (fps)
+        feedback_port: UDP port receiving the control station's QoS reports
+    """
+    def __init__(self, enabled: bool = False, min_bitrate: int = 1500000, max_bitrate: int = 8000000,
+                 adapt_framerate: bool = False, min_framerate: int = 15, feedback_port: int = 5010):
+        self.enabled = enabled
+        self.min_bitrate = min_bitrate
+        self.max_bitrate = max_bitrate
+        self.adapt_framerate = adapt_framerate
+        self.min_framerate = min_framerate
+        self.feedback_port = feedback_port
+    
+    def __repr__(self):
+        return (f"AdaptiveBitrateConfig(enabled={self.enabled}, min_bitrate={self.min_bitrate}, "
+                f"max_bitrate={self.max_bitrate}, adapt_framerate={self.adapt_framerate}, "
+                f"min_framerate={self.min_framerate}, feedback_port={self.feedback_port})")
+
+
+EncoderValue = Union[int, bool, str]
+
+
+class EncoderTuning:
+    """
+    Latency-related encoder settings, independent of the encoder element.
+    
+    Attributes:
+        control_rate: "cbr", "vbr" or None (backend default)
+        maxperf: Keep the hardware encoder at maximum clocks
+        idr_interval: Frames between IDR frames (None = encoder default)
+        preset_level: "ultrafast", "fast", "medium" or "slow" (None = backend default)
+        insert_vui: Write VUI (timing, color) in the SPS
+        slices: Slices per frame (None = one slice per frame)
+        intra_refresh: Frames of a rolling intra refresh cycle, instead of
+            periodic I-frames (None = off)
+    """
+    FIELDS = ("control_rate", "maxperf", "idr_interval", "preset_level", "insert_vui", "slices", "intra_refresh")
+    
+    def __init__(self, control_rate: Optional[str] = None, maxperf: bool = True, idr_interval: Optional[int] = None,
+                 preset_level: Optional[str] = None, insert_vui: bool = False, slices: Optional[int] = None,
+                 intra_refresh: Optional[int] = None):
+        self.control_rate = control_rate
+        self.maxperf = maxperf
+        self.idr_interval = idr_interval
+        self.preset_level = preset_level
+        self.insert_vui = insert_vui
+        self.slices = slices
+        self.intra_refresh = intra_refresh
+    
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    def __eq__(self, other):
+        return isinstance(other, EncoderTuning) and self.as_dict() == other.as_dict()
+    
+    def __repr__(self):
+        return "EncoderTuning(" + ", ".join(f"{key}={value}" for key, value in self.as_dict().items()) + ")"
+
+
+class RecordingConfig:
+    """
+    On-car recording of the encoded stream (recorder).
+    
+    Attributes:
+        enabled: Record whenever the pipeline runs (can also be toggled through the control API)
+        directory: Output directory (relative paths are relative to jetson/)
+        format: "mkv" (survives power loss) or "mp4"
+        segment_seconds: Length of each file
+        quota_mb: Disk space for recordings; the oldest segments are deleted beyond it
+    """
+    def __init__(self, enabled: bool = False, directory: str = "recordings", format: str = "mkv",
+                 segment_seconds: int = 60, quota_mb: int = 4096):
+        self.enabled = enabled
+        self.directory = directory
+        self.format = format
+        self.segment_seconds = segment_seconds
+        self.quota_mb = quota_mb
+    
+    def __repr__(self):
+        return (f"RecordingConfig(enabled={self.enabled}, directory={self.directory}, format={self.format}, "
+                f"segment_seconds={self.segment_seconds}, quota_mb={self.quota_mb})")
+
+
+class LossRecoveryConfig:
+    """
+    Recovery of lost RTP packets; the control station receiver must use the same mode.
+    
+    Attributes:
+        mode: "none", "rtx" (retransmit packets the receiver NACKs) or "fec"
+            (ULP FEC packets sent along with the video)
+        max_delay_ms: rtx: how long sent packets are kept for retransmission;
+            retransmissions later than the receiver's jitterbuffer are useless
+        rtcp_port: rtx: UDP port receiving the receiver's RTCP (NACKs); the
+            sender's RTCP goes to video_port + 1 on the control station
+        fec_percentage: fec: FEC packets as a percentage of media packets
+    """
+    def __init__(self, mode: str = LOSS_RECOVERY_NONE, max_delay_ms: int = 100, rtcp_port: int = 5003,
+                 fec_percentage: int = 20):
+        self.mode = mode
+        self.max_delay_ms = max_delay_ms
+        self.rtcp_port = rtcp_port
+        self.fec_percentage = fec_percentage
+    
+    def __repr__(self):
+        return (f"LossRecoveryConfig(mode={self.mode}, max_delay_ms={self.max_delay_ms}, "
+                f"rtcp_port={self.rtcp_port}, fec_percentage={self.fec_percentage})")
+
+
+class Destination:
+    """
+    Extra receiver of the video stream (fan-out mode).
+    
+    Attributes:
+        host: IP, hostname or multicast group
+        port: UDP port
+    """
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+    
+    @property
+    def multicast(self) -> bool:
+        try:
+            return ipaddress.ip_address(self.host).is_multicast
+        except ValueError:
+            return False  # Hostname
+    
+    def as_dict(self) -> dict:
+        return {"host": self.host, "port": self.port}
+    
+    def __eq__(self, other):
+        return isinstance(other, Destination) and (self.host, self.port) == (other.host, other.port)
+    
+    def __hash__(self):
+        return hash((self.host, self.port))
+    
+    def __repr__(self):
+        return f"{self.host}:{self.port}"
+
+
+class StreamPreset:
+    """
+    Named set of video settings selectable at runtime (``presets`` in the JSON).
+    
+    Attributes:
+        name: Preset name
+        resolution: Video resolution
+        framerate: Video framerate (fps)
+        bitrate: Video bitrate (bps)
+        iframe_interval: Frames between I-frames (GOP length)
+        encoder: Extra encoder properties (e.g. {"preset-level": 1})
+        encoder_tuning: Encoder latency settings
+    """
+    def __init__(self, name: str, resolution: ResolutionConfig, framerate: int, bitrate: int,
+                 iframe_interval: int, encoder: Optional[Dict[str, EncoderValue]] = None,
+                 encoder_tuning: Optional[EncoderTuning] = None):
+        self.name = name
+        self.resolution = resolution
+        self.framerate = framerate
+        self.bitrate = bitrate
+        self.iframe_interval = iframe_interval
+        self.encoder = encoder or {}
+        self.encoder_tuning = encoder_tuning or EncoderTuning()
+    
+    def as_dict(self) -> dict:
+        """JSON form (same keys as in stream_config.json)."""
+        return {
+            "resolution": {"width": self.resolution.width, "height": self.resolution.height},
+            "framerate": self.framerate,
+            "bitrate": self.bitrate,
+            "iframe_interval": self.iframe_interval,
+            "encoder": dict(self.encoder),
+            "encoder_tuning": self.encoder_tuning.as_dict(),
+        }
+    
+    def __repr__(self):
+        return (f"StreamPreset({self.name}: {self.resolution.width}x{self.resolution.height}"
+                f"@{self.framerate}, {self.bitrate} bps, gop={self.iframe_interval}, encoder={self.encoder}, "
+                f"{self.encoder_tuning})")
+
+
 # Define StreamConfig class - compatible with both Python 3.6+ and 3.7+
 if _HAS_DATACLASS:
     # Python 3.7+: Use dataclass
@@ -58,6 +264,17 @@ if _HAS_DATACLASS:
             framerate: Video framerate (fps)
             bitrate: Video bitrate (bits per second)
             flip_method: Video flip method (0=none, 2=180°, etc.)
+            adaptive_bitrate: Receiver-feedback bitrate control (disabled if None)
+            iframe_interval: Frames between I-frames (GOP length)
+            encoder: Extra encoder properties (applied after encoder_tuning)
+            encoder_tuning: Encoder latency settings (defaults if None)
+            presets: Named presets (name -> StreamPreset)
+            active_preset: Preset whose values are in effect (None = top-level values)
+            destinations: Extra receivers; a list (even empty) enables fan-out mode
+            multicast_ttl: TTL of multicast destinations
+            recording: On-car recording (None = no recording branch)
+            pipeline_backend: "nvidia" (Jetson) or "software" (videotestsrc / v4l2 + x264)
+            loss_recovery: Packet loss recovery (None = off)
         """
         control_station_host: str
         video_port: int
@@ -68,6 +285,17 @@ if _HAS_DATACLASS:
         framerate: int
         bitrate: int
         flip_method: int
+        adaptive_bitrate: Optional[AdaptiveBitrateConfig] = None
+        iframe_interval: int = 10
+        encoder: Optional[Dict[str, EncoderValue]] = None
+        encoder_tuning: Optional[EncoderTuning] = None
+        presets: Optional[Dict[str, StreamPreset]] = None
+        active_preset: Optional[str] = None
+        destinations: Optional[List[Destination]] = None
+        multicast_ttl: int = 1
+        recording: Optional[RecordingConfig] = None
+        pipeline_backend: str = PIPELINE_BACKEND_NVIDIA
+        loss_recovery: Optional[LossRecoveryConfig] = None
 else:
     # Python 3.6: Manual class definition
     class StreamConfig:
@@ -84,10 +312,29 @@ else:
             framerate: Video framerate (fps)
             bitrate: Video bitrate (bits per second)
             flip_method: Video flip method (0=none, 2=180°, etc.)
+            adaptive_bitrate: Receiver-feedback bitrate control (disabled if None)
+            iframe_interval: Frames between I-frames (GOP length)
+            encoder: Extra encoder properties (applied after encoder_tuning)
+            encoder_tuning: Encoder latency settings (defaults if None)
+            presets: Named presets (name -> StreamPreset)
+            active_preset: Preset whose values are in effect (None = top-level values)
+            destinations: Extra receivers; a list (even empty) enables fan-out mode
+            multicast_ttl: TTL of multicast destinations
+            recording: On-car recording (None = no recording branch)
+            pipeline_backend: "nvidia" (Jetson) or "software" (videotestsrc / v4l2 + x264)
+            loss_recovery: Packet loss recovery (None = off)
         """
         def __init__(self, control_station_host: str, video_port: int, backend_port: int,
                      camera_device: str, ssid: Optional[str], resolution: ResolutionConfig,
-                     framerate: int, bitrate: int, flip_method: int):
+                     framerate: int, bitrate: int, flip_method: int,
+                     adaptive_bitrate: Optional[AdaptiveBitrateConfig] = None,
+                     iframe_interval: int = 10, encoder: Optional[Dict[str, EncoderValue]] = None,
+                     encoder_tuning: Optional[EncoderTuning] = None,
+                     presets: Optional[Dict[str, StreamPreset]] = None, active_preset: Optional[str] = None,
+                     destinations: Optional[List[Destination]] = None, multicast_ttl: int = 1,
+                     recording: Optional[RecordingConfig] = None,
+                     pipeline_backend: str = PIPELINE_BACKEND_NVIDIA,
+                     loss_recovery: Optional[LossRecoveryConfig] = None):
             self.control_station_host = control_station_host
             self.video_port = video_port
             self.backend_port = backend_port
@@ -97,6 +344,17 @@ else:
             self.framerate = framerate
             self.bitrate = bitrate
             self.flip_method = flip_method
+            self.adaptive_bitrate = adaptive_bitrate
+            self.iframe_interval = iframe_interval
+            self.encoder = encoder
+            self.encoder_tuning = encoder_tuning
+            self.presets = presets
+            self.active_preset = active_preset
+            self.destinations = destinations
+            self.multicast_ttl = multicast_ttl
+            self.recording = recording
+            self.pipeline_backend = pipeline_backend
+            self.loss_recovery = loss_recovery
     """
     Streaming configuration for Jetson camera.
     
@@ -131,25 +389,110 @@ def get_config_path() -> Path:
     """
     Get path to stream_config.json.
     
+    ``MINICARS_STREAM_CONFIG`` points to another file (e.g. the software
+    backend config on a development machine).
+    
     Returns:
         Path to config file in jetson/config/stream_config.json
     """
+    override = os.getenv("MINICARS_STREAM_CONFIG")
+    if override:
+        return Path(override)
     # This file is in jetson/, so config is at jetson/config/
     jetson_dir = Path(__file__).parent
     return jetson_dir / "config" / "stream_config.json"
 
 
-def load_config() -> StreamConfig:
+def _parse_encoder(value, where: str) -> Dict[str, EncoderValue]:
+    """Validate an "encoder" object (property name -> int/bool/str)."""
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}' (must be object)")
+    for key, item in value.items():
+        if not key or not all(c.isalnum() or c == "-" for c in key) or not isinstance(item, (int, bool, str)):
+            raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.{key}': {item!r}")
+        if isinstance(item, str) and (not item or any(c.isspace() or c in "!\"'" for c in item)):
+            raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.{key}': {item!r}")
+    return dict(value)
+
+
+def _parse_encoder_tuning(value, where: str) -> EncoderTuning:
+    """Validate an "encoder_tuning" object (missing keys take the defaults)."""
+    if value is None:
+        return EncoderTuning()
+    if not isinstance(value, dict):
+        raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}' (must be object)")
+    unknown = sorted(set(value) - set(EncoderTuning.FIELDS))
+    if unknown:
+        raise StreamConfigError(
+            f"[STREAM-CONFIG] Unknown '{where}' keys: {', '.join(unknown)} "
+            f"(valid: {', '.join(EncoderTuning.FIELDS)})"
+        )
+    tuning = EncoderTuning(**value)
+    if tuning.control_rate is not None and tuning.control_rate not in CONTROL_RATES:
+        raise StreamConfigError(
+            f"[STREAM-CONFIG] Invalid '{where}.control_rate': {tuning.control_rate} "
+            f"(must be one of {', '.join(CONTROL_RATES)})"
+        )
+    if tuning.preset_level is not None and tuning.preset_level not in PRESET_LEVELS:
+        raise StreamConfigError(
+            f"[STREAM-CONFIG] Invalid '{where}.preset_level': {tuning.preset_level} "
+            f"(must be one of {', '.join(PRESET_LEVELS)})"
+        )
+    for key in ("maxperf", "insert_vui"):
+        if not isinstance(getattr(tuning, key), bool):
+            raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.{key}': {getattr(tuning, key)!r} (must be bool)")
+    for key, low, high in (("idr_interval", 1, 3600), ("slices", 1, 32), ("intra_refresh", 2, 600)):
+        item = getattr(tuning, key)
+        if item is not None and (isinstance(item, bool) or not isinstance(item, int) or not low <= item <= high):
+            raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.{key}': {item!r} (must be {low}-{high})")
+    return tuning
+
+
+def _parse_preset(name: str, data, defaults: StreamPreset) -> StreamPreset:
+    """Validate one preset; missing keys inherit the top-level values."""
+    where = f"presets.{name}"
+    if not isinstance(data, dict):
+        raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}' (must be object)")
+    resolution = defaults.resolution
+    if "resolution" in data:
+        res_data = data["resolution"]
+        if (not isinstance(res_data, dict) or not isinstance(res_data.get("width"), int)
+                or not isinstance(res_data.get("height"), int) or res_data["width"] < 1 or res_data["height"] < 1):
+            raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.resolution': {res_data}")
+        resolution = ResolutionConfig(width=res_data["width"], height=res_data["height"])
+    framerate = data.get("framerate", defaults.framerate)
+    if not isinstance(framerate, int) or framerate < 1 or framerate > 120:
+        raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.framerate': {framerate} (must be 1-120)")
+    bitrate = data.get("bitrate", defaults.bitrate)
+    if not isinstance(bitrate, int) or bitrate < 1000000:
+        raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.bitrate': {bitrate} (must be >= 1000000)")
+    iframe_interval = data.get("iframe_interval", defaults.iframe_interval)
+    if not isinstance(iframe_interval, int) or iframe_interval < 1:
+        raise StreamConfigError(f"[STREAM-CONFIG] Invalid '{where}.iframe_interval': {iframe_interval}")
+    encoder = _parse_encoder(data["encoder"], f"{where}.encoder") if "encoder" in data else dict(defaults.encoder)
+    if "encoder_tuning" in data:
+        encoder_tuning = _parse_encoder_tuning(data["encoder_tuning"], f"{where}.encoder_tuning")
+    else:
+        encoder_tuning = defaults.encoder_tuning
+    return StreamPreset(name, resolution, framerate, bitrate, iframe_interval, encoder, encoder_tuning)
+
+
+def load_config(config_path: Optional[Path] = None) -> StreamConfig:
     """
     Load and validate stream configuration from JSON file.
     
+    Args:
+        config_path: File to read (default: get_config_path())
+    
     Returns:
         StreamConfig object with validated configuration
         
     Raises:
         StreamConfigError: If configuration file is missing or invalid
     """
-    config_path = get_config_path()
+    config_path = config_path or get_config_path()
     
     if not config_path.exists():
         raise StreamConfigError(
@@ -192,6 +535,14 @@ def load_config() -> StreamConfig:
             "[STREAM-CONFIG] Missing or empty 'camera_device'"
         )
     
+    # Pipeline backend is optional (default: Jetson hardware)
+    pipeline_backend = data.get("pipeline_backend", PIPELINE_BACKEND_NVIDIA)
+    if pipeline_backend not in PIPELINE_BACKENDS:
+        raise StreamConfigError(
+            f"[STREAM-CONFIG] Invalid 'pipeline_backend': {pipeline_backend} "
+            f"(must be one of {', '.join(PIPELINE_BACKENDS)})"
+        )
+    
     # Parse resolution
     res_data = data.get("resolution", {})
     if not isinstance(res_data, dict):
@@ -234,6 +585,166 @@ def load_config() -> StreamConfig:
             f"[STREAM-CONFIG] Invalid 'flip_method': {flip_method} (must be 0-7)"
         )
     
+    # GOP length and extra encoder properties (optional)
+    iframe_interval = data.get("iframe_interval", 10)
+    if not isinstance(iframe_interval, int) or iframe_interval < 1:
+        raise StreamConfigError(
+            f"[STREAM-CONFIG] Invalid 'iframe_interval': {iframe_interval} (must be >= 1)"
+        )
+    encoder = _parse_encoder(data.get("encoder"), "encoder")
+    encoder_tuning = _parse_encoder_tuning(data.get("encoder_tuning"), "encoder_tuning")
+    
+    # Named presets (optional); the active one overrides the top-level video settings
+    presets = None
+    presets_data = data.get("presets")
+    if presets_data is not None:
+        if not isinstance(presets_data, dict):
+            raise StreamConfigError(
+                "[STREAM-CONFIG] Invalid 'presets' (must be object of name -> preset)"
+            )
+        defaults = StreamPreset("", resolution, framerate, bitrate, iframe_interval, encoder, encoder_tuning)
+        presets = {name: _parse_preset(name, preset_data, defaults) for name, preset_data in presets_data.items()}
+    active_preset = data.get("active_preset") or None
+    if active_preset is not None:
+        if active_preset not in (presets or {}):
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Unknown 'active_preset': {active_preset} "
+                f"(defined: {', '.join(sorted(presets or {})) or 'none'})"
+            )
+        preset = presets[active_preset]
+        resolution = preset.resolution
+        framerate = preset.framerate
+        bitrate = preset.bitrate
+        iframe_interval = preset.iframe_interval
+        encoder = dict(preset.encoder)
+        encoder_tuning = preset.encoder_tuning
+    
+    # Fan-out destinations (optional): one encode sent to several receivers
+    destinations = None
+    destinations_data = data.get("destinations")
+    if destinations_data is not None:
+        if not isinstance(destinations_data, list):
+            raise StreamConfigError(
+                "[STREAM-CONFIG] Invalid 'destinations' (must be list of {host, port})"
+            )
+        destinations = []
+        for item in destinations_data:
+            if (not isinstance(item, dict) or not item.get("host") or not isinstance(item.get("host"), str)
+                    or not isinstance(item.get("port"), int) or not 1 <= item["port"] <= 65535):
+                raise StreamConfigError(
+                    f"[STREAM-CONFIG] Invalid destination: {item} (need host and port 1-65535)"
+                )
+            destination = Destination(item["host"], item["port"])
+            if destination not in destinations:
+                destinations.append(destination)
+    multicast_ttl = data.get("multicast_ttl", 1)
+    if not isinstance(multicast_ttl, int) or multicast_ttl < 1 or multicast_ttl > 255:
+        raise StreamConfigError(
+            f"[STREAM-CONFIG] Invalid 'multicast_ttl': {multicast_ttl} (must be 1-255)"
+        )
+    
+    # Recording is optional (object; the branch only exists if the section is present)
+    recording = None
+    rec_data = data.get("recording")
+    if rec_data is not None:
+        if not isinstance(rec_data, dict):
+            raise StreamConfigError(
+                "[STREAM-CONFIG] Invalid 'recording' (must be object)"
+            )
+        recording = RecordingConfig(
+            enabled=bool(rec_data.get("enabled", False)),
+            directory=rec_data.get("directory", "recordings"),
+            format=rec_data.get("format", "mkv"),
+            segment_seconds=rec_data.get("segment_seconds", 60),
+            quota_mb=rec_data.get("quota_mb", 4096),
+        )
+        if not isinstance(recording.directory, str) or not recording.directory or " " in recording.directory:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'recording.directory': {recording.directory!r} (no spaces)"
+            )
+        if recording.format not in ("mkv", "mp4"):
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'recording.format': {recording.format} (must be mkv or mp4)"
+            )
+        if not isinstance(recording.segment_seconds, int) or not 5 <= recording.segment_seconds <= 3600:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'recording.segment_seconds': {recording.segment_seconds} (must be 5-3600)"
+            )
+        if not isinstance(recording.quota_mb, int) or recording.quota_mb < 100:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'recording.quota_mb': {recording.quota_mb} (must be >= 100)"
+            )
+        if not Path(recording.directory).is_absolute():
+            recording.directory = str(Path(__file__).parent / recording.directory)
+    
+    # Loss recovery is optional (object; mode "none" is the same as no section)
+    loss_recovery = None
+    lr_data = data.get("loss_recovery")
+    if lr_data is not None:
+        if not isinstance(lr_data, dict):
+            raise StreamConfigError(
+                "[STREAM-CONFIG] Invalid 'loss_recovery' (must be object)"
+            )
+        loss_recovery = LossRecoveryConfig(
+            mode=lr_data.get("mode", LOSS_RECOVERY_NONE),
+            max_delay_ms=lr_data.get("max_delay_ms", 100),
+            rtcp_port=lr_data.get("rtcp_port", 5003),
+            fec_percentage=lr_data.get("fec_percentage", 20),
+        )
+        if loss_recovery.mode not in LOSS_RECOVERY_MODES:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'loss_recovery.mode': {loss_recovery.mode} "
+                f"(must be one of {', '.join(LOSS_RECOVERY_MODES)})"
+            )
+        if not isinstance(loss_recovery.max_delay_ms, int) or not 10 <= loss_recovery.max_delay_ms <= 1000:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'loss_recovery.max_delay_ms': {loss_recovery.max_delay_ms} (must be 10-1000)"
+            )
+        if (not isinstance(loss_recovery.rtcp_port, int) or not 1 <= loss_recovery.rtcp_port <= 65535
+                or loss_recovery.rtcp_port == video_port):
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'loss_recovery.rtcp_port': {loss_recovery.rtcp_port} "
+                f"(must be 1-65535 and not the video port)"
+            )
+        if not isinstance(loss_recovery.fec_percentage, int) or not 1 <= loss_recovery.fec_percentage <= 100:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'loss_recovery.fec_percentage': {loss_recovery.fec_percentage} (must be 1-100)"
+            )
+        if loss_recovery.mode == LOSS_RECOVERY_NONE:
+            loss_recovery = None
+    
+    # Adaptive bitrate is optional (object, disabled by default)
+    adaptive_bitrate = None
+    abr_data = data.get("adaptive_bitrate")
+    if abr_data is not None:
+        if not isinstance(abr_data, dict):
+            raise StreamConfigError(
+                "[STREAM-CONFIG] Invalid 'adaptive_bitrate' (must be object)"
+            )
+        adaptive_bitrate = AdaptiveBitrateConfig(
+            enabled=bool(abr_data.get("enabled", False)),
+            min_bitrate=abr_data.get("min_bitrate", 1500000),
+            max_bitrate=abr_data.get("max_bitrate", bitrate),
+            adapt_framerate=bool(abr_data.get("adapt_framerate", False)),
+            min_framerate=abr_data.get("min_framerate", 15),
+            feedback_port=abr_data.get("feedback_port", 5010),
+        )
+        if (not isinstance(adaptive_bitrate.min_bitrate, int) or not isinstance(adaptive_bitrate.max_bitrate, int)
+                or not 500000 <= adaptive_bitrate.min_bitrate <= bitrate <= adaptive_bitrate.max_bitrate):
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'adaptive_bitrate' bounds: need 500000 <= min_bitrate "
+                f"({adaptive_bitrate.min_bitrate}) <= bitrate ({bitrate}) <= max_bitrate ({adaptive_bitrate.max_bitrate})"
+            )
+        if not isinstance(adaptive_bitrate.min_framerate, int) or not 1 <= adaptive_bitrate.min_framerate <= framerate:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'adaptive_bitrate.min_framerate': {adaptive_bitrate.min_framerate} "
+                f"(must be 1-{framerate})"
+            )
+        if not isinstance(adaptive_bitrate.feedback_port, int) or not 1 <= adaptive_bitrate.feedback_port <= 65535:
+            raise StreamConfigError(
+                f"[STREAM-CONFIG] Invalid 'adaptive_bitrate.feedback_port': {adaptive_bitrate.feedback_port}"
+            )
+    
     # SSID is optional (can be None or empty string)
     ssid = data.get("ssid")
     if ssid == "":
@@ -253,9 +764,67 @@ def load_config() -> StreamConfig:
         framerate=framerate,
         bitrate=bitrate,
         flip_method=flip_method,
+        adaptive_bitrate=adaptive_bitrate,
+        iframe_interval=iframe_interval,
+        encoder=encoder,
+        encoder_tuning=encoder_tuning,
+        presets=presets,
+        active_preset=active_preset,
+        destinations=destinations,
+        multicast_ttl=multicast_ttl,
+        recording=recording,
+        pipeline_backend=pipeline_backend,
+        loss_recovery=loss_recovery,
     )
 
 
+def update_config_file(changes: dict, config_path: Optional[Path] = None) -> None:
+    """
+    Change top-level keys of the config file.
+    
+    The file is rewritten atomically (temporary file + rename) and validated
+    before replacing the original, so a bad value never leaves a broken file.
+    
+    Args:
+        changes: Top-level keys and their new JSON values
+        config_path: File to update (default: get_config_path())
+    
+    Raises:
+        StreamConfigError: If the resulting configuration is invalid
+    """
+    config_path = config_path or get_config_path()
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise StreamConfigError(f"[STREAM-CONFIG] Failed to read config file: {e}") from e
+    data.update(changes)
+    tmp_path = config_path.with_name(config_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    try:
+        load_config(tmp_path)
+    except StreamConfigError:
+        tmp_path.unlink()
+        raise
+    tmp_path.replace(config_path)
+
+
+def set_active_preset(name: Optional[str], config_path: Optional[Path] = None) -> None:
+    """
+    Persist the active preset in the config file.
+    
+    Args:
+        name: Preset name (None = use the top-level values)
+        config_path: File to update (default: get_config_path())
+    
+    Raises:
+        StreamConfigError: If the preset does not exist or the file is invalid
+    """
+    update_config_file({"active_preset": name}, config_path)
+
+
 def validate_config() -> None:
     """
     Validate configuration file (useful for testing).
@@ -273,6 +842,18 @@ def validate_config() -> None:
         print(f"[STREAM-CONFIG]   Resolution: {config.resolution.width}x{config.resolution.height}")
         print(f"[STREAM-CONFIG]   Framerate: {config.framerate} fps")
         print(f"[STREAM-CONFIG]   Bitrate: {config.bitrate} bps")
+        if config.encoder_tuning is not None and config.encoder_tuning != EncoderTuning():
+            print(f"[STREAM-CONFIG]   Encoder tuning: {config.encoder_tuning}")
+        if config.destinations is not None:
+            print(f"[STREAM-CONFIG]   Fan-out destinations: {config.destinations or '(none yet)'}")
+        if config.presets:
+            print(f"[STREAM-CONFIG]   Presets: {', '.join(sorted(config.presets))} "
+                  f"(active: {config.active_preset or 'none'})")
+        if config.loss_recovery is not None:
+            print(f"[STREAM-CONFIG]   Loss recovery: {config.loss_recovery.mode}")
+        if config.adaptive_bitrate is not None and config.adaptive_bitrate.enabled:
+            print(f"[STREAM-CONFIG]   Adaptive bitrate: {config.adaptive_bitrate.min_bitrate}-"
+                  f"{config.adaptive_bitrate.max_bitrate} bps")
     except StreamConfigError as e:
         print(f"[STREAM-CONFIG] ✗ Configuration error: {e}")
         raise
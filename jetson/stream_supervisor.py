@@ -6,28 +6,106 @@ Monitors connectivity to control station and manages GStreamer pipeline
 for camera streaming. Only starts pipeline when control station is reachable
 and (optionally) when connected to the correct WiFi SSID.
 """
+import asyncio
 import logging
 import os
+import re
+import signal
 import socket
 import subprocess
 import sys
 import time
-from typing import Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 
-from stream_config import StreamConfig, StreamConfigError, load_config
+import gst_pipeline
+import recorder
+from latency_probe import LatencyProbe
+from pipeline_backends import PipelineBackend, get_backend
+from supervisor_health import RateMeter, SupervisorHealth
+from config_watcher import ConfigWatcher
+from control_api import ApiError, ControlServer
+from bitrate_controller import ACTION_HOLD, AimdBitrateController, FeedbackSource, UdpFeedbackSource
+from hot_logging import RateLimiter, setup_logging
+from pipeline_output import (
+    ERROR_CAPTURE,
+    FIRST_PACKET_PATTERN,
+    PLAYING_PATTERN,
+    OutputDrainer,
+)
+from process_tracker import PidFile, find_processes, read_cmdline
+from stream_config import (
+    LOSS_RECOVERY_FEC,
+    LOSS_RECOVERY_RTX,
+    Destination,
+    StreamConfig,
+    StreamConfigError,
+    get_config_path,
+    load_config,
+    set_active_preset,
+    update_config_file,
+)
+from wifi_status import WifiMonitor, WifiStatus
 
-# Configure logging
-logging.basicConfig(
+# Configure logging (queue-backed, output written on a background thread)
+setup_logging(
+    '[stream-supervisor] %(levelname)s: %(message)s',
     level=logging.INFO,
-    format='[stream-supervisor] %(levelname)s: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
+    datefmt='%Y-%m-%d %H:%M:%S',
 )
 logger = logging.getLogger(__name__)
 
+# Single-instance lock; also records the pipeline PID for orphan cleanup after a crash
+SUPERVISOR_PIDFILE = os.getenv("MINICARS_SUPERVISOR_PIDFILE", "/tmp/minicars-stream-supervisor.pid")
+# Our pipelines: the Jetson camera, or any backend's named camera + payloader chain
+PIPELINE_PATTERN = r"gst-launch-1\.0.*(nvarguscamerasrc|name=camera .*name=pay )"
+# "auto": in-process (GStreamer Python bindings) if available, else gst-launch-1.0
+# "inprocess" / "gst-launch": force one (inprocess still falls back without bindings)
+PIPELINE_MODE = os.getenv("MINICARS_PIPELINE_MODE", "auto")
+# Seconds a pipeline start may take until the first RTP packet is produced
+READY_TIMEOUT = float(os.getenv("MINICARS_STREAM_READY_TIMEOUT", "8.0"))
+# Seconds a WiFi reading (SSID, signal, bitrate) is reused before re-reading the kernel
+WIFI_STATUS_TTL = float(os.getenv("MINICARS_WIFI_STATUS_TTL", "2.0"))
+# "0" disables reloading stream_config.json when it changes
+CONFIG_RELOAD = os.getenv("MINICARS_CONFIG_RELOAD", "1") != "0"
+# HTTP control API used by the control station backend ("0" disables it). It only
+# listens on loopback unless a bind address is given; set a token before exposing it
+CONTROL_PORT = int(os.getenv("MINICARS_CONTROL_PORT", "9000"))
+CONTROL_BIND = os.getenv("MINICARS_CONTROL_BIND", "127.0.0.1")
+CONTROL_TOKEN = os.getenv("MINICARS_CONTROL_TOKEN", "")
+# Latency measurement mode: per-frame timestamps to this UDP port of the control station ("0" disables it)
+LATENCY_PROBE_PORT = int(os.getenv("MINICARS_LATENCY_PROBE_PORT", "0"))
+
 # Global state
-_pipeline_proc: Optional[subprocess.Popen] = None
-_last_restart_attempt = 0.0
-_restart_delay = 10.0  # Wait 10s after pipeline failure before retry
+_pidfile: Optional[PidFile] = None
+_pipeline_proc: Optional[subprocess.Popen] = None  # Or an InProcessPipeline (same interface)
+_pipeline_output: Optional[OutputDrainer] = None
+_wifi_monitor: Optional[WifiMonitor] = None
+_nvargus_restart_needed = False  # Set when a run failed in the capture session
+_start_context: Optional[Tuple[float, str]] = None  # (monotonic start time, start path)
+_startup_stats: Dict[Tuple[str, str], Deque[float]] = {}  # (start path, marker) -> recent times (ms)
+_running_backend: Optional[PipelineBackend] = None  # Backend of the pipeline in _pipeline_proc
+_restart_delay = 10.0  # Minimum time between pipeline start attempts
+_max_consecutive_failures = 5
+_failure_backoff = 30.0  # Cooldown after _max_consecutive_failures failed starts
+_probe_interval = 1.0  # Backend / SSID probe period
+_probe_timeout = 1.0  # TCP connect timeout per backend probe
+_link_up_after = 2  # Consecutive good probes before starting the pipeline
+_link_down_after = 3  # Consecutive failed probes before stopping it
+_abr_interval = 1.0  # Adaptive bitrate control period (one receiver report per step)
+_config_poll_interval = 2.0  # stream_config.json check period without inotify
+_config_settle = 0.3  # Wait after a change notification so the editor finishes writing
+_output_buffer_lines = 200  # Recent GStreamer output lines kept in memory
+_crash_report_lines = 40  # Lines logged when the pipeline dies
+_pipeline_error_limiter = RateLimiter("supervisor.gst_error", 1.0)
+_destination_counters: Dict[Tuple[str, int], Tuple[float, int]] = {}  # (host, port) -> (time, bytes sent)
+_recording_requested = False  # Record while the pipeline runs (config default, toggled by the API)
+_recording_branch: Optional[recorder.RecordingBranch] = None  # In-process recording branch
+_recording_check_interval = 5.0  # Disk quota enforcement period
+_last_exit: Optional[Tuple[str, Optional[str], Optional[int]]] = None  # (context, category, exit code)
+_encoder_meter = RateMeter()  # Measured encoder fps / bitrate (in-process pipeline)
+_latency_probe: Optional[LatencyProbe] = None  # Frame timestamps (latency measurement mode)
+_latency_probe_warned = False
 
 
 def check_host_reachable(host: str, port: int, timeout: float = 1.0) -> bool:
@@ -57,10 +135,31 @@ def check_host_reachable(host: str, port: int, timeout: float = 1.0) -> bool:
         return False
 
 
+def _on_wifi_change(old: WifiStatus, new: WifiStatus) -> None:
+    """Log SSID / association changes as they are detected."""
+    if new.connected:
+        logger.info(f"WiFi {new.interface}: connected to {new.ssid or '(unknown SSID)'} "
+                    f"(signal {new.signal_dbm} dBm, bitrate {new.bitrate_mbps} Mbit/s)")
+    else:
+        logger.info(f"WiFi {new.interface}: disconnected (was {old.ssid or 'unknown'})")
+
+
+def get_wifi_monitor() -> WifiMonitor:
+    """Shared WiFi monitor (created on first use)."""
+    global _wifi_monitor
+    if _wifi_monitor is None:
+        _wifi_monitor = WifiMonitor(ttl=WIFI_STATUS_TTL)
+        _wifi_monitor.on_change(_on_wifi_change)
+    return _wifi_monitor
+
+
 def check_ssid_match(required_ssid: Optional[str]) -> bool:
     """
     Check if current WiFi SSID matches required SSID.
     
+    Reads nl80211/sysfs through the cached WifiMonitor; ``iwgetid`` is only
+    forked when the kernel does not report the SSID.
+    
     Args:
         required_ssid: Required SSID (None or empty = no check)
         
@@ -71,39 +170,21 @@ def check_ssid_match(required_ssid: Optional[str]) -> bool:
         return True  # No SSID check required
     
     try:
-        # Try to get current SSID using iwgetid
-        result = subprocess.run(
-            ["iwgetid", "-r"],
-            capture_output=True,
-            text=True,
-            timeout=2.0
-        )
-        
-        if result.returncode != 0:
-            logger.debug("iwgetid failed (may not be on WiFi)")
-            return False
-        
-        current_ssid = result.stdout.strip()
-        if current_ssid == required_ssid:
-            logger.debug(f"SSID match: {current_ssid}")
-            return True
-        else:
-            logger.debug(f"SSID mismatch: current={current_ssid}, required={required_ssid}")
-            return False
-    except FileNotFoundError:
-        logger.debug("iwgetid not found (may not be installed)")
-        return False
-    except subprocess.TimeoutExpired:
-        logger.debug("iwgetid timeout")
-        return False
+        status = get_wifi_monitor().get_status(need_ssid=True)
     except Exception as e:
         logger.debug(f"SSID check failed: {e}")
         return False
+    
+    if status.ssid == required_ssid:
+        logger.debug(f"SSID match: {status.ssid}")
+        return True
+    logger.debug(f"SSID mismatch: current={status.ssid}, required={required_ssid}")
+    return False
 
 
 def restart_nvargus_daemon() -> bool:
     """
-    Restart nvargus-daemon to avoid capture session errors.
+    Restart nvargus-daemon to recover from capture session errors.
     
     Note: This requires sudo without password (configured via sudoers).
     If sudo fails, we continue anyway as the pipeline might work without restart.
@@ -141,195 +222,670 @@ def restart_nvargus_daemon() -> bool:
         return False
 
 
-def build_gstreamer_pipeline(config: StreamConfig) -> list:
+def camera_caps(config: StreamConfig, framerate: Optional[int] = None) -> str:
+    """Caps negotiated with the camera (framerate defaults to the configured one)."""
+    return get_backend(config.pipeline_backend).camera_caps(config, framerate)
+
+
+def pipeline_markers(backend: PipelineBackend) -> dict:
+    """Readiness markers in ``gst-launch -v`` output for a backend."""
+    markers = {"playing": PLAYING_PATTERN, "first_packet": FIRST_PACKET_PATTERN}
+    if backend.first_frame_pattern is not None:
+        markers["first_frame"] = backend.first_frame_pattern
+    return markers
+
+
+def stream_destinations(config: StreamConfig) -> List[Tuple[str, int]]:
+    """All receivers of the stream: the control station first, then the fan-out destinations."""
+    destinations = [(config.control_station_host, config.video_port)]
+    for destination in config.destinations or []:
+        if (destination.host, destination.port) not in destinations:
+            destinations.append((destination.host, destination.port))
+    return destinations
+
+
+def _sink_elements(config: StreamConfig) -> list:
+    if config.destinations is None:
+        return [
+            "udpsink", f"name={gst_pipeline.SINK_NAME}",
+            f"host={config.control_station_host}",
+            f"port={config.video_port}",
+            "sync=false",
+            "async=false",
+        ]
+    # Fan-out: the same RTP packets go to every client (unicast or multicast group)
+    clients = ",".join(f"{host}:{port}" for host, port in stream_destinations(config))
+    return [
+        "multiudpsink", f"name={gst_pipeline.SINK_NAME}",
+        f"clients={clients}",
+        "auto-multicast=true",
+        f"ttl-mc={config.multicast_ttl}",
+        "sync=false",
+        "async=false",
+    ]
+
+
+def _loss_recovery_elements(config: StreamConfig) -> list:
+    """Payloader output to the sink, with retransmission or FEC if configured."""
+    recovery = config.loss_recovery
+    if recovery is None:
+        return _sink_elements(config)
+    if recovery.mode == LOSS_RECOVERY_FEC:
+        # FEC packets share the video's SSRC and sequence numbers, one stream to the same sink
+        return [
+            "rtpulpfecenc", f"name={gst_pipeline.FEC_NAME}",
+            f"pt={gst_pipeline.FEC_PAYLOAD_TYPE}", f"percentage={recovery.fec_percentage}",
+            "!",
+        ] + _sink_elements(config)
+    # rtx: the session turns the receiver's RTCP NACKs into retransmission requests that
+    # travel upstream to rtprtxsend, which resends the packet with its own payload type / SSRC
+    session = gst_pipeline.SESSION_NAME
+    return [
+        "rtprtxsend", f"name={gst_pipeline.RTX_NAME}",
+        f'payload-type-map="application/x-rtp-pt-map,{gst_pipeline.VIDEO_PAYLOAD_TYPE}=(uint){gst_pipeline.RTX_PAYLOAD_TYPE}"',
+        f"max-size-time={recovery.max_delay_ms}",
+        "!", f"{session}.send_rtp_sink",
+        "rtpsession", f"name={session}", "rtp-profile=avpf",
+        f"{session}.send_rtp_src", "!",
+    ] + _sink_elements(config) + [
+        f"{session}.send_rtcp_src", "!",
+        "udpsink", f"host={config.control_station_host}", f"port={config.video_port + 1}",
+        "sync=false", "async=false",
+        "udpsrc", f"port={recovery.rtcp_port}", "!", f"{session}.recv_rtcp_sink",
+    ]
+
+
+def build_pipeline_elements(config: StreamConfig, record: bool = False) -> list:
     """
-    Build GStreamer pipeline command from configuration.
+    Build the GStreamer element chain from configuration.
+    
+    Elements that can be changed live are named (see gst_pipeline); the
+    camera and encoder come from the configured pipeline backend.
+    With a ``recording`` section the encoded stream goes through a tee so a
+    recording branch can be attached (see recorder).
     
     Args:
         config: Stream configuration
+        record: Include the recording branch (static pipelines only; in-process
+            pipelines attach it at runtime)
+        
+    Returns:
+        List of gst-launch tokens (elements, properties and "!")
+    """
+    tee = []
+    if config.recording is not None:
+        tee = ["tee", f"name={recorder.TEE_NAME}", "!", "queue", "!"]
+    backend = get_backend(config.pipeline_backend)
+    elements = backend.source_elements(config) + ["!"] + backend.encoder_elements(config) + [
+        "!", "h264parse",
+        "!",
+    ] + tee + [
+        "rtph264pay", f"name={gst_pipeline.PAYLOADER_NAME}", "config-interval=1",
+        f"pt={gst_pipeline.VIDEO_PAYLOAD_TYPE}",
+        "!",
+    ] + _loss_recovery_elements(config)
+    if record and config.recording is not None:
+        rec = config.recording
+        elements += [f"{recorder.TEE_NAME}.", "!"] + recorder.branch_elements(
+            rec.directory, rec.format, rec.segment_seconds)
+    return elements
+
+
+def build_gstreamer_pipeline(config: StreamConfig, record: bool = False) -> list:
+    """
+    Build GStreamer pipeline command from configuration (gst-launch fallback).
+    
+    Args:
+        config: Stream configuration
+        record: Include the recording branch
         
     Returns:
         List of command arguments for GStreamer
     """
     gst_cmd = [
         "gst-launch-1.0", "-e",
-        config.camera_device,
-        "!", f'video/x-raw(memory:NVMM),width={config.resolution.width},height={config.resolution.height},framerate={config.framerate}/1',
-        "!", "nvvidconv", f"flip-method={config.flip_method}",
-        "!", 'video/x-raw(memory:NVMM),format=NV12',
-        "!", "nvv4l2h264enc",
-        "insert-sps-pps=true",
-        "maxperf-enable=1",
-        "control-rate=2",
-        f"bitrate={config.bitrate}",
-        "iframeinterval=10",
-        "!", "h264parse",
-        "!", "rtph264pay", "config-interval=1", "pt=96",
-        "!", "udpsink",
-        f"host={config.control_station_host}",
-        f"port={config.video_port}",
-        "sync=false",
-        "async=false",
-    ]
+        "-v",  # Caps / property notifications are used for readiness detection
+    ] + build_pipeline_elements(config, record)
     
     return gst_cmd
 
 
-def start_pipeline(config: StreamConfig) -> bool:
+def build_pipeline_description(config: StreamConfig) -> str:
+    """Pipeline description for Gst.parse_launch (in-process mode)."""
+    return " ".join(build_pipeline_elements(config))
+
+
+def use_inprocess_pipeline() -> bool:
+    """Whether pipelines run in-process (per PIPELINE_MODE and the bindings)."""
+    if PIPELINE_MODE == "gst-launch":
+        return False
+    if gst_pipeline.available():
+        return True
+    if PIPELINE_MODE == "inprocess":
+        logger.warning("GStreamer Python bindings not available (python3-gi), falling back to gst-launch-1.0")
+    return False
+
+
+def update_pipeline(**changes) -> bool:
     """
-    Start GStreamer pipeline.
+    Change pipeline properties without restarting it.
+    
+    Only possible for in-process pipelines; a gst-launch pipeline has to be
+    restarted with the new configuration instead.
     
     Args:
-        config: Stream configuration
+        **changes: Keys of gst_pipeline.LIVE_PROPERTIES
+            (bitrate, iframe_interval, host, port)
         
     Returns:
-        True if pipeline started successfully, False otherwise
+        True if all changes were applied live
     """
-    global _pipeline_proc
-    
-    # Check for duplicate pipelines (safety check)
-    existing_processes = subprocess.run(
-        ["pgrep", "-f", "gst-launch-1.0.*nvarguscamerasrc"],
-        capture_output=True,
-        text=True
-    )
-    if existing_processes.returncode == 0:
-        pids = existing_processes.stdout.strip().split('\n')
-        pids = [p for p in pids if p and p != str(os.getpid())]  # Exclude current process
-        if pids:
-            logger.warning(f"Found {len(pids)} existing pipeline process(es): {pids}")
-            logger.warning("Another pipeline may already be running. Attempting to continue anyway.")
+    proc = _pipeline_proc
+    backend = _running_backend
+    if not isinstance(proc, gst_pipeline.InProcessPipeline) or proc.poll() is not None:
+        return False
+    if any(name not in backend.live_properties for name in changes):
+        return False
+    for name, value in changes.items():
+        previous = backend.from_element(name, proc.get_property(name))
+        proc.set_property(name, backend.to_element(name, value))
+        logger.info(f"Pipeline {name}: {previous} -> {value} (live)")
+    return True
+
+
+class ConfigChangePlan:
+    """
+    How a new configuration differs from the running one.
     
-    if _pipeline_proc is not None:
-        # Pipeline already running, check if it's still alive
-        poll_result = _pipeline_proc.poll()
-        if poll_result is None:
-            logger.debug("Pipeline already running")
-            return True
+    Attributes:
+        live: Pipeline changes that can be applied while PLAYING
+            (gst_pipeline.LIVE_PROPERTIES key -> value)
+        restart: Changed fields that need a pipeline restart
+        supervisor: Changed fields that only affect the supervisor
+            (probes, SSID check, adaptive bitrate)
+    """
+    
+    __slots__ = ("live", "restart", "supervisor")
+    
+    def __init__(self):
+        self.live: Dict[str, object] = {}
+        self.restart = []
+        self.supervisor = []
+    
+    @property
+    def empty(self) -> bool:
+        return not (self.live or self.restart or self.supervisor)
+    
+    def __repr__(self):
+        return (f"live={sorted(self.live)}, restart={self.restart}, supervisor={self.supervisor}")
+
+
+def plan_config_changes(old: StreamConfig, new: StreamConfig) -> ConfigChangePlan:
+    """
+    Classify the differences between two configurations.
+    
+    Args:
+        old: Running configuration
+        new: Freshly loaded configuration
+    
+    Returns:
+        ConfigChangePlan
+    """
+    plan = ConfigChangePlan()
+    resolution_changed = ((old.resolution.width, old.resolution.height)
+                          != (new.resolution.width, new.resolution.height))
+    if old.bitrate != new.bitrate:
+        plan.live["bitrate"] = new.bitrate
+    if (old.destinations is None) != (new.destinations is None):
+        plan.restart.append("destinations")  # udpsink <-> multiudpsink
+    elif new.destinations is not None:
+        if stream_destinations(old) != stream_destinations(new):
+            plan.live["clients"] = stream_destinations(new)
+        if old.multicast_ttl != new.multicast_ttl:
+            plan.live["multicast_ttl"] = new.multicast_ttl
+    else:
+        if old.control_station_host != new.control_station_host:
+            plan.live["host"] = new.control_station_host
+        if old.video_port != new.video_port:
+            plan.live["port"] = new.video_port
+    if old.iframe_interval != new.iframe_interval:
+        plan.live["iframe_interval"] = new.iframe_interval
+    if old.framerate != new.framerate and not resolution_changed:
+        plan.live["camera_caps"] = camera_caps(new)  # Renegotiates the camera, no restart
+    if resolution_changed:
+        plan.restart.append("resolution")
+        if old.framerate != new.framerate:
+            plan.restart.append("framerate")
+    if old.pipeline_backend != new.pipeline_backend:
+        plan.restart.append("pipeline_backend")
+    else:
+        live_properties = get_backend(new.pipeline_backend).live_properties
+        for name in [name for name in plan.live if name not in live_properties]:
+            del plan.live[name]
+            plan.restart.append(name)
+    if repr(old.loss_recovery) != repr(new.loss_recovery):
+        plan.restart.append("loss_recovery")
+    elif new.loss_recovery is not None and new.loss_recovery.mode == LOSS_RECOVERY_RTX:
+        for name in [name for name in ("host", "port") if name in plan.live]:
+            del plan.live[name]  # The RTCP udpsink follows the control station too
+            plan.restart.append(name)
+    if (old.recording is None) != (new.recording is None):
+        plan.restart.append("recording")  # Adds / removes the tee
+    elif repr(old.recording) != repr(new.recording):
+        plan.supervisor.append("recording")  # Used by the next recording start
+    for field in ("camera_device", "flip_method", "encoder", "encoder_tuning"):
+        if getattr(old, field) != getattr(new, field):
+            plan.restart.append(field)
+    for field in ("ssid", "backend_port", "active_preset"):
+        if getattr(old, field) != getattr(new, field):
+            plan.supervisor.append(field)
+    if repr(old.adaptive_bitrate) != repr(new.adaptive_bitrate):
+        plan.supervisor.append("adaptive_bitrate")
+    return plan
+
+
+def get_destination_stats() -> List[dict]:
+    """
+    Send statistics per stream destination.
+    
+    Counters come from multiudpsink (in-process fan-out mode); with gst-launch
+    or a single udpsink only the destination list is known and the counters
+    are None.
+    
+    Returns:
+        [{"host", "port", "bytes_sent", "packets_sent", "send_kbps"}]
+    """
+    proc = _pipeline_proc
+    stats = []
+    if isinstance(proc, gst_pipeline.InProcessPipeline) and proc.poll() is None:
+        stats = proc.client_stats()
+    now = time.monotonic()
+    for entry in stats:
+        key = (entry["host"], entry["port"])
+        entry["send_kbps"] = None
+        if entry["bytes_sent"] is None:
+            continue
+        previous = _destination_counters.get(key)
+        if previous is not None and now > previous[0] and entry["bytes_sent"] >= previous[1]:
+            entry["send_kbps"] = round((entry["bytes_sent"] - previous[1]) * 8 / (now - previous[0]) / 1000.0, 1)
+        _destination_counters[key] = (now, entry["bytes_sent"])
+    return stats
+
+
+def _on_pipeline_error(category: str, stream: str, line: str) -> None:
+    """Log classified GStreamer errors as they happen (called from drainer threads)."""
+    if _pipeline_error_limiter.allow():
+        logger.error("GStreamer %s error (%s): %s", category, stream, line)
+
+
+def report_pipeline_exit(context: str, exit_code: Optional[int]) -> Optional[str]:
+    """
+    Log a crash report for a pipeline that exited and release it.
+    
+    Args:
+        context: Short description for the log (e.g. "died unexpectedly")
+        exit_code: Process exit code
+    
+    Returns:
+        Classified error category of the failure (None if unclassified)
+    """
+    global _pipeline_proc, _pipeline_output, _nvargus_restart_needed, _last_exit, _latency_probe
+    
+    category = None
+    drainer = _pipeline_output
+    if drainer is not None:
+        drainer.join(timeout=1.0)  # Collect output written right before exit
+        category = drainer.primary_error()
+        lines = drainer.tail(_crash_report_lines)
+        logger.error(
+            f"Pipeline {context} (exit code: {exit_code}, error: {category or 'unclassified'}, "
+            f"errors seen: {drainer.error_counts or 'none'})"
+        )
+        if lines:
+            logger.error("Last %d GStreamer output lines:\n%s", len(lines), "\n".join(lines))
         else:
-            # Pipeline died - capture error output
-            logger.warning(f"Previous pipeline died (exit code: {poll_result})")
-            stderr_output = ""
-            stdout_output = ""
-            try:
-                # Try to read remaining output
-                try:
-                    stdout_bytes, stderr_bytes = _pipeline_proc.communicate(timeout=1.0)
-                    if stderr_bytes:
-                        stderr_output = stderr_bytes.decode('utf-8', errors='replace').strip()
-                    if stdout_bytes:
-                        stdout_output = stdout_bytes.decode('utf-8', errors='replace').strip()
-                except subprocess.TimeoutExpired:
-                    _pipeline_proc.kill()
-                    try:
-                        stdout_bytes, stderr_bytes = _pipeline_proc.communicate(timeout=0.5)
-                        if stderr_bytes:
-                            stderr_output = stderr_bytes.decode('utf-8', errors='replace').strip()
-                        if stdout_bytes:
-                            stdout_output = stdout_bytes.decode('utf-8', errors='replace').strip()
-                    except:
-                        pass
-            except Exception as e:
-                logger.debug(f"Could not read previous pipeline output: {e}")
-            
-            if stderr_output:
-                logger.error(f"Previous pipeline stderr:\n{stderr_output}")
-            if stdout_output:
-                logger.error(f"Previous pipeline stdout:\n{stdout_output}")
-            
-            _pipeline_proc = None
+            logger.error("No output captured. Pipeline may have failed during initialization.")
+            logger.error("Common causes:")
+            logger.error("  - Camera device busy (another process using it)")
+            logger.error("  - nvargus-daemon not running or needs restart")
+            logger.error("  - Permission problems")
+            logger.error("  - Invalid GStreamer pipeline syntax")
+    else:
+        logger.error(f"Pipeline {context} (exit code: {exit_code})")
+    
+    if category == ERROR_CAPTURE and _running_backend is not None and _running_backend.uses_nvargus:
+        _nvargus_restart_needed = True  # Next start restarts nvargus-daemon first
+    _last_exit = (context, category, exit_code)
+    if _latency_probe is not None:
+        _latency_probe.detach()
+        _latency_probe = None
+    _pipeline_proc = None
+    _pipeline_output = None
+    if _pidfile is not None:
+        _pidfile.update(None)
+    return category
+
+
+def cleanup_orphaned_pipelines(previous_pid: Optional[int]) -> None:
+    """
+    Stop pipelines left behind by a previous supervisor (startup only).
+    
+    Our own children are tracked in-process, so orphans can only come from a
+    supervisor that crashed or was killed. The PID it recorded in the pidfile
+    is checked first; /proc is then scanned once for any other match.
+    
+    Args:
+        previous_pid: Pipeline PID recorded by the previous supervisor
+    """
+    pids = set(find_processes(PIPELINE_PATTERN))
+    if previous_pid:
+        cmdline = read_cmdline(previous_pid)
+        if cmdline and re.search(PIPELINE_PATTERN, cmdline):
+            pids.add(previous_pid)
+    if not pids:
+        logger.debug("No orphaned pipeline processes found")
+        return
+    
+    logger.warning(f"Found {len(pids)} orphaned pipeline process(es): {sorted(pids)}. Stopping them...")
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError) as e:
+            logger.warning(f"Could not stop PID {pid}: {e}")
     
-    # Try to restart nvargus-daemon before starting pipeline (optional, may fail if sudo requires password)
-    # If it fails, we continue anyway - the pipeline might work without restart
-    nvargus_restarted = restart_nvargus_daemon()
+    deadline = time.monotonic() + 3.0
+    # Exited (or zombie) processes have an empty cmdline
+    while time.monotonic() < deadline and any(read_cmdline(pid) for pid in pids):
+        time.sleep(0.1)
+    for pid in pids:
+        if read_cmdline(pid):
+            logger.warning(f"Orphaned pipeline PID {pid} ignored SIGTERM, killing")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+
+def _on_pipeline_marker(name: str, seen_at: float) -> None:
+    """Record startup timings for the start in progress (drainer thread)."""
+    global _nvargus_restart_needed
+    if name not in ("first_frame", "first_packet") or _start_context is None:
+        return
+    started_at, path = _start_context
+    elapsed_ms = (seen_at - started_at) * 1000.0
+    samples = _startup_stats.setdefault((path, name), deque(maxlen=20))
+    samples.append(elapsed_ms)
+    if name == "first_frame":
+        _nvargus_restart_needed = False
+    logger.info("Time to %s: %.0f ms (%s; mean %.0f ms over last %d starts)",
+                name.replace("_", " "), elapsed_ms, path, sum(samples) / len(samples), len(samples))
+
+
+def get_startup_stats() -> Dict[str, Dict[str, dict]]:
+    """
+    Startup timings per start path ("direct" / "nvargus-restart").
     
-    # Only wait if we successfully restarted nvargus-daemon
-    if nvargus_restarted:
+    Returns:
+        Dict of path to {marker: {"count", "last_ms", "mean_ms"}} for the
+        "first_frame" and "first_packet" markers
+    """
+    stats: Dict[str, Dict[str, dict]] = {}
+    for (path, name), samples in _startup_stats.items():
+        if samples:
+            stats.setdefault(path, {})[name] = {
+                "count": len(samples), "last_ms": samples[-1], "mean_ms": sum(samples) / len(samples),
+            }
+    return stats
+
+
+def _restart_nvargus_and_settle() -> None:
+    """Restart nvargus-daemon and give it time to come back."""
+    if restart_nvargus_daemon():
         logger.debug("Waiting for nvargus-daemon to stabilize...")
         time.sleep(2)
     else:
         logger.debug("Skipping nvargus-daemon stabilization wait (restart was skipped)")
+
+
+def _launch_pipeline(config: StreamConfig) -> Tuple[bool, Optional[str]]:
+    """
+    Launch gst-launch and wait until video is actually flowing.
     
-    # Build and launch pipeline
-    gst_cmd = build_gstreamer_pipeline(config)
+    The start completes when rtph264pay produces its first packet (seen in
+    the ``-v`` output), fails as soon as the process exits or reports an
+    ERROR-level message, and gives up after READY_TIMEOUT seconds. Other
+    classified lines (warnings, Argus diagnostics) are counted but don't
+    abort the start.
     
-    try:
-        logger.info(f"Starting GStreamer pipeline to {config.control_station_host}:{config.video_port}...")
+    Args:
+        config: Stream configuration
+        
+    Returns:
+        (started, error category); the category is set when the launch failed
+        with a classified error
+    """
+    global _pipeline_proc, _pipeline_output, _running_backend
+    
+    _running_backend = get_backend(config.pipeline_backend)
+    if use_inprocess_pipeline():
+        description = build_pipeline_description(config)
+        logger.info(f"Starting in-process GStreamer pipeline to {config.control_station_host}:{config.video_port}...")
+        logger.debug(f"Pipeline: {description}")
+        # Bus messages are fed in as lines; readiness markers come from pad probes
+        _pipeline_output = OutputDrainer(
+            None, max_lines=_output_buffer_lines, on_error=_on_pipeline_error,
+            on_marker=_on_pipeline_marker,
+        )
+        _pipeline_proc = gst_pipeline.InProcessPipeline(description, _pipeline_output)
+    else:
+        record = _recording_requested and config.recording is not None
+        if record:
+            os.makedirs(config.recording.directory, exist_ok=True)
+        gst_cmd = build_gstreamer_pipeline(config, record)
+        logger.info("Starting GStreamer pipeline to %s...",
+                    ", ".join(f"{host}:{port}" for host, port in stream_destinations(config)))
         logger.debug(f"Command: {' '.join(gst_cmd)}")
         
         _pipeline_proc = subprocess.Popen(
             gst_cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True
+            universal_newlines=True,
+            bufsize=1,
         )
+        # Drain both pipes continuously: a full pipe blocks GStreamer and stalls video
+        _pipeline_output = OutputDrainer(
+            _pipeline_proc, max_lines=_output_buffer_lines, on_error=_on_pipeline_error,
+            markers=pipeline_markers(_running_backend), on_marker=_on_pipeline_marker,
+        )
+    if _pidfile is not None:
+        _pidfile.update(_pipeline_proc.pid)
+    
+    if _pipeline_output.wait_for("first_packet", timeout=READY_TIMEOUT, stop_on_fatal=True):
+        if _recording_requested and isinstance(_pipeline_proc, gst_pipeline.InProcessPipeline):
+            _attach_recording(config)
+        if LATENCY_PROBE_PORT:
+            _attach_latency_probe(config)
+        return True, None
+    
+    poll_result = _pipeline_proc.poll()
+    context = "failed to start"
+    if poll_result is None:
+        # Errored or stuck without exiting: it will not recover on its own
+        if _pipeline_output.fatal_error is None:
+            context = (f"not ready after {READY_TIMEOUT:.1f}s "
+                       f"(reached PLAYING: {'playing' in _pipeline_output.marker_times})")
+        _pipeline_proc.terminate()
+        try:
+            poll_result = _pipeline_proc.wait(timeout=3.0)
+        except subprocess.TimeoutExpired:
+            _pipeline_proc.kill()
+            poll_result = _pipeline_proc.wait()
+    return False, report_pipeline_exit(context, poll_result)
+
+
+def _attach_recording(config: StreamConfig) -> bool:
+    """Attach the recording branch to the running in-process pipeline."""
+    global _recording_branch
+    rec = config.recording
+    if rec is None or _recording_branch is not None:
+        return _recording_branch is not None
+    branch = recorder.RecordingBranch(_pipeline_proc, rec.directory, rec.format, rec.segment_seconds)
+    try:
+        branch.start()
+    except Exception as e:
+        logger.error(f"Could not start recording: {e}")
+        return False
+    _recording_branch = branch
+    return True
+
+
+def _attach_latency_probe(config: StreamConfig) -> None:
+    """Send per-frame timestamps to the control station (in-process pipeline only)."""
+    global _latency_probe, _latency_probe_warned
+    if not isinstance(_pipeline_proc, gst_pipeline.InProcessPipeline):
+        if not _latency_probe_warned:
+            logger.warning("Latency measurement needs the in-process pipeline; frame timestamps disabled")
+            _latency_probe_warned = True
+        return
+    probe = LatencyProbe(_pipeline_proc, config.control_station_host, LATENCY_PROBE_PORT)
+    try:
+        probe.attach()
+    except Exception as e:
+        logger.error(f"Could not attach latency probe: {e}")
+        probe.detach()
+        return
+    _latency_probe = probe
+
+
+def start_recording(config: StreamConfig) -> str:
+    """
+    Start recording.
+    
+    Returns:
+        "started" (branch attached live), "restart" (gst-launch: the pipeline
+        must restart with the branch), "pending" (starts with the pipeline)
+    
+    Raises:
+        RuntimeError: If the configuration has no recording section or the branch failed
+    """
+    global _recording_requested
+    if config.recording is None:
+        raise RuntimeError("no 'recording' section in stream_config.json")
+    _recording_requested = True
+    if _pipeline_proc is None or _pipeline_proc.poll() is not None:
+        return "pending"
+    if isinstance(_pipeline_proc, gst_pipeline.InProcessPipeline):
+        if not _attach_recording(config):
+            raise RuntimeError("recording branch could not be attached (see supervisor log)")
+        return "started"
+    return "restart"
+
+
+def stop_recording() -> str:
+    """
+    Stop recording.
+    
+    Returns:
+        "stopped", or "restart" if a gst-launch pipeline has to restart without the branch
+    """
+    global _recording_requested, _recording_branch
+    was_requested = _recording_requested
+    _recording_requested = False
+    if _recording_branch is not None:
+        branch, _recording_branch = _recording_branch, None
+        branch.stop()
+        return "stopped"
+    if was_requested and _pipeline_proc is not None and not isinstance(_pipeline_proc, gst_pipeline.InProcessPipeline):
+        return "restart"
+    return "stopped"
+
+
+def get_recording_status(config: StreamConfig, ring: Optional[recorder.SegmentRing]) -> dict:
+    """Recording state, branch counters (in-process) and disk usage."""
+    running = _pipeline_proc is not None and _pipeline_proc.poll() is None
+    branch = _recording_branch
+    return {
+        "configured": config.recording is not None,
+        "requested": _recording_requested,
+        "active": branch is not None if isinstance(_pipeline_proc, gst_pipeline.InProcessPipeline)
+        else _recording_requested and running,
+        "format": config.recording.format if config.recording is not None else None,
+        "segment_seconds": config.recording.segment_seconds if config.recording is not None else None,
+        "branch": branch.stats() if branch is not None else None,
+        "disk": ring.stats() if ring is not None else None,
+    }
+
+
+def start_pipeline(config: StreamConfig) -> bool:
+    """
+    Start GStreamer pipeline.
+    
+    The pipeline is started directly; nvargus-daemon is only restarted when
+    the start (or the previous run) failed with a capture/Argus error.
+    
+    Args:
+        config: Stream configuration
         
-        # Give it a moment to start and check for immediate failures
-        time.sleep(1.5)  # Wait a bit longer to catch initialization errors
-        
-        # Check if it's still running
+    Returns:
+        True if pipeline started successfully, False otherwise
+    """
+    global _pipeline_proc, _pipeline_output, _start_context, _last_exit
+    
+    # Duplicates are prevented by the supervisor lock and the single tracked
+    # child (orphans are cleaned up once at startup), so no process scan here
+    if _pipeline_proc is not None:
+        # Pipeline already running, check if it's still alive
         poll_result = _pipeline_proc.poll()
-        if poll_result is not None:
-            # Process died immediately - read stderr for diagnostics
-            stderr_output = ""
-            stdout_output = ""
-            try:
-                # Use communicate() with timeout to get all output
-                try:
-                    stdout_bytes, stderr_bytes = _pipeline_proc.communicate(timeout=2.0)
-                    if stderr_bytes:
-                        stderr_output = stderr_bytes.decode('utf-8', errors='replace').strip()
-                    if stdout_bytes:
-                        stdout_output = stdout_bytes.decode('utf-8', errors='replace').strip()
-                except subprocess.TimeoutExpired:
-                    # Process is still running? That's unexpected if poll() returned non-None
-                    # Try to kill it and read what we can
-                    _pipeline_proc.kill()
-                    try:
-                        stdout_bytes, stderr_bytes = _pipeline_proc.communicate(timeout=1.0)
-                        if stderr_bytes:
-                            stderr_output = stderr_bytes.decode('utf-8', errors='replace').strip()
-                        if stdout_bytes:
-                            stdout_output = stdout_bytes.decode('utf-8', errors='replace').strip()
-                    except:
-                        pass
-            except Exception as e:
-                stderr_output = f"Could not read stderr: {e}"
-            
-            logger.error(f"Pipeline failed to start (exit code: {poll_result})")
-            if stderr_output:
-                # Log stderr (most important for GStreamer errors)
-                logger.error(f"GStreamer stderr:\n{stderr_output}")
-            if stdout_output:
-                # Log stdout (may contain useful info)
-                logger.error(f"GStreamer stdout:\n{stdout_output}")
-            if not stderr_output and not stdout_output:
-                logger.error("No output captured. Pipeline may have failed during initialization.")
-                logger.error("Common causes:")
-                logger.error("  - Camera device busy (another process using it)")
-                logger.error("  - nvargus-daemon not running or needs restart")
-                logger.error("  - Permission problems")
-                logger.error("  - Invalid GStreamer pipeline syntax")
-            _pipeline_proc = None
-            return False
+        if poll_result is None:
+            logger.debug("Pipeline already running")
+            return True
+        else:
+            # Pipeline died - report the drained output
+            report_pipeline_exit("died (previous run)", poll_result)
+    
+    started_at = time.monotonic()
+    path = "direct"
+    if _nvargus_restart_needed and get_backend(config.pipeline_backend).uses_nvargus:
+        logger.info("Previous run failed in the capture session, restarting nvargus-daemon first")
+        _restart_nvargus_and_settle()
+        path = "nvargus-restart"
+    
+    try:
+        _start_context = (started_at, path)
+        started, category = _launch_pipeline(config)
+        if (not started and category == ERROR_CAPTURE and path == "direct"
+                and get_backend(config.pipeline_backend).uses_nvargus):
+            logger.warning("Capture session failed, restarting nvargus-daemon and retrying")
+            _restart_nvargus_and_settle()
+            _start_context = (started_at, "nvargus-restart")
+            started, category = _launch_pipeline(config)
         
-        logger.info("GStreamer pipeline started successfully")
+        if not started:
+            return False
+        logger.info("GStreamer pipeline started successfully (%s)", _start_context[1])
         return True
         
     except Exception as e:
         logger.error(f"Failed to start pipeline: {e}", exc_info=True)
+        _last_exit = (f"failed to start: {e}", None, None)
         _pipeline_proc = None
+        _pipeline_output = None
         return False
 
 
 def stop_pipeline() -> None:
     """
-    Stop GStreamer pipeline gracefully.
-    Also stops any duplicate pipelines that may be running.
+    Stop the supervised GStreamer pipeline gracefully.
     """
-    global _pipeline_proc
+    global _pipeline_proc, _pipeline_output, _recording_branch, _latency_probe
     
     logger.info("Stopping GStreamer pipeline...")
+    # The EOS sent on terminate also reaches the recording branch and closes its last segment
+    _recording_branch = None
+    if _latency_probe is not None:
+        _latency_probe.detach()
+        _latency_probe = None
     
     # Stop managed pipeline
     if _pipeline_proc is not None:
@@ -349,190 +905,725 @@ def stop_pipeline() -> None:
         except Exception as e:
             logger.error(f"Error stopping managed pipeline: {e}")
         finally:
+            if _pipeline_output is not None:
+                _pipeline_output.join(timeout=1.0)
             _pipeline_proc = None
+            _pipeline_output = None
+            if _pidfile is not None:
+                _pidfile.update(None)
+
+
+def get_encoder_stats(config: StreamConfig) -> dict:
+    """
+    Encoder output rate.
     
-    # Safety: Also check for and stop any orphaned pipelines
+    Measured from the encoder's src pad with the in-process pipeline; with
+    gst-launch only the configured values are known.
+    
+    Returns:
+        {"measured", "fps", "bitrate_kbps", "frames", "target_bitrate", "target_framerate"}
+    """
+    proc = _pipeline_proc
+    target_bitrate, target_framerate = config.bitrate, config.framerate
+    if isinstance(proc, gst_pipeline.InProcessPipeline) and proc.poll() is None:
+        try:
+            # Adaptive bitrate moves it
+            target_bitrate = _running_backend.from_element("bitrate", proc.get_property("bitrate"))
+        except Exception:
+            pass
+    stats = {
+        "measured": False, "fps": None, "bitrate_kbps": None, "frames": None,
+        "target_bitrate": target_bitrate, "target_framerate": target_framerate,
+    }
+    if not isinstance(proc, gst_pipeline.InProcessPipeline) or proc.poll() is not None:
+        _encoder_meter.reset()
+        return stats
+    frames, sent = proc.encoder_counters()
+    rates = _encoder_meter.update((frames, sent))
+    stats.update(measured=True, frames=frames)
+    if rates is not None:
+        stats.update(fps=round(rates[0], 1), bitrate_kbps=round(rates[1] * 8 / 1000.0, 1))
+    return stats
+
+
+class Hysteresis:
+    """
+    Debounced boolean condition.
+    
+    Flips to True after ``up_after`` consecutive True samples and to False
+    after ``down_after`` consecutive False samples, so a single lost probe
+    does not stop the stream and a single lucky one does not start it.
+    
+    Args:
+        up_after: Consecutive True samples needed to switch on
+        down_after: Consecutive False samples needed to switch off
+        initial: Starting state
+    """
+    
+    def __init__(self, up_after: int, down_after: int, initial: bool = False):
+        self.up_after = up_after
+        self.down_after = down_after
+        self.state = initial
+        self._streak = 0
+    
+    def update(self, sample: bool) -> bool:
+        """
+        Feed one sample.
+        
+        Returns:
+            True if the state changed
+        """
+        if sample == self.state:
+            self._streak = 0
+            return False
+        self._streak += 1
+        if self._streak >= (self.up_after if sample else self.down_after):
+            self.state = sample
+            self._streak = 0
+            return True
+        return False
+
+
+async def probe_host(host: str, port: int, timeout: float = 1.0) -> bool:
+    """
+    Async version of check_host_reachable (TCP connect attempt).
+    
+    Args:
+        host: Hostname or IP address
+        port: TCP port
+        timeout: Connection timeout in seconds (includes DNS resolution)
+        
+    Returns:
+        True if connection succeeds, False otherwise
+    """
     try:
-        existing_processes = subprocess.run(
-            ["pgrep", "-f", "gst-launch-1.0.*nvarguscamerasrc"],
-            capture_output=True,
-            text=True
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError) as e:
+        logger.debug(f"Connection check failed for {host}:{port}: {e!r}")
+        return False
+    writer.close()
+    return True
+
+
+class AsyncSupervisor:
+    """
+    Event-driven supervisor: probes, SSID checks and the pipeline lifecycle
+    run as concurrent tasks on one asyncio loop.
+    
+    - ``_probe_backend`` / ``_watch_ssid`` sample every ``_probe_interval``
+      seconds and feed Hysteresis filters; a state change wakes the reconciler
+    - ``_watch_child`` waits on the pipeline process in an executor thread and
+      wakes the reconciler the moment it exits
+    - ``_reconcile`` starts/stops the pipeline; blocking steps (nvargus
+      restart, pipeline start/stop) run in executor threads so probing
+      continues meanwhile, and failure backoff is a deadline, not a sleep
+    - ``_watch_config`` reloads stream_config.json when it changes: invalid
+      files are rejected, live-changeable properties are applied to the
+      running pipeline and the rest schedules a restart at the next
+      reconciler step
+    - ``health`` records probe history, pipeline starts and failures for
+      the control API's GET /health
+    
+    Args:
+        config: Stream configuration
+        loop: Event loop the supervisor runs on
+        feedback: Receiver feedback for adaptive bitrate (None = fixed bitrate)
+        config_path: File the configuration was loaded from (watched for changes)
+    """
+    
+    def __init__(self, config: StreamConfig, loop: asyncio.AbstractEventLoop,
+                 feedback: Optional[FeedbackSource] = None, config_path=None):
+        self.config = config
+        self.loop = loop
+        self.feedback = feedback
+        self.config_path = config_path or get_config_path()
+        self.bitrate_controller = self._build_bitrate_controller()
+        self.recording_ring = self._build_recording_ring()
+        global _recording_requested
+        _recording_requested = config.recording is not None and config.recording.enabled
+        self.backend = Hysteresis(_link_up_after, _link_down_after)
+        # Without a required SSID the condition is always met
+        self.ssid = Hysteresis(_link_up_after, _link_down_after, initial=not config.ssid)
+        self._wake = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._expected_exit: Optional[subprocess.Popen] = None
+        self._next_start_at = 0.0
+        self._consecutive_failures = 0
+        self._starting = False
+        self._pending_restart: Optional[str] = None  # Config fields waiting for a pipeline restart
+        self._status_log_limiter = RateLimiter("supervisor.status", 1.0 / 60.0)
+        self._waiting_log_limiter = RateLimiter("supervisor.waiting", 1.0 / 30.0)
+        self._retry_log_limiter = RateLimiter("supervisor.retry", 0.2)
+        self.health = SupervisorHealth()
+    
+    def _build_bitrate_controller(self) -> Optional[AimdBitrateController]:
+        abr = self.config.adaptive_bitrate
+        if self.feedback is None or abr is None or not abr.enabled:
+            return None
+        if not use_inprocess_pipeline():
+            logger.warning("Adaptive bitrate needs the in-process pipeline (python3-gi); using a fixed bitrate")
+            return None
+        return AimdBitrateController(
+            self.config.bitrate, abr.min_bitrate, abr.max_bitrate, self.config.framerate,
+            min_framerate=abr.min_framerate, adapt_framerate=abr.adapt_framerate,
         )
-        if existing_processes.returncode == 0:
-            pids = existing_processes.stdout.strip().split('\n')
-            pids = [p for p in pids if p and p != str(os.getpid())]
-            if pids:
-                logger.warning(f"Found {len(pids)} orphaned pipeline process(es): {pids}. Stopping them...")
-                for pid in pids:
+    
+    def _build_recording_ring(self) -> Optional[recorder.SegmentRing]:
+        rec = self.config.recording
+        if rec is None:
+            return None
+        return recorder.SegmentRing(rec.directory, rec.quota_mb * 1000000)
+    
+    def _reconfigure_feedback(self) -> None:
+        """Open / move / close the receiver feedback socket for a new adaptive_bitrate section."""
+        abr = self.config.adaptive_bitrate
+        port = abr.feedback_port if abr is not None and abr.enabled else None
+        current = getattr(self.feedback, "port", None)
+        if port == current:
+            return
+        if self.feedback is not None:
+            self.feedback.close()
+            self.feedback = None
+        if port is not None:
+            try:
+                self.feedback = UdpFeedbackSource(port)
+            except OSError as e:
+                logger.warning(f"Cannot listen for receiver feedback on UDP {port} ({e}); fixed bitrate")
+    
+    def request_stop(self) -> None:
+        """Ask the supervisor to shut down (signal handler)."""
+        self._stop.set()
+        self._wake.set()
+    
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep, returning early on shutdown."""
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+    
+    def _reasons(self) -> str:
+        reason = []
+        if not self.backend.state:
+            reason.append(f"backend unreachable at {self.config.control_station_host}:{self.config.backend_port}")
+        if not self.ssid.state:
+            reason.append(f"SSID mismatch (required: {self.config.ssid})")
+        return ", ".join(reason)
+    
+    async def _probe_backend(self) -> None:
+        while not self._stop.is_set():
+            ok = await probe_host(self.config.control_station_host, self.config.backend_port, _probe_timeout)
+            changed = self.backend.update(ok)
+            self.health.backend.record(ok, self.backend.state)
+            if changed:
+                logger.info("Backend %s:%d %s", self.config.control_station_host, self.config.backend_port,
+                            "reachable" if ok else "unreachable")
+                self._wake.set()
+            await self._sleep(_probe_interval)
+    
+    async def _watch_ssid(self) -> None:
+        while not self._stop.is_set():
+            # Re-read every time: a config reload can add or remove the SSID requirement
+            required = self.config.ssid
+            ok = True
+            if required:
+                ok = await self.loop.run_in_executor(None, check_ssid_match, required)
+            changed = self.ssid.update(ok)
+            self.health.ssid.record(ok, self.ssid.state)
+            if changed:
+                logger.info(f"SSID {required or '(check disabled)'} {'matched' if ok else 'lost'}")
+                self._wake.set()
+            await self._sleep(_probe_interval)
+    
+    async def _watch_child(self, proc: subprocess.Popen) -> None:
+        exit_code = await self.loop.run_in_executor(None, proc.wait)
+        if proc is self._expected_exit or proc is not _pipeline_proc:
+            return  # Stopped by us
+        # Joins the drainer threads: keep it off the loop
+        category = await self.loop.run_in_executor(None, report_pipeline_exit, "died unexpectedly", exit_code)
+        self.health.failure("exited", category, "died unexpectedly", exit_code)
+        self._wake.set()
+    
+    async def _adapt_bitrate(self) -> None:
+        while not self._stop.is_set():
+            await self._sleep(_abr_interval)
+            # Re-read every time: a config reload can enable, disable or rebuild the controller
+            controller = self.bitrate_controller
+            if controller is None or self.feedback is None:
+                continue
+            report = self.feedback.poll()
+            if _pipeline_proc is None:
+                continue  # Nothing to adapt; the controller is reset on start
+            previous_bitrate, previous_framerate = controller.bitrate, controller.framerate
+            decision = controller.update(report)
+            if decision.action == ACTION_HOLD:
+                continue
+            changes = {"bitrate": decision.bitrate}
+            if decision.framerate != previous_framerate:
+                changes["camera_caps"] = camera_caps(self.config, decision.framerate)
+            try:
+                applied = update_pipeline(**changes)
+                error = ""
+            except Exception as e:
+                applied, error = False, f": {e}"
+            if not applied:
+                # Keep stepping from what the encoder actually runs at
+                controller.rollback(previous_bitrate, previous_framerate)
+                logger.warning(f"Bitrate decision {decision} not applied{error}; staying at "
+                               f"{previous_bitrate} bps, {previous_framerate} fps")
+    
+    async def _watch_config(self) -> None:
+        if not CONFIG_RELOAD:
+            return
+        watcher = ConfigWatcher(self.config_path)
+        changed = asyncio.Event()
+        fd = watcher.fileno()
+        if fd is not None:
+            self.loop.add_reader(fd, changed.set)
+        try:
+            while not self._stop.is_set():
+                if fd is not None:
                     try:
-                        os.kill(int(pid), 15)  # SIGTERM
-                        logger.info(f"Sent SIGTERM to orphaned pipeline PID {pid}")
-                    except (ValueError, ProcessLookupError, PermissionError) as e:
-                        logger.warning(f"Could not stop PID {pid}: {e}")
-    except Exception as e:
-        logger.warning(f"Error checking for orphaned pipelines: {e}")
+                        await asyncio.wait_for(changed.wait(), _probe_interval)
+                    except asyncio.TimeoutError:
+                        continue
+                    changed.clear()
+                else:
+                    await self._sleep(_config_poll_interval)
+                await self._sleep(_config_settle)
+                if watcher.check():
+                    self.reload_config()
+        finally:
+            if fd is not None:
+                self.loop.remove_reader(fd)
+            watcher.close()
+    
+    def reload_config(self) -> bool:
+        """
+        Load the configuration file and apply what changed.
+        
+        Returns:
+            True if a valid configuration with changes was applied
+        """
+        try:
+            new = load_config(self.config_path)
+        except StreamConfigError as e:
+            logger.error(f"Config change rejected, keeping the running configuration: {e}")
+            return False
+        plan = plan_config_changes(self.config, new)
+        if plan.empty:
+            logger.info("Config file changed, nothing to apply")
+            return False
+        logger.info(f"Config reloaded ({plan})")
+        self.apply_config(new, plan)
+        return True
+    
+    def apply_config(self, new: StreamConfig, plan: ConfigChangePlan) -> list:
+        """
+        Switch to a new configuration with as little interruption as possible.
+        
+        Args:
+            new: Validated configuration
+            plan: plan_config_changes(self.config, new)
+        
+        Returns:
+            Fields waiting for a pipeline restart (empty if everything applied live
+            or no pipeline is running)
+        """
+        self.config = new
+        if "recording" in plan.supervisor or "recording" in plan.restart:
+            self.recording_ring = self._build_recording_ring()
+        if "adaptive_bitrate" in plan.supervisor:
+            self._reconfigure_feedback()
+            self.bitrate_controller = self._build_bitrate_controller()
+        elif self.bitrate_controller is not None and ("bitrate" in plan.live or "camera_caps" in plan.live):
+            self.bitrate_controller = self._build_bitrate_controller()
+        
+        pipeline_active = _pipeline_proc is not None or self._starting
+        restart = list(plan.restart)
+        if plan.live and pipeline_active:
+            try:
+                # Live changes are pointless if the pipeline restarts anyway
+                applied = not (self._starting or restart) and update_pipeline(**plan.live)
+            except Exception as e:
+                logger.warning(f"Could not apply {sorted(plan.live)} live: {e}")
+                applied = False
+            if not applied:
+                restart.extend(sorted(plan.live))
+        if not pipeline_active:
+            restart = []  # The next start uses the new configuration
+        if restart:
+            if self._pending_restart:
+                restart = [field for field in self._pending_restart.split(", ") if field not in restart] + restart
+            self._pending_restart = ", ".join(restart)
+            logger.info(f"Pipeline restart scheduled to apply: {self._pending_restart}")
+        # Probes and the SSID check read self.config on their next iteration
+        self._wake.set()
+        return restart
+    
+    def list_presets(self, _body: Optional[dict] = None) -> Tuple[int, dict]:
+        """GET /presets: defined presets, the active one and the values in effect."""
+        config = self.config
+        return 200, {
+            "active": config.active_preset,
+            "presets": {name: preset.as_dict() for name, preset in sorted((config.presets or {}).items())},
+            "current": {
+                "resolution": {"width": config.resolution.width, "height": config.resolution.height},
+                "framerate": config.framerate,
+                "bitrate": config.bitrate,
+                "iframe_interval": config.iframe_interval,
+                "encoder": dict(config.encoder or {}),
+            },
+        }
+    
+    def select_preset(self, body: Optional[dict]) -> Tuple[int, dict]:
+        """
+        POST /presets/active {"name": <preset or null>}: switch preset.
+        
+        The choice is saved in stream_config.json (so it survives restarts) and
+        applied right away: live where possible, otherwise with a pipeline restart.
+        """
+        if not isinstance(body, dict) or "name" not in body:
+            raise ApiError(400, 'Body must be {"name": <preset name or null>}')
+        name = body["name"]
+        if name is not None and name not in (self.config.presets or {}):
+            raise ApiError(404, f"Unknown preset: {name} (defined: {', '.join(sorted(self.config.presets or {}))})")
+        try:
+            set_active_preset(name, self.config_path)
+            new = load_config(self.config_path)
+        except StreamConfigError as e:
+            raise ApiError(400, str(e))
+        plan = plan_config_changes(self.config, new)
+        logger.info(f"Preset {name or '(none)'} selected ({plan})")
+        restart = self.apply_config(new, plan) if not plan.empty else []
+        return 200, {
+            "active": name,
+            "live": [name for name in sorted(plan.live) if name not in restart],
+            "restart": restart,
+        }
+    
+    def list_destinations(self, _body: Optional[dict] = None) -> Tuple[int, dict]:
+        """GET /destinations: stream receivers with their send statistics."""
+        config = self.config
+        stats = {(entry["host"], entry["port"]): entry for entry in get_destination_stats()}
+        destinations = []
+        for index, (host, port) in enumerate(stream_destinations(config)):
+            entry = {"host": host, "port": port, "primary": index == 0,
+                     "multicast": Destination(host, port).multicast,
+                     "bytes_sent": None, "packets_sent": None, "send_kbps": None}
+            entry.update({k: v for k, v in stats.get((host, port), {}).items() if k not in ("host", "port")})
+            destinations.append(entry)
+        return 200, {
+            "mode": "fanout" if config.destinations is not None else "single",
+            "multicast_ttl": config.multicast_ttl,
+            "destinations": destinations,
+        }
+    
+    def _change_destinations(self, body: Optional[dict], add: bool) -> Tuple[int, dict]:
+        if not isinstance(body, dict) or not isinstance(body.get("host"), str) or not isinstance(body.get("port"), int):
+            raise ApiError(400, 'Body must be {"host": <host>, "port": <port>}')
+        destination = Destination(body["host"], body["port"])
+        current = list(self.config.destinations or [])
+        if add:
+            if destination in current or (destination.host, destination.port) == stream_destinations(self.config)[0]:
+                raise ApiError(409, f"{destination} is already a destination")
+            current.append(destination)
+        else:
+            if destination not in current:
+                raise ApiError(404, f"{destination} is not a fan-out destination")
+            current.remove(destination)
+        try:
+            update_config_file({"destinations": [d.as_dict() for d in current]}, self.config_path)
+            new = load_config(self.config_path)
+        except StreamConfigError as e:
+            raise ApiError(400, str(e))
+        plan = plan_config_changes(self.config, new)
+        logger.info(f"Destination {destination} {'added' if add else 'removed'} ({plan})")
+        restart = self.apply_config(new, plan)
+        status, listing = self.list_destinations()
+        listing["restart"] = restart
+        return status, listing
+    
+    def add_destination(self, body: Optional[dict]) -> Tuple[int, dict]:
+        """POST /destinations/add {"host", "port"}: send the stream to one more receiver."""
+        return self._change_destinations(body, add=True)
+    
+    def remove_destination(self, body: Optional[dict]) -> Tuple[int, dict]:
+        """POST /destinations/remove {"host", "port"}: stop sending to a receiver."""
+        return self._change_destinations(body, add=False)
+    
+    def recording_status(self, _body: Optional[dict] = None) -> Tuple[int, dict]:
+        """GET /recording: state, dropped buffers, segment throughput and disk usage."""
+        return 200, get_recording_status(self.config, self.recording_ring)
+    
+    async def _recording_action(self, action) -> Tuple[int, dict]:
+        try:
+            result = await self.loop.run_in_executor(None, action)
+        except RuntimeError as e:
+            raise ApiError(409, str(e))
+        if result == "restart":
+            pending = self._pending_restart.split(", ") if self._pending_restart else []
+            self._pending_restart = ", ".join(pending + ["recording"] if "recording" not in pending else pending)
+            self._wake.set()
+        _, status = self.recording_status()
+        status["result"] = result
+        return 200, status
+    
+    async def start_recording(self, _body: Optional[dict] = None) -> Tuple[int, dict]:
+        """POST /recording/start"""
+        return await self._recording_action(lambda: start_recording(self.config))
+    
+    async def stop_recording(self, _body: Optional[dict] = None) -> Tuple[int, dict]:
+        """POST /recording/stop"""
+        return await self._recording_action(stop_recording)
+    
+    async def _maintain_recordings(self) -> None:
+        while not self._stop.is_set():
+            ring = self.recording_ring
+            if ring is not None:
+                await self.loop.run_in_executor(None, ring.enforce)
+            await self._sleep(_recording_check_interval)
+    
+    def pipeline_state(self) -> Tuple[str, str]:
+        """
+        Pipeline state and why it is in it.
+        
+        Returns:
+            (state, reason); state is "running", "starting", "backoff" (waiting
+            to retry after a failure), "waiting" (backend / SSID conditions not
+            met) or "stopped"
+        """
+        proc = _pipeline_proc
+        if self._starting:
+            return "starting", ""
+        if proc is not None and proc.poll() is None:
+            return "running", ""
+        if not (self.backend.state and self.ssid.state):
+            return "waiting", self._reasons()
+        failure = self.health.last_failure
+        if self._next_start_at > time.time() and failure is not None:
+            return "backoff", f"{failure['context']} ({failure['class']})"
+        return "stopped", ""
+    
+    def get_health(self, _body: Optional[dict] = None) -> Tuple[int, dict]:
+        """GET /health: supervisor and pipeline state, failures, reachability, encoder, time to first frame."""
+        state, reason = self.pipeline_state()
+        health = self.health.snapshot()
+        backend = self.health.backend.snapshot()
+        backend["target"] = f"{self.config.control_station_host}:{self.config.backend_port}"
+        ssid = self.health.ssid.snapshot()
+        ssid["required"] = self.config.ssid
+        return 200, {
+            "state": state,
+            "reason": reason,
+            "pipeline_mode": "in-process" if use_inprocess_pipeline() else "gst-launch",
+            "pipeline_backend": self.config.pipeline_backend,
+            "pipeline_pid": getattr(_pipeline_proc, "pid", None),
+            "active_preset": self.config.active_preset,
+            "consecutive_failures": self._consecutive_failures,
+            "next_start_in_s": round(max(0.0, self._next_start_at - time.time()), 1)
+            if state == "backoff" else None,
+            "pending_restart": self._pending_restart,
+            **health,
+            "reachability": {"backend": backend, "ssid": ssid},
+            "encoder": get_encoder_stats(self.config),
+            "startup": get_startup_stats(),
+        }
+    
+    def _register_api(self, server: ControlServer) -> None:
+        server.route("GET", "/health", self.get_health)
+        server.route("GET", "/presets", self.list_presets)
+        server.route("POST", "/presets/active", self.select_preset)
+        server.route("GET", "/destinations", self.list_destinations)
+        server.route("POST", "/destinations/add", self.add_destination)
+        server.route("POST", "/destinations/remove", self.remove_destination)
+        server.route("GET", "/recording", self.recording_status)
+        server.route("POST", "/recording/start", self.start_recording)
+        server.route("POST", "/recording/stop", self.stop_recording)
+    
+    async def _start(self) -> None:
+        logger.info(f"Backend reachable at {self.config.control_station_host}:{self.config.backend_port}, "
+                    f"starting pipeline...")
+        self._starting = True
+        try:
+            started = await self.loop.run_in_executor(None, start_pipeline, self.config)
+        finally:
+            self._starting = False
+        self._next_start_at = time.time() + _restart_delay
+        if started:
+            self.health.pipeline_started()
+            self._consecutive_failures = 0
+            if self.bitrate_controller is not None:
+                self.bitrate_controller.reset(self.config.bitrate)
+            asyncio.ensure_future(self._watch_child(_pipeline_proc))
+            return
+        context, category, exit_code = _last_exit or ("failed to start", None, None)
+        self.health.failure("start_failed", category, context, exit_code)
+        self._consecutive_failures += 1
+        logger.warning(f"Pipeline start failed (consecutive failures: {self._consecutive_failures})")
+        if self._consecutive_failures >= _max_consecutive_failures:
+            logger.error(f"Too many consecutive failures ({self._consecutive_failures}), "
+                         f"waiting {_failure_backoff:.0f}s...")
+            self._next_start_at = time.time() + _failure_backoff
+            self._consecutive_failures = 0
+    
+    async def _stop_pipeline(self, planned_restart: bool = False) -> None:
+        self._expected_exit = _pipeline_proc
+        await self.loop.run_in_executor(None, stop_pipeline)
+        self.health.pipeline_stopped(planned_restart)
+        self._consecutive_failures = 0
+    
+    async def _step(self) -> float:
+        """
+        Bring the pipeline in line with the current conditions.
+        
+        Returns:
+            Seconds until the next check is due without any event
+        """
+        should_run = self.backend.state and self.ssid.state
+        pipeline_running = _pipeline_proc is not None
+        
+        if self._pending_restart is not None:
+            pending, self._pending_restart = self._pending_restart, None
+            if should_run and pipeline_running:
+                logger.info(f"Restarting pipeline to apply config changes ({pending})")
+                await self._stop_pipeline(planned_restart=True)
+                self._next_start_at = 0.0  # Planned restart: no retry delay
+                return 0.0
+        
+        if should_run and not pipeline_running:
+            remaining = self._next_start_at - time.time()
+            if remaining > 0:
+                if self._retry_log_limiter.allow():
+                    logger.debug("Waiting %.1fs before retry...", remaining)
+                return remaining
+            await self._start()
+            return 0.0  # Conditions may have changed while starting
+        if not should_run and pipeline_running:
+            logger.info(f"Backend/SSID not OK ({self._reasons()}), stopping pipeline")
+            await self._stop_pipeline()
+        elif pipeline_running:
+            if self._status_log_limiter.allow():
+                health = self.health.snapshot()
+                logger.info("Pipeline running, backend reachable at %s:%d (up %.0fs, %d restarts)",
+                            self.config.control_station_host, self.config.backend_port,
+                            health["pipeline_uptime_s"] or 0.0, health["restarts"])
+        elif self._waiting_log_limiter.allow():
+            logger.info("Waiting for backend connectivity... (%s)", self._reasons())
+        return 30.0
+    
+    async def _reconcile(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                timeout = await self._step()
+            except Exception as e:
+                logger.error(f"Unexpected error in supervisor: {e}", exc_info=True)
+                timeout = 5.0
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+    
+    async def run(self) -> None:
+        """Run until request_stop() is called."""
+        probes = [
+            asyncio.ensure_future(self._probe_backend()),
+            asyncio.ensure_future(self._watch_ssid()),
+            asyncio.ensure_future(self._adapt_bitrate()),
+            asyncio.ensure_future(self._watch_config()),
+            asyncio.ensure_future(self._maintain_recordings()),
+        ]
+        api = None
+        if CONTROL_PORT:
+            if not CONTROL_TOKEN and CONTROL_BIND not in ("127.0.0.1", "localhost", "::1"):
+                logger.warning(f"Control API on {CONTROL_BIND}:{CONTROL_PORT} without MINICARS_CONTROL_TOKEN: "
+                               f"anyone on the network can change the stream")
+            api = ControlServer(self.loop, CONTROL_BIND, CONTROL_PORT, token=CONTROL_TOKEN)
+            self._register_api(api)
+            try:
+                await api.start()
+            except OSError as e:
+                logger.warning(f"Control API disabled, cannot listen on {CONTROL_BIND}:{CONTROL_PORT}: {e}")
+                api = None
+        # The reconciler exits on its own so an in-flight start/stop completes
+        await self._reconcile()
+        for task in probes:
+            task.cancel()
+        await asyncio.gather(*probes, return_exceptions=True)
+        if api is not None:
+            await api.stop()
 
 
 def main_loop(config: StreamConfig) -> None:
     """
-    Main supervisor loop.
+    Run the supervisor.
     
-    Monitors connectivity and manages pipeline lifecycle.
+    Monitors connectivity and manages pipeline lifecycle until SIGTERM/SIGINT.
     
     Args:
         config: Stream configuration
     """
-    global _pipeline_proc, _last_restart_attempt
+    global _pidfile
     
     logger.info("=" * 60)
     logger.info("MiniCars Stream Supervisor Starting")
     logger.info("=" * 60)
     logger.info(f"Control station: {config.control_station_host}")
     logger.info(f"  Video stream (UDP): port {config.video_port}")
+    if config.destinations is not None:
+        logger.info(f"  Fan-out destinations: {', '.join(map(repr, config.destinations)) or '(none yet)'}")
     logger.info(f"  Backend check (TCP): port {config.backend_port}")
     logger.info(f"SSID check: {config.ssid or '(disabled)'}")
+    if config.ssid:
+        logger.info(f"WiFi interface: {get_wifi_monitor().interface or '(none found)'}")
     logger.info(f"Resolution: {config.resolution.width}x{config.resolution.height}@{config.framerate}fps")
     logger.info(f"Bitrate: {config.bitrate} bps")
+    logger.info(f"Pipeline mode: {'in-process' if use_inprocess_pipeline() else 'gst-launch-1.0'} ({PIPELINE_MODE}), "
+                f"backend: {config.pipeline_backend} ({config.camera_device})")
+    logger.info(f"Probes: every {_probe_interval}s, up after {_link_up_after}, down after {_link_down_after}")
     logger.info("=" * 60)
     
-    # Safety check: Verify no other supervisor instance is running
-    current_pid = os.getpid()
-    supervisor_processes = subprocess.run(
-        ["pgrep", "-f", "stream_supervisor.py"],
-        capture_output=True,
-        text=True
-    )
-    if supervisor_processes.returncode == 0:
-        pids = [p for p in supervisor_processes.stdout.strip().split('\n') if p and p != str(current_pid)]
-        if pids:
-            logger.warning(f"WARNING: Found {len(pids)} other stream_supervisor process(es) with PIDs: {pids}")
-            logger.warning("Multiple supervisors may cause conflicts. Consider stopping duplicates.")
-    else:
-        logger.debug("No duplicate supervisor processes detected")
-    
-    iteration = 0
-    consecutive_failures = 0
-    max_consecutive_failures = 5
+    # Single instance: two supervisors would fight over the camera
+    pidfile = PidFile(SUPERVISOR_PIDFILE)
+    if not pidfile.acquire():
+        holder_pid, _ = pidfile.read()
+        logger.error(f"Another stream_supervisor is running (PID {holder_pid}, lock {SUPERVISOR_PIDFILE}) - exiting")
+        sys.exit(1)
+    previous_pipeline_pid = pidfile.previous_pipeline_pid()
+    pidfile.update(None)
+    _pidfile = pidfile
+    cleanup_orphaned_pipelines(previous_pipeline_pid)
     
-    while True:
-        iteration += 1
-        current_time = time.time()
-        
+    # Receiver QoS reports from the control station (adaptive bitrate)
+    feedback = None
+    abr = config.adaptive_bitrate
+    if abr is not None and abr.enabled:
         try:
-            # Check backend reachability (TCP port 8000 for backend API)
-            # This is more reliable than checking UDP video port
-            host_reachable = check_host_reachable(config.control_station_host, config.backend_port)
-            
-            # Check SSID if required
-            ssid_ok = check_ssid_match(config.ssid)
-            
-            should_run = host_reachable and ssid_ok
-            
-            # Pipeline state
-            pipeline_running = _pipeline_proc is not None and _pipeline_proc.poll() is None
-            
-            # Check if pipeline died while we thought it was running
-            if _pipeline_proc is not None and not pipeline_running:
-                # Pipeline died - capture error output
-                exit_code = _pipeline_proc.poll()
-                logger.warning(f"Pipeline died unexpectedly (exit code: {exit_code})")
-                
-                # Try to capture stderr/stdout
-                stderr_output = ""
-                stdout_output = ""
-                try:
-                    # Use communicate() with timeout to get remaining output
-                    try:
-                        stdout_bytes, stderr_bytes = _pipeline_proc.communicate(timeout=1.0)
-                        if stderr_bytes:
-                            stderr_output = stderr_bytes.decode('utf-8', errors='replace').strip()
-                        if stdout_bytes:
-                            stdout_output = stdout_bytes.decode('utf-8', errors='replace').strip()
-                    except subprocess.TimeoutExpired:
-                        # Process already finished, try to read what's available
-                        try:
-                            _pipeline_proc.kill()
-                            stdout_bytes, stderr_bytes = _pipeline_proc.communicate(timeout=0.5)
-                            if stderr_bytes:
-                                stderr_output = stderr_bytes.decode('utf-8', errors='replace').strip()
-                            if stdout_bytes:
-                                stdout_output = stdout_bytes.decode('utf-8', errors='replace').strip()
-                        except:
-                            pass
-                except Exception as e:
-                    logger.debug(f"Could not read pipeline output: {e}")
-                
-                if stderr_output:
-                    logger.error(f"GStreamer stderr (pipeline died):\n{stderr_output}")
-                if stdout_output:
-                    logger.error(f"GStreamer stdout (pipeline died):\n{stdout_output}")
-                if not stderr_output and not stdout_output:
-                    logger.error("No output captured from failed pipeline.")
-                
-                # Clean up the dead process
-                _pipeline_proc = None
-                pipeline_running = False
-            
-            if should_run:
-                if not pipeline_running:
-                    # Host is reachable but pipeline is not running
-                    # Check if we should attempt restart (respect cooldown)
-                    time_since_last_attempt = current_time - _last_restart_attempt
-                    if time_since_last_attempt >= _restart_delay:
-                        logger.info(f"Backend reachable at {config.control_station_host}:{config.backend_port}, starting pipeline...")
-                        if start_pipeline(config):
-                            consecutive_failures = 0
-                            _last_restart_attempt = current_time
-                        else:
-                            consecutive_failures += 1
-                            _last_restart_attempt = current_time
-                            logger.warning(f"Pipeline start failed (consecutive failures: {consecutive_failures})")
-                            if consecutive_failures >= max_consecutive_failures:
-                                logger.error(f"Too many consecutive failures ({consecutive_failures}), waiting longer...")
-                                time.sleep(30)  # Longer wait after many failures
-                                consecutive_failures = 0
-                    else:
-                        wait_time = _restart_delay - time_since_last_attempt
-                        logger.debug(f"Waiting {wait_time:.1f}s before retry...")
-                else:
-                    # Pipeline running and backend reachable - all good
-                    if iteration % 20 == 0:  # Log every ~60 seconds (20 * 3s)
-                        logger.info(f"Pipeline running, backend reachable at {config.control_station_host}:{config.backend_port}")
-            else:
-                if pipeline_running:
-                    # Host not reachable but pipeline is running - stop it
-                    reason = []
-                    if not host_reachable:
-                        reason.append(f"backend unreachable at {config.control_station_host}:{config.backend_port}")
-                    if not ssid_ok:
-                        reason.append(f"SSID mismatch (required: {config.ssid})")
-                    logger.info(f"Backend/SSID not OK ({', '.join(reason)}), stopping pipeline")
-                    stop_pipeline()
-                    consecutive_failures = 0
-                else:
-                    # Backend not reachable and no pipeline - just wait
-                    if iteration % 10 == 0:  # Log every ~30 seconds
-                        reason = []
-                        if not host_reachable:
-                            reason.append(f"backend unreachable at {config.control_station_host}:{config.backend_port}")
-                        if not ssid_ok:
-                            reason.append(f"SSID mismatch")
-                        logger.info(f"Waiting for backend connectivity... ({', '.join(reason)})")
-            
-        except KeyboardInterrupt:
-            logger.info("Interrupted by user")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}", exc_info=True)
-            time.sleep(5)  # Wait a bit before continuing
-        
-        # Sleep between iterations
-        time.sleep(3)
+            feedback = UdpFeedbackSource(abr.feedback_port)
+            logger.info(f"Receiver feedback: UDP port {abr.feedback_port}")
+        except OSError as e:
+            logger.warning(f"Cannot listen for receiver feedback on UDP {abr.feedback_port} ({e}); fixed bitrate")
     
-    # Cleanup on exit
-    logger.info("Shutting down supervisor...")
-    stop_pipeline()
-    logger.info("Supervisor stopped")
+    loop = asyncio.get_event_loop()
+    supervisor = AsyncSupervisor(config, loop, feedback=feedback)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, supervisor.request_stop)
+    
+    try:
+        loop.run_until_complete(supervisor.run())
+    finally:
+        # Cleanup on exit
+        logger.info("Shutting down supervisor...")
+        stop_pipeline()
+        if _wifi_monitor is not None:
+            _wifi_monitor.close()
+        if supervisor.feedback is not None:
+            supervisor.feedback.close()
+        pidfile.release()
+        loop.close()
+        logger.info("Supervisor stopped")
 
 
 def main() -> None:
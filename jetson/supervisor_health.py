@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+MiniCars stream supervisor health state.
+
+Everything the supervisor used to only print to journald, kept as data so
+the control API (GET /health) can report why video is down:
+
+- ``ReachabilityHistory`` keeps the recent probe results and the debounced
+  up/down transitions of one condition (backend reachable, SSID matched)
+- ``RateMeter`` turns cumulative counters (encoded frames and bytes) into
+  rates between snapshots
+- ``SupervisorHealth`` counts pipeline starts, restarts, failed starts and
+  unexpected exits, and remembers the last classified failure
+"""
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class ReachabilityHistory:
+    """
+    Probe results and state transitions of one condition.
+
+    Args:
+        window: Recent probe results used for the success rate
+        history: State transitions kept
+    """
+
+    def __init__(self, window: int = 60, history: int = 20):
+        self.samples: Deque[bool] = deque(maxlen=window)
+        self.transitions: Deque[Tuple[float, bool]] = deque(maxlen=history)
+        self.state: Optional[bool] = None
+        self.last_ok_at: Optional[float] = None
+        self.last_failed_at: Optional[float] = None
+
+    def record(self, ok: bool, state: bool, now: Optional[float] = None) -> None:
+        """
+        Record one probe.
+
+        Args:
+            ok: Raw probe result
+            state: Debounced state after this probe
+            now: Wall-clock time of the probe
+        """
+        now = time.time() if now is None else now
+        self.samples.append(ok)
+        if ok:
+            self.last_ok_at = now
+        else:
+            self.last_failed_at = now
+        if state != self.state:
+            self.transitions.append((now, state))
+            self.state = state
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "success_rate": round(sum(self.samples) / len(self.samples), 3) if self.samples else None,
+            "samples": len(self.samples),
+            "last_ok_at": self.last_ok_at,
+            "last_failed_at": self.last_failed_at,
+            "transitions": [{"at": at, "state": state} for at, state in self.transitions],
+        }
+
+
+class RateMeter:
+    """
+    Rates of cumulative counters between snapshots.
+
+    Snapshots closer together than ``min_interval`` reuse the previous rates,
+    so frequent callers do not get noisy values.
+
+    Args:
+        min_interval: Minimum measurement interval in seconds
+    """
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._last: Optional[Tuple[float, Tuple[int, ...]]] = None
+        self._rates: Optional[Tuple[float, ...]] = None
+
+    def reset(self) -> None:
+        self._last = None
+        self._rates = None
+
+    def update(self, counters: Tuple[int, ...], now: Optional[float] = None) -> Optional[Tuple[float, ...]]:
+        """
+        Feed the current counter values.
+
+        Returns:
+            Per-second rate of each counter, or None until two samples are known
+        """
+        now = time.monotonic() if now is None else now
+        if self._last is not None:
+            last_time, last_counters = self._last
+            elapsed = now - last_time
+            if elapsed < self.min_interval:
+                return self._rates
+            if all(c >= p for c, p in zip(counters, last_counters)):
+                self._rates = tuple((c - p) / elapsed for c, p in zip(counters, last_counters))
+            else:
+                self._rates = None  # Counters restarted (new pipeline)
+        self._last = (now, counters)
+        return self._rates
+
+
+class SupervisorHealth:
+    """Pipeline lifecycle counters and the last failure."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._started_mono = time.monotonic()
+        self.pipeline_started_at: Optional[float] = None  # Monotonic time of the running pipeline's start
+        self.pipeline_starts = 0
+        self.start_failures = 0
+        self.unexpected_exits = 0
+        self.planned_restarts = 0
+        self.last_failure: Optional[dict] = None
+        self.backend = ReachabilityHistory()
+        self.ssid = ReachabilityHistory()
+
+    def pipeline_started(self) -> None:
+        self.pipeline_starts += 1
+        self.pipeline_started_at = time.monotonic()
+
+    def pipeline_stopped(self, planned_restart: bool = False) -> None:
+        self.pipeline_started_at = None
+        if planned_restart:
+            self.planned_restarts += 1
+
+    def failure(self, kind: str, category: Optional[str], context: str, exit_code: Optional[int]) -> None:
+        """
+        Record a failed start ("start_failed") or a pipeline that died ("exited").
+
+        Args:
+            kind: "start_failed" or "exited"
+            category: Classified GStreamer error (None if unclassified)
+            context: Short description, as logged
+            exit_code: Pipeline exit code
+        """
+        if kind == "exited":
+            self.unexpected_exits += 1
+            self.pipeline_started_at = None
+        else:
+            self.start_failures += 1
+        self.last_failure = {
+            "kind": kind,
+            "class": category or "unclassified",
+            "context": context,
+            "exit_code": exit_code,
+            "at": time.time(),
+        }
+
+    def snapshot(self) -> Dict[str, object]:
+        now = time.monotonic()
+        return {
+            "uptime_s": round(now - self._started_mono, 1),
+            "started_at": self.started_at,
+            "pipeline_uptime_s": round(now - self.pipeline_started_at, 1)
+            if self.pipeline_started_at is not None else None,
+            "pipeline_starts": self.pipeline_starts,
+            # Every start after the first one is a restart (crash, link loss or config change)
+            "restarts": max(0, self.pipeline_starts - 1),
+            "planned_restarts": self.planned_restarts,
+            "start_failures": self.start_failures,
+            "unexpected_exits": self.unexpected_exits,
+            "last_failure": self.last_failure,
+        }
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+MiniCars helpers for systemd socket activation and the file descriptor store.
+
+Implemented directly on the sd_listen_fds(3) / sd_notify(3) wire protocols so
+the bridge does not need python-systemd:
+
+- ``listen_fds`` returns the sockets systemd passed in (LISTEN_FDS), grouped
+  by name (LISTEN_FDNAMES): the listening socket from minicars-joystick.socket
+  and any connection kept in the fd store by a previous bridge process.
+- ``notify`` sends a state string (READY=1, STATUS=..., FDSTORE=1) to
+  NOTIFY_SOCKET, optionally with file descriptors attached (SCM_RIGHTS).
+- ``store_fd`` / ``remove_stored_fds`` keep a socket in systemd's fd store so
+  it survives a restart or crash of the service (needs
+  FileDescriptorStoreMax > 0 in the unit).
+
+All functions are no-ops outside systemd.
+"""
+import array
+import logging
+import os
+import socket
+from typing import Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+SD_LISTEN_FDS_START = 3
+
+
+def _socket_from_fd(fd: int) -> socket.socket:
+    """Wrap an inherited fd in a socket object of the right family and type."""
+    probe = socket.fromfd(fd, socket.AF_INET, socket.SOCK_STREAM)  # dup, only to query
+    try:
+        family = probe.getsockopt(socket.SOL_SOCKET, socket.SO_DOMAIN)
+        sock_type = probe.getsockopt(socket.SOL_SOCKET, socket.SO_TYPE)
+    finally:
+        probe.close()
+    return socket.socket(family, sock_type, 0, fileno=fd)
+
+
+def listen_fds(unset_environment: bool = True) -> Dict[str, List[socket.socket]]:
+    """
+    Collect sockets passed by systemd (socket activation and fd store).
+
+    Args:
+        unset_environment: Remove LISTEN_* variables so child processes
+            (e.g. a handover target) do not pick them up again
+
+    Returns:
+        Dict of fd name to sockets (unnamed fds are listed under "unknown");
+        empty when not started by systemd
+    """
+    try:
+        if int(os.environ.get("LISTEN_PID", "0")) != os.getpid():
+            return {}
+        count = int(os.environ.get("LISTEN_FDS", "0"))
+    except ValueError:
+        return {}
+    names = os.environ.get("LISTEN_FDNAMES", "").split(":")
+
+    if unset_environment:
+        for key in ("LISTEN_PID", "LISTEN_FDS", "LISTEN_FDNAMES"):
+            os.environ.pop(key, None)
+
+    sockets: Dict[str, List[socket.socket]] = {}
+    for index in range(count):
+        fd = SD_LISTEN_FDS_START + index
+        name = names[index] if index < len(names) and names[index] else "unknown"
+        os.set_inheritable(fd, False)
+        try:
+            sockets.setdefault(name, []).append(_socket_from_fd(fd))
+        except OSError as e:
+            logger.warning(f"Ignoring inherited fd {fd} ({name}): {e}")
+            os.close(fd)
+    return sockets
+
+
+def notify(state: str, fds: Sequence[int] = ()) -> bool:
+    """
+    Send a state update to systemd.
+
+    Args:
+        state: Newline-separated assignments, e.g. "READY=1" or "FDSTORE=1\\nFDNAME=client"
+        fds: File descriptors to pass along (for FDSTORE=1)
+
+    Returns:
+        True if the message was sent (False outside systemd or on error)
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]  # Abstract namespace
+
+    ancillary = []
+    if fds:
+        ancillary.append((socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds)))
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendmsg([state.encode("utf-8")], ancillary, 0, address)
+        return True
+    except OSError as e:
+        logger.debug(f"sd_notify({state!r}) failed: {e}")
+        return False
+
+
+def store_fd(name: str, sock: socket.socket) -> bool:
+    """
+    Keep a socket in systemd's fd store under a name.
+
+    Args:
+        name: FDNAME to store it under (returned in LISTEN_FDNAMES after a restart)
+        sock: Socket to keep open across restarts
+
+    Returns:
+        True if the store request was sent
+    """
+    return notify(f"FDSTORE=1\nFDNAME={name}", [sock.fileno()])
+
+
+def remove_stored_fds(name: str) -> bool:
+    """
+    Drop all fds stored under a name (systemd closes its copies).
+
+    Args:
+        name: FDNAME used in store_fd
+
+    Returns:
+        True if the removal request was sent
+    """
+    return notify(f"FDSTOREREMOVE=1\nFDNAME={name}")
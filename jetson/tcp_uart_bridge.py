@@ -7,11 +7,13 @@ to the Arduino via UART. Includes watchdog for failsafe operation.
 """
 import logging
 import os
+import select
 import signal
 import socket
 import sys
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import Optional
 
@@ -21,19 +23,52 @@ except ImportError:
     print("ERROR: pyserial not installed. Run: pip3 install pyserial")
     sys.exit(1)
 
+import flight_recorder as fr
+import rt_sched
+import systemd_fds
+from hot_logging import RateLimiter, setup_logging
+from uart_protocol import (
+    EVENT_ACK,
+    EVENT_TELEMETRY,
+    FRAMING_ASCII,
+    SEQ_MODULO,
+    TelemetryDecoder,
+    UartValues,
+    VALID_FRAMINGS,
+    get_encoder,
+)
+
 # Configuration from environment variables
 BRIDGE_HOST = os.getenv("MINICARS_BRIDGE_HOST", "0.0.0.0")
 BRIDGE_PORT = int(os.getenv("MINICARS_BRIDGE_PORT", "5005"))
 UART_DEVICE = os.getenv("MINICARS_UART_DEVICE", "/dev/ttyTHS1")
 UART_BAUD = int(os.getenv("MINICARS_UART_BAUD", "115200"))
+UART_FRAMING = os.getenv("MINICARS_UART_FRAMING", FRAMING_ASCII).lower()  # "ascii" or "binary"
 WATCHDOG_MS = int(os.getenv("MINICARS_WATCHDOG_MS", "150"))
+LINK_TIMEOUT_MS = int(os.getenv("MINICARS_LINK_TIMEOUT_MS", "500"))  # Drop a client silent for this long
+# A connection from another host only replaces a client silent for this long
+PREEMPT_STALE_MS = int(os.getenv("MINICARS_PREEMPT_STALE_MS", "200"))
+TELEMETRY_BUFFER_SIZE = int(os.getenv("MINICARS_TELEMETRY_BUFFER", "256"))
+RECORDER_SECONDS = float(os.getenv("MINICARS_RECORDER_SECONDS", "30"))
+RECORDER_EVENTS_PER_SEC = int(os.getenv("MINICARS_RECORDER_EVENTS_PER_SEC", "400"))
+RECORDER_DIR = os.getenv("MINICARS_RECORDER_DIR", "/tmp/minicars-flight")
+RECORDER_DUMP_INTERVAL = float(os.getenv("MINICARS_RECORDER_DUMP_INTERVAL", "10"))
+RECORDER_MAX_DUMPS = int(os.getenv("MINICARS_RECORDER_MAX_DUMPS", "20"))  # 0 = keep all
+HANDOVER = os.getenv("MINICARS_HANDOVER", "0") == "1"  # Keep the client connection across restarts (systemd fd store)
+# Written right before a planned restart (see deploy_services.sh); without it shutdown always sends failsafe
+HANDOVER_MARKER = os.getenv("MINICARS_HANDOVER_MARKER", "/run/minicars-joystick/restart")
+HANDOVER_MARKER_MAX_AGE = 30.0  # Seconds; an older marker is a leftover, not this restart
 LOG_LEVEL = os.getenv("MINICARS_LOG_LEVEL", "INFO")
 SERVO_CENTER = int(os.getenv("MINICARS_SERVO_CENTER", "90"))
 
-# Configure logging
-logging.basicConfig(
+# systemd fd names (see minicars-joystick.socket / FileDescriptorStoreMax)
+LISTEN_FD_NAME = "control"
+CLIENT_FD_NAME = "client"
+
+# Configure logging (queue-backed: hot loops never block on journald)
+setup_logging(
+    '[minicars-joystick-bridge] %(levelname)s: %(message)s',
     level=getattr(logging, LOG_LEVEL.upper(), logging.INFO),
-    format='[minicars-joystick-bridge] %(levelname)s: %(message)s'
 )
 logger = logging.getLogger(__name__)
 
@@ -48,12 +83,12 @@ class JoystickMessage:
     turbo: float  # 0.0 to 1.0
     mode: str  # "kid", "normal", "pro"
     
-    def to_uart_format(self) -> str:
+    def to_uart_values(self) -> UartValues:
         """
-        Convert to UART format for Arduino.
+        Convert to Arduino integer values.
         
         Returns:
-            String: "servo_angle,accel_pct,brake_pct,hbrake_flag,turbo_flag\n"
+            Tuple: (servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag)
         """
         # Convert normalized values to Arduino format
         servo_angle = int((self.servo + 1.0) * 90.0)  # -1..1 → 0..180
@@ -64,7 +99,20 @@ class JoystickMessage:
         hbrake_flag = 1 if self.handbrake > 0.5 else 0
         turbo_flag = 1 if self.turbo > 0.5 else 0
         
-        return f"{servo_angle},{accel_pct},{brake_pct},{hbrake_flag},{turbo_flag}\n"
+        return (servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag)
+    
+    def flags(self) -> int:
+        """Handbrake/turbo as bit flags (bit0 = handbrake, bit1 = turbo)."""
+        return (1 if self.handbrake > 0.5 else 0) | (2 if self.turbo > 0.5 else 0)
+    
+    def to_uart_format(self) -> str:
+        """
+        Convert to UART format for Arduino (ASCII framing).
+        
+        Returns:
+            String: "servo_angle,accel_pct,brake_pct,hbrake_flag,turbo_flag\n"
+        """
+        return "%d,%d,%d,%d,%d\n" % self.to_uart_values()
 
 
 def parse_message(line: str) -> Optional[JoystickMessage]:
@@ -158,6 +206,72 @@ def parse_message(line: str) -> Optional[JoystickMessage]:
         return None
 
 
+def may_preempt(current_addr: tuple, new_addr: tuple, silent_ms: float) -> bool:
+    """
+    Decide whether a new connection may replace the current client.
+    
+    A reconnect from the same host (the laptop after a WiFi drop) always
+    wins. Another host only takes over a link that already looks dead, so
+    a second laptop can't steal an active driver's car.
+    
+    Args:
+        current_addr: Address of the connected client
+        new_addr: Address of the new connection
+        silent_ms: Time since the current client last sent anything
+    
+    Returns:
+        True if the new connection should be served instead
+    """
+    return new_addr[0] == current_addr[0] or silent_ms >= PREEMPT_STALE_MS
+
+
+def consume_restart_marker(path: str) -> bool:
+    """
+    Check for (and delete) the planned-restart marker.
+    
+    The deploy script writes the marker just before ``systemctl restart``;
+    a plain stop, a shutdown or a stale marker must not skip the failsafe.
+    
+    Args:
+        path: Marker file path
+    
+    Returns:
+        True if a fresh marker was present
+    """
+    try:
+        age = time.time() - os.stat(path).st_mtime
+        os.remove(path)
+    except OSError:
+        return False
+    return age <= HANDOVER_MARKER_MAX_AGE
+
+
+def configure_client_socket(sock: socket.socket) -> None:
+    """
+    Tune an accepted control connection for fast dead-link detection.
+    
+    Application-level probes ("P,<id>" → "Q,<id>") and the link timeout are
+    the primary mechanism; keepalive and TCP_USER_TIMEOUT are the kernel-side
+    backstop so a half-open connection errors out instead of lingering.
+    
+    Args:
+        sock: Accepted client socket
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for option, value in (
+        ("TCP_KEEPIDLE", 1),  # Seconds idle before the first probe (minimum granularity)
+        ("TCP_KEEPINTVL", 1),
+        ("TCP_KEEPCNT", 2),
+        ("TCP_USER_TIMEOUT", 2 * LINK_TIMEOUT_MS),  # ms unacked data may stay in flight
+    ):
+        if hasattr(socket, option):
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+            except OSError as e:
+                logger.debug(f"Could not set {option}: {e}")
+
+
 class TCPUARTBridge:
     """
     TCP-to-UART bridge for MiniCars joystick control.
@@ -172,16 +286,56 @@ class TCPUARTBridge:
         self.tcp_socket: Optional[socket.socket] = None
         self.client_socket: Optional[socket.socket] = None
         
+        # Restart handover: the current client is kept in systemd's fd store and
+        # the next bridge process resumes it (no failsafe on a planned restart)
+        self.client_stored = False
+        self.handing_over = False
+        
         # Watchdog state
         self.last_msg_time = 0.0
         self.watchdog_thread: Optional[threading.Thread] = None
         self.failsafe_active = False
-        self.last_failsafe_log = 0.0
+        
+        # Sampled logging for the hot paths (see MINICARS_LOG_RATE_LIMITS)
+        self.failsafe_log_limiter = RateLimiter("bridge.failsafe", 1.0)
+        self.invalid_log_limiter = RateLimiter("bridge.invalid", 1.0)
+        self.refused_log_limiter = RateLimiter("bridge.refused", 1.0)
+        self.uart_log_limiter = RateLimiter("bridge.uart", 0.4)
+        self.uart_error_log_limiter = RateLimiter("bridge.uart_error", 1.0)
+        self.uart_write_count = 0
+        
+        # Timing stats (compare with MINICARS_RT_MODE off vs on)
+        self.watchdog_jitter = rt_sched.JitterStats()  # Watchdog wake-up lateness
+        self.forward_latency = rt_sched.JitterStats()  # TCP recv → UART write done
+        self.jitter_log_limiter = RateLimiter("bridge.jitter", 1.0 / 60.0, delay_first=True)
         
         # State for delta limiting
         self.last_servo = 0.0  # Normalized
         self.last_throttle = 0.0
         
+        # UART framing (validated in main())
+        self.encode_uart = get_encoder(UART_FRAMING)
+        
+        # Telemetry read-back from Arduino
+        self.uart_reader_thread: Optional[threading.Thread] = None
+        self.telemetry = deque(maxlen=TELEMETRY_BUFFER_SIZE)  # (time, battery_mv, wheel_speed_cms)
+        self.uart_write_lock = threading.Lock()  # Watchdog (failsafe) and client thread both write
+        self.uart_seq = 0
+        self.seq_sent_at = [0.0] * SEQ_MODULO  # perf_counter() of last write per sequence number
+        self.last_uart_write = 0.0
+        self.last_ack_rtt_ms: Optional[float] = None
+        self.client_send_lock = threading.Lock()
+        self.client_send_sock: Optional[socket.socket] = None
+        self.client_send_pending = b""  # Unsent tail of a partially sent line
+        
+        # Flight recorder (always on; dumped on failsafe, SIGUSR1 or client "D" request)
+        self.recorder = fr.FlightRecorder(
+            capacity=int(RECORDER_SECONDS * RECORDER_EVENTS_PER_SEC),
+            dump_dir=RECORDER_DIR,
+            min_dump_interval=RECORDER_DUMP_INTERVAL,
+            max_dumps=RECORDER_MAX_DUMPS,
+        )
+        
     def open_uart(self) -> bool:
         """Open UART connection to Arduino."""
         try:
@@ -191,7 +345,7 @@ class TCPUARTBridge:
                 timeout=0.1,
                 write_timeout=0.1,
             )
-            logger.info(f"UART opened: {UART_DEVICE} @ {UART_BAUD} baud")
+            logger.info(f"UART opened: {UART_DEVICE} @ {UART_BAUD} baud ({UART_FRAMING} framing)")
             return True
         except Exception as e:
             logger.error(f"Failed to open UART {UART_DEVICE}: {e}")
@@ -212,24 +366,134 @@ class TCPUARTBridge:
         )
         
         try:
-            uart_cmd = failsafe_msg.to_uart_format()
-            self.uart.write(uart_cmd.encode('ascii'))
-            self.uart.flush()
+            self.write_uart_command(failsafe_msg.to_uart_values())
             
             # Rate-limited logging
-            now = time.time()
-            if now - self.last_failsafe_log > 1.0:
+            if self.failsafe_log_limiter.allow():
                 logger.warning("Failsafe activated - sending safe command to Arduino")
-                self.last_failsafe_log = now
         except Exception as e:
             logger.error(f"Failed to send failsafe to UART: {e}")
     
+    def write_uart_command(self, values: UartValues) -> None:
+        """
+        Encode and write one command to the UART.
+        
+        Tags the command with a rolling sequence number so Arduino acks can
+        be matched to their write time (binary framing). Called from the
+        watchdog and the client thread: the lock keeps sequence numbers
+        unique and frames whole on the serial line.
+        
+        Args:
+            values: (servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag)
+        """
+        with self.uart_write_lock:
+            seq = self.uart_seq
+            self.uart_seq = (seq + 1) % SEQ_MODULO
+            frame = self.encode_uart(values, seq)
+            # Stamp before writing: the ack can be read before flush() returns
+            now = time.perf_counter()
+            self.seq_sent_at[seq] = now
+            self.last_uart_write = now
+            self.uart.write(frame)
+            self.uart.flush()
+            self.recorder.record(fr.EV_UART_WRITE, values[0], values[1], values[2],
+                                 values[3] | (values[4] << 1) | (seq << 4))
+    
+    def send_to_client(self, line: str) -> None:
+        """
+        Send a line to the connected client without blocking.
+        
+        Telemetry is best-effort: if the socket buffer is full the line is
+        dropped rather than stalling the UART reader. Lines are sent whole:
+        the tail of a partial send is kept and flushed before the next line
+        (which is dropped if the tail still doesn't fit), so the client
+        never sees a truncated or interleaved line.
+        
+        Args:
+            line: Line to send (including trailing newline)
+        """
+        sock = self.client_socket
+        if sock is None:
+            return
+        data = line.encode('ascii')
+        with self.client_send_lock:
+            if sock is not self.client_send_sock:
+                self.client_send_sock = sock
+                self.client_send_pending = b""
+            try:
+                if self.client_send_pending:
+                    sent = sock.send(self.client_send_pending, socket.MSG_DONTWAIT)
+                    self.client_send_pending = self.client_send_pending[sent:]
+                    if self.client_send_pending:
+                        return
+                sent = sock.send(data, socket.MSG_DONTWAIT)
+            except (BlockingIOError, OSError):
+                return
+            if sent < len(data):
+                self.client_send_pending = data[sent:]
+    
+    def uart_reader_loop(self) -> None:
+        """UART reader thread: decodes Arduino telemetry/acks and forwards them to the client."""
+        logger.info("UART reader started")
+        rt_sched.apply_thread_policy("uart")
+        decoder = TelemetryDecoder(UART_FRAMING)
+        
+        while self.running:
+            uart = self.uart
+            if not uart or not uart.is_open:
+                time.sleep(0.1)
+                continue
+            
+            try:
+                # Blocks for at most the serial timeout (0.1s) when idle
+                data = uart.read(uart.in_waiting or 1)
+            except Exception as e:
+                if self.running:
+                    logger.error(f"Failed to read from UART: {e}")
+                    time.sleep(0.5)
+                continue
+            
+            if not data:
+                continue
+            
+            for event in decoder.feed(data):
+                if event[0] == EVENT_TELEMETRY:
+                    _, battery_mv, wheel_speed_cms = event
+                    self.telemetry.append((time.time(), battery_mv, wheel_speed_cms))
+                    self.recorder.record(fr.EV_TELEMETRY, battery_mv, wheel_speed_cms)
+                    self.send_to_client(f"T,{battery_mv},{wheel_speed_cms}\n")
+                elif event[0] == EVENT_ACK:
+                    seq = event[1]
+                    sent_at = self.last_uart_write if seq is None else self.seq_sent_at[seq]
+                    if sent_at:
+                        rtt_us = int((time.perf_counter() - sent_at) * 1e6)
+                        self.last_ack_rtt_ms = rtt_us / 1000.0
+                        self.recorder.record(fr.EV_ACK, self.last_ack_rtt_ms, -1 if seq is None else seq)
+                        self.send_to_client(f"A,{rtt_us}\n")
+        
+        logger.info(f"UART reader stopped (frames={decoder.frames_ok}, errors={decoder.errors})")
+    
     def watchdog_loop(self) -> None:
         """Watchdog thread: monitors message timeout and applies failsafe."""
         logger.info(f"Watchdog started (timeout: {WATCHDOG_MS}ms)")
+        rt_sched.apply_thread_policy("watchdog")
+        
+        period = 0.02  # Check every 20ms
+        next_wake = time.perf_counter() + period
         
         while self.running:
-            time.sleep(0.02)  # Check every 20ms
+            delay = next_wake - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            now = time.perf_counter()
+            self.watchdog_jitter.add((now - next_wake) * 1000.0)
+            next_wake += period
+            if next_wake < now:  # Fell behind (e.g. suspended): resync instead of bursting
+                next_wake = now + period
+            
+            if self.jitter_log_limiter.allow():
+                logger.info("Timing: watchdog wake jitter [%s], forward latency [%s]",
+                            self.watchdog_jitter.summary(), self.forward_latency.summary())
             
             if self.last_msg_time == 0:
                 # No messages received yet
@@ -241,11 +505,14 @@ class TCPUARTBridge:
                 if not self.failsafe_active:
                     self.failsafe_active = True
                     logger.warning(f"No message for {elapsed_ms:.0f}ms - activating failsafe")
+                    self.recorder.record(fr.EV_FAILSAFE_ON, elapsed_ms)
+                    self.recorder.dump_if_due("failsafe")
                 
                 self.send_failsafe_to_uart()
             else:
                 if self.failsafe_active:
                     self.failsafe_active = False
+                    self.recorder.record(fr.EV_FAILSAFE_OFF)
                     logger.info("Messages resumed - failsafe deactivated")
     
     def apply_smoothing(self, msg: JoystickMessage) -> JoystickMessage:
@@ -290,32 +557,92 @@ class TCPUARTBridge:
             mode=msg.mode,
         )
     
-    def handle_client(self, client_sock: socket.socket, client_addr: tuple) -> None:
+    def handle_client(self, client_sock: socket.socket, client_addr: tuple,
+                      adopted: bool = False) -> Optional[tuple]:
         """
         Handle a connected TCP client.
         
+        The client is dropped when nothing (commands or probes) arrives for
+        LINK_TIMEOUT_MS. A new connection from the same host, or from any
+        host once this one has been silent for PREEMPT_STALE_MS, preempts
+        it, so a laptop that reconnects after a silent WiFi drop is served
+        immediately instead of waiting for the old socket to die. Other
+        connections are refused while this client is active.
+        
         Args:
             client_sock: Client socket
             client_addr: Client address tuple
+            adopted: Connection handed over by the previous bridge process
+        
+        Returns:
+            (socket, address) of a preempting connection to serve next, or None
         """
-        logger.info(f"Client connected from {client_addr[0]}:{client_addr[1]}")
+        if adopted:
+            logger.info(f"Resumed client {client_addr[0]}:{client_addr[1]} from previous bridge process")
+        else:
+            logger.info(f"Client connected from {client_addr[0]}:{client_addr[1]}")
+        self.recorder.record(fr.EV_CONNECT, 1 if adopted else 0)
+        configure_client_socket(client_sock)
+        if HANDOVER:
+            # systemd dedups an fd that is already stored (adopted connections)
+            self.client_stored = systemd_fds.store_fd(CLIENT_FD_NAME, client_sock)
         
         # Reset state
         self.last_msg_time = 0.0
         self.last_servo = 0.0
         self.last_throttle = 0.0
         self.failsafe_active = False
+        if adopted:
+            # The client was mid-stream: arm the watchdog right away
+            self.last_msg_time = time.time()
         
         buffer = ""
         invalid_count = 0
+        link_timeout = LINK_TIMEOUT_MS / 1000.0
+        last_rx = time.monotonic()
+        disconnect_reason = fr.DISCONNECT_ERROR
+        preempted_by = None
         
         try:
             while self.running:
+                # Wait for data from the client or a new connection on the listener
+                remaining = last_rx + link_timeout - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"No data from client for {LINK_TIMEOUT_MS}ms - dropping dead link")
+                    disconnect_reason = fr.DISCONNECT_LINK_TIMEOUT
+                    break
+                readable, _, _ = select.select([client_sock, self.tcp_socket], [], [], remaining)
+                
+                if self.tcp_socket in readable:
+                    try:
+                        new_sock, new_addr = self.tcp_socket.accept()
+                    except (socket.timeout, BlockingIOError):
+                        pass
+                    else:
+                        silent_ms = (time.monotonic() - last_rx) * 1000.0
+                        if may_preempt(client_addr, new_addr, silent_ms):
+                            logger.warning(f"New client {new_addr[0]}:{new_addr[1]} preempts current connection")
+                            preempted_by = (new_sock, new_addr)
+                            disconnect_reason = fr.DISCONNECT_PREEMPTED
+                            break
+                        new_sock.close()
+                        if self.refused_log_limiter.allow():
+                            logger.warning(
+                                "Refused client %s:%d: %s is active (last data %.0fms ago)",
+                                new_addr[0], new_addr[1], client_addr[0], silent_ms,
+                            )
+                
+                if client_sock not in readable:
+                    continue
+                
                 # Receive data
                 data = client_sock.recv(1024)
                 if not data:
                     logger.info("Client disconnected")
+                    disconnect_reason = fr.DISCONNECT_CLOSED
                     break
+                recv_time = time.perf_counter()
+                last_rx = time.monotonic()
                 
                 buffer += data.decode('ascii', errors='ignore')
                 
@@ -323,12 +650,23 @@ class TCPUARTBridge:
                 while '\n' in buffer:
                     line, buffer = buffer.split('\n', 1)
                     
+                    # Liveness probe: echo the id straight back
+                    if line.startswith("P,"):
+                        self.send_to_client(f"Q,{line[2:].strip()}\n")
+                        continue
+                    
+                    # Control request: dump the flight recorder
+                    if line.strip() == "D":
+                        self.recorder.dump("request")
+                        continue
+                    
                     # Parse message
                     msg = parse_message(line)
                     if msg is None:
                         invalid_count += 1
-                        if invalid_count % 100 == 1:  # Rate-limit logging
-                            logger.warning(f"Invalid message (count={invalid_count}): {line[:80]}")
+                        self.recorder.record(fr.EV_INVALID, invalid_count)
+                        if self.invalid_log_limiter.allow():
+                            logger.warning("Invalid message (count=%d): %s", invalid_count, line[:80])
                         continue
                     
                     # Reset invalid counter on valid message
@@ -336,40 +674,69 @@ class TCPUARTBridge:
                     
                     # Update watchdog timestamp
                     self.last_msg_time = time.time()
+                    self.recorder.record(fr.EV_RX, msg.servo, msg.throttle, msg.brake, msg.flags())
                     
                     # Apply smoothing
                     smoothed_msg = self.apply_smoothing(msg)
+                    self.recorder.record(fr.EV_SMOOTHED, smoothed_msg.servo, smoothed_msg.throttle,
+                                         smoothed_msg.brake, smoothed_msg.flags())
                     
-                    # Convert to UART format and send
-                    uart_cmd = smoothed_msg.to_uart_format()
+                    # Convert to UART framing and send
+                    uart_values = smoothed_msg.to_uart_values()
                     
                     if self.uart and self.uart.is_open:
                         try:
-                            self.uart.write(uart_cmd.encode('ascii'))
-                            self.uart.flush()
-                            # Log every 50 messages (~2.5 seconds at 20Hz) for debugging
-                            if not hasattr(self, '_uart_log_counter'):
-                                self._uart_log_counter = 0
-                            self._uart_log_counter += 1
-                            if self._uart_log_counter % 50 == 0:
+                            self.write_uart_command(uart_values)
+                            self.uart_write_count += 1
+                            self.forward_latency.add((time.perf_counter() - recv_time) * 1000.0)
+                            # Sampled, lazily formatted (default one line every 2.5s)
+                            if logger.isEnabledFor(logging.INFO) and self.uart_log_limiter.allow():
                                 logger.info(
-                                    f"Sent to UART (msg #{self._uart_log_counter}): {uart_cmd.strip()} | "
-                                    f"parsed: servo={msg.servo:.3f}, throttle={msg.throttle:.3f}, "
-                                    f"brake={msg.brake:.3f}, mode={msg.mode}"
+                                    "Sent to UART (msg #%d, %s): %s | parsed: servo=%.3f, "
+                                    "throttle=%.3f, brake=%.3f, mode=%s",
+                                    self.uart_write_count, UART_FRAMING, uart_values,
+                                    msg.servo, msg.throttle, msg.brake, msg.mode,
                                 )
                         except Exception as e:
                             logger.error(f"Failed to write to UART: {e}")
                             break
-                    else:
+                    elif self.uart_error_log_limiter.allow():
                         logger.warning("UART not open, cannot send command")
                     
         except Exception as e:
             logger.error(f"Error handling client: {e}")
         finally:
-            # Send failsafe before closing
-            self.send_failsafe_to_uart()
-            client_sock.close()
-            logger.info("Client connection closed")
+            self.client_socket = None
+            if self.handing_over:
+                # systemd keeps the connection open for the next bridge process
+                client_sock.close()
+            else:
+                self.recorder.record(fr.EV_DISCONNECT, disconnect_reason)
+                if self.client_stored:
+                    systemd_fds.remove_stored_fds(CLIENT_FD_NAME)
+                    self.client_stored = False
+                # Send failsafe before closing
+                self.send_failsafe_to_uart()
+                client_sock.close()
+                logger.info("Client connection closed")
+        
+        return preempted_by
+    
+    def serve_client(self, client_sock: socket.socket, client_addr: tuple, adopted: bool = False) -> None:
+        """
+        Serve a client and, in turn, any connection that preempts it.
+        
+        Args:
+            client_sock: Client socket
+            client_addr: Client address tuple
+            adopted: Connection handed over by the previous bridge process
+        """
+        # A preempting connection is served right away, without a new accept()
+        while client_sock is not None and self.running:
+            self.client_socket = client_sock
+            preempted_by = self.handle_client(client_sock, client_addr, adopted=adopted)
+            client_sock, client_addr = preempted_by or (None, None)
+            adopted = False
     
     def run(self) -> None:
         """Main loop: accept TCP connections and forward to UART."""
@@ -378,22 +745,57 @@ class TCPUARTBridge:
             logger.error("Failed to open UART - exiting")
             return
         
+        # Sockets passed by systemd: the listener (socket activation) and a
+        # client connection kept in the fd store by the previous process
+        inherited = systemd_fds.listen_fds()
+        listeners = inherited.pop(LISTEN_FD_NAME, []) or inherited.pop("unknown", [])
+        adopted_clients = inherited.pop(CLIENT_FD_NAME, [])
+        for extra in listeners[1:] + adopted_clients[:-1] + [s for socks in inherited.values() for s in socks]:
+            extra.close()
+        
         # Create TCP server socket
-        try:
-            self.tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.tcp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.tcp_socket.bind((BRIDGE_HOST, BRIDGE_PORT))
-            self.tcp_socket.listen(1)
-            logger.info(f"TCP server listening on {BRIDGE_HOST}:{BRIDGE_PORT}")
-        except Exception as e:
-            logger.error(f"Failed to create TCP server: {e}")
-            return
+        if listeners:
+            self.tcp_socket = listeners[0]
+            logger.info(f"TCP server listening on {self.tcp_socket.getsockname()} (socket activation)")
+        else:
+            try:
+                self.tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.tcp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self.tcp_socket.bind((BRIDGE_HOST, BRIDGE_PORT))
+                self.tcp_socket.listen(1)
+                logger.info(f"TCP server listening on {BRIDGE_HOST}:{BRIDGE_PORT}")
+            except Exception as e:
+                logger.error(f"Failed to create TCP server: {e}")
+                return
         
         # Start watchdog thread
         self.running = True
         self.watchdog_thread = threading.Thread(target=self.watchdog_loop, daemon=True)
         self.watchdog_thread.start()
         
+        # Start UART reader thread (telemetry read-back)
+        self.uart_reader_thread = threading.Thread(target=self.uart_reader_loop, daemon=True)
+        self.uart_reader_thread.start()
+        
+        # This thread becomes the network thread (pinned after spawning the helpers,
+        # which apply their own policy)
+        rt_sched.apply_thread_policy("net")
+        
+        systemd_fds.notify("READY=1\nSTATUS=Bridging TCP to " + UART_DEVICE)
+        
+        # Resume the connection handed over by the previous process first
+        if adopted_clients:
+            client_sock = adopted_clients[-1]
+            try:
+                client_addr = client_sock.getpeername()
+            except OSError:
+                client_addr = None  # Peer went away during the restart
+            if client_addr is None:
+                client_sock.close()
+                systemd_fds.remove_stored_fds(CLIENT_FD_NAME)
+            else:
+                self.serve_client(client_sock, client_addr, adopted=True)
+        
         # Accept connections loop
         while self.running:
             try:
@@ -405,9 +807,7 @@ class TCPUARTBridge:
                 except socket.timeout:
                     continue
                 
-                self.client_socket = client_sock
-                self.handle_client(client_sock, client_addr)
-                self.client_socket = None
+                self.serve_client(client_sock, client_addr)
                 
             except Exception as e:
                 if self.running:
@@ -418,11 +818,18 @@ class TCPUARTBridge:
         """Graceful shutdown."""
         logger.info("Shutting down bridge...")
         self.running = False
+        systemd_fds.notify("STOPPING=1")
         
-        # Send final failsafe
-        self.send_failsafe_to_uart()
+        if HANDOVER and self.client_stored and consume_restart_marker(HANDOVER_MARKER):
+            # Planned restart: the client stays connected through systemd's fd
+            # store and the next process resumes it, so don't brake the car
+            self.handing_over = True
+            logger.info("Client connection kept in systemd fd store for handover")
+        else:
+            # Send final failsafe
+            self.send_failsafe_to_uart()
         
-        # Close sockets
+        # Close sockets (with a handover, systemd still holds the client connection)
         if self.client_socket:
             try:
                 self.client_socket.close()
@@ -442,9 +849,11 @@ class TCPUARTBridge:
             except:
                 pass
         
-        # Wait for watchdog thread
+        # Wait for watchdog and UART reader threads
         if self.watchdog_thread:
             self.watchdog_thread.join(timeout=1.0)
+        if self.uart_reader_thread:
+            self.uart_reader_thread.join(timeout=1.0)
         
         logger.info("Bridge shut down")
 
@@ -461,6 +870,12 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
+def dump_signal_handler(signum, frame):
+    """Dump the flight recorder on SIGUSR1."""
+    if bridge:
+        bridge.recorder.dump("signal")
+
+
 def main():
     """Main entry point."""
     global bridge
@@ -470,13 +885,29 @@ def main():
     logger.info("===========================================")
     logger.info(f"TCP: {BRIDGE_HOST}:{BRIDGE_PORT}")
     logger.info(f"UART: {UART_DEVICE} @ {UART_BAUD} baud")
+    logger.info(f"UART framing: {UART_FRAMING}")
     logger.info(f"Watchdog: {WATCHDOG_MS}ms timeout")
+    logger.info(f"Link timeout: {LINK_TIMEOUT_MS}ms (dead connections dropped; reconnects from the same host "
+                f"preempt, other hosts after {PREEMPT_STALE_MS}ms of silence)")
+    logger.info(f"Restart handover: {'on' if HANDOVER else 'off'} (systemd socket activation + fd store, "
+                f"only for restarts marked in {HANDOVER_MARKER})")
+    logger.info(f"Flight recorder: last {RECORDER_SECONDS:.0f}s -> {RECORDER_DIR} (SIGUSR1 to dump)")
+    logger.info(f"RT mode: {rt_sched.RT_MODE} (priority {rt_sched.RT_PRIORITY}, nice {rt_sched.RT_NICE})")
     logger.info(f"Log Level: {LOG_LEVEL}")
     logger.info("===========================================")
     
+    if rt_sched.RT_MODE not in rt_sched.VALID_RT_MODES:
+        logger.error(f"Invalid MINICARS_RT_MODE '{rt_sched.RT_MODE}' (must be one of: {', '.join(rt_sched.VALID_RT_MODES)})")
+        sys.exit(1)
+    
+    if UART_FRAMING not in VALID_FRAMINGS:
+        logger.error(f"Invalid MINICARS_UART_FRAMING '{UART_FRAMING}' (must be one of: {', '.join(VALID_FRAMINGS)})")
+        sys.exit(1)
+    
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGUSR1, dump_signal_handler)
     
     # Create and run bridge
     bridge = TCPUARTBridge()
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from stream_config import load_config
+
+
+@pytest.fixture
+def config_base():
+    """Minimal valid stream_config.json. Override it in a test module to change the defaults."""
+    return {
+        "control_station_host": "192.168.68.101",
+        "video_port": 5000,
+        "camera_device": "nvarguscamerasrc",
+        "resolution": {"width": 1280, "height": 720},
+        "framerate": 30,
+        "bitrate": 8000000,
+        "flip_method": 0,
+    }
+
+
+@pytest.fixture
+def write_config(tmp_path, config_base):
+    """write_config(path=None, **changes): write config_base + changes (None drops a key)."""
+
+    def write(path=None, **changes):
+        path = path or tmp_path / "stream_config.json"
+        data = dict(config_base, **changes)
+        path.write_text(json.dumps({key: value for key, value in data.items() if value is not None}))
+        return path
+
+    return write
+
+
+@pytest.fixture
+def make_config(write_config):
+    """make_config(**changes): write the file and load it as a StreamConfig."""
+
+    def make(**changes):
+        return load_config(write_config(**changes))
+
+    return make
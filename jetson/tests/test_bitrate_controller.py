@@ -0,0 +1,76 @@
+import socket
+import time
+
+from bitrate_controller import (
+    ACTION_DECREASE,
+    ACTION_HOLD,
+    ACTION_INCREASE,
+    AimdBitrateController,
+    ReceiverReport,
+    SyntheticFeedbackSource,
+    UdpFeedbackSource,
+    parse_feedback_line,
+)
+
+
+CLEAN = ReceiverReport(loss_fraction=0.0, jitter_ms=4.0, received=700)
+LOSSY = ReceiverReport(loss_fraction=0.08, jitter_ms=12.0, late_drops=3, received=640)
+
+
+def run(controller, reports):
+    source = SyntheticFeedbackSource(reports)
+    return [controller.update(source.poll()) for _ in reports]
+
+
+def test_aimd_decrease_hold_then_increase():
+    controller = AimdBitrateController(8000000, 2000000, 8000000, framerate=30, hold_intervals=2)
+    decisions = run(controller, [LOSSY, LOSSY, CLEAN, CLEAN, CLEAN, None])
+
+    assert [d.action for d in decisions] == [
+        ACTION_DECREASE, ACTION_DECREASE, ACTION_HOLD, ACTION_HOLD, ACTION_INCREASE, ACTION_HOLD,
+    ]
+    assert decisions[0].bitrate == 6800000
+    assert decisions[1].bitrate == 5780000
+    assert decisions[4].bitrate == 6030000
+    assert decisions[5].reason == "no feedback"
+
+
+def test_aimd_bounds_and_framerate_fallback():
+    controller = AimdBitrateController(2100000, 2000000, 3000000, framerate=30, min_framerate=20,
+                                       adapt_framerate=True, hold_intervals=0)
+    decisions = run(controller, [LOSSY] * 5)
+    assert [(d.bitrate, d.framerate) for d in decisions] == [
+        (2000000, 30), (2000000, 25), (2000000, 20), (2000000, 20), (2000000, 20),
+    ]
+    assert decisions[-1].action == ACTION_HOLD
+
+    decisions = run(controller, [CLEAN] * 7)
+    assert [d.framerate for d in decisions[:2]] == [25, 30]  # Framerate restored first
+    assert decisions[-1].bitrate == 3000000  # Capped at max_bitrate
+
+
+def test_parse_feedback_line():
+    report = parse_feedback_line(b"R,12,25000,4500,3,410\n")
+    assert abs(report.loss_fraction - 0.025) < 1e-9
+    assert report.jitter_ms == 4.5
+    assert (report.late_drops, report.received) == (3, 410)
+    assert parse_feedback_line(b"R,1,2\n") is None
+    assert parse_feedback_line(b"X,1,0,0,0,0\n") is None
+
+
+def test_udp_feedback_source_returns_newest_report():
+    source = UdpFeedbackSource(port=0, bind_host="127.0.0.1")
+    port = source._sock.getsockname()[1]
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        assert source.poll() is None
+        for line in (b"R,1,0,0,0,100\n", b"garbage", b"R,2,50000,0,0,90\n"):
+            sender.sendto(line, ("127.0.0.1", port))
+        time.sleep(0.05)
+        report = source.poll()
+        assert report.received == 90 and report.loss_fraction == 0.05
+        assert (source.received, source.invalid) == (2, 1)
+        assert source.poll() is None
+    finally:
+        sender.close()
+        source.close()
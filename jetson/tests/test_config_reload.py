@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+import stream_supervisor
+from bitrate_controller import AimdBitrateController, ReceiverReport
+from config_watcher import ConfigWatcher
+from stream_config import load_config
+from stream_supervisor import AsyncSupervisor, plan_config_changes
+
+
+def test_watcher_detects_writes_and_replacements(tmp_path, write_config):
+    path = write_config()
+    for use_inotify in (True, False):
+        watcher = ConfigWatcher(path, use_inotify=use_inotify)
+        try:
+            assert not watcher.check()
+            write_config(bitrate=6000000)
+            assert watcher.check()
+            assert not watcher.check()
+            # Editors save to a temporary file and rename it over the original
+            tmp = tmp_path / "stream_config.json.swp"
+            write_config(tmp, bitrate=5000000)
+            time.sleep(0.01)
+            tmp.rename(path)
+            assert watcher.check()
+            # Other files in the directory are ignored
+            (tmp_path / "other.json").write_text("{}")
+            assert not watcher.check()
+        finally:
+            watcher.close()
+
+
+def test_plan_config_changes(write_config):
+    path = write_config()
+    old = load_config(path)
+    write_config(bitrate=4000000, framerate=60, video_port=5004, ssid="MiniCars Network")
+    plan = plan_config_changes(old, load_config(path))
+    assert plan.live == {
+        "bitrate": 4000000,
+        "port": 5004,
+        "camera_caps": "video/x-raw(memory:NVMM),width=1280,height=720,framerate=60/1",
+    }
+    assert plan.restart == []
+    assert plan.supervisor == ["ssid"]
+
+    write_config(resolution={"width": 640, "height": 480}, framerate=60, flip_method=2)
+    plan = plan_config_changes(old, load_config(path))
+    assert plan.live == {}
+    assert plan.restart == ["resolution", "framerate", "flip_method"]
+    assert plan_config_changes(old, old).empty
+
+
+class FakeProc:
+    def poll(self):
+        return None
+
+
+def test_reload_rejects_invalid_and_schedules_restart(write_config, monkeypatch):
+    path = write_config()
+    loop = asyncio.new_event_loop()
+    try:
+        supervisor = AsyncSupervisor(load_config(path), loop, config_path=path)
+        monkeypatch.setattr(stream_supervisor, "_pipeline_proc", FakeProc())
+
+        write_config(bitrate=10)  # Below the minimum: rejected
+        assert not supervisor.reload_config()
+        assert supervisor.config.bitrate == 8000000
+        assert supervisor._pending_restart is None
+
+        # Not an in-process pipeline: a live-changeable field still needs a restart
+        write_config(bitrate=6000000, backend_port=8001)
+        assert supervisor.reload_config()
+        assert supervisor.config.bitrate == 6000000
+        assert supervisor._pending_restart == "bitrate"
+        assert not supervisor.reload_config()  # Unchanged file: nothing to apply
+    finally:
+        loop.close()
+
+
+class LossyFeedback:
+    def poll(self):
+        return ReceiverReport(loss_fraction=0.1)
+
+
+def run_adapt_bitrate(supervisor, enable_after=0.0):
+    """Run the ABR loop for a few steps; adaptive bitrate is switched on after enable_after seconds."""
+
+    async def scenario():
+        task = asyncio.ensure_future(supervisor._adapt_bitrate())
+        await asyncio.sleep(enable_after)
+        # What a reload enabling adaptive_bitrate leaves behind
+        supervisor.feedback = LossyFeedback()
+        supervisor.bitrate_controller = AimdBitrateController(8000000, 2000000, 8000000, framerate=30)
+        await asyncio.sleep(0.05)
+        supervisor.request_stop()
+        await task
+
+    supervisor.loop.run_until_complete(scenario())
+
+
+def test_adapt_bitrate_follows_reloaded_controller(write_config, monkeypatch):
+    path = write_config()
+    applied = []
+
+    def update_pipeline(**changes):
+        applied.append(changes)
+        return True
+
+    monkeypatch.setattr(stream_supervisor, "_abr_interval", 0.01)
+    monkeypatch.setattr(stream_supervisor, "_pipeline_proc", FakeProc())
+    monkeypatch.setattr(stream_supervisor, "update_pipeline", update_pipeline)
+    loop = asyncio.new_event_loop()
+    try:
+        supervisor = AsyncSupervisor(load_config(path), loop, config_path=path)
+        assert supervisor.bitrate_controller is None
+
+        # Adaptive bitrate off at first: the loop idles instead of exiting
+        run_adapt_bitrate(supervisor, enable_after=0.05)
+
+        assert applied[:2] == [{"bitrate": 6800000}, {"bitrate": 5780000}]
+    finally:
+        loop.close()
+
+
+def test_adapt_bitrate_rolls_back_unapplied_decisions(write_config, monkeypatch):
+    path = write_config()
+    attempts = []
+
+    def update_pipeline(**changes):
+        attempts.append(changes)
+        if len(attempts) % 2:
+            return False  # Pipeline exiting, not yet reaped
+        raise RuntimeError("property refused")
+
+    monkeypatch.setattr(stream_supervisor, "_abr_interval", 0.01)
+    monkeypatch.setattr(stream_supervisor, "_pipeline_proc", FakeProc())
+    monkeypatch.setattr(stream_supervisor, "update_pipeline", update_pipeline)
+    loop = asyncio.new_event_loop()
+    try:
+        supervisor = AsyncSupervisor(load_config(path), loop, config_path=path)
+        run_adapt_bitrate(supervisor)
+
+        # Every step starts again from the bitrate the encoder still runs at
+        assert len(attempts) >= 2
+        assert all(changes == {"bitrate": 6800000} for changes in attempts)
+        controller = supervisor.bitrate_controller
+        assert (controller.bitrate, controller.framerate) == (8000000, 30)
+    finally:
+        loop.close()
+
+
+def test_plan_fanout_destinations(write_config):
+    path = write_config()
+    single = load_config(path)
+    write_config(destinations=[{"host": "239.1.1.5", "port": 5000}])
+    fanout = load_config(path)
+    assert plan_config_changes(single, fanout).restart == ["destinations"]
+
+    elements = " ".join(stream_supervisor.build_pipeline_elements(fanout))
+    assert "multiudpsink name=sink clients=192.168.68.101:5000,239.1.1.5:5000 auto-multicast=true ttl-mc=1" in elements
+
+    write_config(destinations=[{"host": "239.1.1.5", "port": 5000}, {"host": "10.0.0.7", "port": 5000}],
+                 multicast_ttl=2)
+    plan = plan_config_changes(fanout, load_config(path))
+    assert plan.restart == []
+    assert plan.live == {
+        "clients": [("192.168.68.101", 5000), ("239.1.1.5", 5000), ("10.0.0.7", 5000)],
+        "multicast_ttl": 2,
+    }
@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import pytest
+
+import stream_supervisor
+from control_api import TOKEN_HEADER, ApiError, ControlServer
+from stream_config import load_config
+from stream_supervisor import AsyncSupervisor
+
+
+@pytest.fixture
+def config_base(config_base):
+    return dict(config_base, presets={
+        "low_latency": {"resolution": {"width": 640, "height": 480}, "framerate": 60, "bitrate": 3000000,
+                        "iframe_interval": 30, "encoder": {"preset-level": 1}},
+        "sharper": {"bitrate": 10000000, "iframe_interval": 15},
+    })
+
+
+async def http(port, method, path, body=None, token=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    auth = f"{TOKEN_HEADER}: {token}\r\n" if token is not None else ""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\n{auth}Content-Length: {len(data)}\r\n\r\n".encode()
+                 + data)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload.decode())
+
+
+def test_control_server_routes_and_errors():
+    loop = asyncio.new_event_loop()
+
+    def fail(body):
+        raise ApiError(409, "busy")
+
+    async def scenario():
+        server = ControlServer(loop, "127.0.0.1", 0)
+        server.route("GET", "/ping", lambda body: (200, {"pong": True}))
+        server.route("POST", "/echo", lambda body: (200, {"got": body}))
+        server.route("POST", "/fail", fail)
+        await server.start()
+        try:
+            assert await http(server.port, "GET", "/ping") == (200, {"pong": True})
+            assert await http(server.port, "POST", "/echo", {"a": 1}) == (200, {"got": {"a": 1}})
+            assert (await http(server.port, "GET", "/echo"))[0] == 405
+            assert (await http(server.port, "GET", "/nope"))[0] == 404
+            assert await http(server.port, "POST", "/fail") == (409, {"error": "busy"})
+        finally:
+            await server.stop()
+
+    try:
+        loop.run_until_complete(scenario())
+    finally:
+        loop.close()
+
+
+def test_control_server_requires_token():
+    loop = asyncio.new_event_loop()
+
+    async def scenario():
+        server = ControlServer(loop, "127.0.0.1", 0, token="s3cret")
+        server.route("GET", "/ping", lambda body: (200, {"pong": True}))
+        await server.start()
+        try:
+            assert (await http(server.port, "GET", "/ping"))[0] == 401
+            assert (await http(server.port, "GET", "/ping", token="wrong"))[0] == 401
+            assert (await http(server.port, "GET", "/nope", token="wrong"))[0] == 401
+            assert await http(server.port, "GET", "/ping", token="s3cret") == (200, {"pong": True})
+        finally:
+            await server.stop()
+
+    try:
+        loop.run_until_complete(scenario())
+    finally:
+        loop.close()
+
+
+def test_control_api_binds_loopback_by_default():
+    assert stream_supervisor.CONTROL_BIND == "127.0.0.1"
+    assert ControlServer(None).host == "127.0.0.1"
+
+
+def test_presets_resolve_and_select(write_config, monkeypatch):
+    path = write_config(active_preset="sharper")
+    config = load_config(path)
+    # Missing preset keys inherit the top-level values
+    assert (config.resolution.width, config.framerate, config.bitrate, config.iframe_interval) == (1280, 30, 10000000, 15)
+
+    loop = asyncio.new_event_loop()
+    try:
+        supervisor = AsyncSupervisor(config, loop, config_path=path)
+        status, listing = supervisor.list_presets()
+        assert status == 200 and listing["active"] == "sharper"
+        assert listing["presets"]["low_latency"]["encoder"] == {"preset-level": 1}
+
+        monkeypatch.setattr(stream_supervisor, "_pipeline_proc", object())
+        status, result = supervisor.select_preset({"name": "low_latency"})
+        assert status == 200
+        assert result["restart"][:2] == ["resolution", "framerate"]
+        assert supervisor.config.resolution.width == 640
+        assert json.loads(path.read_text())["active_preset"] == "low_latency"
+        elements = " ".join(stream_supervisor.build_pipeline_elements(supervisor.config))
+        assert "iframeinterval=30 preset-level=1 !" in elements
+
+        try:
+            supervisor.select_preset({"name": "missing"})
+            assert False, "unknown preset accepted"
+        except ApiError as e:
+            assert e.status == 404
+    finally:
+        loop.close()
+
+
+def test_destinations_add_and_remove(write_config):
+    path = write_config(destinations=[])
+    loop = asyncio.new_event_loop()
+    try:
+        supervisor = AsyncSupervisor(load_config(path), loop, config_path=path)
+        status, listing = supervisor.add_destination({"host": "239.1.1.5", "port": 5004})
+        assert status == 200 and listing["mode"] == "fanout"
+        assert [(d["host"], d["primary"], d["multicast"]) for d in listing["destinations"]] == [
+            ("192.168.68.101", True, False), ("239.1.1.5", False, True),
+        ]
+        assert listing["restart"] == []  # No pipeline running: applies on the next start
+        assert json.loads(path.read_text())["destinations"] == [{"host": "239.1.1.5", "port": 5004}]
+
+        for body, code in (({"host": "239.1.1.5", "port": 5004}, 409), ({"host": "10.0.0.9", "port": 1}, 404),
+                           ({"host": "x"}, 400)):
+            try:
+                (supervisor.add_destination if code == 409 else supervisor.remove_destination)(body)
+                assert False, body
+            except ApiError as e:
+                assert e.status == code
+
+        status, listing = supervisor.remove_destination({"host": "239.1.1.5", "port": 5004})
+        assert len(listing["destinations"]) == 1
+    finally:
+        loop.close()
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import flight_recorder as fr
+
+
+def test_ring_wraparound_keeps_newest_in_order():
+    recorder = fr.FlightRecorder(capacity=4, dump_dir="/nonexistent")
+    for i in range(10):
+        recorder.record(fr.EV_RX, float(i))
+
+    data, count = recorder.snapshot()
+    assert count == 4
+    values = [record[2] for record in fr._RECORD.iter_unpack(data)]
+    assert values == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_partial_ring_snapshot():
+    recorder = fr.FlightRecorder(capacity=8, dump_dir="/nonexistent")
+    recorder.record(fr.EV_CONNECT)
+    recorder.record(fr.EV_RX, 0.5, 0.25, 0.0, 3)
+
+    data, count = recorder.snapshot()
+    assert count == 2
+    assert [record[1] for record in fr._RECORD.iter_unpack(data)] == [fr.EV_CONNECT, fr.EV_RX]
+
+
+def test_dump_load_round_trip(tmp_path):
+    recorder = fr.FlightRecorder(capacity=3, dump_dir=str(tmp_path))
+    recorder.record(fr.EV_CONNECT)
+    recorder.record(fr.EV_RX, 0.5, 0.25, 0.0, 3)
+    recorder.record(fr.EV_UART_WRITE, 112, 25, 0, 0x13)
+    recorder.record(fr.EV_DISCONNECT, fr.DISCONNECT_LINK_TIMEOUT)
+
+    path = recorder.dump("test", background=False)
+    records = list(fr.read_dump(path))
+
+    assert os.path.basename(path).endswith("-test.bin")
+    assert [r[1] for r in records] == [fr.EV_RX, fr.EV_UART_WRITE, fr.EV_DISCONNECT]
+    assert records[0][2:] == (0.5, 0.25, 0.0, 3.0)
+    assert records[1][2:] == (112.0, 25.0, 0.0, 19.0)
+    assert records[0][0] <= records[1][0] <= records[2][0]
+
+
+def test_read_dump_rejects_other_files(tmp_path):
+    path = tmp_path / "flight-bogus.bin"
+    path.write_bytes(b"not a dump at all")
+    with pytest.raises(ValueError):
+        list(fr.read_dump(str(path)))
+
+
+def test_dump_retention_deletes_oldest(tmp_path):
+    for name in ("flight-20250101-120000-failsafe.bin", "flight-20250101-120010-failsafe.bin",
+                 "flight-20250101-120020-request.bin"):
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "notes.txt").write_text("kept")
+    recorder = fr.FlightRecorder(capacity=4, dump_dir=str(tmp_path), max_dumps=2)
+    recorder.record(fr.EV_FAILSAFE_ON, 250)
+
+    path = recorder.dump("failsafe", background=False)
+
+    assert sorted(os.listdir(str(tmp_path))) == sorted([
+        "flight-20250101-120020-request.bin", os.path.basename(path), "notes.txt",
+    ])
+
+
+def test_dumps_in_the_same_second_do_not_overwrite(tmp_path):
+    recorder = fr.FlightRecorder(capacity=4, dump_dir=str(tmp_path))
+    paths = [recorder.dump("request", background=False) for _ in range(3)]
+
+    assert len(set(paths)) == 3
+    assert sorted(os.listdir(str(tmp_path))) == sorted(os.path.basename(path) for path in paths)
+    assert paths == sorted(paths)  # Retention deletes the oldest by name
+
+
+def test_dump_retention_disabled(tmp_path):
+    for second in range(5):
+        (tmp_path / ("flight-20250101-12000%d-failsafe.bin" % second)).write_bytes(b"")
+    recorder = fr.FlightRecorder(capacity=4, dump_dir=str(tmp_path), max_dumps=0)
+
+    recorder.dump("request", background=False)
+
+    assert len(os.listdir(str(tmp_path))) == 6
@@ -0,0 +1,119 @@
+import socket
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+import gst_pipeline
+import latency_probe
+from latency_probe import LatencyProbe, format_timing_line
+
+
+def test_timing_line_format():
+    # Parsed by backend/minicars_backend/video/latency.py (parse_timing)
+    line = format_timing_line(4294967295, 1700000000000000, 1700000000008000, 1700000000009000)
+    assert line == b"T,4294967295,1700000000000000,1700000000008000,1700000000009000\n"
+
+
+class FakePad:
+    def __init__(self):
+        self.callback = None
+
+    def add_probe(self, mask, callback):
+        self.callback = callback
+        return 1
+
+    def remove_probe(self, probe_id):
+        self.callback = None
+
+
+class FakeGstPipeline:
+    """Pipeline clock in ns; base time 1s."""
+
+    def __init__(self):
+        self.now = 0
+        self.pads = {gst_pipeline.ENCODER_NAME: FakePad(), gst_pipeline.PAYLOADER_NAME: FakePad()}
+
+    def get_by_name(self, name):
+        return SimpleNamespace(get_static_pad=lambda pad_name: self.pads[name])
+
+    def get_clock(self):
+        return SimpleNamespace(get_time=lambda: self.now)
+
+    def get_base_time(self):
+        return 1000000000
+
+
+class FakeBuffer:
+    def __init__(self, pts, rtp_ts=0):
+        self.pts = pts
+        self.header = struct.pack("!BBHII", 0x80, 96, 1, rtp_ts, 1234)
+
+    def extract_dup(self, offset, size):
+        return self.header[offset:offset + size]
+
+
+def buffer_info(buffer):
+    return SimpleNamespace(get_buffer=lambda: buffer, get_buffer_list=lambda: None)
+
+
+def buffer_list_info(buffer):
+    buffers = SimpleNamespace(length=lambda: 1, get=lambda index: buffer)
+    return SimpleNamespace(get_buffer=lambda: None, get_buffer_list=lambda: buffers)
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    monkeypatch.setattr(gst_pipeline, "Gst", SimpleNamespace(
+        CLOCK_TIME_NONE=2 ** 64 - 1,
+        PadProbeReturn=SimpleNamespace(OK=1),
+        PadProbeType=SimpleNamespace(BUFFER=16, BUFFER_LIST=32),
+    ))
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(1.0)
+    pipeline = FakeGstPipeline()
+    probe = LatencyProbe(SimpleNamespace(pipeline=pipeline), "127.0.0.1", receiver.getsockname()[1])
+    probe.attach()
+    yield probe, pipeline, receiver
+    probe.detach()
+    receiver.close()
+
+
+def test_probe_matches_pts_and_converts_to_wall_clock(probe, monkeypatch):
+    probe, pipeline, receiver = probe
+    on_encoded = pipeline.pads[gst_pipeline.ENCODER_NAME].callback
+    on_payloaded = pipeline.pads[gst_pipeline.PAYLOADER_NAME].callback
+    monkeypatch.setattr(latency_probe.time, "time", lambda: 1700000000.0)
+
+    # Captured at running time 0.5s, encoded 20ms later, first packet 10ms after that
+    pipeline.now = 1520000000
+    assert on_encoded(None, buffer_info(FakeBuffer(pts=500000000))) == 1
+    pipeline.now = 1530000000
+    assert on_payloaded(None, buffer_info(FakeBuffer(pts=500000000, rtp_ts=90000))) == 1
+
+    # Wall clock is 1700000000s at the last probe: capture 30ms and encode 10ms before it
+    assert receiver.recv(256) == b"T,90000,1699999999970000,1699999999990000,1700000000000000\n"
+    assert probe.frames_sent == 1
+
+
+def test_probe_sends_first_packet_of_each_frame_only(probe):
+    probe, pipeline, receiver = probe
+    on_encoded = pipeline.pads[gst_pipeline.ENCODER_NAME].callback
+    on_payloaded = pipeline.pads[gst_pipeline.PAYLOADER_NAME].callback
+
+    pipeline.now = 1100000000
+    on_encoded(None, buffer_info(FakeBuffer(pts=33000000)))
+    on_encoded(None, buffer_info(FakeBuffer(pts=66000000)))
+    for _ in range(3):  # Three packets of the first frame
+        on_payloaded(None, buffer_info(FakeBuffer(pts=33000000, rtp_ts=2970)))
+    on_payloaded(None, buffer_list_info(FakeBuffer(pts=66000000, rtp_ts=5940)))
+    # A frame the encoder probe never saw is skipped
+    on_payloaded(None, buffer_info(FakeBuffer(pts=99000000, rtp_ts=8910)))
+
+    lines = [receiver.recv(256), receiver.recv(256)]
+    assert [line.split(b",")[1] for line in lines] == [b"2970", b"5940"]
+    assert probe.frames_sent == 2
+    receiver.settimeout(0.05)
+    with pytest.raises(socket.timeout):
+        receiver.recv(256)
@@ -0,0 +1,51 @@
+import pytest
+
+from stream_config import StreamConfigError
+from stream_supervisor import build_pipeline_elements, plan_config_changes
+
+
+@pytest.fixture
+def config_base(config_base):
+    return dict(config_base, control_station_host="10.0.0.2", camera_device="videotestsrc",
+                resolution={"width": 640, "height": 480}, bitrate=2000000, pipeline_backend="software")
+
+
+def test_no_recovery_by_default(make_config):
+    text = " ".join(build_pipeline_elements(make_config(loss_recovery={"mode": "none"})))
+    assert "rtph264pay name=pay config-interval=1 pt=96 ! udpsink name=sink host=10.0.0.2 port=5000" in text
+    assert "rtprtxsend" not in text and "rtpulpfecenc" not in text
+
+
+def test_rtx_pipeline(make_config):
+    config = make_config(loss_recovery={"mode": "rtx", "max_delay_ms": 80, "rtcp_port": 5003})
+    text = " ".join(build_pipeline_elements(config))
+    assert ('pt=96 ! rtprtxsend name=rtx payload-type-map="application/x-rtp-pt-map,96=(uint)97" '
+            "max-size-time=80 ! session.send_rtp_sink rtpsession name=session rtp-profile=avpf "
+            "session.send_rtp_src ! udpsink name=sink host=10.0.0.2 port=5000") in text
+    assert "session.send_rtcp_src ! udpsink host=10.0.0.2 port=5001" in text
+    assert text.endswith("udpsrc port=5003 ! session.recv_rtcp_sink")
+
+
+def test_fec_pipeline(make_config):
+    config = make_config(loss_recovery={"mode": "fec", "fec_percentage": 30})
+    text = " ".join(build_pipeline_elements(config))
+    assert "pt=96 ! rtpulpfecenc name=fec pt=122 percentage=30 ! udpsink name=sink" in text
+
+
+@pytest.mark.parametrize("loss_recovery", [
+    {"mode": "arq"}, {"mode": "rtx", "max_delay_ms": 5}, {"mode": "rtx", "rtcp_port": 5000},
+    {"mode": "fec", "fec_percentage": 0}, "rtx",
+])
+def test_invalid_loss_recovery_rejected(make_config, loss_recovery):
+    with pytest.raises(StreamConfigError):
+        make_config(loss_recovery=loss_recovery)
+
+
+def test_loss_recovery_changes_restart(make_config):
+    old = make_config()
+    rtx = make_config(loss_recovery={"mode": "rtx"})
+    assert plan_config_changes(old, rtx).restart == ["loss_recovery"]
+    # With rtx the RTCP sink follows the control station: host changes restart too
+    moved = make_config(loss_recovery={"mode": "rtx"}, control_station_host="10.0.0.3")
+    plan = plan_config_changes(rtx, moved)
+    assert "host" not in plan.live and plan.restart == ["host"]
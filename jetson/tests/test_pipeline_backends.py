@@ -0,0 +1,106 @@
+import pytest
+
+import pipeline_backends
+from stream_config import PIPELINE_BACKENDS, StreamConfigError
+from stream_supervisor import build_pipeline_elements, pipeline_markers, plan_config_changes
+
+
+@pytest.fixture
+def config_base(config_base):
+    return dict(config_base, control_station_host="127.0.0.1", camera_device="videotestsrc",
+                resolution={"width": 640, "height": 480}, bitrate=2000000, flip_method=2,
+                pipeline_backend="software")
+
+
+def test_every_config_backend_is_registered():
+    assert sorted(pipeline_backends.BACKENDS) == sorted(PIPELINE_BACKENDS)
+
+
+def test_software_pipeline_uses_x264_and_keeps_element_names(make_config):
+    elements = build_pipeline_elements(make_config())
+    text = " ".join(elements)
+    assert text.startswith("videotestsrc name=camera is-live=true")
+    assert 'caps="video/x-raw,width=640,height=480,framerate=30/1"' in text
+    assert "videoflip method=rotate-180" in text
+    assert "x264enc name=encoder tune=zerolatency speed-preset=ultrafast bitrate=2000 key-int-max=10" in text
+    assert "nvvidconv" not in text and "NVMM" not in text
+    assert "rtph264pay name=pay" in text
+
+    v4l2 = " ".join(build_pipeline_elements(make_config(camera_device="/dev/video2")))
+    assert v4l2.startswith("v4l2src name=camera device=/dev/video2 !")
+
+
+def test_nvidia_backend_is_the_default(make_config):
+    config = make_config(pipeline_backend=None, camera_device="nvarguscamerasrc")
+    text = " ".join(build_pipeline_elements(config))
+    assert text.startswith("nvarguscamerasrc name=camera")
+    assert "nvv4l2h264enc name=encoder" in text and "bitrate=2000000" in text
+
+
+def test_invalid_backend_rejected(make_config):
+    with pytest.raises(StreamConfigError):
+        make_config(pipeline_backend="cuda")
+
+
+def test_live_changes_follow_backend(make_config):
+    old = make_config()
+    plan = plan_config_changes(old, make_config(bitrate=3000000, iframe_interval=30))
+    assert plan.live == {"bitrate": 3000000}
+    assert plan.restart == ["iframe_interval"]  # x264enc reads key-int-max only at init
+
+    backend = pipeline_backends.get_backend("software")
+    assert backend.to_element("bitrate", 3000000) == 3000
+    assert backend.from_element("bitrate", 3000) == 3000000
+
+    plan = plan_config_changes(old, make_config(pipeline_backend="nvidia"))
+    assert plan.restart == ["pipeline_backend"]
+
+
+def test_software_first_frame_marker():
+    markers = pipeline_markers(pipeline_backends.get_backend("software"))
+    line = "/GstPipeline:pipeline0/GstCapsFilter:camcaps.GstPad:src: caps = video/x-raw, width=(int)640"
+    assert markers["first_frame"].search(line)
+
+
+def test_encoder_tuning_defaults_keep_pipeline(make_config):
+    text = " ".join(build_pipeline_elements(make_config(pipeline_backend="nvidia")))
+    assert "insert-sps-pps=true maxperf-enable=1 control-rate=2 bitrate=2000000 iframeinterval=10 !" in text
+
+
+def test_encoder_tuning_nvidia(make_config):
+    tuning = {"control_rate": "cbr", "maxperf": False, "idr_interval": 30, "preset_level": "fast",
+              "insert_vui": True, "slices": 4, "intra_refresh": 15}
+    config = make_config(pipeline_backend="nvidia", encoder_tuning=tuning, encoder={"vbv-size": 5000})
+    text = " ".join(build_pipeline_elements(config))
+    assert "maxperf-enable" not in text
+    # 640x480 = 40x30 macroblocks, 4 slices of 300
+    assert ("control-rate=1 bitrate=2000000 iframeinterval=10 idrinterval=30 preset-level=2 insert-vui=true "
+            "slice-header-spacing=300 slice-intrarefresh-interval=15 vbv-size=5000 !") in text
+
+
+def test_encoder_tuning_software(make_config):
+    tuning = {"control_rate": "cbr", "preset_level": "medium", "slices": 2, "intra_refresh": 20, "insert_vui": True}
+    text = " ".join(build_pipeline_elements(make_config(encoder_tuning=tuning)))
+    assert ("x264enc name=encoder tune=zerolatency speed-preset=veryfast bitrate=2000 key-int-max=20 "
+            'vbv-buf-capacity=34 intra-refresh=true sliced-threads=true option-string="slices=2" !') in text
+
+
+@pytest.mark.parametrize("tuning", [
+    {"control_rate": "abr"}, {"preset_level": 2}, {"slices": 0}, {"intra_refresh": True},
+    {"maxperf": 1}, {"idrinterval": 30}, [],
+])
+def test_invalid_encoder_tuning_rejected(make_config, tuning):
+    with pytest.raises(StreamConfigError):
+        make_config(encoder_tuning=tuning)
+
+
+def test_encoder_tuning_in_presets_and_plan(make_config):
+    presets = {"fast": {"encoder_tuning": {"control_rate": "cbr"}}, "plain": {"bitrate": 3000000}}
+    base = make_config(encoder_tuning={"insert_vui": True}, presets=presets)
+    assert base.presets["plain"].encoder_tuning.insert_vui  # Inherited from the top level
+    assert base.presets["fast"].as_dict()["encoder_tuning"]["control_rate"] == "cbr"
+
+    active = make_config(encoder_tuning={"insert_vui": True}, presets=presets, active_preset="fast")
+    assert active.encoder_tuning.control_rate == "cbr" and not active.encoder_tuning.insert_vui
+    plan = plan_config_changes(base, active)
+    assert "encoder_tuning" in plan.restart
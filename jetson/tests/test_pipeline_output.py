@@ -0,0 +1,148 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
+import stream_supervisor
+from pipeline_output import (
+    ERROR_CAPTURE,
+    ERROR_ENCODER,
+    ERROR_OTHER,
+    ERROR_UDPSINK,
+    FIRST_PACKET_PATTERN,
+    OutputDrainer,
+    classify_line,
+)
+
+# Printed by gst-launch-1.0 -v on every normal start on the Jetson Nano
+# (nvarguscamerasrc ! nvv4l2h264enc ! rtph264pay ! udpsink)
+BENIGN_JETSON_LINES = [
+    "Setting pipeline to PAUSED ...",
+    "Opening in BLOCKING MODE ",
+    "Pipeline is live and does not need PREROLL ...",
+    "Setting pipeline to PLAYING ...",
+    "New clock: GstSystemClock",
+    "/GstPipeline:pipeline0/GstNvArgusCameraSrc:nvarguscamerasrc0.GstPad:src: caps = "
+    "video/x-raw(memory:NVMM), width=(int)1280, height=(int)720, format=(string)NV12, framerate=(fraction)30/1",
+    "Redistribute latency...",
+    "NvMMLiteOpen : Block : BlockType = 4 ",
+    "===== NVMEDIA: NVENC =====",
+    "NvMMLiteBlockCreate : Block : BlockType = 4 ",
+    "GST_ARGUS: Creating output stream",
+    "CONSUMER: Waiting until producer is connected...",
+    "GST_ARGUS: Available Sensor modes :",
+    "GST_ARGUS: 3264 x 2464 FR = 21.000000 fps Duration = 47619048 ; Analog Gain range min 1.000000, "
+    "max 10.625000; Exposure Range min 13000, max 683709000;",
+    "GST_ARGUS: Running with following settings:",
+    "   Camera index = 0 ",
+    "GST_ARGUS: Setup Complete, Starting captures for 0 seconds",
+    "GST_ARGUS: Starting repeat capture requests.",
+    "CONSUMER: Producer has connected; continuing.",
+    "H264: Profile = 66, Level = 0 ",
+    "NVMEDIA_ENC: bBlitMode is set to TRUE ",
+    "/GstPipeline:pipeline0/nvv4l2h264enc:encoder.GstPad:src: caps = video/x-h264, "
+    "stream-format=(string)byte-stream, alignment=(string)au, profile=(string)baseline, level=(string)4, "
+    "width=(int)1280, height=(int)720, pixel-aspect-ratio=(fraction)1/1, framerate=(fraction)30/1",
+    "/GstPipeline:pipeline0/GstRtpH264Pay:rtph264pay0.GstPad:src: caps = application/x-rtp, "
+    "media=(string)video, clock-rate=(int)90000, encoding-name=(string)H264, packetization-mode=(string)1, "
+    "payload=(int)96, ssrc=(uint)1372614561, timestamp-offset=(uint)2744287218, seqnum-offset=(uint)21385",
+    "/GstPipeline:pipeline0/GstRtpH264Pay:rtph264pay0: timestamp = 2744290218",
+    "/GstPipeline:pipeline0/GstRtpH264Pay:rtph264pay0: seqnum = 21385",
+]
+
+
+@pytest.mark.parametrize("line", BENIGN_JETSON_LINES)
+def test_benign_jetson_output_is_not_an_error(line):
+    assert classify_line(line) is None
+
+
+@pytest.mark.parametrize("line, category", [
+    ("Error generated. /dvs/git/dirty/git-master_linux/multimedia/nvgstreamer/gst-nvarguscamera/"
+     "gstnvarguscamerasrc.cpp, execute:645 Failed to create CaptureSession", ERROR_CAPTURE),
+    ("(Argus) Error FileOperationFailed: Connecting to nvargus-daemon failed: No such file or directory "
+     "(in src/rpc/socket/client/SocketClientDispatch.cpp, function openSocketConnection(), line 204)",
+     ERROR_CAPTURE),
+    ("ERROR: from element /GstPipeline:pipeline0/GstNvArgusCameraSrc:nvarguscamerasrc0: "
+     "Internal data stream error.", ERROR_CAPTURE),
+    ("ERROR: from element /GstPipeline:pipeline0/nvv4l2h264enc:encoder: Failed to process frame.",
+     ERROR_ENCODER),
+    ("NVENC: Failed to create encoder session", ERROR_ENCODER),
+    ("WARNING: from element /GstPipeline:pipeline0/GstUDPSink:udpsink0: Error sending UDP packets",
+     ERROR_UDPSINK),
+    ("ERROR: pipeline doesn't want to preroll.", ERROR_OTHER),
+])
+def test_error_lines_are_classified(line, category):
+    assert classify_line(line) == category
+
+
+def test_wait_for_stops_only_on_error_level_lines():
+    drainer = OutputDrainer(None, markers={"first_packet": FIRST_PACKET_PATTERN})
+    drainer.feed("stderr", "WARNING: from element /GstPipeline:pipeline0/GstUDPSink:udpsink0: "
+                           "Error sending UDP packets")
+    assert not drainer.wait_for("first_packet", timeout=0.05, stop_on_fatal=True)
+    assert drainer.fatal_error is None  # Counted, but the start keeps waiting
+
+    drainer.feed("stdout", "ERROR: from element /GstPipeline:pipeline0/GstUDPSink:udpsink0: Could not send")
+    assert drainer.fatal_error.startswith("ERROR: from element")
+    assert not drainer.wait_for("first_packet", timeout=5.0, stop_on_fatal=True)
+    assert drainer.error_counts == {ERROR_UDPSINK: 2}
+
+
+CAPTURE_FAILURE_LINES = [
+    "Setting pipeline to PAUSED ...",
+    "Pipeline is live and does not need PREROLL ...",
+    "Setting pipeline to PLAYING ...",
+    "New clock: GstSystemClock",
+    "NvMMLiteOpen : Block : BlockType = 4 ",
+    "===== NVMEDIA: NVENC =====",
+    "Error generated. /dvs/git/dirty/git-master_linux/multimedia/nvgstreamer/gst-nvarguscamera/"
+    "gstnvarguscamerasrc.cpp, execute:645 Failed to create CaptureSession",
+    "ERROR: from element /GstPipeline:pipeline0/GstNvArgusCameraSrc:nvarguscamerasrc0: "
+    "Internal data stream error.",
+    "Execution ended after 0:00:00.412350625",
+    "Setting pipeline to NULL ...",
+]
+
+
+def fake_gst_launch(tmp_path, monkeypatch, lines, exit_code=None):
+    """Put a gst-launch-1.0 on PATH that replays lines, then keeps running or exits."""
+    script = tmp_path / "gst-launch-1.0"
+    script.write_text(textwrap.dedent("""\
+        #!{python}
+        import sys, time
+        for line in {lines!r}:
+            print(line, flush=True)
+            time.sleep(0.005)
+        if {exit_code!r} is not None:
+            sys.exit({exit_code!r})
+        time.sleep(30)
+        """).format(python=sys.executable, lines=lines, exit_code=exit_code))
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path) + os.pathsep + os.environ["PATH"])
+    monkeypatch.setattr(stream_supervisor, "PIPELINE_MODE", "gst-launch")
+    monkeypatch.setattr(stream_supervisor, "READY_TIMEOUT", 5.0)
+
+
+def test_launch_ready_on_normal_jetson_start(tmp_path, monkeypatch, make_config):
+    fake_gst_launch(tmp_path, monkeypatch, BENIGN_JETSON_LINES)
+    try:
+        started, category = stream_supervisor._launch_pipeline(make_config(control_station_host="127.0.0.1"))
+        output = stream_supervisor._pipeline_output
+        assert (started, category) == (True, None)
+        assert output.error_counts == {}
+        assert output.fatal_error is None
+        assert {"playing", "first_frame", "first_packet"} <= set(output.marker_times)
+    finally:
+        stream_supervisor.stop_pipeline()
+
+
+def test_launch_fails_fast_on_capture_error(tmp_path, monkeypatch, make_config):
+    monkeypatch.setattr(stream_supervisor, "_nvargus_restart_needed", False)
+    fake_gst_launch(tmp_path, monkeypatch, CAPTURE_FAILURE_LINES, exit_code=1)
+
+    started, category = stream_supervisor._launch_pipeline(make_config(control_station_host="127.0.0.1"))
+
+    assert (started, category) == (False, ERROR_CAPTURE)
+    # The NVENC banner no longer hides the capture failure: nvargus-daemon is restarted next
+    assert stream_supervisor._nvargus_restart_needed
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+import recorder
+from stream_config import StreamConfigError
+from stream_supervisor import build_pipeline_elements, plan_config_changes
+
+
+def write_segment(directory, name, size, mtime):
+    path = directory / name
+    path.write_bytes(b"\0" * size)
+    os.utime(str(path), (mtime, mtime))
+    return path
+
+
+def test_ring_deletes_oldest_segments_over_quota(tmp_path):
+    for i in range(5):
+        write_segment(tmp_path, f"rec-20260101-000000-{i:05d}.mkv", 400, 1000 + i)
+    (tmp_path / "notes.txt").write_bytes(b"\0" * 5000)  # Not a segment: never counted or deleted
+    ring = recorder.SegmentRing(str(tmp_path), quota_bytes=1000)
+
+    deleted = ring.enforce()
+
+    assert [os.path.basename(p) for p in deleted] == [
+        "rec-20260101-000000-00000.mkv", "rec-20260101-000000-00001.mkv", "rec-20260101-000000-00002.mkv",
+    ]
+    stats = ring.stats()
+    assert stats["segments"] == 2 and stats["bytes"] == 800
+    assert stats["newest"] == "rec-20260101-000000-00004.mkv"
+    assert (tmp_path / "notes.txt").exists()
+
+
+def test_ring_keeps_segment_being_written(tmp_path):
+    write_segment(tmp_path, "rec-a-00000.mkv", 5000, 1000)
+    ring = recorder.SegmentRing(str(tmp_path), quota_bytes=1000)
+    assert ring.enforce() == []
+    assert ring.stats()["segments"] == 1
+
+
+def test_pipeline_tees_encoded_stream_only_with_recording_section(make_config):
+    plain = build_pipeline_elements(make_config())
+    assert "tee" not in plain
+
+    config = make_config(recording={"format": "mp4", "segment_seconds": 30})
+    live = build_pipeline_elements(config)
+    assert live[live.index("tee") + 1] == f"name={recorder.TEE_NAME}"
+    assert "splitmuxsink" not in live  # Attached at runtime (in-process) or with record=True
+
+    recording = build_pipeline_elements(config, record=True)
+    branch = recording[recording.index(f"{recorder.TEE_NAME}.") + 2:]
+    assert branch[:3] == ["queue", f"name={recorder.QUEUE_NAME}", "leaky=downstream"]
+    assert "muxer=mp4mux" in branch and "max-size-time=30000000000" in branch
+    # The branch carries the encoder output as is: no second encoder
+    assert sum(1 for token in recording if token.startswith("nvv4l2h264enc")) == 1
+
+
+def test_recording_config_validation(make_config):
+    config = make_config(recording={"enabled": True})
+    assert config.recording.enabled and config.recording.format == "mkv"
+    assert os.path.isabs(config.recording.directory)
+    for bad in ({"format": "avi"}, {"segment_seconds": 2}, {"quota_mb": 10}, {"directory": ""}):
+        with pytest.raises(StreamConfigError):
+            make_config(recording=bad)
+
+
+def test_recording_section_changes_are_planned(make_config):
+    old = make_config()
+    added = make_config(recording={})
+    assert "recording" in plan_config_changes(old, added).restart
+    changed = make_config(recording={"segment_seconds": 120})
+    plan = plan_config_changes(added, changed)
+    assert plan.restart == [] and plan.supervisor == ["recording"]
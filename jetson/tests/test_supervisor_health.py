@@ -0,0 +1,57 @@
+import asyncio
+
+import stream_supervisor
+from stream_config import load_config
+from stream_supervisor import AsyncSupervisor
+from supervisor_health import RateMeter, ReachabilityHistory
+
+
+def test_reachability_history_records_transitions():
+    history = ReachabilityHistory(window=4)
+    for ok, state, now in ((False, False, 1.0), (True, False, 2.0), (True, True, 3.0), (False, True, 4.0),
+                           (False, True, 5.0)):
+        history.record(ok, state, now)
+    snapshot = history.snapshot()
+    assert snapshot["state"] is True
+    assert snapshot["success_rate"] == 0.5  # Last 4 probes
+    assert snapshot["last_ok_at"] == 3.0 and snapshot["last_failed_at"] == 5.0
+    assert snapshot["transitions"] == [{"at": 1.0, "state": False}, {"at": 3.0, "state": True}]
+
+
+def test_rate_meter():
+    meter = RateMeter(min_interval=1.0)
+    assert meter.update((0, 0), now=10.0) is None
+    assert meter.update((30, 1000), now=11.0) == (30.0, 1000.0)
+    assert meter.update((31, 1100), now=11.5) == (30.0, 1000.0)  # Too soon: previous rates
+    assert meter.update((5, 100), now=13.0) is None  # Counters went back: new pipeline
+
+
+def test_health_reports_failed_start(write_config, monkeypatch):
+    path = write_config()
+    loop = asyncio.new_event_loop()
+
+    def failing_start(config):
+        stream_supervisor._last_exit = ("failed to start", "capture", 1)
+        return False
+
+    monkeypatch.setattr(stream_supervisor, "start_pipeline", failing_start)
+    monkeypatch.setattr(stream_supervisor, "_pipeline_proc", None)
+    try:
+        supervisor = AsyncSupervisor(load_config(path), loop, config_path=path)
+        supervisor.health.backend.record(True, True)
+        supervisor.backend.state = True
+        assert supervisor.get_health()[1]["state"] == "stopped"
+
+        loop.run_until_complete(supervisor._start())
+        status, health = supervisor.get_health()
+        assert status == 200
+        assert health["state"] == "backoff" and "capture" in health["reason"]
+        assert health["start_failures"] == 1 and health["restarts"] == 0
+        assert health["last_failure"]["class"] == "capture"
+        assert health["reachability"]["backend"]["target"] == "192.168.68.101:8000"
+        assert health["encoder"]["measured"] is False and health["encoder"]["target_bitrate"] == 8000000
+
+        supervisor.backend.state = False
+        assert supervisor.get_health()[1]["state"] == "waiting"
+    finally:
+        loop.close()
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+import tcp_uart_bridge as bridge
+from uart_protocol import BinaryFrameDecoder, encode_ascii
+
+
+def test_same_host_reconnect_preempts_active_client():
+    assert bridge.may_preempt(("192.168.68.100", 54321), ("192.168.68.100", 54400), silent_ms=5.0)
+
+
+def test_other_host_refused_while_client_is_active():
+    assert not bridge.may_preempt(("192.168.68.100", 54321), ("192.168.68.120", 40000), silent_ms=15.0)
+
+
+def test_other_host_takes_over_stale_link():
+    silent_ms = bridge.PREEMPT_STALE_MS + 1.0
+    assert bridge.may_preempt(("192.168.68.100", 54321), ("192.168.68.120", 40000), silent_ms=silent_ms)
+
+
+class FakeUart:
+    is_open = True
+
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+def make_bridge(tmp_path):
+    b = bridge.TCPUARTBridge()
+    b.recorder.dump_dir = str(tmp_path)
+    b.uart = FakeUart()
+    b.client_stored = True  # A client connection is in systemd's fd store
+    return b
+
+
+class SlowUart(FakeUart):
+    def write(self, data):
+        # Split the write so an unlocked writer in another thread can interleave
+        self.written.append(data[:2])
+        time.sleep(0.0001)
+        self.written.append(data[2:])
+
+
+def test_watchdog_and_client_writes_do_not_interleave(tmp_path):
+    b = make_bridge(tmp_path)
+    b.uart = SlowUart()
+    b.encode_uart = bridge.get_encoder("binary")
+
+    def writer(values):
+        for _ in range(100):
+            b.write_uart_command(values)
+
+    threads = [threading.Thread(target=writer, args=(values,))
+               for values in ((90, 0, 100, 0, 0), (120, 40, 0, 0, 0))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    decoder = BinaryFrameDecoder()
+    seqs = []
+    for i in range(0, len(b.uart.written), 2):
+        assert len(decoder.feed(b"".join(b.uart.written[i:i + 2]))) == 1
+        seqs.append(decoder.last_seq)
+    assert decoder.crc_errors == 0
+    assert seqs == [i % bridge.SEQ_MODULO for i in range(200)]
+
+
+def test_restart_marker_is_consumed_once(tmp_path):
+    marker = tmp_path / "restart"
+    assert not bridge.consume_restart_marker(str(marker))
+    marker.touch()
+    assert bridge.consume_restart_marker(str(marker))
+    assert not marker.exists()
+    assert not bridge.consume_restart_marker(str(marker))
+
+
+def test_stale_restart_marker_is_ignored(tmp_path):
+    marker = tmp_path / "restart"
+    marker.touch()
+    old = marker.stat().st_mtime - bridge.HANDOVER_MARKER_MAX_AGE - 5
+    os.utime(str(marker), (old, old))
+    assert not bridge.consume_restart_marker(str(marker))
+    assert not marker.exists()
+
+
+def test_stop_without_restart_marker_sends_failsafe(tmp_path, monkeypatch):
+    monkeypatch.setattr(bridge, "HANDOVER", True)
+    monkeypatch.setattr(bridge, "HANDOVER_MARKER", str(tmp_path / "restart"))
+    b = make_bridge(tmp_path)
+    uart = b.uart
+
+    b.shutdown()
+
+    assert not b.handing_over
+    assert uart.written == [encode_ascii((90, 0, 100, 0, 0))]
+
+
+def test_marked_restart_hands_over_without_failsafe(tmp_path, monkeypatch):
+    marker = tmp_path / "restart"
+    marker.touch()
+    monkeypatch.setattr(bridge, "HANDOVER", True)
+    monkeypatch.setattr(bridge, "HANDOVER_MARKER", str(marker))
+    b = make_bridge(tmp_path)
+    uart = b.uart
+
+    b.shutdown()
+
+    assert b.handing_over
+    assert uart.written == []
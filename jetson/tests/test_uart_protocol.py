@@ -0,0 +1,88 @@
+from uart_protocol import (
+    EVENT_ACK,
+    EVENT_TELEMETRY,
+    FRAME_SIZE,
+    SYNC_BYTE,
+    BinaryFrameDecoder,
+    TelemetryDecoder,
+    crc8,
+    decode_ascii_line,
+    encode_ack,
+    encode_ascii,
+    encode_binary,
+    encode_telemetry,
+)
+
+
+def test_crc8_check_value():
+    # CRC-8/SMBUS check value for "123456789"
+    assert crc8(b"123456789") == 0xF4
+    assert crc8(b"") == 0
+
+
+def test_ascii_longest_command_is_16_bytes():
+    line = encode_ascii((180, 100, 100, 1, 1))
+    assert line == b"180,100,100,1,1\n"
+    assert len(line) == 16
+    assert decode_ascii_line(line.decode("ascii")) == (180, 100, 100, 1, 1)
+
+
+def test_binary_frame_round_trip():
+    decoder = BinaryFrameDecoder()
+    commands = [(90, 0, 100, 0, 0), (180, 100, 0, 1, 1), (0, 55, 12, 0, 1)]
+    stream = b"".join(encode_binary(values, seq=i) for i, values in enumerate(commands, start=14))
+
+    # Arbitrary chunking, as the serial port delivers it
+    decoded = []
+    for i in range(0, len(stream), 4):
+        decoded.extend(decoder.feed(stream[i:i + 4]))
+
+    assert decoded == commands
+    assert decoder.frames_ok == 3
+    assert decoder.crc_errors == 0
+    assert decoder.last_seq == 0  # 16 wraps to 0
+
+
+def test_binary_frame_bad_crc_is_dropped():
+    decoder = BinaryFrameDecoder()
+    frame = bytearray(encode_binary((90, 20, 0, 0, 0)))
+    frame[2] ^= 0x01  # Flip a bit in accel
+
+    assert decoder.feed(bytes(frame)) == []
+    assert decoder.crc_errors == 1
+    assert decoder.frames_ok == 0
+
+
+def test_binary_decoder_resyncs_after_garbage_and_corruption():
+    decoder = BinaryFrameDecoder()
+    good = encode_binary((90, 0, 100, 0, 0), seq=3)
+    # Truncated frame whose body contains a sync byte, then garbage, then a good frame
+    corrupted = bytes((SYNC_BYTE, 10, SYNC_BYTE, 7))
+    stream = b"\x00\x13" + corrupted + b"\xff" + good
+
+    assert decoder.feed(stream) == [(90, 0, 100, 0, 0)]
+    assert decoder.last_seq == 3
+    assert decoder.crc_errors >= 1
+    assert decoder.bytes_skipped > 0
+
+    # Still in sync for the next frame
+    assert decoder.feed(encode_binary((45, 5, 0, 0, 0))) == [(45, 5, 0, 0, 0)]
+    assert len(good) == FRAME_SIZE
+
+
+def test_telemetry_round_trip_both_framings():
+    for framing in ("ascii", "binary"):
+        decoder = TelemetryDecoder(framing)
+        stream = encode_telemetry(framing, 7400, -35) + encode_ack(framing, seq=5)
+        events = decoder.feed(stream[:3]) + decoder.feed(stream[3:])
+        expected_seq = 5 if framing == "binary" else None
+        assert events == [(EVENT_TELEMETRY, 7400, -35), (EVENT_ACK, expected_seq, 0)]
+
+
+def test_binary_telemetry_bad_crc_resyncs():
+    decoder = TelemetryDecoder("binary")
+    bad = bytearray(encode_telemetry("binary", 7400, 10))
+    bad[-1] ^= 0xFF
+    events = decoder.feed(bytes(bad) + encode_ack("binary", seq=2))
+    assert events == [(EVENT_ACK, 2, 0)]
+    assert decoder.errors == 1
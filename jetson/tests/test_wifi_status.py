@@ -0,0 +1,67 @@
+import struct
+
+from wifi_status import (
+    NL80211_RATE_INFO_BITRATE32,
+    NL80211_STA_INFO_SIGNAL,
+    NL80211_STA_INFO_TX_BITRATE,
+    WifiMonitor,
+    _nla,
+    find_wireless_interface,
+    parse_station_info,
+    read_proc_wireless,
+)
+
+
+PROC_WIRELESS = (
+    "Inter-| sta-|   Quality        |   Discarded packets               | Missed | WE\n"
+    " face | tus | link level noise |  nwid  crypt   frag  retry   misc | beacon | 22\n"
+    " wlan0: 0000   58.  -52.  -256        0      0      0      0      0        0\n"
+)
+
+
+def make_fake_roots(tmp_path, operstate="up", carrier="1"):
+    proc_root = tmp_path / "proc"
+    (proc_root / "net").mkdir(parents=True)
+    (proc_root / "net" / "wireless").write_text(PROC_WIRELESS)
+    sys_root = tmp_path / "sys"
+    for name in ("eth0", "wlan0"):
+        (sys_root / "class" / "net" / name).mkdir(parents=True)
+    iface = sys_root / "class" / "net" / "wlan0"
+    (iface / "wireless").mkdir()
+    (iface / "operstate").write_text(operstate + "\n")
+    (iface / "carrier").write_text(carrier + "\n")
+    (iface / "ifindex").write_text("3\n")
+    return str(proc_root), str(sys_root)
+
+
+def test_proc_wireless_and_interface_detection(tmp_path):
+    proc_root, sys_root = make_fake_roots(tmp_path)
+    assert read_proc_wireless(proc_root) == {"wlan0": (58.0, -52.0)}
+    assert find_wireless_interface(sys_root, proc_root) == "wlan0"
+
+
+def test_parse_station_info():
+    rate = _nla(NL80211_RATE_INFO_BITRATE32, struct.pack("=I", 722))
+    sta_info = _nla(NL80211_STA_INFO_SIGNAL, struct.pack("=b", -47)) + _nla(NL80211_STA_INFO_TX_BITRATE, rate)
+    assert parse_station_info(sta_info) == (-47.0, 72.2)
+
+
+def test_monitor_cache_and_change_events(tmp_path, monkeypatch):
+    proc_root, sys_root = make_fake_roots(tmp_path)
+    calls = []
+    monkeypatch.setattr("wifi_status.read_iwgetid_ssid", lambda: calls.append(1) or "MiniCars Network")
+    monitor = WifiMonitor(ttl=60.0, proc_root=proc_root, sys_root=sys_root, use_netlink=False)
+    changes = []
+    monitor.on_change(lambda old, new: changes.append((old.connected, new.connected)))
+
+    status = monitor.get_status()
+    assert status.connected and status.signal_dbm == -52.0 and status.ssid_source == "iwgetid"
+    assert monitor.ssid_matches("MiniCars Network")
+    assert not monitor.ssid_matches("Other")
+    assert len(calls) == 1  # Cached within the TTL
+
+    (tmp_path / "sys" / "class" / "net" / "wlan0" / "operstate").write_text("dormant\n")
+    status = monitor.get_status(force=True)
+    assert not status.connected and status.ssid is None
+    assert changes == [(True, False)]
+    assert len(calls) == 1  # No fallback while not associated
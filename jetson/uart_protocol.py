@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+MiniCars UART framing for the Jetson-to-Arduino link.
+
+Two framings are supported on the serial line:
+
+- ``ascii`` (legacy): "servo_angle,accel_pct,brake_pct,hbrake_flag,turbo_flag\\n"
+  (up to 16 bytes per command including the newline, no integrity check)
+- ``binary``: fixed 6-byte frame with CRC-8
+
+Binary frame layout::
+
+    +------+-------+-------+-------+-------+-------+
+    | 0xA5 | servo | accel | brake | flags | crc8  |
+    +------+-------+-------+-------+-------+-------+
+
+    servo: 0-180 (servo angle)
+    accel: 0-100 (throttle percent)
+    brake: 0-100 (brake percent)
+    flags: bit0 = handbrake, bit1 = turbo, bits 2-3 reserved (send 0),
+           bits 4-7 = command sequence number (0-15, echoed in acks)
+    crc8:  CRC-8/SMBUS (poly 0x07, init 0x00) over servo..flags
+
+The CRC excludes the sync byte so a receiver can validate a candidate frame
+without special-casing it. The Arduino side only needs the 256-byte table
+below (or the bitwise loop in ``crc8``) to decode it.
+
+Arduino-to-Jetson telemetry uses the same framing as commands:
+
+- ascii: "T,battery_mv,wheel_speed_cms\\n" and "A\\n" (ack of the last command)
+- binary: 7-byte frame ``0x5A | type | 4-byte payload | crc8`` where type 0x01
+  is telemetry (battery_mv u16 LE, wheel_speed_cms s16 LE) and type 0x02 is an
+  ack (sequence number in the first payload byte)
+"""
+import struct
+from typing import List, Optional, Tuple
+
+FRAMING_ASCII = "ascii"
+FRAMING_BINARY = "binary"
+VALID_FRAMINGS = (FRAMING_ASCII, FRAMING_BINARY)
+
+SYNC_BYTE = 0xA5
+FRAME_SIZE = 6
+
+FLAG_HANDBRAKE = 0x01
+FLAG_TURBO = 0x02
+SEQ_SHIFT = 4
+SEQ_MODULO = 16
+
+TELEMETRY_SYNC_BYTE = 0x5A
+TELEMETRY_FRAME_SIZE = 7
+TELEMETRY_TYPE_STATUS = 0x01
+TELEMETRY_TYPE_ACK = 0x02
+
+# Decoded telemetry events
+EVENT_TELEMETRY = "T"  # (EVENT_TELEMETRY, battery_mv, wheel_speed_cms)
+EVENT_ACK = "A"  # (EVENT_ACK, seq or None, 0)
+
+# (servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag)
+UartValues = Tuple[int, int, int, int, int]
+
+
+def _build_crc8_table(poly: int = 0x07) -> bytes:
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return bytes(table)
+
+
+_CRC8_TABLE = _build_crc8_table()
+
+
+def crc8(data: bytes) -> int:
+    """
+    Compute CRC-8/SMBUS (poly 0x07, init 0x00, no reflection).
+
+    Args:
+        data: Bytes to checksum
+
+    Returns:
+        CRC value (0-255)
+    """
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def encode_ascii(values: UartValues, seq: int = 0) -> bytes:
+    """
+    Encode command values in the legacy ASCII CSV format.
+
+    Args:
+        values: (servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag)
+        seq: Ignored (ASCII acks always refer to the last command)
+
+    Returns:
+        Encoded line, e.g. b"90,0,100,0,0\\n"
+    """
+    return ("%d,%d,%d,%d,%d\n" % values).encode('ascii')
+
+
+def encode_binary(values: UartValues, seq: int = 0) -> bytes:
+    """
+    Encode command values as a 6-byte binary frame.
+
+    Args:
+        values: (servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag)
+        seq: Command sequence number (0-15), echoed back by the Arduino ack
+
+    Returns:
+        Frame bytes (sync, servo, accel, brake, flags, crc8)
+    """
+    servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag = values
+    flags = (FLAG_HANDBRAKE if hbrake_flag else 0) | (FLAG_TURBO if turbo_flag else 0)
+    flags |= (seq % SEQ_MODULO) << SEQ_SHIFT
+    body = bytes((servo_angle & 0xFF, accel_pct & 0xFF, brake_pct & 0xFF, flags))
+    return bytes((SYNC_BYTE,)) + body + bytes((crc8(body),))
+
+
+def get_encoder(framing: str):
+    """
+    Get the encoder function for a framing name.
+
+    Args:
+        framing: "ascii" or "binary"
+
+    Returns:
+        Callable taking (UartValues, seq) and returning bytes
+
+    Raises:
+        ValueError: If framing is unknown
+    """
+    if framing == FRAMING_ASCII:
+        return encode_ascii
+    if framing == FRAMING_BINARY:
+        return encode_binary
+    raise ValueError(f"Unknown UART framing: {framing} (must be one of {', '.join(VALID_FRAMINGS)})")
+
+
+class BinaryFrameDecoder:
+    """
+    Reference decoder for the binary framing.
+
+    Feed it raw serial bytes in arbitrary chunks; it returns complete,
+    CRC-valid commands and resynchronizes on the next sync byte after
+    corruption. This mirrors what the Arduino sketch is expected to do.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.frames_ok = 0
+        self.crc_errors = 0
+        self.bytes_skipped = 0
+        self.last_seq = 0
+
+    def feed(self, data: bytes) -> List[UartValues]:
+        """
+        Consume bytes and return decoded commands.
+
+        Args:
+            data: Raw bytes read from the serial line
+
+        Returns:
+            List of (servo_angle, accel_pct, brake_pct, hbrake_flag, turbo_flag)
+        """
+        buf = self._buffer
+        buf.extend(data)
+        frames = []
+
+        while True:
+            start = buf.find(SYNC_BYTE)
+            if start < 0:
+                self.bytes_skipped += len(buf)
+                del buf[:]
+                break
+            if start > 0:
+                self.bytes_skipped += start
+                del buf[:start]
+            if len(buf) < FRAME_SIZE:
+                break
+
+            body = bytes(buf[1:5])
+            if crc8(body) != buf[5]:
+                # Drop only the sync byte: the real frame may start inside this one
+                self.crc_errors += 1
+                del buf[:1]
+                continue
+
+            servo_angle, accel_pct, brake_pct, flags = body
+            self.last_seq = flags >> SEQ_SHIFT
+            frames.append((
+                servo_angle,
+                accel_pct,
+                brake_pct,
+                1 if flags & FLAG_HANDBRAKE else 0,
+                1 if flags & FLAG_TURBO else 0,
+            ))
+            self.frames_ok += 1
+            del buf[:FRAME_SIZE]
+
+        return frames
+
+
+def decode_ascii_line(line: str) -> Optional[UartValues]:
+    """
+    Decode one legacy ASCII command line.
+
+    Args:
+        line: Line without or with trailing newline
+
+    Returns:
+        Decoded values or None if malformed
+    """
+    parts = line.strip().split(',')
+    if len(parts) != 5:
+        return None
+    try:
+        values = tuple(int(p) for p in parts)
+    except ValueError:
+        return None
+    return values  # type: ignore
+
+
+def encode_telemetry(framing: str, battery_mv: int, wheel_speed_cms: int) -> bytes:
+    """
+    Encode a telemetry report as the Arduino would send it.
+
+    Args:
+        framing: "ascii" or "binary"
+        battery_mv: Battery voltage in millivolts
+        wheel_speed_cms: Wheel speed in cm/s (signed)
+
+    Returns:
+        Encoded telemetry bytes
+    """
+    if framing == FRAMING_BINARY:
+        body = bytes((TELEMETRY_TYPE_STATUS,)) + struct.pack('<Hh', battery_mv & 0xFFFF, wheel_speed_cms)
+        return bytes((TELEMETRY_SYNC_BYTE,)) + body + bytes((crc8(body),))
+    return f"T,{battery_mv},{wheel_speed_cms}\n".encode('ascii')
+
+
+def encode_ack(framing: str, seq: int = 0) -> bytes:
+    """
+    Encode a command acknowledgement as the Arduino would send it.
+
+    Args:
+        framing: "ascii" or "binary"
+        seq: Sequence number of the acknowledged command (binary only)
+
+    Returns:
+        Encoded ack bytes
+    """
+    if framing == FRAMING_BINARY:
+        body = bytes((TELEMETRY_TYPE_ACK, seq % SEQ_MODULO, 0, 0, 0))
+        return bytes((TELEMETRY_SYNC_BYTE,)) + body + bytes((crc8(body),))
+    return b"A\n"
+
+
+class TelemetryDecoder:
+    """
+    Decoder for Arduino-to-Jetson telemetry and acks.
+
+    Returns events as tuples:
+    - (EVENT_TELEMETRY, battery_mv, wheel_speed_cms)
+    - (EVENT_ACK, seq, 0) where seq is None for ASCII acks
+    """
+
+    def __init__(self, framing: str):
+        self.framing = framing
+        self._buffer = bytearray()
+        self.frames_ok = 0
+        self.errors = 0
+
+    def feed(self, data: bytes) -> List[tuple]:
+        """
+        Consume bytes read from the UART and return decoded events.
+
+        Args:
+            data: Raw bytes read from the serial line
+
+        Returns:
+            List of event tuples
+        """
+        self._buffer.extend(data)
+        if self.framing == FRAMING_BINARY:
+            return self._feed_binary()
+        return self._feed_ascii()
+
+    def _feed_ascii(self) -> List[tuple]:
+        buf = self._buffer
+        events = []
+        while True:
+            end = buf.find(b'\n')
+            if end < 0:
+                if len(buf) > 256:  # Garbage without newlines, don't grow forever
+                    self.errors += 1
+                    del buf[:]
+                break
+            line = bytes(buf[:end]).decode('ascii', errors='replace').strip()
+            del buf[:end + 1]
+            parts = line.split(',')
+            try:
+                if parts[0] == EVENT_TELEMETRY and len(parts) == 3:
+                    events.append((EVENT_TELEMETRY, int(parts[1]), int(parts[2])))
+                elif parts[0] == EVENT_ACK and len(parts) == 1:
+                    events.append((EVENT_ACK, None, 0))
+                elif line:
+                    self.errors += 1
+                    continue
+                else:
+                    continue
+            except ValueError:
+                self.errors += 1
+                continue
+            self.frames_ok += 1
+        return events
+
+    def _feed_binary(self) -> List[tuple]:
+        buf = self._buffer
+        events = []
+        while True:
+            start = buf.find(TELEMETRY_SYNC_BYTE)
+            if start < 0:
+                del buf[:]
+                break
+            if start > 0:
+                del buf[:start]
+            if len(buf) < TELEMETRY_FRAME_SIZE:
+                break
+
+            body = bytes(buf[1:6])
+            if crc8(body) != buf[6]:
+                self.errors += 1
+                del buf[:1]
+                continue
+            del buf[:TELEMETRY_FRAME_SIZE]
+
+            frame_type = body[0]
+            if frame_type == TELEMETRY_TYPE_STATUS:
+                battery_mv, wheel_speed_cms = struct.unpack('<Hh', body[1:5])
+                events.append((EVENT_TELEMETRY, battery_mv, wheel_speed_cms))
+            elif frame_type == TELEMETRY_TYPE_ACK:
+                events.append((EVENT_ACK, body[1] % SEQ_MODULO, 0))
+            else:
+                self.errors += 1
+                continue
+            self.frames_ok += 1
+        return events
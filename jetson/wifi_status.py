@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+MiniCars WiFi link status without subprocesses.
+
+Reads the kernel interfaces directly instead of forking ``iwgetid -r`` on
+every supervisor iteration:
+
+- SSID, TX bitrate and signal from nl80211 over generic netlink
+  (NL80211_CMD_GET_INTERFACE / NL80211_CMD_GET_STATION)
+- signal level and link quality from /proc/net/wireless
+- link state (operstate / carrier) from /sys/class/net/<iface>
+
+Results are cached for ``ttl`` seconds, and registered callbacks are told
+when the SSID or the connected state changes. ``iwgetid -r`` is only used
+when an SSID is needed and nl80211 cannot provide it (old kernels, netlink
+blocked). ``proc_root`` / ``sys_root`` can point at a fake tree for tests.
+"""
+import logging
+import os
+import socket
+import struct
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Netlink / generic netlink
+NETLINK_GENERIC = 16
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+NLA_TYPE_MASK = 0x3FFF
+
+# nl80211 (include/uapi/linux/nl80211.h)
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_STATION = 17
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_STA_INFO = 21
+NL80211_ATTR_WIPHY_FREQ = 38
+NL80211_ATTR_SSID = 52
+NL80211_STA_INFO_SIGNAL = 7
+NL80211_STA_INFO_TX_BITRATE = 8
+NL80211_RATE_INFO_BITRATE = 1  # u16, units of 100 kbit/s
+NL80211_RATE_INFO_BITRATE32 = 5  # u32, units of 100 kbit/s
+
+_NLMSG_HDR = struct.Struct("=IHHII")
+_GENL_HDR = struct.Struct("=BBH")
+_NLA_HDR = struct.Struct("=HH")
+
+
+class WifiStatus:
+    """
+    Snapshot of the WiFi link.
+
+    Attributes:
+        interface: Wireless interface name (None if none found)
+        connected: Interface up with carrier (associated)
+        ssid: Current SSID (None if unknown / not associated)
+        signal_dbm: Signal level in dBm
+        link_quality: Link quality from /proc/net/wireless (driver scale, often 0-70)
+        bitrate_mbps: Current TX bitrate in Mbit/s
+        frequency_mhz: Operating frequency
+        ssid_source: Where the SSID came from ("nl80211", "iwgetid" or None)
+        updated_at: time.time() of the reading
+    """
+
+    __slots__ = ("interface", "connected", "ssid", "signal_dbm", "link_quality",
+                 "bitrate_mbps", "frequency_mhz", "ssid_source", "updated_at")
+
+    def __init__(self, interface: Optional[str] = None, connected: bool = False,
+                 ssid: Optional[str] = None, signal_dbm: Optional[float] = None,
+                 link_quality: Optional[float] = None, bitrate_mbps: Optional[float] = None,
+                 frequency_mhz: Optional[int] = None, ssid_source: Optional[str] = None,
+                 updated_at: float = 0.0):
+        self.interface = interface
+        self.connected = connected
+        self.ssid = ssid
+        self.signal_dbm = signal_dbm
+        self.link_quality = link_quality
+        self.bitrate_mbps = bitrate_mbps
+        self.frequency_mhz = frequency_mhz
+        self.ssid_source = ssid_source
+        self.updated_at = updated_at
+
+    def as_dict(self) -> dict:
+        """Plain dict (for logs and JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"WifiStatus(interface={self.interface!r}, connected={self.connected}, "
+                f"ssid={self.ssid!r}, signal_dbm={self.signal_dbm}, bitrate_mbps={self.bitrate_mbps})")
+
+
+# ----------------------------------------------------------------------------
+# Generic netlink / nl80211
+# ----------------------------------------------------------------------------
+
+def _nla(attr_type: int, payload: bytes) -> bytes:
+    length = _NLA_HDR.size + len(payload)
+    return _NLA_HDR.pack(length, attr_type) + payload + b"\0" * ((4 - length % 4) % 4)
+
+
+def parse_attrs(data: bytes) -> Dict[int, bytes]:
+    """
+    Parse a run of netlink attributes.
+
+    Args:
+        data: Attribute bytes (after the generic netlink header)
+
+    Returns:
+        Dict of attribute type (flags masked off) to payload
+    """
+    attrs = {}
+    offset = 0
+    while offset + _NLA_HDR.size <= len(data):
+        length, attr_type = _NLA_HDR.unpack_from(data, offset)
+        if length < _NLA_HDR.size:
+            break
+        attrs[attr_type & NLA_TYPE_MASK] = data[offset + _NLA_HDR.size:offset + length]
+        offset += (length + 3) & ~3
+    return attrs
+
+
+def parse_station_info(sta_info: bytes) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Extract signal and TX bitrate from a nested NL80211_ATTR_STA_INFO.
+
+    Args:
+        sta_info: Payload of NL80211_ATTR_STA_INFO
+
+    Returns:
+        (signal_dbm, bitrate_mbps); None for missing values
+    """
+    info = parse_attrs(sta_info)
+    signal_dbm = None
+    if NL80211_STA_INFO_SIGNAL in info:
+        signal_dbm = float(struct.unpack("=b", info[NL80211_STA_INFO_SIGNAL][:1])[0])
+    bitrate_mbps = None
+    if NL80211_STA_INFO_TX_BITRATE in info:
+        rate = parse_attrs(info[NL80211_STA_INFO_TX_BITRATE])
+        if NL80211_RATE_INFO_BITRATE32 in rate:
+            bitrate_mbps = struct.unpack("=I", rate[NL80211_RATE_INFO_BITRATE32][:4])[0] / 10.0
+        elif NL80211_RATE_INFO_BITRATE in rate:
+            bitrate_mbps = struct.unpack("=H", rate[NL80211_RATE_INFO_BITRATE][:2])[0] / 10.0
+    return signal_dbm, bitrate_mbps
+
+
+class Nl80211Client:
+    """Minimal nl80211 client over a generic netlink socket."""
+
+    def __init__(self, timeout: float = 0.5):
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC)
+        self._sock.settimeout(timeout)
+        self._sock.bind((0, 0))
+        self._seq = int(time.time()) & 0xFFFF
+        self.family_id = self._resolve_family("nl80211")
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def _request(self, msg_type: int, cmd: int, attrs: bytes, dump: bool = False) -> List[Dict[int, bytes]]:
+        self._seq += 1
+        flags = NLM_F_REQUEST | (NLM_F_DUMP if dump else 0)
+        body = _GENL_HDR.pack(cmd, 1, 0) + attrs
+        self._sock.send(_NLMSG_HDR.pack(_NLMSG_HDR.size + len(body), msg_type, flags, self._seq, 0) + body)
+
+        replies = []
+        while True:
+            data = self._sock.recv(65536)
+            offset = 0
+            while offset + _NLMSG_HDR.size <= len(data):
+                length, rtype, _, seq, _ = _NLMSG_HDR.unpack_from(data, offset)
+                if length < _NLMSG_HDR.size:
+                    return replies
+                payload = data[offset + _NLMSG_HDR.size:offset + length]
+                offset += (length + 3) & ~3
+                if seq != self._seq:
+                    continue
+                if rtype == NLMSG_ERROR:
+                    error = struct.unpack_from("=i", payload)[0]
+                    if error:
+                        raise OSError(-error, os.strerror(-error))
+                    return replies
+                if rtype == NLMSG_DONE:
+                    return replies
+                replies.append(parse_attrs(payload[_GENL_HDR.size:]))
+            if not dump and replies:
+                return replies
+
+    def _resolve_family(self, name: str) -> int:
+        replies = self._request(GENL_ID_CTRL, CTRL_CMD_GETFAMILY,
+                                _nla(CTRL_ATTR_FAMILY_NAME, name.encode("ascii") + b"\0"))
+        for attrs in replies:
+            if CTRL_ATTR_FAMILY_ID in attrs:
+                return struct.unpack("=H", attrs[CTRL_ATTR_FAMILY_ID][:2])[0]
+        raise OSError(f"generic netlink family {name} not found")
+
+    def interface_info(self, ifindex: int) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Current SSID and frequency of an interface.
+
+        Returns:
+            (ssid, frequency_mhz); SSID is None if not associated or the
+            kernel does not report it in GET_INTERFACE
+        """
+        replies = self._request(self.family_id, NL80211_CMD_GET_INTERFACE,
+                                _nla(NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)))
+        ssid = frequency = None
+        for attrs in replies:
+            if NL80211_ATTR_SSID in attrs:
+                ssid = attrs[NL80211_ATTR_SSID].decode("utf-8", errors="replace")
+            if NL80211_ATTR_WIPHY_FREQ in attrs:
+                frequency = struct.unpack("=I", attrs[NL80211_ATTR_WIPHY_FREQ][:4])[0]
+        return ssid, frequency
+
+    def station_info(self, ifindex: int) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Signal and TX bitrate towards the associated AP.
+
+        Returns:
+            (signal_dbm, bitrate_mbps)
+        """
+        replies = self._request(self.family_id, NL80211_CMD_GET_STATION,
+                                _nla(NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)), dump=True)
+        for attrs in replies:
+            if NL80211_ATTR_STA_INFO in attrs:
+                return parse_station_info(attrs[NL80211_ATTR_STA_INFO])
+        return None, None
+
+
+# ----------------------------------------------------------------------------
+# procfs / sysfs
+# ----------------------------------------------------------------------------
+
+def read_proc_wireless(proc_root: str = "/proc") -> Dict[str, Tuple[float, float]]:
+    """
+    Parse /proc/net/wireless.
+
+    Args:
+        proc_root: procfs mount point
+
+    Returns:
+        Dict of interface to (link_quality, signal_dbm)
+    """
+    result = {}
+    try:
+        with open(os.path.join(proc_root, "net", "wireless"), "r") as f:
+            lines = f.readlines()[2:]  # Two header lines
+    except OSError:
+        return result
+    for line in lines:
+        name, sep, rest = line.partition(":")
+        fields = rest.split()
+        if not sep or len(fields) < 3:
+            continue
+        try:
+            result[name.strip()] = (float(fields[1].rstrip(".")), float(fields[2].rstrip(".")))
+        except ValueError:
+            continue
+    return result
+
+
+def _read_sys(sys_root: str, interface: str, name: str) -> Optional[str]:
+    try:
+        with open(os.path.join(sys_root, "class", "net", interface, name), "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def find_wireless_interface(sys_root: str = "/sys", proc_root: str = "/proc") -> Optional[str]:
+    """
+    First wireless interface (has a "wireless" or "phy80211" entry in sysfs).
+
+    Returns:
+        Interface name or None
+    """
+    net_dir = os.path.join(sys_root, "class", "net")
+    try:
+        names = sorted(os.listdir(net_dir))
+    except OSError:
+        names = []
+    for name in names:
+        for marker in ("wireless", "phy80211"):
+            if os.path.exists(os.path.join(net_dir, name, marker)):
+                return name
+    wireless = read_proc_wireless(proc_root)
+    return sorted(wireless)[0] if wireless else None
+
+
+def read_iwgetid_ssid() -> Optional[str]:
+    """SSID from ``iwgetid -r`` (fallback only: forks a process)."""
+    try:
+        result = subprocess.run(["iwgetid", "-r"], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                universal_newlines=True, timeout=2.0)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"iwgetid failed: {e}")
+        return None
+    ssid = result.stdout.strip()
+    return ssid if result.returncode == 0 and ssid else None
+
+
+# ----------------------------------------------------------------------------
+# Monitor
+# ----------------------------------------------------------------------------
+
+class WifiMonitor:
+    """
+    Cached WiFi status with change notifications.
+
+    Args:
+        interface: Wireless interface (auto-detected if None)
+        ttl: Seconds a reading is reused before the kernel is queried again
+        proc_root: procfs mount point (tests use a fake tree)
+        sys_root: sysfs mount point (tests use a fake tree)
+        use_netlink: Query nl80211 (disable for tests / unsupported systems)
+        iwgetid_fallback: Fork ``iwgetid -r`` when an SSID is needed and
+            nl80211 cannot provide it
+    """
+
+    def __init__(self, interface: Optional[str] = None, ttl: float = 2.0,
+                 proc_root: str = "/proc", sys_root: str = "/sys",
+                 use_netlink: bool = True, iwgetid_fallback: bool = True):
+        self.ttl = ttl
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.interface = interface or find_wireless_interface(sys_root, proc_root)
+        self.use_netlink = use_netlink
+        self.iwgetid_fallback = iwgetid_fallback
+        self._nl: Optional[Nl80211Client] = None
+        self._netlink_failed = False
+        self._status = WifiStatus(interface=self.interface)
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[WifiStatus, WifiStatus], None]] = []
+        self.iwgetid_calls = 0
+
+    def on_change(self, callback: Callable[[WifiStatus, WifiStatus], None]) -> None:
+        """
+        Register a callback for SSID / connected-state changes.
+
+        Args:
+            callback: Called as callback(old_status, new_status)
+        """
+        self._callbacks.append(callback)
+
+    def _netlink(self) -> Optional[Nl80211Client]:
+        if not self.use_netlink or self._netlink_failed:
+            return None
+        if self._nl is None:
+            try:
+                self._nl = Nl80211Client()
+            except OSError as e:
+                logger.info(f"nl80211 unavailable ({e}), using /proc and sysfs only")
+                self._netlink_failed = True
+                return None
+        return self._nl
+
+    def _read(self, need_ssid: bool) -> WifiStatus:
+        status = WifiStatus(interface=self.interface, updated_at=time.time())
+        if self.interface is None:
+            return status
+
+        operstate = _read_sys(self.sys_root, self.interface, "operstate")
+        carrier = _read_sys(self.sys_root, self.interface, "carrier")
+        status.connected = operstate in ("up", "unknown") and carrier == "1"
+
+        quality = read_proc_wireless(self.proc_root).get(self.interface)
+        if quality is not None:
+            status.link_quality, status.signal_dbm = quality
+
+        nl = self._netlink() if status.connected else None
+        if nl is not None:
+            ifindex = _read_sys(self.sys_root, self.interface, "ifindex")
+            try:
+                if ifindex is not None:
+                    status.ssid, status.frequency_mhz = nl.interface_info(int(ifindex))
+                    signal_dbm, status.bitrate_mbps = nl.station_info(int(ifindex))
+                    if signal_dbm is not None:
+                        status.signal_dbm = signal_dbm
+            except (OSError, ValueError, struct.error) as e:
+                logger.debug(f"nl80211 query failed: {e}")
+            if status.ssid is not None:
+                status.ssid_source = "nl80211"
+
+        if status.connected and status.ssid is None and need_ssid and self.iwgetid_fallback:
+            self.iwgetid_calls += 1
+            status.ssid = read_iwgetid_ssid()
+            if status.ssid is not None:
+                status.ssid_source = "iwgetid"
+        return status
+
+    def get_status(self, need_ssid: bool = True, force: bool = False) -> WifiStatus:
+        """
+        Current WiFi status (cached for ``ttl`` seconds).
+
+        Args:
+            need_ssid: Allow the iwgetid fallback if nl80211 has no SSID
+            force: Ignore the cache
+
+        Returns:
+            WifiStatus snapshot
+        """
+        with self._lock:
+            cached = self._status
+            if not force and cached.updated_at and time.time() - cached.updated_at < self.ttl:
+                return cached
+            status = self._read(need_ssid)
+            self._status = status
+
+        if (status.ssid, status.connected) != (cached.ssid, cached.connected) and cached.updated_at:
+            for callback in self._callbacks:
+                try:
+                    callback(cached, status)
+                except Exception as e:
+                    logger.warning(f"WiFi change callback failed: {e}")
+        return status
+
+    def ssid_matches(self, required_ssid: Optional[str]) -> bool:
+        """
+        Check the current SSID against a required one.
+
+        Args:
+            required_ssid: Required SSID (None or empty = no check)
+
+        Returns:
+            True if no check is required or the SSID matches
+        """
+        if not required_ssid:
+            return True
+        return self.get_status(need_ssid=True).ssid == required_ssid
+
+    def close(self) -> None:
+        """Close the netlink socket."""
+        if self._nl is not None:
+            self._nl.close()
+            self._nl = None
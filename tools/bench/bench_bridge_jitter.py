@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: command forwarding latency/jitter through the TCP-UART bridge.
+
+Acts as the laptop: sends joystick commands at a fixed rate and collects the
+"A,<rtt_us>" lines the bridge streams back (UART write -> Arduino ack). With
+the PTY stand-in (jetson/fake_arduino.py) the ack is immediate, so the RTT is
+dominated by bridge scheduling: run it once with MINICARS_RT_MODE=off and once
+with the RT mode enabled, ideally while the camera pipeline is streaming (or
+under `stress -c 4`), and compare the percentiles.
+
+Usage:
+    python3 tools/bench/bench_bridge_jitter.py --host 127.0.0.1 --hz 100 --seconds 30
+"""
+import argparse
+import socket
+import time
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100.0))
+    return sorted_values[index]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure bridge forwarding jitter")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--hz", type=float, default=100.0)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    sock = socket.create_connection((args.host, args.port), timeout=5.0)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setblocking(False)
+
+    period = 1.0 / args.hz
+    deadline = time.perf_counter() + args.seconds
+    next_send = time.perf_counter()
+    send_lateness_ms = []
+    rtts_ms = []
+    buffer = b""
+    servo = 0.0
+
+    while time.perf_counter() < deadline:
+        now = time.perf_counter()
+        if now >= next_send:
+            send_lateness_ms.append((now - next_send) * 1000.0)
+            servo = -servo if servo else 0.1
+            sock.sendall(f"{servo:.3f},0.100,0.000,0.000,0.000,normal\n".encode("ascii"))
+            next_send += period
+
+        try:
+            buffer += sock.recv(4096)
+        except BlockingIOError:
+            pass
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            parts = line.decode("ascii", errors="ignore").split(",")
+            if parts[0] == "A" and len(parts) == 2:
+                rtts_ms.append(int(parts[1]) / 1000.0)
+
+        time.sleep(min(0.001, max(0.0, next_send - time.perf_counter())))
+
+    sock.close()
+
+    rtts_ms.sort()
+    print(f"commands sent: {len(send_lateness_ms)}, acks received: {len(rtts_ms)}")
+    if rtts_ms:
+        print("ack RTT (bridge UART write -> ack) ms: "
+              f"p50={percentile(rtts_ms, 50):.3f} p90={percentile(rtts_ms, 90):.3f} "
+              f"p99={percentile(rtts_ms, 99):.3f} max={rtts_ms[-1]:.3f}")
+    else:
+        print("no acks received (is the Arduino/fake_arduino acknowledging commands?)")
+    print("See the bridge log 'Timing:' lines for watchdog wake jitter and recv->UART forward latency.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark: control interruption while the bridge process is restarted.
+
+Plays the part of systemd for jetson/tcp_uart_bridge.py so the handover can
+be measured without installing the units:
+
+- holds the listening socket and passes it as LISTEN_FDS (socket activation)
+- runs a NOTIFY_SOCKET, honouring READY=1, FDSTORE=1 and FDSTOREREMOVE=1
+- on restart writes the planned-restart marker (like deploy_services.sh),
+  sends SIGTERM, waits for exit, starts a new process with the listener plus
+  the stored client connection (like FileDescriptorStoreMax)
+
+Meanwhile a client sends commands at --hz plus "P,<id>" probes over ONE
+connection and records when acks ("A") and pongs ("Q") come back. Reported
+per restart: SIGTERM → READY=1 of the new process, and the longest gap
+between acks (commands reaching the UART) around the restart.
+
+Usage (with jetson/fake_arduino.py providing the UART):
+    MINICARS_UART_DEVICE=/dev/pts/N python3 tools/bench/bench_bridge_restart.py --restarts 5
+"""
+import argparse
+import array
+import fcntl
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BRIDGE = os.path.join(os.path.dirname(__file__), "..", "..", "jetson", "tcp_uart_bridge.py")
+
+
+class FakeSystemd:
+    """Minimal socket activation + fd store + readiness for one service."""
+
+    def __init__(self, port: int, handover: bool):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(("127.0.0.1", port))
+        self.listener.listen(8)
+        self.handover = handover
+        self.store = {}  # fd name -> list of fds
+        self.ready = threading.Event()
+        self.proc = None
+
+        state_dir = tempfile.mkdtemp()
+        self.notify_path = os.path.join(state_dir, "notify")
+        self.marker_path = os.path.join(state_dir, "restart")
+        self.notify_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.notify_sock.bind(self.notify_path)
+        threading.Thread(target=self._notify_loop, daemon=True).start()
+
+    def _notify_loop(self) -> None:
+        fd_size = array.array("i").itemsize
+        while True:
+            msg, ancdata, _, _ = self.notify_sock.recvmsg(4096, socket.CMSG_SPACE(16 * fd_size))
+            fds = array.array("i")
+            for level, kind, data in ancdata:
+                if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                    fds.frombytes(data[:len(data) - (len(data) % fd_size)])
+            fields = dict(line.split("=", 1) for line in msg.decode().splitlines() if "=" in line)
+            name = fields.get("FDNAME", "stored")
+            if fields.get("FDSTORE") == "1":
+                self.store.setdefault(name, []).extend(fds)
+            elif fields.get("FDSTOREREMOVE") == "1":
+                for fd in self.store.pop(name, []):
+                    os.close(fd)
+            else:
+                for fd in fds:
+                    os.close(fd)
+            if fields.get("READY") == "1":
+                self.ready.set()
+
+    def start(self) -> None:
+        passed = [("control", self.listener.fileno())]
+        if self.handover:
+            passed += [(name, fd) for name, fds in self.store.items() for fd in fds[-1:]]
+        # Park the fds out of the way, then place them at 3, 4, ... in the child
+        parked = [(name, fcntl.fcntl(fd, fcntl.F_DUPFD_CLOEXEC, 100)) for name, fd in passed]
+
+        def place_fds():
+            for index, (_, fd) in enumerate(parked):
+                os.dup2(fd, 3 + index)  # dup2 targets are inheritable
+
+        env = dict(os.environ)
+        env.update({
+            "LISTEN_FDS": str(len(parked)),
+            "LISTEN_FDNAMES": ":".join(name for name, _ in parked),
+            "NOTIFY_SOCKET": self.notify_path,
+            "MINICARS_HANDOVER": "1" if self.handover else "0",
+            "MINICARS_HANDOVER_MARKER": self.marker_path,
+        })
+        self.ready.clear()
+        # LISTEN_PID is only known after fork: set it in the child before exec
+        self.proc = subprocess.Popen(
+            ["sh", "-c", 'LISTEN_PID=$$ exec "$0" "$@"', sys.executable, BRIDGE],
+            env=env, preexec_fn=place_fds, close_fds=False,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        for _, fd in parked:
+            os.close(fd)
+
+    def restart(self) -> float:
+        """Planned-restart marker + SIGTERM + start; returns seconds from SIGTERM to READY=1."""
+        if self.handover:
+            open(self.marker_path, "w").close()
+        begin = time.perf_counter()
+        self.proc.send_signal(signal.SIGTERM)
+        self.proc.wait()
+        self.start()
+        if not self.ready.wait(10.0):
+            raise RuntimeError("bridge did not report READY=1")
+        return time.perf_counter() - begin
+
+    def stop(self) -> None:
+        self.proc.send_signal(signal.SIGTERM)
+        self.proc.wait()
+
+
+class Client:
+    """Sends commands/probes at a fixed rate and timestamps acks."""
+
+    def __init__(self, port: int, hz: float):
+        self.sock = socket.create_connection(("127.0.0.1", port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.hz = hz
+        self.ack_times = []
+        self.closed = False
+        threading.Thread(target=self._send_loop, daemon=True).start()
+        threading.Thread(target=self._recv_loop, daemon=True).start()
+
+    def _send_loop(self) -> None:
+        probe_id = 0
+        while not self.closed:
+            try:
+                self.sock.sendall(b"0.000,0.100,0.000,0.000,0.000,normal\n")
+                if probe_id % 10 == 0:
+                    self.sock.sendall(f"P,{probe_id}\n".encode("ascii"))
+            except OSError:
+                self.closed = True
+            probe_id += 1
+            time.sleep(1.0 / self.hz)
+
+    def _recv_loop(self) -> None:
+        buffer = b""
+        while True:
+            try:
+                data = self.sock.recv(4096)
+            except OSError:
+                data = b""
+            if not data:
+                self.closed = True
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line.startswith(b"A,"):
+                    self.ack_times.append(time.perf_counter())
+
+    def max_gap_ms(self, since: float, until: float) -> float:
+        times = [t for t in self.ack_times if since <= t <= until]
+        if len(times) < 2:
+            return float("inf")
+        return max(b - a for a, b in zip(times, times[1:])) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure bridge restart interruption")
+    parser.add_argument("--port", type=int, default=5915)
+    parser.add_argument("--hz", type=float, default=100.0)
+    parser.add_argument("--restarts", type=int, default=5)
+    parser.add_argument("--no-handover", action="store_true", help="Restart without passing the client fd")
+    args = parser.parse_args()
+
+    systemd = FakeSystemd(args.port, handover=not args.no_handover)
+    systemd.start()
+    systemd.ready.wait(10.0)
+    client = Client(args.port, args.hz)
+    time.sleep(1.0)
+
+    print(f"handover {'off' if args.no_handover else 'on'}, commands at {args.hz:.0f}Hz")
+    print(f"{'restart':>7} {'ready':>8} {'ack gap':>9}  (ms)")
+    for run in range(1, args.restarts + 1):
+        before = time.perf_counter()
+        ready_s = systemd.restart()
+        time.sleep(1.0)
+        gap = client.max_gap_ms(before - 0.2, time.perf_counter())
+        print(f"{run:>7} {ready_s * 1000.0:8.0f} {gap:9.0f}" + ("  (client disconnected)" if client.closed else ""))
+        if client.closed:
+            break
+
+    systemd.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compare encoder_tuning combinations.
+
+Runs the real sender pipeline (built by the supervisor from a
+stream_config.json, with only "encoder_tuning" changed) once per
+combination, sends it to a local UDP socket and reports:
+
+- bitrate stability: mean kbit/s over 1s windows and their coefficient of
+  variation (stdev / mean)
+- frame sizes: p95 and max encoded frame (bytes per RTP timestamp) and how
+  long the largest frame takes to send at the configured bitrate; that
+  burst is what queues up on a WiFi link
+- latency: encoder element latency and capture -> udpsink latency from the
+  GStreamer latency tracer
+
+Works with the software backend on any Linux, and with the nvidia backend
+on the Jetson (stop minicars-streamer first: the camera can only be opened
+once). The top-level video settings of the config are used (active_preset is
+ignored).
+
+Usage:
+    python3 tools/bench/bench_encoder_tuning.py --config jetson/config/stream_config.software.json
+    python3 tools/bench/bench_encoder_tuning.py --seconds 20 \\
+        --combo 'cbr={"control_rate": "cbr"}' --combo 'cbr4={"control_rate": "cbr", "slices": 4}'
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "jetson"))
+sys.path.insert(0, str(ROOT / "backend"))
+
+from stream_config import StreamConfigError, load_config  # noqa: E402
+from stream_supervisor import build_gstreamer_pipeline  # noqa: E402
+from minicars_backend.video.latency import TRACER_ENV, parse_tracer_line, percentiles  # noqa: E402
+
+COMBINATIONS = {
+    "baseline": {},
+    "cbr": {"control_rate": "cbr"},
+    "vbr": {"control_rate": "vbr"},
+    "cbr+slices4": {"control_rate": "cbr", "slices": 4},
+    "cbr+intra_refresh": {"control_rate": "cbr", "intra_refresh": 30},
+    "cbr+idr+vui": {"control_rate": "cbr", "idr_interval": 30, "insert_vui": True},
+    "preset_fast": {"preset_level": "fast"},
+}
+_RTP_HEADER = struct.Struct("!BBHII")
+
+
+def make_config(base: dict, tuning: dict, port: int, directory: str):
+    data = dict(base, control_station_host="127.0.0.1", video_port=port, encoder_tuning=tuning)
+    for key in ("active_preset", "destinations", "recording", "adaptive_bitrate"):
+        data.pop(key, None)
+    path = Path(directory) / "stream_config.json"
+    path.write_text(json.dumps(data))
+    return load_config(path)
+
+
+def run_combination(config, port: int, seconds: float, warmup: float) -> dict:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    sock.bind(("127.0.0.1", port))
+    sock.settimeout(0.2)
+    encoder_ms, pipeline_ms = [], []
+    proc = subprocess.Popen(build_gstreamer_pipeline(config), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            env=dict(os.environ, **TRACER_ENV))
+
+    def read_tracer():
+        for raw in iter(proc.stderr.readline, b""):
+            parsed = parse_tracer_line(raw.decode("utf-8", errors="replace"))
+            if parsed is not None and time.monotonic() >= measure_from:
+                kind, element, ms = parsed
+                if kind == "pipeline":
+                    pipeline_ms.append(ms)
+                elif element == "encoder":
+                    encoder_ms.append(ms)
+
+    measure_from = time.monotonic() + warmup
+    threading.Thread(target=read_tracer, daemon=True).start()
+    window_bytes, frames = {}, {}
+    end = measure_from + seconds
+    try:
+        while time.monotonic() < end:
+            try:
+                packet = sock.recv(65536)
+            except socket.timeout:
+                if proc.poll() is not None:
+                    break
+                continue
+            now = time.monotonic()
+            if now < measure_from or len(packet) < _RTP_HEADER.size:
+                continue
+            payload = len(packet) - _RTP_HEADER.size
+            window = int(now - measure_from)
+            window_bytes[window] = window_bytes.get(window, 0) + payload
+            rtp_ts = _RTP_HEADER.unpack_from(packet)[3]
+            frames[rtp_ts] = frames.get(rtp_ts, 0) + payload
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=3.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        sock.close()
+
+    if proc.returncode not in (0, -15, None) and not frames:
+        return {"error": f"pipeline exited with code {proc.returncode}"}
+    kbps = [window_bytes[w] * 8 / 1000.0 for w in sorted(window_bytes)[:-1]]  # Last window is partial
+    sizes = sorted(frames.values())
+    if not kbps or not sizes:
+        return {"error": "no video received"}
+    mean = statistics.mean(kbps)
+    return {
+        "kbps": mean,
+        "cv": statistics.pstdev(kbps) / mean if mean else 0.0,
+        "frame_p95_kb": sizes[min(len(sizes) - 1, int(0.95 * len(sizes)))] / 1000.0,
+        "frame_max_kb": sizes[-1] / 1000.0,
+        "burst_ms": sizes[-1] * 8 / config.bitrate * 1000.0,
+        "encoder": percentiles(encoder_ms),
+        "pipeline": percentiles(pipeline_ms),
+    }
+
+
+def parse_combo(text: str):
+    name, _, value = text.partition("=")
+    try:
+        tuning = json.loads(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"{text}: {e}")
+    if not name or not isinstance(tuning, dict):
+        raise argparse.ArgumentTypeError(f"{text}: expected NAME={{json object}}")
+    return name, tuning
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare encoder_tuning combinations")
+    parser.add_argument("--config", default=str(ROOT / "jetson" / "config" / "stream_config.json"))
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=5600)
+    parser.add_argument("--combo", type=parse_combo, action="append",
+                        help="NAME=JSON encoder_tuning (repeatable; replaces the built-in list)")
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.config).read_text())
+    combinations = dict(args.combo) if args.combo else COMBINATIONS
+    print(f"backend: {base.get('pipeline_backend', 'nvidia')}, {base['resolution']['width']}x"
+          f"{base['resolution']['height']}@{base.get('framerate', 30)}, {base.get('bitrate', 8000000)} bps, "
+          f"{args.seconds:.0f}s per combination")
+    print(f"{'combination':<20}{'kbit/s':>9}{'cv':>7}{'p95 KB':>8}{'max KB':>8}{'burst ms':>9}"
+          f"{'enc p50':>9}{'enc p95':>9}{'cap->tx p50':>12}{'p95':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, tuning in combinations.items():
+            try:
+                config = make_config(base, tuning, args.port, directory)
+            except StreamConfigError as e:
+                print(f"{name:<20}invalid: {e}")
+                continue
+            result = run_combination(config, args.port, args.seconds, args.warmup)
+            if "error" in result:
+                print(f"{name:<20}{result['error']}")
+                continue
+            encoder = result["encoder"] or {}
+            pipeline = result["pipeline"] or {}
+            print(f"{name:<20}{result['kbps']:>9.0f}{result['cv'] * 100:>6.1f}%{result['frame_p95_kb']:>8.1f}"
+                  f"{result['frame_max_kb']:>8.1f}{result['burst_ms']:>9.1f}"
+                  f"{encoder.get('p50', float('nan')):>9.2f}{encoder.get('p95', float('nan')):>9.2f}"
+                  f"{pipeline.get('p50', float('nan')):>12.2f}{pipeline.get('p95', float('nan')):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
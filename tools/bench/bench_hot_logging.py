@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: logging overhead in the bridge hot loop.
+
+Runs a loop shaped like TCPUARTBridge.handle_client (parse a command line,
+smooth it, encode it) with the UART log line as:
+
+- legacy:  the baseline bridge code as it was: hasattr() counter, f-string
+           every 50th message, synchronous handler
+- sampled: the current bridge code: isEnabledFor() + RateLimiter, %-style
+           lazy args, QueueHandler/QueueListener
+
+each with the logger at INFO and with logging disabled. Neither variant
+logs anything else per message. Log output is discarded; --sink-delay-ms
+makes every write stall like a busy journald, which the legacy loop pays
+for in the hot thread.
+
+Usage (on the Jetson, from the repo root):
+    python3 tools/bench/bench_hot_logging.py [--iterations 200000]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "jetson"))
+
+import hot_logging  # noqa: E402
+from uart_protocol import encode_ascii  # noqa: E402
+
+LINE = "0.250,0.400,0.000,0.000,0.000,normal"
+
+
+def parse_and_encode(line):
+    parts = line.split(',')
+    servo, throttle, brake = float(parts[0]), float(parts[1]), float(parts[2])
+    values = (int((servo + 1.0) * 90.0), int(throttle * 100.0), int(brake * 100.0), 0, 0)
+    return servo, throttle, brake, values, encode_ascii(values)
+
+
+class LegacyLoop:
+    """Hot loop with the baseline bridge logging, unchanged."""
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def step(self, line):
+        servo, throttle, brake, values, frame = parse_and_encode(line)
+        if not hasattr(self, '_uart_log_counter'):
+            self._uart_log_counter = 0
+        self._uart_log_counter += 1
+        if self._uart_log_counter % 50 == 0:
+            self.logger.info(
+                f"Sent to UART (msg #{self._uart_log_counter}): {frame.decode('ascii').strip()} | "
+                f"parsed: servo={servo:.3f}, throttle={throttle:.3f}, brake={brake:.3f}"
+            )
+        return frame
+
+
+class SampledLoop:
+    """Hot loop with the current bridge logging (TCPUARTBridge.handle_client)."""
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.limiter = hot_logging.RateLimiter("bench.uart", 0.4)
+        self.count = 0
+
+    def step(self, line):
+        servo, throttle, brake, values, frame = parse_and_encode(line)
+        self.count += 1
+        if self.logger.isEnabledFor(logging.INFO) and self.limiter.allow():
+            self.logger.info(
+                "Sent to UART (msg #%d): %s | parsed: servo=%.3f, throttle=%.3f, brake=%.3f",
+                self.count, values, servo, throttle, brake,
+            )
+        return frame
+
+
+class SlowSink:
+    """Stand-in for a log destination that stalls on each write (busy journald, slow SD card)."""
+
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+
+    def write(self, text):
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def configure(queue_backed: bool, level: int, sink) -> logging.Logger:
+    """Reset root logging to the sink, optionally queue-backed."""
+    hot_logging.stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    if queue_backed:
+        hot_logging.setup_logging("%(levelname)s: %(message)s", level=level)
+        # Point the listener's stream handler at the sink
+        hot_logging._listener.handlers[0].setStream(sink)
+    else:
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        root.addHandler(handler)
+        root.setLevel(level)
+    return logging.getLogger("bench")
+
+
+def run(loop_cls, queue_backed: bool, level: int, iterations: int, sink) -> float:
+    """Return mean microseconds per iteration."""
+    logger = configure(queue_backed, level, sink)
+    loop = loop_cls(logger)
+    step = loop.step
+    start = time.perf_counter()
+    for _ in range(iterations):
+        step(LINE)
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--sink-delay-ms", type=float, default=0.0,
+                        help="Stall each log write this long (simulates a blocking journald)")
+    args = parser.parse_args()
+
+    disabled = logging.CRITICAL + 1
+    sink = SlowSink(args.sink_delay_ms / 1000.0)
+    cases = [
+        ("legacy  (sync, f-strings)", LegacyLoop, False),
+        ("sampled (queue, lazy)    ", SampledLoop, True),
+    ]
+    print(f"{args.iterations} iterations per case, microseconds per message, "
+          f"log write stall {args.sink_delay_ms:g}ms")
+    print(f"{'variant':<27} {'INFO':>8} {'disabled':>9}")
+    for name, loop_cls, queue_backed in cases:
+        info_us = run(loop_cls, queue_backed, logging.INFO, args.iterations, sink)
+        off_us = run(loop_cls, queue_backed, disabled, args.iterations, sink)
+        print(f"{name:<27} {info_us:8.2f} {off_us:9.2f}")
+    hot_logging.stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-to-recover after a silent control-link drop.
+
+Puts a TCP proxy between a JoystickSender-driven client and the bridge. After
+a warm-up the proxy "freezes" the current connection: it keeps both sockets
+open but stops forwarding, which is what a laptop WiFi drop looks like to both
+ends (no FIN, no RST). New connections through the proxy work normally, like
+the WiFi coming back.
+
+The client uses the real JoystickSender link logic (probes, _check_link,
+_reconnect) without pygame, so the numbers reflect the shipped code:
+
+- detect:    freeze → sender declares the link dead
+- reconnect: freeze → new TCP connection established
+- recover:   freeze → first probe answered on the new connection (the bridge
+             accepted it, i.e. the stale connection was preempted or dropped)
+
+Usage (bridge running, e.g. with jetson/fake_arduino.py as UART):
+    python3 tools/bench/bench_link_recovery.py --bridge-port 5005 --runs 5
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+from minicars_backend.joystick import JoystickSender  # noqa: E402
+from minicars_backend.joystick.protocol import JoystickMessage  # noqa: E402
+
+COMMAND = JoystickMessage(servo=0.0, throttle=0.0, brake=0.0, handbrake=0.0,
+                          turbo=0.0, mode="normal").to_tcp_format().encode("ascii")
+
+
+class FreezableProxy:
+    """TCP proxy whose existing connections can be silently frozen."""
+
+    def __init__(self, listen_port: int, target: tuple):
+        self.target = target
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", listen_port))
+        self.server.listen(4)
+        self.generation = 0  # Connections from older generations are frozen
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def freeze(self) -> None:
+        self.generation += 1
+
+    def _accept_loop(self) -> None:
+        while True:
+            client, _ = self.server.accept()
+            upstream = socket.create_connection(self.target)
+            generation = self.generation
+            for src, dst in ((client, upstream), (upstream, client)):
+                threading.Thread(target=self._pump, args=(src, dst, generation), daemon=True).start()
+
+    def _pump(self, src: socket.socket, dst: socket.socket, generation: int) -> None:
+        while True:
+            try:
+                data = src.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            if generation == self.generation:
+                dst.sendall(data)
+            # Frozen: swallow the data and keep the sockets open
+
+
+def run_once(sender: JoystickSender, proxy: FreezableProxy, hz: float) -> tuple:
+    """Drive the sender over the proxy, freeze it, return (detect, reconnect, recover) ms."""
+    period = 1.0 / hz
+    warmup_until = time.monotonic() + 1.0
+    next_probe = 0.0
+    frozen_at = detected_at = reconnected_at = None
+
+    while True:
+        now = time.monotonic()
+        if frozen_at is None and now >= warmup_until:
+            if not sender._link_confirmed:
+                raise RuntimeError("bridge never answered a probe (is it running the current version?)")
+            proxy.freeze()
+            frozen_at = time.monotonic()
+        try:
+            sender._socket.sendall(COMMAND)
+            if now >= next_probe:
+                sender._send_probe()
+                next_probe = now + sender.probe_interval_ms / 1000.0
+            sender._check_link()
+        except OSError:
+            detected_at = time.monotonic()
+            sender._socket.close()
+            sender._reconnect()
+            reconnected_at = time.monotonic()
+            next_probe = 0.0
+        if reconnected_at is not None and sender._link_confirmed:
+            recovered_at = time.monotonic()
+            return tuple((t - frozen_at) * 1000.0 for t in (detected_at, reconnected_at, recovered_at))
+        time.sleep(period)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure control-link time-to-recover")
+    parser.add_argument("--bridge-host", default="127.0.0.1")
+    parser.add_argument("--bridge-port", type=int, default=5005)
+    parser.add_argument("--proxy-port", type=int, default=5995)
+    parser.add_argument("--hz", type=float, default=100.0)
+    parser.add_argument("--link-timeout-ms", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    proxy = FreezableProxy(args.proxy_port, (args.bridge_host, args.bridge_port))
+    sender = JoystickSender(target_host="127.0.0.1", target_port=args.proxy_port,
+                            link_timeout_ms=args.link_timeout_ms)
+    sender._running = True
+    sender._connect()
+
+    print(f"link timeout {args.link_timeout_ms}ms, commands at {args.hz:.0f}Hz")
+    print(f"{'run':>3} {'detect':>9} {'reconnect':>10} {'recover':>9}  (ms after freeze)")
+    for run in range(1, args.runs + 1):
+        detect, reconnect, recover = run_once(sender, proxy, args.hz)
+        print(f"{run:>3} {detect:9.0f} {reconnect:10.0f} {recover:9.0f}")
+
+    sender._running = False
+    sender._socket.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recovered vs unrecovered packet loss with RTX and ULP FEC.
+
+Applies packet loss (and delay, as a WiFi-like RTT) to the loopback
+interface with ``tc netem`` and, for every loss rate and loss_recovery mode,
+runs the real sender pipeline (gst-launch, built by the supervisor with the
+software backend) and the control station receiver pipeline (built by the
+backend, decoding to fakesink) on localhost. Loss applies to everything on
+lo, including the RTCP NACKs, as it would on the WiFi link.
+
+Reported per run, from the receiver's elements:
+
+- pushed:       packets the jitterbuffer delivered
+- recovered:    rtx: retransmissions that arrived in time (rtx-success-count)
+                fec: packets rebuilt by rtpulpfecdec
+- unrecovered:  packets the jitterbuffer gave up on (num-lost): the picture
+                is corrupted until the next I-frame / intra refresh
+- rtx requests and the retransmission round trip (rtx)
+
+The receiver's jitterbuffer latency (--latency-ms) is the bound on the extra
+latency; the sender keeps packets for retransmission as long.
+
+Needs root (tc), GStreamer with gst-plugins-good/ugly/libav and the Python
+bindings (python3-gi). Usage:
+    sudo python3 tools/bench/bench_loss_recovery.py --loss 1 5 --delay-ms 5 --seconds 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "jetson"))
+sys.path.insert(0, str(ROOT / "backend"))
+
+import gst_pipeline  # noqa: E402
+from stream_config import load_config  # noqa: E402
+from stream_supervisor import build_gstreamer_pipeline  # noqa: E402
+from minicars_backend.video.receiver import build_receiver_pipeline  # noqa: E402
+
+SENDER_RTCP_PORT = 5603
+
+
+def netem(args: list) -> None:
+    subprocess.run(["tc", "qdisc"] + args, check=True)
+
+
+def sender_config(base: dict, mode: str, port: int, latency_ms: int, directory: str):
+    data = dict(base, control_station_host="127.0.0.1", video_port=port,
+                loss_recovery={"mode": mode, "max_delay_ms": latency_ms, "rtcp_port": SENDER_RTCP_PORT})
+    for key in ("active_preset", "destinations", "recording", "adaptive_bitrate"):
+        data.pop(key, None)
+    path = Path(directory) / "stream_config.json"
+    path.write_text(json.dumps(data))
+    return load_config(path)
+
+
+def find_element(pipeline, factory: str):
+    iterator = pipeline.iterate_elements()
+    while True:
+        result, element = iterator.next()
+        if result != gst_pipeline.Gst.IteratorResult.OK:
+            return None
+        if element.get_factory().get_name() == factory:
+            return element
+
+
+def run(base: dict, mode: str, port: int, latency_ms: int, seconds: float) -> dict:
+    Gst = gst_pipeline.Gst
+    settings = SimpleNamespace(
+        video_loss_recovery=mode, video_loss_recovery_latency_ms=latency_ms,
+        video_jitterbuffer_latency_ms=latency_ms, video_rtcp_port=port + 1,
+        video_sender_rtcp_port=SENDER_RTCP_PORT, joystick_target_host="127.0.0.1",
+    )
+    receiver = Gst.parse_launch(build_receiver_pipeline(settings, port, sink="fakesink sync=false"))
+    receiver.set_state(Gst.State.PLAYING)
+    with tempfile.TemporaryDirectory() as directory:
+        sender = subprocess.Popen(build_gstreamer_pipeline(sender_config(base, mode, port, latency_ms, directory)),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            time.sleep(seconds)
+        finally:
+            sender.terminate()
+            sender.wait()
+
+    stats = find_element(receiver, "rtpjitterbuffer").get_property("stats")
+    result = {
+        "pushed": stats.get_value("num-pushed"),
+        "unrecovered": stats.get_value("num-lost"),
+        "late": stats.get_value("num-late"),
+        "recovered": 0,
+    }
+    if mode == "rtx":
+        result["recovered"] = stats.get_value("rtx-success-count")
+        result["rtx_requests"] = stats.get_value("rtx-count")
+        result["rtx_rtt_ms"] = stats.get_value("rtx-rtt") / 1e6
+    elif mode == "fec":
+        fec = receiver.get_by_name("fec")
+        result["recovered"] = fec.get_property("recovered")
+        result["unrecovered"] = fec.get_property("unrecovered")
+    receiver.set_state(Gst.State.NULL)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure RTX / FEC loss recovery under tc netem")
+    parser.add_argument("--config", default=str(ROOT / "jetson" / "config" / "stream_config.software.json"))
+    parser.add_argument("--modes", nargs="+", default=["none", "rtx", "fec"])
+    parser.add_argument("--loss", type=float, nargs="+", default=[1.0, 5.0], help="Packet loss (%%)")
+    parser.add_argument("--delay-ms", type=float, default=5.0, help="One-way delay on lo (RTT = 2x)")
+    parser.add_argument("--latency-ms", type=int, default=100, help="Receiver jitterbuffer latency (bound)")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=5600)
+    parser.add_argument("--no-netem", action="store_true", help="Use the loss already configured on lo")
+    args = parser.parse_args()
+
+    if not args.no_netem and os.geteuid() != 0:
+        sys.exit("tc netem needs root (or pass --no-netem)")
+    if not gst_pipeline.available():
+        sys.exit("GStreamer Python bindings not available (python3-gi)")
+    base = json.loads(Path(args.config).read_text())
+
+    print(f"jitterbuffer latency {args.latency_ms}ms, delay {args.delay_ms}ms each way, {args.seconds:.0f}s per run")
+    print(f"{'loss':>6}  {'mode':<6}{'pushed':>9}{'recovered':>11}{'unrecovered':>13}{'residual':>10}"
+          f"{'rtx req':>9}{'rtx rtt':>9}")
+    try:
+        for loss in args.loss:
+            if not args.no_netem:
+                netem(["replace", "dev", "lo", "root", "netem", "delay", f"{args.delay_ms}ms", "loss", f"{loss}%"])
+            for mode in args.modes:
+                result = run(base, mode, args.port, args.latency_ms, args.seconds)
+                total = result["pushed"] + result["unrecovered"]
+                residual = result["unrecovered"] / total * 100.0 if total else 0.0
+                rtx = (f"{result['rtx_requests']:>9}{result['rtx_rtt_ms']:>7.1f}ms"
+                       if "rtx_requests" in result else f"{'-':>9}{'-':>9}")
+                print(f"{loss:>5.1f}%  {mode:<6}{result['pushed']:>9}{result['recovered']:>11}"
+                      f"{result['unrecovered']:>13}{residual:>9.2f}%{rtx}")
+    finally:
+        if not args.no_netem:
+            netem(["del", "dev", "lo", "root"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-stage glass-to-glass video latency.
+
+Uses the backend's latency measurement mode (MINICARS_VIDEO_LATENCY_ENABLED=1
+on the backend, MINICARS_LATENCY_PROBE_PORT on the Jetson supervisor, stream
+running). Resets the collected samples, waits while frames flow and prints
+the percentiles of every stage:
+
+- capture_to_encode:  capture timestamp → encoder output (Jetson)
+- encode_to_send:     encoder output → first RTP packet sent (Jetson)
+- network:            first packet sent → last packet received (needs synced clocks)
+- jitterbuffer:       rtpjitterbuffer latency (receiver, GStreamer tracer)
+- decode_to_display:  rest of the receiver pipeline up to the sink
+- total:              capture → sink
+
+Usage (backend on the laptop):
+    python3 tools/bench/bench_video_latency.py --backend http://127.0.0.1:8000 --seconds 30
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.request
+
+STAGES = ("capture_to_encode", "encode_to_send", "network", "jitterbuffer", "decode_to_display", "total")
+
+
+def request(url: str, method: str = "GET") -> dict:
+    req = urllib.request.Request(url, method=method, data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(req, timeout=5.0) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure per-stage video latency")
+    parser.add_argument("--backend", default="http://127.0.0.1:8000")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+    base = args.backend.rstrip("/")
+
+    status = request(f"{base}/video/latency")
+    if status.get("status") != "running":
+        sys.exit("latency measurement mode is off (set MINICARS_VIDEO_LATENCY_ENABLED=1 on the backend)")
+    request(f"{base}/video/latency/reset", method="POST")
+    print(f"measuring for {args.seconds:.0f}s...")
+    time.sleep(args.seconds)
+    latency = request(f"{base}/video/latency")["latency"]
+
+    print(f"frames matched: {latency['frames_matched']}")
+    print(f"{'stage':<20}{'count':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for stage in STAGES:
+        stats = latency["stages"].get(stage)
+        if stats is None:
+            print(f"{stage:<20}{'-':>8}")
+            continue
+        print(f"{stage:<20}{stats['count']:>8}" + "".join(
+            f"{stats[key]:>9.2f}" for key in ("p50", "p90", "p95", "p99", "max")))
+    if latency["frames_matched"] == 0:
+        print("no frames matched: is the Jetson supervisor running with MINICARS_LATENCY_PROBE_PORT "
+              "and the in-process pipeline?")
+    if not latency["receiver_tracer"]:
+        print("no receiver tracer data: start the receiver from the backend (POST /actions/start_stream)")
+    if latency["clock_skew_suspected"]:
+        print("WARNING: negative network latency seen; sync the Jetson and laptop clocks (NTP/chrony)")
+
+
+if __name__ == "__main__":
+    main()